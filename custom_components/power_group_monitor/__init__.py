@@ -10,13 +10,35 @@ Funktionen:
 - async_migrate_entry: Platzhalter für zukünftige Migrationslogik.
 """
 
+import copy
 import logging
 import uuid
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-
-from .const import DOMAIN, CONF_GROUP_STANDBY, CONF_GROUPS, CONF_GROUP_ID  # noqa: TID252
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+
+from .const import (  # noqa: TID252
+    DOMAIN,
+    DATA_CONFIG,
+    DATA_ENGINE,
+    DATA_GROUP_ENTITIES,
+    DATA_GROUP_STORE,
+    DATA_GROUPS,
+    DATA_STATISTICS,
+    CONF_GROUP_STANDBY,
+    CONF_GROUP_STORE,
+    CONF_GROUPS,
+    CONF_GROUPS_REVISION,
+    CONF_GROUP_ID,
+    CONF_GROUP_NAME,
+    CONF_GROUP_BACKFILL,
+    CONF_GROUP_BACKFILL_STATISTICS,
+)
+from .core.engine import PowerGroupEngine
+from .core.group_store import async_get_group_store
+from .core.snapshot import SnapshotStore
+from .core.statistics import StatisticsCompiler
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -40,7 +62,9 @@ async def async_setup(hass: HomeAssistant, config: dict):  # pylint: disable=unu
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Initialisiert eine neue Instanz der Integration beim Hinzufügen über die UI.
 
-    Registriert den Webhook und lädt die Sensor-Plattform.
+    Lädt die Gruppen aus ihrem Store, erstellt die zentrale Aggregations-Engine,
+    lädt ihren gespeicherten Snapshot, erstellt den Compiler der
+    Langzeitstatistiken und lädt die Sensor-Plattform.
 
     Args:
         hass: Die Home Assistant-Instanz.
@@ -52,13 +76,133 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     """
 
     hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][entry.entry_id] = {}
+
+    store = async_get_group_store(hass, entry.data.get(CONF_GROUP_STORE, entry.entry_id))
+    groups = await store.async_load()
+
+    engine = PowerGroupEngine(hass, entry, groups)
+    statistics = StatisticsCompiler(hass, entry, engine, groups)
+    hass.data[DOMAIN][entry.entry_id] = {
+        DATA_CONFIG: dict(entry.data),
+        DATA_GROUPS: copy.deepcopy(groups),
+        DATA_GROUP_STORE: store,
+        DATA_ENGINE: engine,
+        DATA_STATISTICS: statistics,
+    }
+
+    # Snapshot vor dem ersten Abgleich laden, damit die Sensoren sofort Werte haben
+    await engine.async_restore()
+    engine.async_start()
+    entry.async_on_unload(engine.async_stop)
+
+    # Wartet im Hintergrund auf den Recorder, um den Start nicht zu verzögern
+    entry.async_create_background_task(
+        hass, statistics.async_start(), f"{DOMAIN}_statistics_{entry.entry_id}"
+    )
+    entry.async_on_unload(statistics.async_stop)
 
     await hass.config_entries.async_forward_entry_setups(entry, ["sensor"])
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
+    # Backfill für neu angelegte oder bearbeitete Gruppen, nachdem die Sensoren
+    # ihre gespeicherten Zustände übernommen haben
+    if any(group.get(CONF_GROUP_BACKFILL) for group in groups):
+        entry.async_create_background_task(
+            hass, _async_run_backfills(hass, entry), f"{DOMAIN}_backfill_{entry.entry_id}"
+        )
 
     return True
 
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Übernimmt geänderte Daten des Eintrags.
+
+    Die Gruppen selbst liegen im ``GroupStore``; eine geänderte Revision
+    (``CONF_GROUPS_REVISION``) zeigt an, dass sie sich geändert haben. Sie
+    werden dann zur Laufzeit übernommen und alle übrigen Gruppen laufen
+    unverändert weiter. Jede andere Änderung, z.B. an Zeitfenstern oder Tarif,
+    lädt den Eintrag vollständig neu.
+    """
+    runtime = hass.data[DOMAIN].get(entry.entry_id)
+    if runtime is None:
+        return
+    previous = runtime[DATA_CONFIG]
+    settings_changed = {
+        key: value for key, value in entry.data.items() if key != CONF_GROUPS_REVISION
+    } != {key: value for key, value in previous.items() if key != CONF_GROUPS_REVISION}
+    if settings_changed or DATA_GROUP_ENTITIES not in runtime:
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    # pylint: disable=import-outside-toplevel
+    from .sensor import async_apply_group_changes
+
+    old_groups = runtime[DATA_GROUPS]
+    groups = runtime[DATA_GROUP_STORE].groups
+    runtime[DATA_CONFIG] = dict(entry.data)
+    runtime[DATA_GROUPS] = copy.deepcopy(groups)
+    await async_apply_group_changes(hass, entry, old_groups, groups)
+    await runtime[DATA_STATISTICS].async_update_groups(groups)
+
+    # Backfill nur für neu markierte Gruppen anstoßen
+    marked = {group[CONF_GROUP_ID]: group.get(CONF_GROUP_BACKFILL) for group in old_groups}
+    if any(
+        group.get(CONF_GROUP_BACKFILL)
+        and group.get(CONF_GROUP_BACKFILL) != marked.get(group[CONF_GROUP_ID])
+        for group in groups
+    ):
+        entry.async_create_background_task(
+            hass, _async_run_backfills(hass, entry), f"{DOMAIN}_backfill_{entry.entry_id}"
+        )
+
+
+async def _async_run_backfills(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Berechnet die Energie der markierten Gruppen aus der History nach.
+
+    Nach erfolgreichem Backfill wird die Markierung der Gruppe entfernt, damit
+    er beim nächsten Start nicht erneut läuft.
+    """
+    if "recorder" not in hass.config.components:
+        _LOGGER.warning("Backfill nicht möglich, der Recorder ist nicht geladen")
+        return
+
+    # NumPy erst laden, wenn tatsächlich nachberechnet wird
+    from .core.backfill import async_backfill_group  # pylint: disable=import-outside-toplevel
+
+    runtime = hass.data[DOMAIN][entry.entry_id]
+    store = runtime[DATA_GROUP_STORE]
+    statistics = runtime[DATA_STATISTICS]
+    # Erst nach dem Einlesen der letzten Summen, sonst überschreibt der Start
+    # die fortgesetzten Summen des Backfills
+    await statistics.async_wait_started()
+    done = set()
+    for group in store.groups:
+        days = int(group.get(CONF_GROUP_BACKFILL) or 0)
+        if days <= 0:
+            continue
+        if await async_backfill_group(
+            hass,
+            runtime[DATA_ENGINE],
+            statistics,
+            group[CONF_GROUP_ID],
+            days,
+            bool(group.get(CONF_GROUP_BACKFILL_STATISTICS)),
+        ):
+            done.add(group[CONF_GROUP_ID])
+
+    if not done:
+        return
+
+    # Nur der Store ändert sich; die Markierung ist für Engine und Sensoren ohne Bedeutung
+    reset = {CONF_GROUP_BACKFILL: 0, CONF_GROUP_BACKFILL_STATISTICS: False}
+    store.async_set_groups([
+        {**group, **reset} if group[CONF_GROUP_ID] in done else group for group in store.groups
+    ])
+    for group in runtime[DATA_GROUPS]:
+        if group[CONF_GROUP_ID] in done:
+            group.update(reset)
+
+
 # pylint: disable=too-many-statements
 async def async_migrate_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
     """Migration eines Config-Eintrags von Version 1 auf Version 2.
@@ -137,7 +281,63 @@ async def async_migrate_entry(hass: HomeAssistant, config_entry: ConfigEntry) ->
             _LOGGER.exception("Fehler bei Migration auf Version 1.2: %s", e)
             return False
 
-    return version == 1 and minor_version == 2
+    if version == 1 and minor_version == 2:
+        _LOGGER.warning("Migration PowerGroupMonitor v1.2 → v1.3 gestartet")
+
+        # Gruppen aus ConfigEntry.data in einen eigenen Store verschieben
+        data = dict(config_entry.data)
+        store = async_get_group_store(hass, config_entry.entry_id)
+        store.async_set_groups(data.pop(CONF_GROUPS, []))
+        await store.async_save()
+        data[CONF_GROUP_STORE] = config_entry.entry_id
+        data[CONF_GROUPS_REVISION] = 0
+
+        version = 1
+        minor_version = 3
+
+        hass.config_entries.async_update_entry(
+            config_entry,
+            version=version,
+            minor_version=minor_version,
+            data=data,
+        )
+        _LOGGER.info("Migration auf Version 1.3 abgeschlossen")
+
+    if version == 1 and minor_version == 3:
+        _LOGGER.warning("Migration PowerGroupMonitor v1.3 → v1.4 gestartet")
+
+        # Durchschnittssensoren über die Gruppen-ID statt über den Namen
+        # identifizieren, damit sie eine Umbenennung der Gruppe überstehen
+        entry_id = config_entry.entry_id
+        groups = await async_get_group_store(
+            hass, config_entry.data.get(CONF_GROUP_STORE, entry_id)
+        ).async_load()
+        unique_ids = {
+            f"{entry_id}_{group[CONF_GROUP_NAME]}_avg_power": (
+                f"{entry_id}_{group[CONF_GROUP_ID]}_avg_power"
+            )
+            for group in groups
+        }
+
+        @callback
+        def _migrate_unique_id(entity_entry: er.RegistryEntry) -> dict | None:
+            if (unique_id := unique_ids.get(entity_entry.unique_id)) is None:
+                return None
+            return {"new_unique_id": unique_id}
+
+        await er.async_migrate_entries(hass, entry_id, _migrate_unique_id)
+
+        version = 1
+        minor_version = 4
+
+        hass.config_entries.async_update_entry(
+            config_entry,
+            version=version,
+            minor_version=minor_version,
+        )
+        _LOGGER.info("Migration auf Version 1.4 abgeschlossen")
+
+    return version == 1 and minor_version == 4
 
 # async def async_migrate_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
 #     # pylint: disable=unused-argument
@@ -172,6 +372,23 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     unload_ok = await hass.config_entries.async_unload_platforms(entry, ["sensor"])
 
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id, None)
+        runtime = hass.data[DOMAIN].pop(entry.entry_id, None)
+        if runtime is not None:
+            # Aktuellen Stand sichern, damit ein Neuladen verlustfrei fortsetzt
+            await runtime[DATA_ENGINE].async_save_snapshot()
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Entfernt den gespeicherten Snapshot und die Gruppen eines gelöschten Eintrags.
+
+    Args:
+        hass: Die Home Assistant-Instanz.
+        entry: Der gelöschte Konfigurationseintrag.
+
+    """
+    await SnapshotStore(hass, entry.entry_id).async_remove()
+    await async_get_group_store(
+        hass, entry.data.get(CONF_GROUP_STORE, entry.entry_id)
+    ).async_remove()
@@ -17,6 +17,7 @@ aufgerufen, wenn der Nutzer die Integration hinzufügt oder neu konfiguriert.
 
 """
 import logging
+import re
 import uuid
 import voluptuous as vol
 
@@ -25,29 +26,188 @@ from homeassistant.const import CONF_NAME
 from homeassistant.helpers.selector import selector
 
 from .const import (
-    CONF_GROUPS,
+    CONF_COALESCE_WINDOW,
+    CONF_GROUP_STORE,
+    CONF_GROUPS_REVISION,
+    CONF_BILLING_DAY,
+    CONF_TOTAL_MODE,
+    CONF_ENERGY_PERIODS,
+    CONF_GROUP_CHILDREN,
     CONF_GROUP_ENTITIES,
     CONF_GROUP_NAME,
     CONF_GROUP_ID,
     CONF_GROUP_STANDBY,
+    CONF_GROUP_DEADBAND,
+    CONF_GROUP_DEADBAND_RELATIVE,
+    CONF_GROUP_HEARTBEAT,
+    CONF_GROUP_MAX_AGE,
+    CONF_GROUP_AREAS,
+    CONF_GROUP_FLOORS,
+    CONF_GROUP_LABELS,
+    CONF_GROUP_DEVICE_CLASSES,
+    CONF_GROUP_PATTERN,
+    CONF_GROUP_BACKFILL,
+    CONF_GROUP_BACKFILL_STATISTICS,
+    CONF_IMPORT_CONTENT,
+    CONF_IMPORT_FORMAT,
+    CONF_IMPORT_MODE,
     CONF_NEXT_STEP,
+    CONF_PEAK_WINDOWS,
+    CONF_PRICE_ENTITY,
+    CONF_QUANTILES,
+    CONF_STATISTICS_WINDOWS,
+    CONF_TARIFF_SCHEDULE,
+    DEFAULT_BILLING_DAY,
+    DEFAULT_TOTAL_MODE,
+    DEFAULT_COALESCE_WINDOW,
+    DEFAULT_DEADBAND,
+    DEFAULT_ENERGY_PERIODS,
+    DEFAULT_DEADBAND_RELATIVE,
+    DEFAULT_HEARTBEAT,
+    DEFAULT_MAX_AGE,
+    DEFAULT_DEVICE_CLASSES,
+    DEVICE_CLASS_OPTIONS,
+    DEFAULT_PEAK_WINDOWS,
+    DEFAULT_QUANTILES,
+    DEFAULT_STATISTICS_WINDOWS,
     DOMAIN,
+    ENERGY_PERIOD_OPTIONS,
+    IMPORT_FORMAT_OPTIONS,
+    IMPORT_FORMAT_YAML,
+    IMPORT_MODE_OPTIONS,
+    IMPORT_MODE_REPLACE,
+    MAX_BACKFILL_DAYS,
+    MAX_MAX_AGE,
+    MAX_BILLING_DAY,
+    TOTAL_MODE_OPTIONS,
+    MAX_COALESCE_WINDOW,
+    QUANTILE_OPTIONS,
+    STATISTICS_WINDOW_OPTIONS,
 )
+from .core.group_store import async_get_group_store
+from .core.group_transfer import build_groups, export_groups, parse_groups, unknown_entities
+from .core.hierarchy import find_cycle
+from .core.membership import compile_pattern
+from .core.tariff import parse_schedule
 
 _LOGGER = logging.getLogger(__name__)
 
+COALESCE_WINDOW_SELECTOR = selector({
+    "number": {
+        "min": 0,
+        "max": MAX_COALESCE_WINDOW,
+        "step": 50,
+        "unit_of_measurement": "ms",
+        "mode": "box",
+    }
+})
+
+STATISTICS_WINDOWS_SELECTOR = selector({
+    "select": {
+        "multiple": True,
+        "options": [
+            {
+                "value": minutes,
+                "label": f"{int(minutes) // 60} h" if int(minutes) % 60 == 0 else f"{minutes} min",
+            }
+            for minutes in STATISTICS_WINDOW_OPTIONS
+        ],
+    }
+})
+
+QUANTILES_SELECTOR = selector({
+    "select": {
+        "multiple": True,
+        "options": [
+            {"value": percentile, "label": f"P{percentile}"} for percentile in QUANTILE_OPTIONS
+        ],
+    }
+})
+
+ENERGY_PERIODS_SELECTOR = selector({
+    "select": {
+        "multiple": True,
+        "options": ENERGY_PERIOD_OPTIONS,
+        "translation_key": "energy_periods",
+    }
+})
+
+BILLING_DAY_SELECTOR = selector({
+    "number": {"min": 1, "max": MAX_BILLING_DAY, "step": 1, "mode": "box"}
+})
+
+TOTAL_MODE_SELECTOR = selector({
+    "select": {
+        "options": TOTAL_MODE_OPTIONS,
+        "translation_key": "total_mode",
+    }
+})
+
+PRICE_ENTITY_SELECTOR = selector({
+    "entity": {"filter": [{"domain": "sensor"}, {"domain": "input_number"}]}
+})
+TARIFF_SCHEDULE_SELECTOR = selector({"text": {"multiline": True}})
+
+DEADBAND_SELECTOR = selector({
+    "number": {"min": 0, "max": 1000, "step": 0.1, "unit_of_measurement": "W", "mode": "box"}
+})
+DEADBAND_RELATIVE_SELECTOR = selector({
+    "number": {"min": 0, "max": 100, "step": 0.1, "unit_of_measurement": "%", "mode": "box"}
+})
+HEARTBEAT_SELECTOR = selector({
+    "number": {"min": 0, "max": 86400, "step": 1, "unit_of_measurement": "s", "mode": "box"}
+})
+MAX_AGE_SELECTOR = selector({
+    "number": {"min": 0, "max": MAX_MAX_AGE, "step": 1, "unit_of_measurement": "min", "mode": "box"}
+})
+AREAS_SELECTOR = selector({"area": {"multiple": True}})
+FLOORS_SELECTOR = selector({"floor": {"multiple": True}})
+LABELS_SELECTOR = selector({"label": {"multiple": True}})
+DEVICE_CLASSES_SELECTOR = selector({
+    "select": {"multiple": True, "options": DEVICE_CLASS_OPTIONS}
+})
+IMPORT_FORMAT_SELECTOR = selector({
+    "select": {"options": IMPORT_FORMAT_OPTIONS, "translation_key": "import_format"}
+})
+IMPORT_MODE_SELECTOR = selector({
+    "select": {"options": IMPORT_MODE_OPTIONS, "translation_key": "import_mode"}
+})
+IMPORT_CONTENT_SELECTOR = selector({"text": {"multiline": True}})
+# Anzahl der unbekannten Entitäten, die in der Fehlermeldung genannt werden
+MAX_REPORTED_ENTITIES = 10
+BACKFILL_SELECTOR = selector({
+    "number": {
+        "min": 0,
+        "max": MAX_BACKFILL_DAYS,
+        "step": 1,
+        "unit_of_measurement": "d",
+        "mode": "box",
+    }
+})
+
+
 class PowerGroupMonitorConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Konfigurations-Flow für die PowerGroupMonitor Integration."""
 
     VERSION = 1
-    MINOR_VERSION = 2
+    MINOR_VERSION = 4
     reconfigure_supported = True  # Aktiviert den Reconfigure-Flow
 
     def __init__(self):
         self._name = None
+        self._coalesce_window = DEFAULT_COALESCE_WINDOW
+        self._statistics_windows = list(DEFAULT_STATISTICS_WINDOWS)
+        self._peak_windows = list(DEFAULT_PEAK_WINDOWS)
+        self._quantiles = list(DEFAULT_QUANTILES)
+        self._energy_periods = list(DEFAULT_ENERGY_PERIODS)
+        self._billing_day = DEFAULT_BILLING_DAY
+        self._total_mode = DEFAULT_TOTAL_MODE
+        self._price_entity = None
+        self._tariff_schedule = ""
         self._groups = []
         self._reconfigure = False
         self._edit_group_id = None  # UUID der Gruppe, die editiert wird
+        self._export_format = IMPORT_FORMAT_YAML
 
     # Hilfsmethode: Index einer Gruppe anhand der UUID finden
     def _find_group_index_by_id(self, group_id):
@@ -56,10 +216,96 @@ class PowerGroupMonitorConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 return idx
         return None
 
+    # Hilfsmethode: Auswahl der möglichen Untergruppen (ohne die Gruppe selbst)
+    def _children_selector(self, exclude_group_id=None):
+        return selector({
+            "select": {
+                "multiple": True,
+                "options": [
+                    {"value": g[CONF_GROUP_ID], "label": g[CONF_GROUP_NAME]}
+                    for g in self._groups
+                    if g[CONF_GROUP_ID] != exclude_group_id
+                ],
+            }
+        })
+
+    # Hilfsmethode: Prüft, ob die Gruppen mit geänderten Untergruppen einen Zyklus bilden
+    def _creates_cycle(self, group_id, children):
+        hierarchy = {g[CONF_GROUP_ID]: g.get(CONF_GROUP_CHILDREN, []) for g in self._groups}
+        hierarchy[group_id] = children
+        return find_cycle(hierarchy) is not None
+
+    # Hilfsmethode: Übernimmt die Tarif-Felder, liefert den Fehler eines ungültigen Zeitplans
+    def _read_tariff(self, user_input):
+        try:
+            parse_schedule(user_input.get(CONF_TARIFF_SCHEDULE))
+        except ValueError:
+            return "invalid_tariff"
+        self._price_entity = user_input.get(CONF_PRICE_ENTITY) or None
+        self._tariff_schedule = user_input.get(CONF_TARIFF_SCHEDULE, "")
+        return None
+
+    # Hilfsmethode: Felder für Preis-Entität und Tarif-Zeitplan
+    def _tariff_schema(self):
+        return {
+            vol.Optional(
+                CONF_PRICE_ENTITY, description={"suggested_value": self._price_entity}
+            ): PRICE_ENTITY_SELECTOR,
+            vol.Optional(
+                CONF_TARIFF_SCHEDULE, default=self._tariff_schedule
+            ): TARIFF_SCHEDULE_SELECTOR,
+        }
+
+    # Hilfsmethode: Liest die dynamischen Regeln einer Gruppe, ``None`` bei ungültigem Muster
+    @staticmethod
+    def _read_rules(user_input):
+        try:
+            compile_pattern(user_input.get(CONF_GROUP_PATTERN))
+        except re.error:
+            return None
+        return {
+            CONF_GROUP_AREAS: user_input.get(CONF_GROUP_AREAS, []),
+            CONF_GROUP_FLOORS: user_input.get(CONF_GROUP_FLOORS, []),
+            CONF_GROUP_LABELS: user_input.get(CONF_GROUP_LABELS, []),
+            CONF_GROUP_DEVICE_CLASSES: user_input.get(
+                CONF_GROUP_DEVICE_CLASSES, list(DEFAULT_DEVICE_CLASSES)
+            ),
+            CONF_GROUP_PATTERN: user_input.get(CONF_GROUP_PATTERN, "").strip(),
+        }
+
+    # Hilfsmethode: Felder für die dynamischen Regeln einer Gruppe
+    @staticmethod
+    def _rules_schema(group=None):
+        group = group or {}
+        return {
+            vol.Optional(CONF_GROUP_AREAS, default=group.get(CONF_GROUP_AREAS, [])): AREAS_SELECTOR,
+            vol.Optional(
+                CONF_GROUP_FLOORS, default=group.get(CONF_GROUP_FLOORS, [])
+            ): FLOORS_SELECTOR,
+            vol.Optional(
+                CONF_GROUP_LABELS, default=group.get(CONF_GROUP_LABELS, [])
+            ): LABELS_SELECTOR,
+            vol.Optional(
+                CONF_GROUP_DEVICE_CLASSES,
+                default=group.get(CONF_GROUP_DEVICE_CLASSES, list(DEFAULT_DEVICE_CLASSES)),
+            ): DEVICE_CLASSES_SELECTOR,
+            vol.Optional(CONF_GROUP_PATTERN, default=group.get(CONF_GROUP_PATTERN, "")): str,
+        }
+
     # ---------- Setup-Flow ----------
     async def async_step_user(self, user_input=None):
-        if user_input is not None:
+        errors = {}
+        if user_input is not None and (error := self._read_tariff(user_input)):
+            errors["base"] = error
+        elif user_input is not None:
             self._name = user_input[CONF_NAME]
+            self._coalesce_window = int(user_input[CONF_COALESCE_WINDOW])
+            self._statistics_windows = user_input[CONF_STATISTICS_WINDOWS]
+            self._peak_windows = user_input[CONF_PEAK_WINDOWS]
+            self._quantiles = user_input[CONF_QUANTILES]
+            self._energy_periods = user_input[CONF_ENERGY_PERIODS]
+            self._billing_day = int(user_input[CONF_BILLING_DAY])
+            self._total_mode = user_input.get(CONF_TOTAL_MODE, DEFAULT_TOTAL_MODE)
             self._groups = []
             return await self.async_step_add_group()
 
@@ -67,19 +313,56 @@ class PowerGroupMonitorConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             step_id="user",
             data_schema=vol.Schema({
                 vol.Required(CONF_NAME): str,
-            })
+                vol.Required(
+                    CONF_COALESCE_WINDOW, default=DEFAULT_COALESCE_WINDOW
+                ): COALESCE_WINDOW_SELECTOR,
+                vol.Optional(
+                    CONF_STATISTICS_WINDOWS, default=list(DEFAULT_STATISTICS_WINDOWS)
+                ): STATISTICS_WINDOWS_SELECTOR,
+                vol.Optional(
+                    CONF_PEAK_WINDOWS, default=list(DEFAULT_PEAK_WINDOWS)
+                ): STATISTICS_WINDOWS_SELECTOR,
+                vol.Optional(
+                    CONF_QUANTILES, default=list(DEFAULT_QUANTILES)
+                ): QUANTILES_SELECTOR,
+                vol.Optional(
+                    CONF_ENERGY_PERIODS, default=list(DEFAULT_ENERGY_PERIODS)
+                ): ENERGY_PERIODS_SELECTOR,
+                vol.Optional(
+                    CONF_BILLING_DAY, default=DEFAULT_BILLING_DAY
+                ): BILLING_DAY_SELECTOR,
+                vol.Optional(
+                    CONF_TOTAL_MODE, default=DEFAULT_TOTAL_MODE
+                ): TOTAL_MODE_SELECTOR,
+                **self._tariff_schema(),
+            }),
+            errors=errors,
         )
 
     async def async_step_add_group(self, user_input=None):
         """Schritt zum Hinzufügen einer neuen Gruppe im Setup-Flow."""
 
-        if user_input is not None:
+        errors = {}
+        rules = None
+        if user_input is not None and (rules := self._read_rules(user_input)) is None:
+            errors["base"] = "invalid_pattern"
+        elif user_input is not None:
             group_id = str(uuid.uuid4())  # UUID generieren
             self._groups.append({
                 CONF_GROUP_ID: group_id,
                 CONF_GROUP_NAME: user_input[CONF_GROUP_NAME],
                 CONF_GROUP_STANDBY: user_input[CONF_GROUP_STANDBY],
-                CONF_GROUP_ENTITIES: user_input[CONF_GROUP_ENTITIES],
+                CONF_GROUP_ENTITIES: user_input.get(CONF_GROUP_ENTITIES, []),
+                CONF_GROUP_CHILDREN: user_input.get(CONF_GROUP_CHILDREN, []),
+                CONF_GROUP_DEADBAND: float(user_input[CONF_GROUP_DEADBAND]),
+                CONF_GROUP_DEADBAND_RELATIVE: float(user_input[CONF_GROUP_DEADBAND_RELATIVE]),
+                CONF_GROUP_HEARTBEAT: float(user_input[CONF_GROUP_HEARTBEAT]),
+                CONF_GROUP_MAX_AGE: int(user_input.get(CONF_GROUP_MAX_AGE, DEFAULT_MAX_AGE)),
+                CONF_GROUP_BACKFILL: int(user_input.get(CONF_GROUP_BACKFILL, 0)),
+                CONF_GROUP_BACKFILL_STATISTICS: user_input.get(
+                    CONF_GROUP_BACKFILL_STATISTICS, False
+                ),
+                **rules,
             })
             if self._reconfigure:
                 return await self.async_step_reconfigure_menu()
@@ -91,7 +374,7 @@ class PowerGroupMonitorConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             data_schema=vol.Schema({
                 vol.Required(CONF_GROUP_NAME): str,
                 vol.Required(CONF_GROUP_STANDBY): str,
-                vol.Required(CONF_GROUP_ENTITIES): selector({
+                vol.Optional(CONF_GROUP_ENTITIES, default=[]): selector({
                     "entity": {
                         "multiple": True,
                         "filter": [
@@ -102,7 +385,18 @@ class PowerGroupMonitorConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                         "device_class": ["power", "energy"]
                     }
                 }),
+                vol.Optional(CONF_GROUP_CHILDREN, default=[]): self._children_selector(),
+                **self._rules_schema(),
+                vol.Optional(CONF_GROUP_DEADBAND, default=DEFAULT_DEADBAND): DEADBAND_SELECTOR,
+                vol.Optional(
+                    CONF_GROUP_DEADBAND_RELATIVE, default=DEFAULT_DEADBAND_RELATIVE
+                ): DEADBAND_RELATIVE_SELECTOR,
+                vol.Optional(CONF_GROUP_HEARTBEAT, default=DEFAULT_HEARTBEAT): HEARTBEAT_SELECTOR,
+                vol.Optional(CONF_GROUP_MAX_AGE, default=DEFAULT_MAX_AGE): MAX_AGE_SELECTOR,
+                vol.Optional(CONF_GROUP_BACKFILL, default=0): BACKFILL_SELECTOR,
+                vol.Optional(CONF_GROUP_BACKFILL_STATISTICS, default=False): bool,
             }),
+            errors=errors,
         )
 
     async def async_step_group_menu(self, user_input=None):
@@ -110,17 +404,35 @@ class PowerGroupMonitorConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         options = {
             "add_another": "Weitere Gruppe hinzufügen",
+            "import": "Gruppen importieren (YAML/CSV)",
             "finish": "Fertig"
         }
 
         if user_input is not None:
             if user_input[CONF_NEXT_STEP] == "add_another":
                 return await self.async_step_add_group()
+            if user_input[CONF_NEXT_STEP] == "import":
+                return await self.async_step_import_groups()
+            # Die Gruppen liegen in einem eigenen Store, der Eintrag verweist nur darauf
+            store_id = uuid.uuid4().hex
+            store = async_get_group_store(self.hass, store_id)
+            store.async_set_groups(self._groups)
+            await store.async_save()
             return self.async_create_entry(
                 title=self._name,
                 data={
                     CONF_NAME: self._name,
-                    CONF_GROUPS: self._groups,
+                    CONF_COALESCE_WINDOW: self._coalesce_window,
+                    CONF_STATISTICS_WINDOWS: self._statistics_windows,
+                    CONF_PEAK_WINDOWS: self._peak_windows,
+                    CONF_QUANTILES: self._quantiles,
+                    CONF_ENERGY_PERIODS: self._energy_periods,
+                    CONF_BILLING_DAY: self._billing_day,
+                    CONF_TOTAL_MODE: self._total_mode,
+                    CONF_PRICE_ENTITY: self._price_entity,
+                    CONF_TARIFF_SCHEDULE: self._tariff_schedule,
+                    CONF_GROUP_STORE: store_id,
+                    CONF_GROUPS_REVISION: 0,
                 },
             )
 
@@ -138,7 +450,24 @@ class PowerGroupMonitorConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         entry = self._get_reconfigure_entry()
         self._name = entry.data.get(CONF_NAME)
-        self._groups = entry.data.get(CONF_GROUPS, []).copy()
+        self._coalesce_window = entry.data.get(CONF_COALESCE_WINDOW, DEFAULT_COALESCE_WINDOW)
+        self._statistics_windows = list(
+            entry.data.get(CONF_STATISTICS_WINDOWS, DEFAULT_STATISTICS_WINDOWS)
+        )
+        self._peak_windows = list(entry.data.get(CONF_PEAK_WINDOWS, DEFAULT_PEAK_WINDOWS))
+        self._quantiles = list(entry.data.get(CONF_QUANTILES, DEFAULT_QUANTILES))
+        self._energy_periods = list(
+            entry.data.get(CONF_ENERGY_PERIODS, DEFAULT_ENERGY_PERIODS)
+        )
+        self._billing_day = entry.data.get(CONF_BILLING_DAY, DEFAULT_BILLING_DAY)
+        self._total_mode = entry.data.get(CONF_TOTAL_MODE, DEFAULT_TOTAL_MODE)
+        self._price_entity = entry.data.get(CONF_PRICE_ENTITY)
+        self._tariff_schedule = entry.data.get(CONF_TARIFF_SCHEDULE, "")
+        # Gruppen kopieren, damit der Store bis zum Abschluss unverändert bleibt
+        store = async_get_group_store(
+            self.hass, entry.data.get(CONF_GROUP_STORE, entry.entry_id)
+        )
+        self._groups = [dict(group) for group in await store.async_load()]
         self._reconfigure = True
         return await self.async_step_reconfigure_menu()
 
@@ -149,6 +478,9 @@ class PowerGroupMonitorConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             "add": "Neue Gruppe hinzufügen",
             "edit": "Bestehende Gruppe bearbeiten",
             "delete": "Gruppe löschen",
+            "settings": "Einstellungen ändern",
+            "import": "Gruppen importieren (YAML/CSV)",
+            "export": "Gruppen exportieren (YAML/CSV)",
             "finish": "Fertigstellen"
         }
 
@@ -160,15 +492,41 @@ class PowerGroupMonitorConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 return await self.async_step_select_group_to_edit()
             if choice == "delete":
                 return await self.async_step_select_group_to_delete()
+            if choice == "settings":
+                return await self.async_step_settings()
+            if choice == "import":
+                return await self.async_step_import_groups()
+            if choice == "export":
+                return await self.async_step_export_groups()
             if choice == "finish":
+                # Kein Neuladen: der Update-Listener übernimmt geänderte Gruppen
+                # zur Laufzeit und lädt nur bei geänderten Einstellungen neu.
+                # Eine neue Revision zeigt ihm geänderte Gruppen im Store an.
                 entry = self._get_reconfigure_entry()
-                return self.async_update_reload_and_abort(
+                store = async_get_group_store(
+                    self.hass, entry.data.get(CONF_GROUP_STORE, entry.entry_id)
+                )
+                revision = entry.data.get(CONF_GROUPS_REVISION, 0)
+                if store.async_set_groups(self._groups):
+                    revision += 1
+                self.hass.config_entries.async_update_entry(
                     entry,
-                    data_updates={
+                    data={
+                        **entry.data,
                         CONF_NAME: self._name,
-                        CONF_GROUPS: self._groups
+                        CONF_COALESCE_WINDOW: self._coalesce_window,
+                        CONF_STATISTICS_WINDOWS: self._statistics_windows,
+                        CONF_PEAK_WINDOWS: self._peak_windows,
+                        CONF_QUANTILES: self._quantiles,
+                        CONF_ENERGY_PERIODS: self._energy_periods,
+                        CONF_BILLING_DAY: self._billing_day,
+                        CONF_TOTAL_MODE: self._total_mode,
+                        CONF_PRICE_ENTITY: self._price_entity,
+                        CONF_TARIFF_SCHEDULE: self._tariff_schedule,
+                        CONF_GROUPS_REVISION: revision,
                     }
                 )
+                return self.async_abort(reason="reconfigure_successful")
 
         group_list_str = "\n".join(
             [
@@ -185,6 +543,135 @@ class PowerGroupMonitorConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             description_placeholders={"groups": group_list_str}
         )
 
+    # ---------- Import und Export ----------
+    async def async_step_import_groups(self, user_input=None):
+        """Schritt zum Importieren vieler Gruppen aus YAML oder CSV.
+
+        Die Datei wird vollständig geprüft, bevor die Gruppen übernommen
+        werden; gespeichert wird erst beim Abschluss des Flows.
+        """
+
+        errors = {}
+        placeholders = {"error": ""}
+        user_input = user_input or {}
+        if CONF_IMPORT_CONTENT in user_input:
+            try:
+                groups = build_groups(
+                    parse_groups(user_input[CONF_IMPORT_CONTENT], user_input[CONF_IMPORT_FORMAT]),
+                    self._groups,
+                    user_input.get(CONF_IMPORT_MODE, IMPORT_MODE_REPLACE),
+                )
+            except ValueError as err:
+                errors["base"] = "invalid_import"
+                placeholders["error"] = str(err)
+            else:
+                if missing := unknown_entities(self.hass, groups):
+                    errors["base"] = "unknown_entities"
+                    placeholders["error"] = ", ".join(missing[:MAX_REPORTED_ENTITIES]) + (
+                        " …" if len(missing) > MAX_REPORTED_ENTITIES else ""
+                    )
+                else:
+                    _LOGGER.info("%d Gruppen importiert", len(groups))
+                    self._groups = groups
+                    if self._reconfigure:
+                        return await self.async_step_reconfigure_menu()
+                    return await self.async_step_group_menu()
+
+        return self.async_show_form(
+            step_id="import_groups",
+            data_schema=vol.Schema({
+                vol.Required(
+                    CONF_IMPORT_FORMAT,
+                    default=user_input.get(CONF_IMPORT_FORMAT, IMPORT_FORMAT_YAML),
+                ): IMPORT_FORMAT_SELECTOR,
+                vol.Required(
+                    CONF_IMPORT_MODE,
+                    default=user_input.get(CONF_IMPORT_MODE, IMPORT_MODE_REPLACE),
+                ): IMPORT_MODE_SELECTOR,
+                vol.Required(
+                    CONF_IMPORT_CONTENT, default=user_input.get(CONF_IMPORT_CONTENT, "")
+                ): IMPORT_CONTENT_SELECTOR,
+            }),
+            errors=errors,
+            description_placeholders=placeholders,
+        )
+
+    async def async_step_export_groups(self, user_input=None):
+        """Schritt zur Auswahl des Formats für den Export der Gruppen."""
+
+        if user_input is not None:
+            self._export_format = user_input[CONF_IMPORT_FORMAT]
+            return await self.async_step_export_result()
+
+        return self.async_show_form(
+            step_id="export_groups",
+            data_schema=vol.Schema({
+                vol.Required(
+                    CONF_IMPORT_FORMAT, default=self._export_format
+                ): IMPORT_FORMAT_SELECTOR,
+            }),
+        )
+
+    async def async_step_export_result(self, user_input=None):
+        """Zeigt die exportierten Gruppen zum Kopieren an."""
+
+        if user_input is not None:
+            return await self.async_step_reconfigure_menu()
+
+        return self.async_show_form(
+            step_id="export_result",
+            data_schema=vol.Schema({
+                vol.Optional(
+                    CONF_IMPORT_CONTENT, default=export_groups(self._groups, self._export_format)
+                ): IMPORT_CONTENT_SELECTOR,
+            }),
+        )
+
+    async def async_step_settings(self, user_input=None):
+        """Schritt zum Ändern der Einstellungen des Eintrags im Reconfigure-Flow."""
+
+        errors = {}
+        if user_input is not None and (error := self._read_tariff(user_input)):
+            errors["base"] = error
+        elif user_input is not None:
+            self._coalesce_window = int(user_input[CONF_COALESCE_WINDOW])
+            self._statistics_windows = user_input[CONF_STATISTICS_WINDOWS]
+            self._peak_windows = user_input[CONF_PEAK_WINDOWS]
+            self._quantiles = user_input[CONF_QUANTILES]
+            self._energy_periods = user_input[CONF_ENERGY_PERIODS]
+            self._billing_day = int(user_input[CONF_BILLING_DAY])
+            self._total_mode = user_input.get(CONF_TOTAL_MODE, DEFAULT_TOTAL_MODE)
+            return await self.async_step_reconfigure_menu()
+
+        return self.async_show_form(
+            step_id="settings",
+            data_schema=vol.Schema({
+                vol.Required(
+                    CONF_COALESCE_WINDOW, default=self._coalesce_window
+                ): COALESCE_WINDOW_SELECTOR,
+                vol.Optional(
+                    CONF_STATISTICS_WINDOWS, default=self._statistics_windows
+                ): STATISTICS_WINDOWS_SELECTOR,
+                vol.Optional(
+                    CONF_PEAK_WINDOWS, default=self._peak_windows
+                ): STATISTICS_WINDOWS_SELECTOR,
+                vol.Optional(
+                    CONF_QUANTILES, default=self._quantiles
+                ): QUANTILES_SELECTOR,
+                vol.Optional(
+                    CONF_ENERGY_PERIODS, default=self._energy_periods
+                ): ENERGY_PERIODS_SELECTOR,
+                vol.Optional(
+                    CONF_BILLING_DAY, default=self._billing_day
+                ): BILLING_DAY_SELECTOR,
+                vol.Optional(
+                    CONF_TOTAL_MODE, default=self._total_mode
+                ): TOTAL_MODE_SELECTOR,
+                **self._tariff_schema(),
+            }),
+            errors=errors,
+        )
+
     async def async_step_select_group_to_edit(self, user_input=None):
         """Schritt zum Auswählen und Bearbeiten einer bestehenden Gruppe."""
 
@@ -214,6 +701,11 @@ class PowerGroupMonitorConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             idx = self._find_group_index_by_id(group_id)
             if idx is not None:
                 del self._groups[idx]
+                for group in self._groups:
+                    if group_id in group.get(CONF_GROUP_CHILDREN, []):
+                        group[CONF_GROUP_CHILDREN] = [
+                            child for child in group[CONF_GROUP_CHILDREN] if child != group_id
+                        ]
             return await self.async_step_reconfigure_menu()
 
         choices_list = [{"value": g[CONF_GROUP_ID],
@@ -242,23 +734,42 @@ class PowerGroupMonitorConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             self._edit_group_id = None
             return await self.async_step_select_group_to_edit()
 
+        errors = {}
         if user_input is not None:
-            self._groups[idx] = {
-                CONF_GROUP_ID: self._edit_group_id,
-                CONF_GROUP_NAME: user_input[CONF_GROUP_NAME],
-                CONF_GROUP_STANDBY: user_input[CONF_GROUP_STANDBY],
-                CONF_GROUP_ENTITIES: user_input[CONF_GROUP_ENTITIES],
-            }
-            self._edit_group_id = None
-            return await self.async_step_reconfigure_menu()
+            children = user_input.get(CONF_GROUP_CHILDREN, [])
+            rules = self._read_rules(user_input)
+            if self._creates_cycle(self._edit_group_id, children):
+                errors["base"] = "group_cycle"
+            elif rules is None:
+                errors["base"] = "invalid_pattern"
+            else:
+                self._groups[idx] = {
+                    CONF_GROUP_ID: self._edit_group_id,
+                    CONF_GROUP_NAME: user_input[CONF_GROUP_NAME],
+                    CONF_GROUP_STANDBY: user_input[CONF_GROUP_STANDBY],
+                    CONF_GROUP_ENTITIES: user_input.get(CONF_GROUP_ENTITIES, []),
+                    CONF_GROUP_CHILDREN: children,
+                    CONF_GROUP_DEADBAND: float(user_input[CONF_GROUP_DEADBAND]),
+                    CONF_GROUP_DEADBAND_RELATIVE: float(user_input[CONF_GROUP_DEADBAND_RELATIVE]),
+                    CONF_GROUP_HEARTBEAT: float(user_input[CONF_GROUP_HEARTBEAT]),
+                    CONF_GROUP_MAX_AGE: int(user_input.get(CONF_GROUP_MAX_AGE, DEFAULT_MAX_AGE)),
+                    CONF_GROUP_BACKFILL: int(user_input.get(CONF_GROUP_BACKFILL, 0)),
+                    CONF_GROUP_BACKFILL_STATISTICS: user_input.get(
+                        CONF_GROUP_BACKFILL_STATISTICS, False
+                    ),
+                    **rules,
+                }
+                self._edit_group_id = None
+                return await self.async_step_reconfigure_menu()
 
         group = self._groups[idx]
         return self.async_show_form(
             step_id="edit_group",
+            errors=errors,
             data_schema=vol.Schema({
                 vol.Required(CONF_GROUP_NAME, default=group[CONF_GROUP_NAME]): str,
                 vol.Required(CONF_GROUP_STANDBY, default=group[CONF_GROUP_STANDBY]): str,
-                vol.Required(CONF_GROUP_ENTITIES,
+                vol.Optional(CONF_GROUP_ENTITIES,
                              default=group.get(CONF_GROUP_ENTITIES, [])): selector({
                     "entity": {
                         "multiple": True,
@@ -269,7 +780,29 @@ class PowerGroupMonitorConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                         ],
                         "device_class": ["power", "energy"]
                     }
-                })
+                }),
+                vol.Optional(
+                    CONF_GROUP_CHILDREN, default=group.get(CONF_GROUP_CHILDREN, [])
+                ): self._children_selector(self._edit_group_id),
+                **self._rules_schema(group),
+                vol.Optional(
+                    CONF_GROUP_DEADBAND,
+                    default=group.get(CONF_GROUP_DEADBAND, DEFAULT_DEADBAND),
+                ): DEADBAND_SELECTOR,
+                vol.Optional(
+                    CONF_GROUP_DEADBAND_RELATIVE,
+                    default=group.get(CONF_GROUP_DEADBAND_RELATIVE, DEFAULT_DEADBAND_RELATIVE),
+                ): DEADBAND_RELATIVE_SELECTOR,
+                vol.Optional(
+                    CONF_GROUP_HEARTBEAT,
+                    default=group.get(CONF_GROUP_HEARTBEAT, DEFAULT_HEARTBEAT),
+                ): HEARTBEAT_SELECTOR,
+                vol.Optional(
+                    CONF_GROUP_MAX_AGE,
+                    default=group.get(CONF_GROUP_MAX_AGE, DEFAULT_MAX_AGE),
+                ): MAX_AGE_SELECTOR,
+                vol.Optional(CONF_GROUP_BACKFILL, default=0): BACKFILL_SELECTOR,
+                vol.Optional(CONF_GROUP_BACKFILL_STATISTICS, default=False): bool,
             })
         )
 
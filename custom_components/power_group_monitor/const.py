@@ -5,17 +5,157 @@ Attributes:
         in Home Assistant verwendet.
 """
 
+from datetime import timedelta
+
 DOMAIN = "power_group_monitor"
 
 CONF_GROUPS = "groups"
+# Verweis auf den Store mit den Gruppen und Revision, die bei jeder Änderung steigt
+CONF_GROUP_STORE = "group_store"
+CONF_GROUPS_REVISION = "groups_revision"
 CONF_GROUP_ENTITIES = "entities"
 CONF_GROUP_NAME = "group_name"
 CONF_GROUP_STANDBY = "standby"
 CONF_NEXT_STEP = "next_step"
 CONF_GROUP_ID = "CONF_GROUP_ID"
+CONF_GROUP_CHILDREN = "children"
+CONF_GROUP_DEADBAND = "deadband"
+CONF_GROUP_DEADBAND_RELATIVE = "deadband_relative"
+CONF_GROUP_HEARTBEAT = "heartbeat"
+CONF_GROUP_BACKFILL = "backfill"
+CONF_GROUP_MAX_AGE = "max_age"
+CONF_GROUP_AREAS = "areas"
+CONF_GROUP_FLOORS = "floors"
+CONF_GROUP_LABELS = "labels"
+CONF_GROUP_DEVICE_CLASSES = "device_classes"
+CONF_GROUP_PATTERN = "pattern"
+CONF_GROUP_BACKFILL_STATISTICS = "backfill_statistics"
+CONF_COALESCE_WINDOW = "coalesce_window"
+CONF_STATISTICS_WINDOWS = "statistics_windows"
+CONF_PEAK_WINDOWS = "peak_windows"
+CONF_QUANTILES = "quantiles"
+CONF_ENERGY_PERIODS = "energy_periods"
+CONF_BILLING_DAY = "billing_day"
+CONF_PRICE_ENTITY = "price_entity"
+CONF_TOTAL_MODE = "total_mode"
+CONF_TARIFF_SCHEDULE = "tariff_schedule"
+CONF_IMPORT_FORMAT = "format"
+CONF_IMPORT_MODE = "mode"
+CONF_IMPORT_CONTENT = "content"
+
+# Zeitfenster (ms), in dem Zustandsänderungen zusammengefasst geschrieben werden
+DEFAULT_COALESCE_WINDOW = 1000
+MAX_COALESCE_WINDOW = 5000
+
+# Gleitende Statistik-Fenster (Minuten); 15 Minuten speist immer den Durchschnittssensor
+STATISTICS_WINDOW_OPTIONS = ["1", "5", "15", "60", "1440"]
+DEFAULT_STATISTICS_WINDOWS = STATISTICS_WINDOW_OPTIONS
+AVERAGE_WINDOW = 15 * 60
+# Stundenfenster für Minimum und Maximum der Langzeitstatistik, immer vorhanden
+STATISTICS_HOUR_WINDOW = 60 * 60
+
+# Gleitende Spitzenwert-Fenster (Minuten), Auswahl wie bei den Statistik-Fenstern
+DEFAULT_PEAK_WINDOWS = ["15", "60"]
+
+# Perzentile (%) der Leistung je Tag und gleitender Woche
+QUANTILE_OPTIONS = ["50", "75", "90", "95", "99"]
+DEFAULT_QUANTILES = ["50", "95", "99"]
+QUANTILE_DAYS = 7
+
+# Messperiode (s) der Leistungsspitze nach Abrechnung und ihre Zeiträume
+DEMAND_INTERVAL = 15 * 60
+PERIOD_DAY = "day"
+PERIOD_MONTH = "month"
+
+# Weitere Zeiträume mit eigenem Energie-Sensor; die Abrechnungsperiode beginnt
+# am konfigurierten Tag des Monats
+PERIOD_WEEK = "week"
+PERIOD_YEAR = "year"
+PERIOD_BILLING = "billing"
+ENERGY_PERIOD_OPTIONS = [PERIOD_WEEK, PERIOD_MONTH, PERIOD_YEAR, PERIOD_BILLING]
+DEFAULT_ENERGY_PERIODS = [PERIOD_MONTH]
+DEFAULT_BILLING_DAY = 1
+MAX_BILLING_DAY = 28
+
+# Anzahl der größten Verbraucher im Attribut ``top_members`` des Leistungssensors
+TOP_MEMBERS = 5
+
+# Gesamtsumme über alle Gruppen: Summe der obersten Gruppen oder Vereinigung,
+# in der ein Mitglied mehrerer Gruppen nur einmal zählt
+TOTAL_MODE_SUM = "sum"
+TOTAL_MODE_UNION = "union"
+TOTAL_MODE_OPTIONS = [TOTAL_MODE_SUM, TOTAL_MODE_UNION]
+DEFAULT_TOTAL_MODE = TOTAL_MODE_SUM
+
+# Import und Export der Gruppen: Dateiformat und ob bestehende Gruppen erhalten bleiben
+IMPORT_FORMAT_YAML = "yaml"
+IMPORT_FORMAT_CSV = "csv"
+IMPORT_FORMAT_OPTIONS = [IMPORT_FORMAT_YAML, IMPORT_FORMAT_CSV]
+IMPORT_MODE_REPLACE = "replace"
+IMPORT_MODE_MERGE = "merge"
+IMPORT_MODE_OPTIONS = [IMPORT_MODE_REPLACE, IMPORT_MODE_MERGE]
+
+# Totband (W bzw. %) und maximale Ruhezeit (s) vor dem Schreiben eines Zustands
+DEFAULT_DEADBAND = 1.0
+DEFAULT_DEADBAND_RELATIVE = 1.0
+DEFAULT_HEARTBEAT = 300
+
+# Backfill: maximale Anzahl Tage und Länge eines aus der History gelesenen Abschnitts
+MAX_BACKFILL_DAYS = 365
+BACKFILL_CHUNK = timedelta(hours=6)
+
+# Snapshot der Engine: Speicherintervall, Verzögerung zum Bündeln der Schreibvorgänge
+# und maximale Lücke, über die die zuletzt gehaltene Leistung fortgeschrieben wird
+SNAPSHOT_INTERVAL = timedelta(minutes=5)
+SNAPSHOT_SAVE_DELAY = 10
+SNAPSHOT_MAX_GAP = timedelta(minutes=15)
+
+# Verzögerung (s), mit der Änderungen der Gruppen gebündelt gespeichert werden
+GROUP_SAVE_DELAY = 1
+
+# Schlüssel der Laufzeitdaten unter hass.data[DOMAIN][entry_id]
+DATA_ENGINE = "engine"
+DATA_STATISTICS = "statistics"
+# Zuletzt übernommene Daten und Gruppen des Eintrags, Callback und Entitäten der Sensor-Plattform
+DATA_CONFIG = "config"
+DATA_GROUPS = "groups"
+DATA_GROUP_STORE = "group_store"
+DATA_ADD_ENTITIES = "add_entities"
+DATA_GROUP_ENTITIES = "group_entities"
+DATA_TOTAL_ENTITIES = "total_entities"
+
+# Schlüssel des domänenweiten Registers der Quell-Entitäten unter hass.data[DOMAIN]
+DATA_REGISTRY = "member_registry"
+# Schlüssel der geladenen Gruppen-Stores unter hass.data[DOMAIN]
+DATA_GROUP_STORES = "group_stores"
 
 
 DEVICE_INFO = {
     "manufacturer": "mephdrac",
     "model": "Power - Monitor",
 }
+
+# Intervall, in dem die inkrementell geführten Summen vollständig neu berechnet
+# werden, um Rundungsfehler der Gleitkomma-Arithmetik zu begrenzen.
+RESYNC_INTERVAL = timedelta(minutes=10)
+
+# Intervall, in dem die Energie auch ohne neue Ereignisse fortgeschrieben wird
+INTEGRATION_INTERVAL = timedelta(seconds=60)
+
+# Geräteklassen der Sensoren, die über dynamische Regeln Mitglied werden können
+DEVICE_CLASS_OPTIONS = ["power", "energy"]
+DEFAULT_DEVICE_CLASSES = ["power"]
+
+# Maximales Alter (min) des letzten Berichts eines Mitglieds, 0 = unbegrenzt,
+# und Auflösung des Timing Wheels, das veraltete Mitglieder erkennt
+DEFAULT_MAX_AGE = 0
+MAX_MAX_AGE = 1440
+STALE_CHECK_INTERVAL = timedelta(seconds=10)
+
+# Namen der Energie-Akkumulatoren des gemeinsamen Integrators
+ENERGY_TODAY = "today"
+ENERGY_TOTAL = "total"
+ENERGY_HOUR = "hour"
+
+# Akkumulatoren, für die bei konfiguriertem Tarif auch die Kosten geführt werden
+COST_ACCUMULATORS = (ENERGY_TODAY, ENERGY_TOTAL)
@@ -0,0 +1,281 @@
+"""Nachberechnung der Energie einer Gruppe aus der History des Recorders.
+
+Wird eine Gruppe neu angelegt oder bearbeitet, beginnen ihre Energie-Sensoren
+sonst bei null bzw. bei einem veralteten Stand. Der Backfill liest die History
+der Mitglieder abschnittsweise (``BACKFILL_CHUNK``) im Executor des Recorders,
+integriert die Leistung jedes Mitglieds mit NumPy und summiert die Energie
+gewichtet in Stunden-Buckets. Da die Integration linear ist, entspricht die
+Summe der Mitglieder-Energien exakt der Energie der Gruppenleistung, ohne dass
+die Gruppenleistung selbst auf ein gemeinsames Raster gebracht werden muss.
+
+Aus denselben Stunden-Buckets werden die Stunde und alle konfigurierten
+Perioden (Tag, Woche, Monat, Jahr, Abrechnung) gesetzt. Der Gesamtzähler
+behält die Energie vor dem Zeitraum: Nur die Energie, die die Engine im
+Zeitraum bereits gezählt hat (laut Langzeitstatistik und laufender Stunde),
+wird durch die nachberechnete ersetzt.
+
+Bei Energiezählern (kWh) werden statt der Integration die Zählerzuwächse mit
+derselben Behandlung von Rücksetzungen wie in der Engine summiert.
+
+Im Speicher liegt damit immer nur die History eines Mitglieds für einen
+Abschnitt sowie ein Wert pro Stunde des gesamten Zeitraums (ein Jahr sind
+8760 Werte), unabhängig von der Anzahl der Mitglieder und der Auflösung.
+
+Functions:
+    bucket_energy: Integriert eine Treppenfunktion in Energie je Intervall.
+    bucket_counter: Summiert die Zuwächse eines Energiezählers je Intervall.
+    async_backfill_group: Berechnet die Energie einer Gruppe und setzt die Integratoren.
+"""
+
+import logging
+import math
+
+import numpy as np
+
+from homeassistant.components.recorder import get_instance, history
+from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from ..const import (  # noqa: TID252
+    BACKFILL_CHUNK,
+    ENERGY_HOUR,
+    ENERGY_TODAY,
+    ENERGY_TOTAL,
+)
+from .engine import PowerGroupEngine
+from .statistics import StatisticsCompiler
+from .units import KIND_ENERGY, METER_RESET_RATIO, unit_kind
+
+_LOGGER = logging.getLogger(__name__)
+
+# Wattsekunden pro Kilowattstunde
+WS_PER_KWH = 3_600_000.0
+
+
+def bucket_energy(times, values, edges) -> np.ndarray:
+    """Integriert eine Treppenfunktion in Energie je Intervall.
+
+    Args:
+        times (np.ndarray): Aufsteigende Zeitpunkte der Werte (Unix-Zeit in Sekunden).
+        values (np.ndarray): Leistung in Watt, gehalten bis zum nächsten Zeitpunkt.
+        edges (np.ndarray): Aufsteigende Intervallgrenzen; der letzte Wert
+            beendet auch das letzte Intervall der Treppenfunktion.
+
+    Returns:
+        np.ndarray: Energie je Intervall in kWh (``len(edges) - 1`` Werte).
+
+    """
+    if len(times) == 0:
+        return np.zeros(len(edges) - 1)
+
+    times = np.clip(times, edges[0], edges[-1])
+    bounds = np.append(times, edges[-1])
+    cumulative = np.concatenate(([0.0], np.cumsum(values * np.diff(bounds))))
+    return np.diff(np.interp(edges, bounds, cumulative)) / WS_PER_KWH
+
+
+def bucket_counter(times, values, edges) -> np.ndarray:
+    """Summiert die Zuwächse eines Energiezählers je Intervall.
+
+    Der erste Wert dient als Ausgangsstand. Fällt der Zähler unter
+    ``METER_RESET_RATIO`` des vorherigen Stands, zählt der neue Stand als
+    Zuwachs; kleinere Rückgänge werden ignoriert.
+
+    Args:
+        times (np.ndarray): Aufsteigende Zeitpunkte der Zählerstände.
+        values (np.ndarray): Zählerstände in kWh.
+        edges (np.ndarray): Aufsteigende Intervallgrenzen.
+
+    Returns:
+        np.ndarray: Zuwachs je Intervall in kWh (``len(edges) - 1`` Werte).
+
+    """
+    if len(times) < 2:
+        return np.zeros(len(edges) - 1)
+
+    # Kleine Rückgänge ignorieren: gezählt wird gegen das bisherige Maximum
+    # seit der letzten Rücksetzung
+    previous = values[:-1]
+    current = values[1:]
+    deltas = np.zeros(len(values))
+    resets = current < previous * METER_RESET_RATIO
+    segments = np.concatenate(([0], np.cumsum(resets)))
+    for segment in np.unique(segments):
+        mask = segments == segment
+        peak = np.maximum.accumulate(values[mask])
+        deltas[mask] = np.diff(peak, prepend=peak[0])
+        first = np.flatnonzero(mask)[0]
+        if first > 0:
+            deltas[first] = values[first]
+
+    cumulative = np.cumsum(deltas)
+    index = np.searchsorted(times, edges, side="right") - 1
+    at_edges = np.where(index >= 0, cumulative[np.clip(index, 0, None)], 0.0)
+    return np.diff(at_edges)
+
+
+def _member_chunk(
+    hass: HomeAssistant, entity_id: str, kind: str, factor: float, edges
+) -> np.ndarray:
+    """Liest die History eines Mitglieds für einen Abschnitt und integriert sie.
+
+    Läuft im Executor des Recorders.
+    """
+    start = dt_util.utc_from_timestamp(edges[0])
+    end = dt_util.utc_from_timestamp(edges[-1])
+    states = history.state_changes_during_period(
+        hass,
+        start_time=start,
+        end_time=end,
+        entity_id=entity_id,
+        no_attributes=True,
+        include_start_time_state=True,
+    ).get(entity_id, [])
+
+    times = np.fromiter(
+        (state.last_changed_timestamp for state in states), dtype=float, count=len(states)
+    )
+    values = np.fromiter(
+        (_to_float(state.state) for state in states), dtype=float, count=len(states)
+    )
+    if kind == KIND_ENERGY:
+        valid = ~np.isnan(values)
+        return bucket_counter(times[valid], values[valid] * factor, edges)
+    return bucket_energy(times, np.nan_to_num(values) * factor, edges)
+
+
+def _to_float(value: str) -> float:
+    """Wandelt einen Zustand in eine Zahl um; ungültige Zustände werden ``NaN``."""
+    try:
+        number = float(value)
+    except ValueError:
+        return np.nan
+    return number if math.isfinite(number) else np.nan
+
+
+def _chunk_edges(start: float, end: float, midnight: float) -> list[np.ndarray]:
+    """Teilt den Zeitraum in Abschnitte mit Stundengrenzen und lokaler Mitternacht."""
+    chunk = BACKFILL_CHUNK.total_seconds()
+    chunks = []
+    chunk_start = start
+    while chunk_start < end:
+        chunk_end = min(chunk_start + chunk, end)
+        edges = np.arange(chunk_start, chunk_end, 3600.0)
+        edges = np.union1d(edges, [chunk_end])
+        if chunk_start < midnight < chunk_end:
+            edges = np.union1d(edges, [midnight])
+        chunks.append(edges)
+        chunk_start = chunk_end
+    return chunks
+
+
+# pylint: disable=too-many-locals
+async def async_backfill_group(
+    hass: HomeAssistant,
+    engine: PowerGroupEngine,
+    statistics: StatisticsCompiler,
+    group_id: str,
+    days: int,
+    import_statistics: bool = False,
+) -> bool:
+    """Berechnet die Energie einer Gruppe aus der History und setzt die Integratoren.
+
+    Der Zeitraum endet beim Start des Backfills. Die Energie, die die Engine
+    währenddessen weiter integriert, wird anschließend wieder aufgeschlagen.
+    Der Gesamtzähler wird nicht überschrieben, sondern um die Differenz zur
+    bereits im Zeitraum gezählten Energie korrigiert.
+
+    Args:
+        hass (HomeAssistant): Die Home Assistant-Instanz.
+        engine (PowerGroupEngine): Die Aggregations-Engine des ConfigEntry.
+        statistics (StatisticsCompiler): Compiler der Langzeitstatistiken, aus
+            denen die bisher gezählte Energie gelesen wird.
+        group_id (str): Die Gruppe.
+        days (int): Anzahl Tage, die nachberechnet werden.
+        import_statistics (bool): Die Stundenwerte auch in die
+            Langzeitstatistiken übernehmen.
+
+    Returns:
+        bool: ``True``, wenn der Backfill durchgeführt wurde.
+
+    """
+    instance = get_instance(hass)
+    if not await instance.async_db_ready:
+        return False
+
+    integrator = engine.energy.integrator(group_id)
+    before = {
+        name: integrator.energy(name)
+        for name in (ENERGY_TOTAL, ENERGY_TODAY, ENERGY_HOUR, *engine.energy.periods)
+    }
+
+    now = dt_util.utcnow()
+    end = now.timestamp()
+    current_hour = now.replace(minute=0, second=0, microsecond=0).timestamp()
+    start = current_hour - days * 86400
+    midnight = dt_util.start_of_local_day().timestamp()
+
+    # Im Zeitraum bereits gezählt: geschriebene Stunden und die laufende Stunde
+    recorded = await statistics.async_recorded_hours(group_id, dt_util.utc_from_timestamp(start))
+    counted = min(
+        sum(kwh for hour, kwh in recorded.items() if hour < current_hour) + before[ENERGY_HOUR],
+        before[ENERGY_TOTAL],
+    )
+
+    # Energie je Stunde (Beginn der Stunde -> kWh) und seit Mitternacht
+    hours = np.arange(start, current_hour + 3600.0, 3600.0)
+    hourly = np.zeros(len(hours))
+    today = 0.0
+
+    members = []
+    for entity_id, weight in engine.members.group_members(group_id).items():
+        state = hass.states.get(entity_id)
+        unit = state.attributes.get(ATTR_UNIT_OF_MEASUREMENT) if state else None
+        kind, factor = unit_kind(unit)
+        if kind is not None:
+            members.append((entity_id, kind, factor * weight))
+
+    _LOGGER.info(
+        "Backfill der Gruppe %s: %s Mitglieder, %s Tage", group_id, len(members), days
+    )
+
+    for edges in _chunk_edges(start, end, midnight):
+        energy = np.zeros(len(edges) - 1)
+        for entity_id, kind, factor in members:
+            energy += await instance.async_add_executor_job(
+                _member_chunk, hass, entity_id, kind, factor, edges
+            )
+        bins = ((edges[:-1] - start) // 3600).astype(int)
+        np.add.at(hourly, bins, energy)
+        today += float(energy[edges[:-1] >= midnight].sum())
+
+    total = float(hourly.sum())
+    energy = {
+        ENERGY_TOTAL: before[ENERGY_TOTAL] - counted + total,
+        ENERGY_TODAY: today,
+        ENERGY_HOUR: float(hourly[-1]),
+    }
+    # Woche, Monat, Jahr und Abrechnung beginnen an lokaler Mitternacht und
+    # werden aus den Stunden-Buckets ab ihrem Beginn summiert. Beginnt eine
+    # Periode vor dem Zeitraum, enthält sie nur den nachberechneten Zeitraum.
+    for period in engine.energy.periods:
+        period_start = engine.periods.period_start(period, now).timestamp()
+        energy[period] = float(hourly[hours >= period_start].sum())
+
+    live = {name: max(integrator.energy(name) - before[name], 0.0) for name in before}
+    engine.energy.async_set_energy(
+        group_id, {name: kwh + live[name] for name, kwh in energy.items()}
+    )
+
+    if import_statistics:
+        await statistics.async_import_history(
+            group_id,
+            [
+                (dt_util.utc_from_timestamp(hour), float(kwh))
+                for hour, kwh in zip(hours[:-1], hourly[:-1], strict=True)
+            ],
+        )
+
+    _LOGGER.info("Backfill der Gruppe %s abgeschlossen: %.3f kWh", group_id, total)
+    return True
@@ -0,0 +1,76 @@
+"""Zusammenfassen von Zustands-Schreibvorgängen innerhalb eines Zeitfensters.
+
+Bei Ereignisstürmen (z.B. wenn nach einem WLAN-Reconnect alle Steckdosen
+gleichzeitig melden) schreibt jeder Sensor innerhalb des konfigurierten
+Fensters höchstens einmal seinen Zustand. Der zuletzt berechnete Wert wird am
+Ende des Fensters garantiert geschrieben.
+
+Classes:
+    WriteCoalescer: Sammelt Schreibanforderungen und schreibt sie gebündelt.
+"""
+
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.entity import Entity
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class WriteCoalescer:
+    """Sammelt Schreibanforderungen von Entitäten und schreibt sie gebündelt."""
+
+    def __init__(self, hass: HomeAssistant, window: float) -> None:
+        """Initialisiert den Coalescer.
+
+        Args:
+            hass (HomeAssistant): Die Home Assistant-Instanz.
+            window (float): Länge des Zeitfensters in Sekunden. Bei ``0`` wird
+                sofort geschrieben.
+
+        """
+        self._pending: dict[Entity, None] = {}
+        self._debouncer: Debouncer | None = None
+
+        if window > 0:
+            self._debouncer = Debouncer(
+                hass,
+                _LOGGER,
+                cooldown=window,
+                immediate=False,
+                function=self._async_flush,
+            )
+
+    @callback
+    def async_schedule_write(self, entity: Entity) -> None:
+        """Fordert das Schreiben des Zustands einer Entität an.
+
+        Args:
+            entity (Entity): Die Entität, deren Zustand geschrieben werden soll.
+
+        """
+        if self._debouncer is None:
+            entity.async_write_ha_state()
+            return
+
+        self._pending[entity] = None
+        self._debouncer.async_schedule_call()
+
+    @callback
+    def async_flush(self) -> None:
+        """Schreibt alle ausstehenden Zustände sofort."""
+        self._async_flush()
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Beendet den Coalescer und verwirft ausstehende Schreibvorgänge."""
+        if self._debouncer is not None:
+            self._debouncer.async_shutdown()
+        self._pending.clear()
+
+    @callback
+    def _async_flush(self) -> None:
+        pending, self._pending = self._pending, {}
+        for entity in pending:
+            entity.async_write_ha_state()
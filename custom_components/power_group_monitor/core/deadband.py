@@ -0,0 +1,106 @@
+"""Filter für signifikante Änderungen vor dem Schreiben eines Zustands.
+
+Ein neuer Wert wird nur geschrieben, wenn er sich gegenüber dem zuletzt
+geschriebenen Wert deutlich ändert (absolutes und relatives Totband) oder
+wenn seit dem letzten Schreiben die maximale Ruhezeit (Heartbeat) abgelaufen
+ist. Nach jedem Schreiben wird der Heartbeat neu eingeplant; bei seinem Ablauf
+wird der aktuelle Wert erneut geschrieben, auch wenn er sich nicht geändert
+hat. Jeder geschriebene Zustand erzeugt eine Zeile im Recorder; das Totband
+reduziert daher das Wachstum der Datenbank deutlich.
+
+Classes:
+    SignificantChangeWriter: Schreibt Werte nur bei signifikanter Änderung.
+"""
+
+from collections.abc import Callable
+import time
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+
+class SignificantChangeWriter:
+    """Schreibt Werte nur bei signifikanter Änderung oder nach Ablauf des Heartbeats."""
+
+    # pylint: disable=too-many-arguments, too-many-positional-arguments
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        write: Callable[[float | None], None],
+        absolute: float,
+        relative: float,
+        heartbeat: float,
+    ) -> None:
+        """Initialisiert den Filter.
+
+        Args:
+            hass (HomeAssistant): Die Home Assistant-Instanz.
+            write (Callable): Übernimmt einen signifikanten Wert in die Entität.
+            absolute (float): Absolutes Totband in W (0 = deaktiviert).
+            relative (float): Relatives Totband in Prozent (0 = deaktiviert).
+            heartbeat (float): Maximale Ruhezeit in Sekunden (0 = deaktiviert).
+
+        """
+        self.hass = hass
+        self._write = write
+        self._absolute = absolute
+        self._relative = relative / 100
+        self._heartbeat = heartbeat
+
+        self._last_value: float | None = None
+        self._last_write = 0.0
+        self._pending: float | None = None
+        self._unsub_heartbeat: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_update(self, value: float | None) -> None:
+        """Übernimmt einen neuen Wert und schreibt ihn, falls er signifikant ist.
+
+        Args:
+            value (float | None): Der neue Wert.
+
+        """
+        now = time.monotonic()
+        if (
+            value is None
+            or self._last_value is None
+            or self._is_significant(value)
+            or (self._heartbeat and now - self._last_write >= self._heartbeat)
+        ):
+            self._async_write(value, now)
+            return
+
+        # Der Heartbeat nach dem letzten Schreiben übernimmt den Wert spätestens
+        self._pending = value
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Beendet einen ausstehenden Heartbeat."""
+        if self._unsub_heartbeat is not None:
+            self._unsub_heartbeat()
+            self._unsub_heartbeat = None
+
+    def _is_significant(self, value: float) -> bool:
+        change = abs(value - self._last_value)
+        if change == 0:
+            return False
+        return change >= self._absolute and change >= self._relative * abs(self._last_value)
+
+    @callback
+    def _async_heartbeat(self, _now) -> None:
+        """Schreibt nach Ablauf der Ruhezeit den aktuellen Wert, auch wenn er unverändert ist."""
+        self._unsub_heartbeat = None
+        value = self._pending if self._pending is not None else self._last_value
+        self._async_write(value, time.monotonic())
+
+    @callback
+    def _async_write(self, value: float | None, now: float) -> None:
+        self.async_shutdown()
+        self._pending = None
+        self._last_value = value
+        self._last_write = now
+        self._write(value)
+        if self._heartbeat:
+            self._unsub_heartbeat = async_call_later(
+                self.hass, self._heartbeat, self._async_heartbeat
+            )
@@ -0,0 +1,175 @@
+"""Höchste Durchschnittsleistung fester Messperioden (Leistungsspitze nach Abrechnung).
+
+Netzbetreiber rechnen die Leistung in der Regel über feste, an der Uhr
+ausgerichtete Messperioden (meist 15 Minuten) ab und berechnen den höchsten
+Mittelwert pro Abrechnungszeitraum. Der ``DemandTracker`` integriert die
+Leistung der laufenden Messperiode zeitgewichtet und übernimmt ihren
+Mittelwert beim Abschluss in die Spitzenwerte des Tages und des Monats.
+Jeder Messwert kostet damit O(1), unabhängig von der Länge der Zeiträume.
+
+Classes:
+    DemandPeak: Spitzenwert eines Zeitraums mit Zeitpunkt.
+    DemandTracker: Führt die Spitzenwerte einer Gruppe oder der Gesamtsumme.
+"""
+
+from datetime import datetime
+from typing import NamedTuple
+
+from homeassistant.util import dt as dt_util
+
+from ..const import DEMAND_INTERVAL, PERIOD_DAY, PERIOD_MONTH  # noqa: TID252
+
+
+class DemandPeak(NamedTuple):
+    """Spitzenwert eines Zeitraums."""
+
+    value: float
+    timestamp: float
+    period: tuple
+
+
+def period_key(period: str, timestamp: float) -> tuple:
+    """Liefert den Schlüssel des lokalen Zeitraums, in den ``timestamp`` fällt."""
+    local = dt_util.as_local(dt_util.utc_from_timestamp(timestamp))
+    if period == PERIOD_DAY:
+        return (local.year, local.month, local.day)
+    return (local.year, local.month)
+
+
+class DemandTracker:
+    """Höchster Mittelwert fester Messperioden je Tag und Monat."""
+
+    def __init__(self, interval: float = DEMAND_INTERVAL) -> None:
+        """Initialisiert den Tracker.
+
+        Args:
+            interval (float): Länge einer Messperiode in Sekunden.
+
+        """
+        self.interval = interval
+        self._block_start: float | None = None
+        self._first_time: float | None = None
+        self._last_time: float | None = None
+        self._power = 0.0
+        self._area = 0.0
+        self._peaks: dict[str, DemandPeak | None] = {PERIOD_DAY: None, PERIOD_MONTH: None}
+
+    def add(self, timestamp: float, power: float | None = None) -> None:
+        """Schreibt die laufende Messperiode bis ``timestamp`` fort.
+
+        Args:
+            timestamp (float): Zeitpunkt (Unix-Zeit in Sekunden).
+            power (float | None): Neue Leistung ab ``timestamp`` in Watt;
+                ``None`` behält die bisherige Leistung bei.
+
+        """
+        if self._last_time is None:
+            self._block_start = timestamp - timestamp % self.interval
+            self._first_time = self._last_time = timestamp
+        elif timestamp > self._last_time:
+            self._advance(timestamp)
+
+        if power is not None:
+            self._power = power
+
+    def current(self, now: float) -> float | None:
+        """Liefert den bisherigen Mittelwert der laufenden Messperiode."""
+        if self._last_time is None:
+            return None
+        if now > self._last_time:
+            self._advance(now)
+        covered = self._last_time - self._first_time
+        if covered <= 0:
+            return self._power
+        return self._area / covered
+
+    def peak(self, period: str, now: float) -> DemandPeak | None:
+        """Liefert den Spitzenwert des Zeitraums, in den ``now`` fällt.
+
+        Args:
+            period (str): ``PERIOD_DAY`` oder ``PERIOD_MONTH``.
+            now (float): Aktueller Zeitpunkt (Unix-Zeit in Sekunden).
+
+        Returns:
+            DemandPeak | None: Der Spitzenwert oder ``None``, solange im
+            aktuellen Zeitraum noch keine Messperiode abgeschlossen wurde.
+
+        """
+        if self._last_time is not None and now > self._last_time:
+            self._advance(now)
+        peak = self._peaks[period]
+        if peak is None or peak.period != period_key(period, now):
+            return None
+        return peak
+
+    def restore(self, period: str, value: float, peak_time: datetime) -> None:
+        """Übernimmt einen gespeicherten Spitzenwert, sofern er noch gültig ist."""
+        timestamp = peak_time.timestamp()
+        key = period_key(period, timestamp)
+        if key != period_key(period, dt_util.utcnow().timestamp()):
+            return
+        current = self._peaks[period]
+        if current is None or current.period != key or value > current.value:
+            self._peaks[period] = DemandPeak(value, timestamp, key)
+
+    def as_dict(self) -> dict:
+        """Liefert den Zustand des Trackers für einen Snapshot."""
+        return {
+            "block_start": self._block_start,
+            "first_time": self._first_time,
+            "last_time": self._last_time,
+            "power": self._power,
+            "area": self._area,
+            "peaks": {
+                period: None if peak is None else [peak.value, peak.timestamp]
+                for period, peak in self._peaks.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(
+        cls, data: dict, running: bool = True, interval: float = DEMAND_INTERVAL
+    ) -> "DemandTracker":
+        """Erstellt einen Tracker aus einem Snapshot.
+
+        Args:
+            data (dict): Der mit ``as_dict`` gespeicherte Zustand.
+            running (bool): Übernimmt auch die laufende Messperiode.
+            interval (float): Länge einer Messperiode in Sekunden.
+
+        """
+        tracker = cls(interval)
+        for period, peak in (data.get("peaks") or {}).items():
+            if period in tracker._peaks and peak is not None:
+                value, timestamp = peak
+                tracker._peaks[period] = DemandPeak(value, timestamp, period_key(period, timestamp))
+        if running and data.get("last_time") is not None:
+            tracker._block_start = data["block_start"]
+            tracker._first_time = data["first_time"]
+            tracker._last_time = data["last_time"]
+            tracker._power = data["power"]
+            tracker._area = data["area"]
+        return tracker
+
+    def _advance(self, timestamp: float) -> None:
+        """Schließt alle bis ``timestamp`` beendeten Messperioden ab."""
+        block_end = self._block_start + self.interval
+        while timestamp >= block_end:
+            self._area += self._power * (block_end - self._last_time)
+            # Wie beim Zähler des Netzbetreibers zählt die volle Messperiode;
+            # eine nach dem Start nur teilweise erfasste Periode wird dadurch
+            # nicht auf eine volle Periode hochgerechnet
+            self._close(self._block_start, self._area / self.interval)
+            self._block_start = self._first_time = self._last_time = block_end
+            self._area = 0.0
+            block_end += self.interval
+
+        self._area += self._power * (timestamp - self._last_time)
+        self._last_time = timestamp
+
+    def _close(self, block_start: float, mean: float) -> None:
+        """Übernimmt den Mittelwert einer Messperiode in die Spitzenwerte."""
+        for period, peak in self._peaks.items():
+            key = period_key(period, block_start)
+            if peak is None or peak.period != key or mean > peak.value:
+                self._peaks[period] = DemandPeak(mean, block_start, key)
@@ -0,0 +1,317 @@
+"""Energie, Kosten und Perioden der Gruppen eines ConfigEntry.
+
+Die Energie jeder Gruppe wird von genau einem ``EnergyIntegrator`` berechnet,
+der alle Energie-Sensoren der Gruppe speist. Als Vereinigung hat auch die
+Gesamtsumme (``None``) einen eigenen Integrator, da die Summe der obersten
+Gruppen gemeinsame Mitglieder mehrfach zählt.
+
+Der Tag nutzt den Akkumulator ``ENERGY_TODAY``, die übrigen konfigurierten
+Perioden (Woche, Monat, Jahr, Abrechnung) einen Akkumulator mit dem Namen der
+Periode. An einer Grenze werden alle Integratoren zum selben Zeitstempel
+abgeschlossen und der Stand der abgeschlossenen Periode vorgehalten.
+
+Ist ein Tarif konfiguriert, führen die Integratoren zusätzlich die Kosten.
+Bei jeder Preisänderung werden alle Gruppen bis zum Zeitpunkt der Änderung
+integriert, bevor der neue Preis gilt.
+
+Classes:
+    EnergyLedger: Führt Integratoren, Perioden und Tarif eines ConfigEntry.
+"""
+
+from collections.abc import Callable, Iterable
+from datetime import datetime, timedelta
+import logging
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from ..const import (  # noqa: TID252
+    CONF_ENERGY_PERIODS,
+    CONF_PRICE_ENTITY,
+    CONF_TARIFF_SCHEDULE,
+    COST_ACCUMULATORS,
+    DEFAULT_ENERGY_PERIODS,
+    ENERGY_HOUR,
+    ENERGY_TODAY,
+    ENERGY_TOTAL,
+    PERIOD_DAY,
+)
+from .integrator import EnergyIntegrator
+from .members import GroupMembers
+from .periods import PeriodScheduler
+from .tariff import Tariff, parse_schedule
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class EnergyLedger:
+    """Führt Integratoren, Perioden und Tarif der Gruppen eines ConfigEntry."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        members: GroupMembers,
+        scheduler: PeriodScheduler,
+    ) -> None:
+        """Initialisiert Integratoren und Tarif.
+
+        Args:
+            hass (HomeAssistant): Die Home Assistant-Instanz.
+            entry (ConfigEntry): Der Konfigurationseintrag mit den Einstellungen.
+            members (GroupMembers): Die Mitglieder und Wurzeln der Gruppen.
+            scheduler (PeriodScheduler): Liefert die Grenzen der Perioden.
+
+        """
+        self._members = members
+        self._scheduler = scheduler
+
+        # Konfigurierte Perioden außer dem Tag und ihre Akkumulatoren
+        self.periods: list[str] = list(entry.data.get(CONF_ENERGY_PERIODS, DEFAULT_ENERGY_PERIODS))
+        self._period_accumulators: dict[str, str] = {
+            PERIOD_DAY: ENERGY_TODAY,
+            **{period: period for period in self.periods},
+        }
+        self._accumulators = (ENERGY_TODAY, ENERGY_TOTAL, ENERGY_HOUR, *self.periods)
+
+        # Tarif für die Kosten: Preis-Entität und/oder lokaler Zeitplan
+        try:
+            schedule = parse_schedule(entry.data.get(CONF_TARIFF_SCHEDULE))
+        except ValueError as err:
+            _LOGGER.error("Tarif-Zeitplan wird ignoriert: %s", err)
+            schedule = []
+        price_entity = entry.data.get(CONF_PRICE_ENTITY) or None
+        self._tariff: Tariff | None = None
+        if schedule or price_entity:
+            self._tariff = Tariff(hass, price_entity, schedule, self._async_price_changed)
+        self._costs = COST_ACCUMULATORS if self._tariff is not None else ()
+
+        self._totals: tuple[str | None, ...] = (None,) if members.union_total else ()
+        self._integrators: dict[str | None, EnergyIntegrator] = {}
+        # Stand der zuletzt abgeschlossenen Periode je Gruppe (kWh)
+        self._previous: dict[str | None, dict[str, float]] = {}
+        self._listeners: dict[str | None, list[CALLBACK_TYPE]] = {}
+        self.sync_groups()
+
+    def sync_groups(self) -> None:
+        """Legt Integratoren neuer Gruppen an und verwirft die entfernter Gruppen."""
+        group_ids = (*self._members.groups, *self._totals)
+        for group_id in set(self._integrators) - set(group_ids):
+            del self._integrators[group_id]
+            self._previous.pop(group_id, None)
+            self._listeners.pop(group_id, None)
+        for group_id in group_ids:
+            if group_id in self._integrators:
+                continue
+            self._integrators[group_id] = EnergyIntegrator(self._accumulators, self._costs)
+            if self._tariff is not None and self._tariff.price is not None:
+                self._integrators[group_id].price = self._tariff.price
+            self._previous[group_id] = {}
+
+    @callback
+    def async_start(self) -> None:
+        """Startet die Überwachung des Tarifs."""
+        if self._tariff is not None:
+            self._tariff.async_start()
+
+    @callback
+    def async_stop(self) -> None:
+        """Beendet die Überwachung des Tarifs und entfernt alle Listener."""
+        if self._tariff is not None:
+            self._tariff.async_stop()
+        self._listeners.clear()
+
+    @callback
+    def async_add_listener(
+        self, group_id: str | None, update_callback: CALLBACK_TYPE
+    ) -> Callable[[], None]:
+        """Registriert einen Listener für die Energie einer Gruppe.
+
+        Die Listener werden im ``INTEGRATION_INTERVAL`` sowie nach dem
+        Zurücksetzen eines Akkumulators benachrichtigt.
+
+        Args:
+            group_id (str | None): Die Gruppe oder ``None`` für alle Gruppen, die
+                nur im ``INTEGRATION_INTERVAL`` benachrichtigt werden.
+            update_callback (CALLBACK_TYPE): Wird nach jeder Fortschreibung aufgerufen.
+
+        Returns:
+            Callable[[], None]: Funktion zum Entfernen des Listeners.
+
+        """
+        listeners = self._listeners.setdefault(group_id, [])
+        listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            listeners.remove(update_callback)
+
+        return remove_listener
+
+    def _notify(self, group_ids: Iterable[str | None]) -> None:
+        for group_id in group_ids:
+            for update_callback in self._listeners.get(group_id, ()):
+                update_callback()
+
+    def integrator(self, group_id: str | None) -> EnergyIntegrator:
+        """Liefert den Integrator einer Gruppe oder, als Vereinigung, der Gesamtsumme."""
+        return self._integrators[group_id]
+
+    @property
+    def has_tariff(self) -> bool:
+        """Gibt an, ob ein Tarif konfiguriert ist und Kosten geführt werden."""
+        return self._tariff is not None
+
+    @property
+    def price(self) -> float | None:
+        """Liefert den aktuell gültigen Preis je kWh."""
+        return None if self._tariff is None else self._tariff.price
+
+    def cost(self, group_id: str | None, name: str) -> float:
+        """Liefert die Kosten einer Gruppe oder aller Gruppen.
+
+        Args:
+            group_id (str | None): Die Gruppe oder ``None`` für alle Gruppen.
+            name (str): Der Akkumulator, z.B. ``ENERGY_TODAY``.
+
+        """
+        if group_id is not None or self._totals:
+            return self._integrators[group_id].cost(name)
+        return sum(self._integrators[root].cost(name) for root in self._members.roots)
+
+    def period_accumulator(self, period: str) -> str:
+        """Liefert den Akkumulator, der die Energie einer Periode zählt."""
+        return self._period_accumulators[period]
+
+    def previous_energy(self, group_id: str, period: str) -> float | None:
+        """Liefert die Energie (kWh) der zuletzt abgeschlossenen Periode einer Gruppe.
+
+        Returns:
+            float | None: Der Stand an der letzten Grenze oder ``None``, wenn
+            seit dem Start noch keine Periode abgeschlossen wurde.
+
+        """
+        return self._previous[group_id].get(period)
+
+    @callback
+    def async_restore_previous_energy(self, group_id: str, period: str, kwh: float) -> None:
+        """Übernimmt die Energie der abgeschlossenen Periode aus einem gespeicherten Zustand."""
+        self._previous[group_id].setdefault(period, kwh)
+
+    def update(self, timestamp: float) -> None:
+        """Schreibt die Energie aller Gruppen mit der bisherigen Leistung fort."""
+        for integrator in self._integrators.values():
+            integrator.update(timestamp)
+
+    @callback
+    def async_integrate(self, timestamp: float) -> None:
+        """Schreibt die Energie aller Gruppen fort und benachrichtigt alle Listener."""
+        self.update(timestamp)
+        self._notify((*self._members.groups, None))
+
+    def count(self, entity_id: str, kwh: float) -> None:
+        """Bucht den Zuwachs eines Energiezählers auf die Integratoren seiner Gruppen."""
+        for group_id, weight in self._members.weights.get(entity_id, ()):
+            self._integrators[group_id].count(kwh * weight)
+        for group_id in self._totals:
+            self._integrators[group_id].count(kwh * self._members.total_weights[entity_id])
+
+    @callback
+    def async_reset_energy(self, group_id: str | None, name: str, now: datetime) -> float:
+        """Schreibt die Energie bis ``now`` fort und setzt einen Akkumulator zurück.
+
+        Args:
+            group_id (str | None): Die Gruppe oder, als Vereinigung, die Gesamtsumme.
+            name (str): Der Akkumulator, z.B. ``ENERGY_TODAY``.
+            now (datetime): Zeitpunkt des Zurücksetzens.
+
+        Returns:
+            float: Der Stand des Akkumulators vor dem Zurücksetzen in kWh.
+
+        """
+        integrator = self._integrators[group_id]
+        integrator.update(now.timestamp())
+        previous = integrator.reset(name)
+        self._notify((group_id,))
+        return previous
+
+    @callback
+    def async_set_energy(self, group_id: str, values: dict[str, float]) -> None:
+        """Setzt Akkumulatoren einer Gruppe, z.B. nach einem Backfill.
+
+        Args:
+            group_id (str): Die Gruppe.
+            values (dict[str, float]): Neuer Stand in kWh je Akkumulator.
+
+        """
+        integrator = self._integrators[group_id]
+        for name, kwh in values.items():
+            integrator.set_energy(name, kwh)
+        self._notify((group_id,))
+
+    @callback
+    def _async_price_changed(self, timestamp: float, price: float) -> None:
+        """Integriert alle Gruppen bis zur Preisänderung und setzt den neuen Preis."""
+        for integrator in self._integrators.values():
+            integrator.update(timestamp)
+            integrator.price = price
+
+    def close_periods(self, closed: frozenset[str], timestamp: float) -> None:
+        """Integriert alle Gruppen bis zur Grenze und schließt die Perioden ab.
+
+        Die Stände der Perioden stimmen dadurch untereinander und mit der
+        Gesamtenergie überein.
+        """
+        accumulators = [
+            (period, self._period_accumulators[period])
+            for period in closed
+            if period in self._period_accumulators
+        ]
+        for group_id, integrator in self._integrators.items():
+            integrator.update(timestamp)
+            previous = self._previous[group_id]
+            for period, name in accumulators:
+                previous[period] = integrator.reset(name)
+
+    def as_dict(self, group_id: str | None) -> dict:
+        """Liefert Integrator und Vorperioden einer Gruppe für den Snapshot."""
+        return {
+            "integrator": self._integrators[group_id].as_dict(),
+            "previous": dict(self._previous[group_id]),
+        }
+
+    def restore(self, group_id: str | None, data: dict, running: bool) -> None:
+        """Übernimmt Integrator und Vorperioden einer Gruppe aus dem Snapshot."""
+        self._integrators[group_id] = EnergyIntegrator.from_dict(
+            self._accumulators, data["integrator"], running, self._costs
+        )
+        self._previous[group_id] = {
+            period: float(kwh)
+            for period, kwh in data.get("previous", {}).items()
+            if period in self._period_accumulators
+        }
+
+    def close_missed_periods(self, saved: datetime, now: datetime) -> None:
+        """Schließt die Perioden ab, deren Grenze seit dem Snapshot verstrichen ist.
+
+        Wurde die Lücke überbrückt, wird bis zur Grenze integriert; andernfalls
+        beginnt die neue Periode bei null. Der Stand der Vorperiode bleibt nur
+        erhalten, wenn der Snapshot aus genau dieser Periode stammt.
+        """
+        for period, name in self._period_accumulators.items():
+            start = self._scheduler.period_start(period, now)
+            if saved >= start:
+                continue
+            previous_start = self._scheduler.period_start(period, start - timedelta(seconds=1))
+            for group_id, integrator in self._integrators.items():
+                integrator.update(start.timestamp())
+                energy = integrator.reset(name)
+                if saved >= previous_start:
+                    self._previous[group_id][period] = energy
+                else:
+                    self._previous[group_id].pop(period, None)
+
+        # Die Stunde des Snapshots wurde nicht mehr in die Statistik übernommen
+        if int(saved.timestamp() // 3600) != int(now.timestamp() // 3600):
+            for integrator in self._integrators.values():
+                integrator.reset(ENERGY_HOUR)
@@ -0,0 +1,836 @@
+"""Zentrale Aggregations-Engine pro ConfigEntry.
+
+Die Engine erhält die Zustände ihrer Quell-Entitäten über das domänenweite
+``MemberRegistry``, das jede Entität über alle ConfigEntries hinweg genau einmal
+abonniert und jeden Zustand nur einmal ausliest. Die Engine führt die Summen
+pro Gruppe sowie über alle Gruppen inkrementell. Die Sensoren registrieren sich
+als Listener und werden nach jeder Änderung benachrichtigt, sodass die Kosten
+pro Ereignis unabhängig von der Anzahl der abgeleiteten Sensoren bleiben.
+Die Energie führt das ``EnergyLedger`` mit genau einem Integrator je Gruppe.
+Mitglieder mit Energieeinheit (z.B. kWh-Zähler) werden nicht integriert,
+sondern ihre Zählerzuwächse direkt auf die Integratoren gebucht.
+
+Gruppen können Untergruppen enthalten. ``GroupMembers`` übersetzt die
+Hierarchie beim Start einmalig in eine topologische Reihenfolge und Gewichte
+je Mitglied, sodass eine Änderung eines Mitglieds in einem Durchlauf bis zur
+Wurzel gelangt. Mitglieder aus den dynamischen Regeln einer Gruppe (Bereich, Etage, Label,
+Muster) werden zur Laufzeit hinzugefügt oder entfernt, ohne den Eintrag neu
+zu laden. Die Gesamtsumme ist wahlweise die Summe der obersten Gruppen oder die
+Vereinigung aller Mitglieder, in der ein Mitglied mehrerer Gruppen nur einmal
+zählt.
+
+Jede Gruppe besitzt einen Messwertspeicher, aus dem alle gleitenden
+Statistik-Fenster (Mittelwert, Minimum, Maximum, Standardabweichung) bedient
+werden, ohne die History abzufragen. Zusätzlich führt die Engine je Gruppe und
+für die Gesamtsumme die Leistungsspitze fester 15-Minuten-Messperioden sowie
+zeitgewichtete Quantil-Skizzen für Tag und gleitende Woche.
+
+Alle Perioden-Grenzen (Tag, Woche, Monat, Jahr, Abrechnung) werden von einem
+gemeinsamen ``PeriodScheduler`` ausgelöst. Die Engine schließt an der Grenze
+alle Akkumulatoren zum selben Zeitstempel ab, bevor die Sensoren benachrichtigt
+werden.
+
+Der gesamte Zustand wird als Snapshot gespeichert und beim Start vor dem
+ersten Abgleich geladen; Energie und Messwertspeicher liefern dazu ihren Teil
+selbst. Liegt der Snapshot höchstens ``SNAPSHOT_MAX_GAP``
+zurück, wird die Lücke mit der zuletzt gehaltenen Leistung überbrückt;
+ältere Snapshots liefern nur die aufgelaufenen Werte.
+
+Je Gruppe hält ein indizierter Max-Heap den Beitrag jedes Mitglieds, sodass
+die größten Verbraucher ohne Sortieren bei jedem Ereignis abrufbar sind.
+
+Mitglieder, deren letzter Bericht älter als das maximale Alter ihrer Gruppe
+ist, gelten als veraltet und werden aus den Summen genommen, bis sie wieder
+berichten. Die Ablaufzeiten aller Mitglieder liegen in einem gemeinsamen
+``TimingWheel``, sodass ein Bericht die Ablaufzeit in O(1) verschiebt.
+
+Classes:
+    PowerGroupEngine: Aggregiert die Leistung aller Gruppen eines ConfigEntry.
+"""
+
+from collections.abc import Callable
+from datetime import datetime, timedelta
+import logging
+import time
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util import dt as dt_util
+
+from ..const import (  # noqa: TID252
+    CONF_BILLING_DAY,
+    CONF_COALESCE_WINDOW,
+    CONF_PEAK_WINDOWS,
+    CONF_STATISTICS_WINDOWS,
+    CONF_TOTAL_MODE,
+    AVERAGE_WINDOW,
+    STATISTICS_HOUR_WINDOW,
+    DEFAULT_BILLING_DAY,
+    DEFAULT_COALESCE_WINDOW,
+    DEFAULT_PEAK_WINDOWS,
+    DEFAULT_STATISTICS_WINDOWS,
+    DEFAULT_TOTAL_MODE,
+    INTEGRATION_INTERVAL,
+    PERIOD_DAY,
+    QUANTILE_DAYS,
+    RESYNC_INTERVAL,
+    SNAPSHOT_MAX_GAP,
+    STALE_CHECK_INTERVAL,
+    TOP_MEMBERS,
+    TOTAL_MODE_UNION,
+)
+from .coalescer import WriteCoalescer
+from .demand import DemandTracker
+from .energy import EnergyLedger
+from .members import GroupMembers
+from .periods import PeriodScheduler
+from .snapshot import SnapshotStore
+from .timing_wheel import TimingWheel
+from .quantiles import PowerQuantiles
+from .registry import async_get_registry
+from .topn import IndexedMaxHeap
+from .units import KIND_ENERGY, KIND_POWER, counter_delta
+from .window_stats import SampleStore, WindowStats
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class PowerGroupEngine:
+    """Aggregiert die Leistung aller Gruppen eines ConfigEntry.
+
+    Pro Mitglied wird der zuletzt gelesene Wert in Watt gehalten. Bei einer
+    Zustandsänderung wird nur die Differenz auf die betroffenen Gruppen und die
+    Gesamtsumme angewendet. Über ``coalescer`` schreiben die Sensoren ihren
+    Zustand gebündelt im konfigurierten Zeitfenster. Energie, Kosten und
+    Perioden führt ``energy``, Mitglieder und Hierarchie ``members``.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, groups: list[dict]) -> None:
+        """Initialisiert die Engine.
+
+        Args:
+            hass (HomeAssistant): Die Home Assistant-Instanz.
+            entry (ConfigEntry): Der Konfigurationseintrag mit den Einstellungen.
+            groups (list[dict]): Die Gruppen aus dem ``GroupStore`` des Eintrags.
+
+        """
+        self.hass = hass
+        self._entry = entry
+        self.coalescer = WriteCoalescer(
+            hass, entry.data.get(CONF_COALESCE_WINDOW, DEFAULT_COALESCE_WINDOW) / 1000
+        )
+
+        # Mitglieder, Hierarchie und Einstellungen der Gruppen
+        self.members = GroupMembers(
+            hass,
+            entry.data.get(CONF_TOTAL_MODE, DEFAULT_TOTAL_MODE) == TOTAL_MODE_UNION,
+            self._async_membership_changed,
+        )
+        self.members.load(groups)
+        self._wheel = TimingWheel(STALE_CHECK_INTERVAL.total_seconds(), time.time())
+        self._stale: set[str] = set()
+
+        self._registry = async_get_registry(hass)
+        self._units = self._registry.units
+        self._values: dict[str, float] = {}
+        # Energiezähler: letzter gezählter Stand (kWh) und ``last_reset``
+        self._counters: dict[str, tuple[float, object]] = {}
+        self._group_power: dict[str, float] = dict.fromkeys(self.members.groups, 0.0)
+        self._total_power = 0.0
+        # Beitrag (W) jedes Leistungs-Mitglieds je Gruppe für die größten Verbraucher
+        self._contributors: dict[str, IndexedMaxHeap] = {
+            group_id: IndexedMaxHeap() for group_id in self.members.groups
+        }
+
+        # Energie, Kosten und Perioden aller Gruppen
+        self.periods = PeriodScheduler(
+            hass, int(entry.data.get(CONF_BILLING_DAY, DEFAULT_BILLING_DAY))
+        )
+        self.energy = EnergyLedger(hass, entry, self.members, self.periods)
+
+        configured = [
+            *entry.data.get(CONF_STATISTICS_WINDOWS, DEFAULT_STATISTICS_WINDOWS),
+            *entry.data.get(CONF_PEAK_WINDOWS, DEFAULT_PEAK_WINDOWS),
+        ]
+        self.statistics_windows = sorted(
+            {int(minutes) * 60 for minutes in configured}
+            | {AVERAGE_WINDOW, STATISTICS_HOUR_WINDOW}
+        )
+        # Messwertspeicher, Leistungsspitze nach Abrechnung und Quantil-Skizzen;
+        # ``None`` steht für die Gesamtsumme
+        self._stores: dict[str | None, SampleStore] = {}
+        self._demand: dict[str | None, DemandTracker] = {}
+        self._quantiles: dict[str | None, PowerQuantiles] = {}
+        for group_id in (*self.members.groups, None):
+            self._add_group_state(group_id)
+
+        # Tagesspitze (Leistung, Zeitpunkt) je Gruppe und der Gesamtsumme
+        self._peaks: dict[str | None, tuple[float, float]] = {}
+
+        # Snapshot: geladen beim Start, Werte von Mitgliedern ohne Zustand
+        # werden bis zum ersten Abgleich übernommen
+        self._snapshots = SnapshotStore(hass, entry.entry_id)
+        self.restored = False
+        self._restored_samples: set[str | None] = set()
+        self._restored_values: dict[str, float] = {}
+        # Bereits übernommene gespeicherte Stände (Gruppe, Akkumulator) der Sensoren
+        self._restore_claims: set[tuple[str, str]] = set()
+
+        # Listener je Gruppe, ``None`` steht für die Gesamtsumme
+        self._listeners: dict[str | None, list[CALLBACK_TYPE]] = {}
+        self._unsubs: list[CALLBACK_TYPE] = []
+        # Abonnements je Mitglied, damit Mitglieder zur Laufzeit wechseln können
+        self._member_unsubs: dict[str, CALLBACK_TYPE] = {}
+        self._report_unsubs: dict[str, CALLBACK_TYPE] = {}
+
+    def _add_group_state(self, group_id: str | None) -> None:
+        """Legt Messwertspeicher, Leistungsspitze und Quantil-Skizzen einer Gruppe an."""
+        self._stores[group_id] = SampleStore(self.statistics_windows)
+        self._demand[group_id] = DemandTracker()
+        self._quantiles[group_id] = PowerQuantiles(QUANTILE_DAYS)
+
+    @callback
+    def async_start(self) -> None:
+        """Abonniert die Quell-Entitäten und berechnet die Summen erstmalig."""
+        for entity_id in self.members.weights:
+            self._subscribe_member(entity_id)
+        self._unsubs.append(self._unsubscribe_members)
+        self.members.async_start()
+        self._unsubs.append(self.members.async_stop)
+        self._unsubs.append(
+            async_track_time_interval(self.hass, self._async_resync, RESYNC_INTERVAL)
+        )
+        # Auch ohne maximales Alter, damit es zur Laufzeit hinzukommen kann;
+        # ein leeres Rad kostet je Tick nur einen Vergleich
+        self._unsubs.append(
+            async_track_time_interval(
+                self.hass, self._async_expire_members, STALE_CHECK_INTERVAL
+            )
+        )
+        self._unsubs.append(
+            async_track_time_interval(
+                self.hass, self._async_integrate, INTEGRATION_INTERVAL
+            )
+        )
+        # Die Engine registriert sich zuerst und schließt damit die Perioden
+        # ab, bevor die Sensoren benachrichtigt werden
+        self._unsubs.append(self.periods.async_add_listener(self._async_close_periods))
+        self.periods.async_start()
+        self._unsubs.append(self.periods.async_stop)
+        self._resync(dt_util.utcnow().timestamp())
+        self._restored_values = {}
+        self.energy.async_start()
+        self._unsubs.append(self.energy.async_stop)
+        self._snapshots.async_start(self.snapshot)
+        self._unsubs.append(self._snapshots.async_stop)
+
+    async def async_restore(self) -> None:
+        """Lädt den gespeicherten Snapshot; muss vor ``async_start`` aufgerufen werden."""
+        data = await self._snapshots.async_load()
+        if not data:
+            return
+        try:
+            self._restore(data, dt_util.utcnow())
+        except (KeyError, TypeError, ValueError) as err:
+            _LOGGER.warning("Snapshot konnte nicht übernommen werden: %s", err)
+            return
+        self.restored = True
+
+    async def async_save_snapshot(self) -> None:
+        """Speichert den Snapshot sofort, z.B. vor dem Entladen des Eintrags."""
+        await self._snapshots.async_save()
+
+    @callback
+    def async_stop(self) -> None:
+        """Beendet alle Abonnements der Engine."""
+        while self._unsubs:
+            self._unsubs.pop()()
+        self._listeners.clear()
+        self.coalescer.async_shutdown()
+
+    @callback
+    def async_update_groups(self, groups: list[dict]) -> None:
+        """Übernimmt geänderte Gruppen zur Laufzeit, ohne den Eintrag neu zu laden.
+
+        Alle Integratoren werden zuvor mit der bisherigen Leistung bis jetzt
+        fortgeschrieben. Bestehende Gruppen behalten Integratoren, Statistiken
+        und Spitzenwerte; neue Gruppen beginnen leer, entfernte werden
+        verworfen. Anschließend werden Topologie, Abonnements und Summen zum
+        aktuellen Zeitpunkt neu berechnet.
+
+        Args:
+            groups (list[dict]): Die neuen Gruppen des Eintrags.
+
+        """
+        timestamp = dt_util.utcnow().timestamp()
+        self.energy.update(timestamp)
+
+        self.members.async_stop()
+        previous = set(self.members.groups)
+        self.members.load(groups)
+        current = set(self.members.groups)
+        self.energy.sync_groups()
+
+        # Zustand entfernter Gruppen verwerfen, neue Gruppen anlegen
+        for group_id in previous - current:
+            for registry in (
+                self._group_power,
+                self._contributors,
+                self._stores,
+                self._demand,
+                self._quantiles,
+                self._peaks,
+                self._listeners,
+            ):
+                registry.pop(group_id, None)
+        for group_id in current - previous:
+            self._group_power[group_id] = 0.0
+            self._contributors[group_id] = IndexedMaxHeap()
+            self._add_group_state(group_id)
+        # Laufende Gruppen brauchen keine Vorbelegung aus der History
+        self._restored_samples = previous & current
+
+        # Abonnements nur für hinzugekommene und entfallene Mitglieder ändern
+        for entity_id in set(self._member_unsubs) - set(self.members.weights):
+            self._forget_member(entity_id)
+        for entity_id in self.members.weights:
+            self._subscribe_member(entity_id)
+            if entity_id not in self.members.max_ages:
+                self._wheel.cancel(entity_id)
+                self._stale.discard(entity_id)
+        self.members.async_start()
+
+        self._resync(timestamp)
+        _LOGGER.debug("Gruppen zur Laufzeit übernommen: %s", list(self.members.groups))
+        self._notify(self.members.groups)
+
+    def _subscribe_member(self, entity_id: str) -> None:
+        """Abonniert Änderungen und ggf. Meldungen eines Mitglieds beim ``MemberRegistry``."""
+        if entity_id not in self._member_unsubs:
+            self._member_unsubs[entity_id] = self._registry.async_track_changes(
+                [entity_id], self._async_member_changed
+            )
+        max_ages = self.members.max_ages
+        if entity_id in max_ages and entity_id not in self._report_unsubs:
+            self._report_unsubs[entity_id] = self._registry.async_track_reports(
+                [entity_id], self._async_member_reported
+            )
+        elif entity_id not in max_ages and entity_id in self._report_unsubs:
+            self._report_unsubs.pop(entity_id)()
+
+    def _unsubscribe_member(self, entity_id: str) -> None:
+        if unsub := self._member_unsubs.pop(entity_id, None):
+            unsub()
+        if unsub := self._report_unsubs.pop(entity_id, None):
+            unsub()
+
+    def _forget_member(self, entity_id: str) -> None:
+        """Beendet Abonnements und Zustand einer Entität, die kein Mitglied mehr ist."""
+        self._unsubscribe_member(entity_id)
+        self._wheel.cancel(entity_id)
+        self._stale.discard(entity_id)
+        self._counters.pop(entity_id, None)
+
+    @callback
+    def _unsubscribe_members(self) -> None:
+        for entity_id in list(self._member_unsubs):
+            self._unsubscribe_member(entity_id)
+
+    @callback
+    def async_add_listener(
+        self, group_id: str | None, update_callback: CALLBACK_TYPE
+    ) -> Callable[[], None]:
+        """Registriert einen Listener für eine Gruppe oder die Gesamtsumme.
+
+        Args:
+            group_id (str | None): Die Gruppe oder ``None`` für alle Gruppen.
+            update_callback (CALLBACK_TYPE): Wird nach jeder Änderung aufgerufen.
+
+        Returns:
+            Callable[[], None]: Funktion zum Entfernen des Listeners.
+
+        """
+        listeners = self._listeners.setdefault(group_id, [])
+        listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            listeners.remove(update_callback)
+
+        return remove_listener
+
+    def group_power(self, group_id: str) -> float:
+        """Liefert die aktuelle Leistung einer Gruppe in Watt."""
+        return self._group_power.get(group_id, 0.0)
+
+    @property
+    def total_power(self) -> float:
+        """Liefert die aktuelle Leistung über alle Gruppen in Watt."""
+        return self._total_power
+
+    def top_members(self, group_id: str, count: int = TOP_MEMBERS) -> list[dict]:
+        """Liefert die größten Verbraucher einer Gruppe mit ihrem Anteil.
+
+        Args:
+            group_id (str): Die ID der Gruppe.
+            count (int): Maximale Anzahl der Einträge.
+
+        Returns:
+            list[dict]: Absteigend ``entity_id``, ``power`` (W) und ``share`` (%)
+                an der Gruppenleistung; der Anteil ist ``None``, solange die
+                Gruppe keine positive Leistung hat.
+
+        """
+        heap = self._contributors.get(group_id)
+        if heap is None:
+            return []
+        power = self._group_power.get(group_id, 0.0)
+        return [
+            {
+                "entity_id": entity_id,
+                "power": round(value, 2),
+                "share": round(value / power * 100, 1) if power > 0 else None,
+            }
+            for entity_id, value in heap.top(count)
+        ]
+
+    def stale_members(self, group_id: str | None) -> list[str]:
+        """Liefert die veralteten Mitglieder einer Gruppe oder aller Gruppen."""
+        weights = self.members.weights
+        return sorted(
+            entity_id
+            for entity_id in self._stale
+            if group_id is None
+            or any(member_group == group_id for member_group, _ in weights[entity_id])
+        )
+
+    def window_stats(self, group_id: str | None, length: float) -> WindowStats | None:
+        """Liefert die Kennzahlen eines gleitenden Zeitfensters einer Gruppe.
+
+        Args:
+            group_id (str | None): Die Gruppe oder ``None`` für die Gesamtsumme.
+            length (float): Länge des Zeitfensters in Sekunden.
+
+        Returns:
+            WindowStats | None: Die Kennzahlen oder ``None`` ohne Messwerte.
+
+        """
+        return self._stores[group_id].stats(length, dt_util.utcnow().timestamp())
+
+    @callback
+    def async_seed_samples(self, group_id: str, samples) -> None:
+        """Füllt den Messwertspeicher einer Gruppe mit historischen Werten vor.
+
+        Der Speicher wird aus den chronologisch sortierten ``samples`` neu
+        aufgebaut und mit der aktuellen Gruppenleistung fortgesetzt.
+
+        Args:
+            group_id (str): Die Gruppe.
+            samples (Iterable[tuple[float, float]]): Paare aus Zeitstempel und Wert.
+
+        """
+        store = SampleStore(self.statistics_windows)
+        for timestamp, value in samples:
+            store.add(timestamp, value)
+        store.add(dt_util.utcnow().timestamp(), self._group_power[group_id])
+        self._stores[group_id] = store
+
+    def samples_restored(self, group_id: str) -> bool:
+        """Gibt an, ob der Messwertspeicher einer Gruppe aus dem Snapshot stammt.
+
+        Das gilt auch für eine Gruppe, die bei einer Änderung zur Laufzeit
+        bereits bestand und deren Speicher weiterläuft.
+        """
+        return group_id in self._restored_samples
+
+    def claim_restore(self, group_id: str, name: str) -> bool:
+        """Gibt an, ob ein Sensor seinen gespeicherten Stand übernehmen darf.
+
+        Das gilt nur ohne Snapshot und nur einmal je Gruppe und Akkumulator,
+        damit ein nach einer Gruppenänderung neu hinzugefügter Sensor den
+        Stand nicht erneut addiert.
+        """
+        if self.restored or (group_id, name) in self._restore_claims:
+            return False
+        self._restore_claims.add((group_id, name))
+        return True
+
+    def daily_peak(self, group_id: str | None) -> tuple[float, float] | None:
+        """Liefert die höchste Leistung (W) und ihren Zeitpunkt am laufenden Tag.
+
+        Args:
+            group_id (str | None): Die Gruppe oder ``None`` für die Gesamtsumme.
+
+        """
+        return self._peaks.get(group_id)
+
+    def demand(self, group_id: str | None) -> DemandTracker:
+        """Liefert die Leistungsspitze nach Abrechnung einer Gruppe oder der Gesamtsumme."""
+        return self._demand[group_id]
+
+    def quantiles(self, group_id: str | None) -> PowerQuantiles:
+        """Liefert die Quantil-Skizzen einer Gruppe oder der Gesamtsumme."""
+        return self._quantiles[group_id]
+
+    @callback
+    def _async_member_changed(self, event, reading: tuple[str, float] | None) -> None:
+        """Übernimmt die Differenz eines Mitglieds in alle betroffenen Summen.
+
+        Args:
+            event (Event): Das Ereignis der Zustandsänderung.
+            reading (tuple[str, float] | None): Der vom ``MemberRegistry`` einmal
+                gelesene Messwert des neuen Zustands.
+
+        """
+        entity_id = event.data["entity_id"]
+        new_state = event.data["new_state"]
+        was_stale = entity_id in self._stale
+        fresh = self._track_age(entity_id, new_state, event.time_fired_timestamp)
+        if reading is not None and reading[0] == KIND_ENERGY:
+            self._count_energy(entity_id, reading[1], new_state)
+            reading = None
+        elif not fresh:
+            # Bereits beim Eintreffen veraltet: wie ein Zustand ohne Wert behandeln
+            reading = None
+        new_value = reading[1] if reading is not None else None
+        old_value = self._values.pop(entity_id, None)
+
+        if new_value is not None:
+            self._values[entity_id] = new_value
+
+        weights = self.members.weights
+        if new_value == old_value:
+            if was_stale:
+                self._notify(group_id for group_id, _ in weights[entity_id])
+            return
+
+        self._apply_change(entity_id, old_value, new_value, event.time_fired_timestamp)
+        self._notify(group_id for group_id, _ in weights.get(entity_id, ()))
+
+    def _apply_change(
+        self, entity_id: str, old_value: float | None, new_value: float | None, timestamp: float
+    ) -> None:
+        """Wendet die Änderung eines Mitglieds auf seine Gruppen und die Gesamtsumme an."""
+        delta = (new_value or 0.0) - (old_value or 0.0)
+        for group_id, weight in self.members.weights.get(entity_id, ()):
+            if new_value is None:
+                self._contributors[group_id].remove(entity_id)
+            else:
+                self._contributors[group_id].set(entity_id, new_value * weight)
+            power = self._group_power[group_id] + delta * weight
+            self._update_group(group_id, timestamp, power)
+        self._total_power += delta * self.members.total_weights.get(entity_id, 0)
+        self._update_total(timestamp)
+
+    def _update_group(self, group_id: str, timestamp: float, power: float) -> None:
+        """Übernimmt die neue Leistung einer Gruppe in Integrator und Statistiken."""
+        self._group_power[group_id] = power
+        self.energy.integrator(group_id).update(timestamp, power)
+        self._stores[group_id].add(timestamp, power)
+        self._demand[group_id].add(timestamp, power)
+        self._quantiles[group_id].update(timestamp, power)
+        self._update_peak(group_id, timestamp, power)
+
+    def _update_total(self, timestamp: float) -> None:
+        """Übernimmt die Gesamtleistung in Integrator und Statistiken der Gesamtsumme."""
+        if self.members.union_total:
+            self.energy.integrator(None).update(timestamp, self._total_power)
+        self._stores[None].add(timestamp, self._total_power)
+        self._demand[None].add(timestamp, self._total_power)
+        self._quantiles[None].update(timestamp, self._total_power)
+        self._update_peak(None, timestamp, self._total_power)
+
+    @callback
+    def _async_member_reported(self, event) -> None:
+        """Verschiebt die Ablaufzeit eines Mitglieds, das einen unveränderten Zustand meldet.
+
+        Ein veraltetes Mitglied wird wie bei einer Änderung wieder in die
+        Summen aufgenommen.
+        """
+        entity_id = event.data["entity_id"]
+        if entity_id in self._stale:
+            self._async_member_changed(event, self._units.read(entity_id, event.data["new_state"]))
+            return
+        self._wheel.schedule(
+            entity_id,
+            event.data["new_state"].last_reported_timestamp + self.members.max_ages[entity_id],
+        )
+
+    @callback
+    def _async_expire_members(self, now) -> None:
+        """Nimmt die Mitglieder aus den Summen, deren letzter Bericht zu alt ist."""
+        timestamp = now.timestamp()
+        expired = self._wheel.advance(timestamp)
+        if not expired:
+            return
+        changed = set()
+        for entity_id in expired:
+            self._stale.add(entity_id)
+            old_value = self._values.pop(entity_id, None)
+            if old_value is not None:
+                self._apply_change(entity_id, old_value, None, timestamp)
+            changed.update(group_id for group_id, _ in self.members.weights[entity_id])
+        _LOGGER.debug("Veraltete Mitglieder: %s", expired)
+        self._notify(changed)
+
+    def _track_age(self, entity_id: str, state, timestamp: float) -> bool:
+        """Plant die Ablaufzeit eines Mitglieds mit maximalem Alter ein.
+
+        Returns:
+            bool: ``False``, wenn der letzte Bericht bereits älter als das
+                maximale Alter ist und das Mitglied als veraltet gilt.
+
+        """
+        max_age = self.members.max_ages.get(entity_id)
+        if max_age is None:
+            return True
+        if state is None:
+            self._wheel.cancel(entity_id)
+            self._stale.discard(entity_id)
+            return True
+        deadline = state.last_reported_timestamp + max_age
+        if deadline <= timestamp:
+            self._wheel.cancel(entity_id)
+            self._stale.add(entity_id)
+            return False
+        self._wheel.schedule(entity_id, deadline)
+        self._stale.discard(entity_id)
+        return True
+
+    def _update_peak(self, group_id: str | None, timestamp: float, power: float) -> None:
+        peak = self._peaks.get(group_id)
+        if peak is None or power > peak[0]:
+            self._peaks[group_id] = (power, timestamp)
+
+    def _count_energy(self, entity_id: str, value: float, state) -> None:
+        """Bucht den Zuwachs eines Energiezählers auf die Integratoren seiner Gruppen.
+
+        Ändert sich ``last_reset`` oder fällt der Zähler deutlich, beginnt ein
+        neuer Zählzyklus (Rücksetzung oder Zählerwechsel) und der neue Stand wird
+        vollständig gezählt. Kleine Rückgänge werden ignoriert.
+        """
+        last_reset = state.attributes.get("last_reset")
+        previous = self._counters.get(entity_id)
+        if previous is None:
+            self._counters[entity_id] = (value, last_reset)
+            return
+
+        delta = value if last_reset != previous[1] else counter_delta(previous[0], value)
+        if delta is None:
+            return
+        self._counters[entity_id] = (value, last_reset)
+        if delta:
+            self.energy.count(entity_id, delta)
+
+    @callback
+    def _async_resync(self, now) -> None:
+        """Periodische Neuberechnung aller Summen."""
+        self._resync(now.timestamp())
+        self._notify(self.members.groups)
+
+    @callback
+    def _async_integrate(self, now) -> None:
+        """Schreibt die Energie aller Gruppen bis ``now`` fort."""
+        timestamp = now.timestamp()
+        for tracker in self._demand.values():
+            tracker.add(timestamp)
+        self.energy.async_integrate(timestamp)
+
+    @callback
+    def _async_close_periods(self, closed: frozenset[str], boundary: datetime) -> None:
+        """Schließt alle Akkumulatoren der abgelaufenen Perioden ab.
+
+        Alle Gruppen werden bis exakt zur Grenze integriert. Die Sensoren
+        werden anschließend direkt vom ``PeriodScheduler`` benachrichtigt und
+        übernehmen Stand und ``last_reset`` gemeinsam.
+        """
+        timestamp = boundary.timestamp()
+        self.energy.close_periods(closed, timestamp)
+
+        if PERIOD_DAY in closed:
+            for quantiles in self._quantiles.values():
+                quantiles.rollover(timestamp)
+            # Die neue Tagesspitze beginnt mit der aktuellen Leistung
+            self._peaks = {
+                group_id: (power, timestamp) for group_id, power in self._group_power.items()
+            }
+            self._peaks[None] = (self._total_power, timestamp)
+
+    def _resync(self, timestamp: float) -> None:
+        """Berechnet alle Summen vollständig aus der State-Machine neu."""
+        members = self.members
+        self._values = {}
+        for entity_id in members.weights:
+            state = self.hass.states.get(entity_id)
+            if state is None and entity_id in self._restored_values:
+                # Quelle noch nicht geladen: letzten Wert aus dem Snapshot halten
+                self._values[entity_id] = self._restored_values[entity_id]
+                continue
+            fresh = self._track_age(entity_id, state, timestamp)
+            reading = self._units.read(entity_id, state)
+            if reading is None:
+                continue
+            kind, value = reading
+            if kind == KIND_POWER and fresh:
+                self._values[entity_id] = value
+            elif kind == KIND_ENERGY and entity_id not in self._counters:
+                self._counters[entity_id] = (value, state.attributes.get("last_reset"))
+
+        contributions: dict[str, dict[str, float]] = {group_id: {} for group_id in members.groups}
+        for entity_id, value in self._values.items():
+            for group_id, weight in members.weights[entity_id]:
+                contributions[group_id][entity_id] = value * weight
+        for group_id, heap in self._contributors.items():
+            heap.rebuild(contributions[group_id])
+
+        # Blätter zuerst, damit die Untergruppen bereits berechnet sind
+        for group_id in members.order:
+            power = sum(self._values.get(entity_id, 0.0) for entity_id in members.groups[group_id])
+            power += sum(self._group_power[child] for child in members.children[group_id])
+            self._update_group(group_id, timestamp, power)
+        self._total_power = sum(
+            self._values.get(entity_id, 0.0) * weight
+            for entity_id, weight in members.total_weights.items()
+        )
+        self._update_total(timestamp)
+
+    def snapshot(self) -> dict:
+        """Liefert den vollständigen Aggregationszustand für den Snapshot.
+
+        Die Energie aller Gruppen wird vorher bis jetzt fortgeschrieben, damit
+        der Snapshot einem einheitlichen Zeitpunkt entspricht.
+        """
+        now = dt_util.utcnow().timestamp()
+        self.energy.update(now)
+        groups = {
+            group_id: {**self.energy.as_dict(group_id), **self._power_snapshot(group_id)}
+            for group_id in self.members.groups
+        }
+        total = self._power_snapshot(None)
+        if self.members.union_total:
+            total.update(self.energy.as_dict(None))
+
+        return {
+            "saved_at": now,
+            "values": dict(self._values),
+            "counters": {
+                entity_id: [value, last_reset]
+                for entity_id, (value, last_reset) in self._counters.items()
+            },
+            "groups": groups,
+            "total": total,
+        }
+
+    def _power_snapshot(self, group_id: str | None) -> dict:
+        """Liefert Messwertspeicher, Spitzenwerte und Quantil-Skizzen für den Snapshot."""
+        return {
+            "samples": self._stores[group_id].as_dict(),
+            "demand": self._demand[group_id].as_dict(),
+            "quantiles": self._quantiles[group_id].as_dict(),
+            "peak": self._peaks.get(group_id),
+        }
+
+    def _restore(self, data: dict, now: datetime) -> None:
+        """Übernimmt einen Snapshot für die aktuell konfigurierten Gruppen."""
+        saved = dt_util.utc_from_timestamp(float(data["saved_at"]))
+        running = timedelta(0) <= now - saved <= SNAPSHOT_MAX_GAP
+        same_day = self.periods.period_start(PERIOD_DAY, saved) == self.periods.period_start(
+            PERIOD_DAY, now
+        )
+
+        weights = self.members.weights
+        if running:
+            self._restored_values = {
+                entity_id: float(value)
+                for entity_id, value in data.get("values", {}).items()
+                if entity_id in weights
+            }
+        self._counters = {
+            entity_id: (float(value), last_reset)
+            for entity_id, (value, last_reset) in data.get("counters", {}).items()
+            if entity_id in weights
+        }
+
+        stored = data.get("groups", {})
+        for group_id in self.members.groups:
+            if (group := stored.get(group_id)) is None:
+                continue
+            self.energy.restore(group_id, group, running)
+            self._restore_power(group_id, group, running, same_day)
+
+        if (total := data.get("total")) is not None:
+            # Die Energie der Vereinigung nur aus einem Snapshot in diesem Modus
+            if self.members.union_total and "integrator" in total:
+                self.energy.restore(None, total, running)
+            self._restore_power(None, total, running, same_day)
+
+        self.energy.close_missed_periods(saved, now)
+        days = (dt_util.as_local(now).date() - dt_util.as_local(saved).date()).days
+        day_start = self.periods.period_start(PERIOD_DAY, now).timestamp()
+        for _ in range(min(days, QUANTILE_DAYS)):
+            for quantiles in self._quantiles.values():
+                quantiles.rollover(day_start)
+
+    def _restore_power(
+        self, group_id: str | None, data: dict, running: bool, same_day: bool
+    ) -> None:
+        """Übernimmt Messwertspeicher, Spitzen und Quantil-Skizzen aus dem Snapshot."""
+        if running and data.get("samples"):
+            self._stores[group_id] = SampleStore.from_dict(
+                self.statistics_windows, data["samples"]
+            )
+            self._restored_samples.add(group_id)
+        self._demand[group_id] = DemandTracker.from_dict(data["demand"], running)
+        self._quantiles[group_id] = PowerQuantiles.from_dict(
+            data["quantiles"], QUANTILE_DAYS, running
+        )
+        if same_day and data.get("peak"):
+            power, timestamp = data["peak"]
+            self._peaks[group_id] = (float(power), float(timestamp))
+
+    @callback
+    def _async_membership_changed(self, entity_id: str, dynamic: frozenset[str]) -> None:
+        """Fügt ein Mitglied zur Laufzeit hinzu, entfernt es oder ändert seine Gruppen.
+
+        Der bisherige Beitrag wird mit den alten Gewichten abgezogen und der
+        aktuelle Zustand mit den neuen Gewichten wieder aufgenommen, sodass alle
+        Summen, Integratoren und Statistiken ohne Neuladen weiterlaufen.
+        """
+        members = self.members
+        groups = members.groups_for(entity_id, dynamic)
+        old_groups = members.containing(entity_id)
+        if groups == old_groups:
+            return
+
+        timestamp = dt_util.utcnow().timestamp()
+        affected = {group_id for group_id, _ in members.weights.get(entity_id, ())}
+        old_value = self._values.pop(entity_id, None)
+        if old_value is not None:
+            self._apply_change(entity_id, old_value, None, timestamp)
+
+        members.move(entity_id, old_groups, groups)
+        if not groups:
+            self._forget_member(entity_id)
+            self._notify(affected)
+            return
+
+        self._subscribe_member(entity_id)
+        affected.update(group_id for group_id, _ in members.weights[entity_id])
+        state = self.hass.states.get(entity_id)
+        fresh = self._track_age(entity_id, state, timestamp)
+        reading = self._units.read(entity_id, state)
+        if reading is not None and reading[0] == KIND_POWER and fresh:
+            self._values[entity_id] = reading[1]
+            self._apply_change(entity_id, None, reading[1], timestamp)
+        elif reading is not None and reading[0] == KIND_ENERGY and entity_id not in self._counters:
+            self._counters[entity_id] = (reading[1], state.attributes.get("last_reset"))
+        self._notify(affected)
+
+    def _notify(self, group_ids) -> None:
+        """Benachrichtigt die Listener der geänderten Gruppen und der Gesamtsumme."""
+        for group_id in group_ids:
+            for update_callback in self._listeners.get(group_id, ()):
+                update_callback()
+        for update_callback in self._listeners.get(None, ()):
+            update_callback()
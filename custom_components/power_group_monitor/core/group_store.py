@@ -0,0 +1,136 @@
+"""Persistente Gruppendefinitionen eines ConfigEntry.
+
+Die Gruppen liegen nicht in ``ConfigEntry.data``, das Home Assistant bei jeder
+Änderung vollständig in ``core.config_entries`` zurückschreibt, sondern in
+einem eigenen, versionierten ``Store`` je Eintrag, indiziert nach
+``CONF_GROUP_ID``. Der Eintrag enthält nur den Verweis (``CONF_GROUP_STORE``)
+und eine Revision, die bei jeder Änderung der Gruppen steigt und damit den
+Update-Listener auslöst.
+
+Geänderte Gruppen ersetzen im Speicher nur ihren eigenen Eintrag; unveränderte
+Übernahmen lösen keinen Schreibvorgang aus, mehrere Änderungen werden
+gebündelt geschrieben.
+
+Functions:
+    async_get_group_store: Liefert den Gruppen-Store eines Verweises.
+
+Classes:
+    GroupStore: Lädt und speichert die Gruppen eines ConfigEntry.
+"""
+
+import copy
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from ..const import (  # noqa: TID252
+    CONF_GROUP_ID,
+    DATA_GROUP_STORES,
+    DOMAIN,
+    GROUP_SAVE_DELAY,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+STORAGE_MINOR_VERSION = 1
+
+
+def storage_key(store_id: str) -> str:
+    """Liefert den Schlüssel der Gruppen-Datei eines Verweises."""
+    return f"{DOMAIN}.{store_id}.groups"
+
+
+@callback
+def async_get_group_store(hass: HomeAssistant, store_id: str) -> "GroupStore":
+    """Liefert den Gruppen-Store eines Verweises und legt ihn bei Bedarf an.
+
+    Config-Flow und Eintrag verwenden dieselbe Instanz, damit geänderte
+    Gruppen ohne erneutes Lesen der Datei übernommen werden.
+    """
+    stores = hass.data.setdefault(DOMAIN, {}).setdefault(DATA_GROUP_STORES, {})
+    if (store := stores.get(store_id)) is None:
+        store = stores[store_id] = GroupStore(hass, store_id)
+    return store
+
+
+class GroupStore:
+    """Lädt und speichert die Gruppen eines ConfigEntry."""
+
+    def __init__(self, hass: HomeAssistant, store_id: str) -> None:
+        """Initialisiert den Speicher.
+
+        Args:
+            hass (HomeAssistant): Die Home Assistant-Instanz.
+            store_id (str): Der Verweis aus ``CONF_GROUP_STORE``.
+
+        """
+        self.hass = hass
+        self.store_id = store_id
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, storage_key(store_id), minor_version=STORAGE_MINOR_VERSION
+        )
+        self._groups: dict[str, dict] = {}
+        self._loaded = False
+
+    @property
+    def groups(self) -> list[dict]:
+        """Liefert die Gruppen in ihrer Reihenfolge."""
+        return list(self._groups.values())
+
+    async def async_load(self) -> list[dict]:
+        """Liest die Gruppen einmalig aus der Datei.
+
+        Returns:
+            list[dict]: Die Gruppen in ihrer Reihenfolge.
+
+        """
+        if not self._loaded:
+            data = await self._store.async_load() or {}
+            self._groups = dict(data.get("groups", {}))
+            self._loaded = True
+        return self.groups
+
+    @callback
+    def async_set_groups(self, groups: list[dict]) -> bool:
+        """Übernimmt die Gruppen und speichert sie verzögert, falls sie sich geändert haben.
+
+        Args:
+            groups (list[dict]): Die neuen Gruppen.
+
+        Returns:
+            bool: ``True``, wenn sich mindestens eine Gruppe oder die Reihenfolge geändert hat.
+
+        """
+        self._loaded = True
+        groups_by_id = {group[CONF_GROUP_ID]: group for group in groups}
+        changed = [
+            group_id
+            for group_id, group in groups_by_id.items()
+            if self._groups.get(group_id) != group
+        ]
+        if not changed and list(groups_by_id) == list(self._groups):
+            return False
+
+        # Unveränderte Gruppen behalten ihre Einträge, nur geänderte werden kopiert
+        self._groups = {
+            group_id: copy.deepcopy(group) if group_id in changed else self._groups[group_id]
+            for group_id, group in groups_by_id.items()
+        }
+        _LOGGER.debug("%d Gruppen von %s geändert", len(changed), self.store_id)
+        self._store.async_delay_save(self._data, GROUP_SAVE_DELAY)
+        return True
+
+    async def async_save(self) -> None:
+        """Speichert die Gruppen sofort."""
+        await self._store.async_save(self._data())
+
+    async def async_remove(self) -> None:
+        """Entfernt die Gruppen-Datei, z.B. beim Löschen des Eintrags."""
+        self.hass.data.get(DOMAIN, {}).get(DATA_GROUP_STORES, {}).pop(self.store_id, None)
+        await self._store.async_remove()
+
+    def _data(self) -> dict[str, Any]:
+        return {"groups": self._groups}
@@ -0,0 +1,360 @@
+"""Import und Export von Gruppendefinitionen als YAML oder CSV.
+
+Große Installationen mit Hunderten von Stromkreisen legen ihre Gruppen in
+einer Datei an, statt sie einzeln im Konfigurationsdialog zu erfassen. Die
+Datei wird vollständig eingelesen und geprüft, bevor eine einzige Gruppe
+übernommen wird.
+
+YAML: eine Liste von Gruppen (optional unter ``groups``) mit ``name`` und
+optional ``id``, ``standby``, ``entities``, ``children`` sowie den Einstellungen
+``deadband``, ``deadband_relative``, ``heartbeat``, ``max_age`` und den Regeln
+``areas``, ``floors``, ``labels``, ``device_classes`` und ``pattern``.
+
+CSV: eine Kopfzeile und je Zeile eine Zuordnung mit den Spalten ``group``,
+``entity``, ``parent`` und ``standby``; alle Spalten außer ``group`` sind
+optional, Komma und Semikolon werden als Trennzeichen erkannt.
+
+Untergruppen werden über ihren Namen oder ihre ID referenziert. Jede Gruppe
+behält eine stabile ID: die ID aus der Datei, sonst die ID der bestehenden
+Gruppe gleichen Namens, sonst eine aus dem Namen abgeleitete UUID (uuid5).
+Ein erneuter Import derselben Datei erzeugt damit dieselben Gruppen, und
+bestehende Gruppen behalten ihre Energiezähler.
+
+Functions:
+    parse_groups: Liest Gruppendefinitionen aus YAML oder CSV.
+    build_groups: Übersetzt Definitionen in Gruppen des ConfigEntry.
+    unknown_entities: Prüft alle Entitäten gemeinsam gegen das Entity-Registry.
+    export_groups: Schreibt Gruppen als YAML oder CSV.
+"""
+
+import csv
+import io
+import uuid
+
+from homeassistant.core import HomeAssistant, valid_entity_id
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import yaml as yaml_util
+
+from ..const import (  # noqa: TID252
+    CONF_GROUP_AREAS,
+    CONF_GROUP_BACKFILL,
+    CONF_GROUP_BACKFILL_STATISTICS,
+    CONF_GROUP_CHILDREN,
+    CONF_GROUP_DEADBAND,
+    CONF_GROUP_DEADBAND_RELATIVE,
+    CONF_GROUP_DEVICE_CLASSES,
+    CONF_GROUP_ENTITIES,
+    CONF_GROUP_FLOORS,
+    CONF_GROUP_HEARTBEAT,
+    CONF_GROUP_ID,
+    CONF_GROUP_LABELS,
+    CONF_GROUP_MAX_AGE,
+    CONF_GROUP_NAME,
+    CONF_GROUP_PATTERN,
+    CONF_GROUP_STANDBY,
+    DEFAULT_DEADBAND,
+    DEFAULT_DEADBAND_RELATIVE,
+    DEFAULT_DEVICE_CLASSES,
+    DEFAULT_HEARTBEAT,
+    DEFAULT_MAX_AGE,
+    IMPORT_FORMAT_CSV,
+    IMPORT_MODE_MERGE,
+)
+from .hierarchy import find_cycle
+from .membership import compile_pattern
+
+# Namensraum der aus dem Gruppennamen abgeleiteten IDs
+GROUP_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "https://github.com/mephdrac/PowerGroupMonitor")
+
+# Schlüssel in der Datei und ihre Felder im ConfigEntry
+KEY_NAME = "name"
+KEY_ID = "id"
+KEY_STANDBY = "standby"
+KEY_ENTITIES = "entities"
+KEY_CHILDREN = "children"
+NUMBER_FIELDS = {
+    "deadband": CONF_GROUP_DEADBAND,
+    "deadband_relative": CONF_GROUP_DEADBAND_RELATIVE,
+    "heartbeat": CONF_GROUP_HEARTBEAT,
+    "max_age": CONF_GROUP_MAX_AGE,
+}
+LIST_FIELDS = {
+    "areas": CONF_GROUP_AREAS,
+    "floors": CONF_GROUP_FLOORS,
+    "labels": CONF_GROUP_LABELS,
+    "device_classes": CONF_GROUP_DEVICE_CLASSES,
+}
+
+CSV_GROUP = "group"
+CSV_ENTITY = "entity"
+CSV_PARENT = "parent"
+CSV_STANDBY = "standby"
+
+
+def parse_groups(content: str, fmt: str) -> list[dict]:
+    """Liest Gruppendefinitionen aus YAML oder CSV.
+
+    Args:
+        content (str): Inhalt der Datei.
+        fmt (str): ``IMPORT_FORMAT_YAML`` oder ``IMPORT_FORMAT_CSV``.
+
+    Returns:
+        list[dict]: Definitionen mit den Schlüsseln der Datei, Untergruppen
+            als Referenz über Name oder ID.
+
+    Raises:
+        ValueError: Wenn die Datei nicht gelesen werden kann oder eine
+            Definition ungültig ist.
+
+    """
+    definitions = _parse_csv(content) if fmt == IMPORT_FORMAT_CSV else _parse_yaml(content)
+    if not definitions:
+        raise ValueError("Die Datei enthält keine Gruppen")
+
+    names: set[str] = set()
+    for index, definition in enumerate(definitions, start=1):
+        if not isinstance(definition, dict):
+            raise ValueError(f"Eintrag {index} ist keine Gruppe")
+        name = str(definition.get(KEY_NAME) or "").strip()
+        if not name:
+            raise ValueError(f"Eintrag {index} hat keinen Namen")
+        if name in names:
+            raise ValueError(f"Gruppe {name} ist mehrfach definiert")
+        names.add(name)
+        definition[KEY_NAME] = name
+        # Fehlende Listen bleiben ``None`` und lassen die bestehende Gruppe unverändert
+        for key in (KEY_ENTITIES, KEY_CHILDREN, *LIST_FIELDS):
+            value = definition.get(key)
+            if value is None:
+                continue
+            if isinstance(value, str):
+                value = [value]
+            if not isinstance(value, list):
+                raise ValueError(f"Gruppe {name}: {key} muss eine Liste sein")
+            definition[key] = list(dict.fromkeys(str(item).strip() for item in value))
+        for entity_id in definition.get(KEY_ENTITIES) or []:
+            if not valid_entity_id(entity_id):
+                raise ValueError(f"Gruppe {name}: ungültige Entity-ID {entity_id}")
+        try:
+            float(definition.get(KEY_STANDBY) or 0)
+            for key in NUMBER_FIELDS:
+                if definition.get(key) is not None:
+                    float(definition[key])
+            compile_pattern(definition.get("pattern"))
+        except (TypeError, ValueError) as err:
+            raise ValueError(f"Gruppe {name}: {err}") from err
+    return definitions
+
+
+def _parse_yaml(content: str) -> list:
+    try:
+        data = yaml_util.parse_yaml(content)
+    except HomeAssistantError as err:
+        raise ValueError(str(err)) from err
+    if isinstance(data, dict):
+        data = data.get("groups")
+    if not isinstance(data, list):
+        raise ValueError("Erwartet wird eine Liste von Gruppen")
+    return data
+
+
+def _parse_csv(content: str) -> list[dict]:
+    content = content.strip()
+    try:
+        dialect = csv.Sniffer().sniff(content.split("\n", 1)[0], delimiters=",;")
+    except csv.Error:
+        dialect = csv.excel
+    reader = csv.DictReader(io.StringIO(content), dialect=dialect)
+    if reader.fieldnames is None or CSV_GROUP not in reader.fieldnames:
+        raise ValueError(f"Die Kopfzeile benötigt die Spalte {CSV_GROUP}")
+
+    definitions: dict[str, dict] = {}
+    children: dict[str, list[str]] = {}
+    for row in reader:
+        name = (row.get(CSV_GROUP) or "").strip()
+        if not name:
+            continue
+        definition = definitions.setdefault(name, {KEY_NAME: name})
+        definition.setdefault(KEY_ENTITIES, [])
+        children.setdefault(name, [])
+        if entity_id := (row.get(CSV_ENTITY) or "").strip():
+            definition[KEY_ENTITIES].append(entity_id)
+        if standby := (row.get(CSV_STANDBY) or "").strip():
+            definition[KEY_STANDBY] = standby
+        if parent := (row.get(CSV_PARENT) or "").strip():
+            children.setdefault(parent, []).append(name)
+            # Nur als Elterngruppe genannt: Entitäten einer bestehenden Gruppe bleiben
+            definitions.setdefault(parent, {KEY_NAME: parent})
+    for name, definition in definitions.items():
+        definition[KEY_CHILDREN] = children.get(name, [])
+    return list(definitions.values())
+
+
+def build_groups(definitions: list[dict], existing: list[dict], mode: str) -> list[dict]:
+    """Übersetzt Definitionen in Gruppen des ConfigEntry.
+
+    Args:
+        definitions (list[dict]): Definitionen aus ``parse_groups``.
+        existing (list[dict]): Die bisherigen Gruppen.
+        mode (str): ``IMPORT_MODE_MERGE`` behält Gruppen, die nicht in der Datei
+            stehen, und ergänzt Untergruppen; sonst ersetzt die Datei alle Gruppen.
+
+    Returns:
+        list[dict]: Die neuen Gruppen. Felder, die die Datei nicht angibt,
+            übernehmen bestehende Gruppen unverändert.
+
+    Raises:
+        ValueError: Bei unbekannten Untergruppen, doppelten IDs oder Zyklen.
+
+    """
+    by_id = {group[CONF_GROUP_ID]: group for group in existing}
+    by_name = {group[CONF_GROUP_NAME]: group for group in existing}
+
+    groups: dict[str, dict] = {}
+    refs: dict[str, str] = {}
+    for definition in definitions:
+        name = definition[KEY_NAME]
+        current = by_id.get(str(definition.get(KEY_ID) or "")) or by_name.get(name)
+        if definition.get(KEY_ID):
+            group_id = str(definition[KEY_ID])
+        elif current is not None:
+            group_id = current[CONF_GROUP_ID]
+        else:
+            group_id = str(uuid.uuid5(GROUP_NAMESPACE, name))
+        if group_id in groups:
+            raise ValueError(f"Gruppe {name}: ID {group_id} ist mehrfach vergeben")
+        groups[group_id] = _group(group_id, definition, current)
+        refs[name] = refs[group_id] = group_id
+
+    if mode == IMPORT_MODE_MERGE:
+        for group in existing:
+            if group[CONF_GROUP_ID] not in groups and group[CONF_GROUP_NAME] not in refs:
+                groups[group[CONF_GROUP_ID]] = dict(group)
+                refs.setdefault(group[CONF_GROUP_NAME], group[CONF_GROUP_ID])
+                refs.setdefault(group[CONF_GROUP_ID], group[CONF_GROUP_ID])
+
+    for definition in definitions:
+        if definition.get(KEY_CHILDREN) is None:
+            continue
+        group = groups[refs[definition[KEY_NAME]]]
+        # Beim Zusammenführen kommen Untergruppen nur hinzu
+        children = list(group.get(CONF_GROUP_CHILDREN, [])) if mode == IMPORT_MODE_MERGE else []
+        for ref in definition[KEY_CHILDREN]:
+            if ref not in refs:
+                raise ValueError(f"Gruppe {definition[KEY_NAME]}: unbekannte Untergruppe {ref}")
+            children.append(refs[ref])
+        group[CONF_GROUP_CHILDREN] = list(dict.fromkeys(children))
+
+    # Untergruppen bestehender Gruppen, die es nicht mehr gibt, entfallen
+    for group in groups.values():
+        group[CONF_GROUP_CHILDREN] = [
+            child for child in group.get(CONF_GROUP_CHILDREN, []) if child in groups
+        ]
+    hierarchy = {group_id: group[CONF_GROUP_CHILDREN] for group_id, group in groups.items()}
+    if (cycle := find_cycle(hierarchy)) is not None:
+        names = [groups[group_id][CONF_GROUP_NAME] for group_id in cycle]
+        raise ValueError(f"Zyklus in der Gruppenhierarchie: {' → '.join(names)}")
+    return list(groups.values())
+
+
+def _group(group_id: str, definition: dict, current: dict | None) -> dict:
+    """Erstellt eine Gruppe aus einer Definition und der bestehenden Gruppe."""
+    group = dict(current) if current is not None else {
+        CONF_GROUP_STANDBY: "0",
+        CONF_GROUP_DEADBAND: DEFAULT_DEADBAND,
+        CONF_GROUP_DEADBAND_RELATIVE: DEFAULT_DEADBAND_RELATIVE,
+        CONF_GROUP_HEARTBEAT: DEFAULT_HEARTBEAT,
+        CONF_GROUP_MAX_AGE: DEFAULT_MAX_AGE,
+        CONF_GROUP_AREAS: [],
+        CONF_GROUP_FLOORS: [],
+        CONF_GROUP_LABELS: [],
+        CONF_GROUP_DEVICE_CLASSES: list(DEFAULT_DEVICE_CLASSES),
+        CONF_GROUP_PATTERN: "",
+        CONF_GROUP_BACKFILL: 0,
+        CONF_GROUP_BACKFILL_STATISTICS: False,
+    }
+    group[CONF_GROUP_ID] = group_id
+    group[CONF_GROUP_NAME] = definition[KEY_NAME]
+    if definition.get(KEY_ENTITIES) is not None:
+        group[CONF_GROUP_ENTITIES] = definition[KEY_ENTITIES]
+    group.setdefault(CONF_GROUP_ENTITIES, [])
+    group.setdefault(CONF_GROUP_CHILDREN, [])
+    if definition.get(KEY_STANDBY) is not None:
+        group[CONF_GROUP_STANDBY] = str(definition[KEY_STANDBY])
+    for key, field in NUMBER_FIELDS.items():
+        if definition.get(key) is not None:
+            group[field] = int(definition[key]) if key == "max_age" else float(definition[key])
+    for key, field in LIST_FIELDS.items():
+        if definition.get(key) is not None:
+            group[field] = definition[key]
+    if definition.get("pattern") is not None:
+        group[CONF_GROUP_PATTERN] = str(definition["pattern"]).strip()
+    return group
+
+
+def unknown_entities(hass: HomeAssistant, groups: list[dict]) -> list[str]:
+    """Prüft alle Entitäten der Gruppen gemeinsam gegen das Entity-Registry.
+
+    Entitäten ohne Registry-Eintrag gelten als bekannt, solange sie einen
+    Zustand haben.
+
+    Returns:
+        list[str]: Die unbekannten Entitäten, sortiert.
+
+    """
+    entity_ids = {entity_id for group in groups for entity_id in group.get(CONF_GROUP_ENTITIES, [])}
+    missing = entity_ids.difference(er.async_get(hass).entities)
+    return sorted(entity_id for entity_id in missing if hass.states.get(entity_id) is None)
+
+
+def export_groups(groups: list[dict], fmt: str) -> str:
+    """Schreibt Gruppen als YAML oder CSV.
+
+    Untergruppen werden über ihren Namen referenziert, damit die Datei lesbar
+    bleibt; die IDs werden in YAML mit exportiert.
+    """
+    names = {group[CONF_GROUP_ID]: group[CONF_GROUP_NAME] for group in groups}
+    if fmt == IMPORT_FORMAT_CSV:
+        parents: dict[str, list[str]] = {}
+        for group in groups:
+            for child in group.get(CONF_GROUP_CHILDREN, []):
+                parents.setdefault(child, []).append(group[CONF_GROUP_NAME])
+        output = io.StringIO()
+        writer = csv.writer(output, lineterminator="\n")
+        writer.writerow([CSV_GROUP, CSV_ENTITY, CSV_PARENT, CSV_STANDBY])
+        for group in groups:
+            name = group[CONF_GROUP_NAME]
+            entities = group.get(CONF_GROUP_ENTITIES, [])
+            group_parents = parents.get(group[CONF_GROUP_ID], [])
+            rows = max(len(entities), len(group_parents), 1)
+            for row in range(rows):
+                writer.writerow([
+                    name,
+                    entities[row] if row < len(entities) else "",
+                    group_parents[row] if row < len(group_parents) else "",
+                    group.get(CONF_GROUP_STANDBY, "") if row == 0 else "",
+                ])
+        return output.getvalue()
+
+    data = []
+    for group in groups:
+        item = {
+            KEY_NAME: group[CONF_GROUP_NAME],
+            KEY_ID: group[CONF_GROUP_ID],
+            KEY_STANDBY: group.get(CONF_GROUP_STANDBY, "0"),
+            KEY_ENTITIES: list(group.get(CONF_GROUP_ENTITIES, [])),
+            KEY_CHILDREN: [
+                names[child] for child in group.get(CONF_GROUP_CHILDREN, []) if child in names
+            ],
+        }
+        for key, field in NUMBER_FIELDS.items():
+            if field in group:
+                item[key] = group[field]
+        for key, field in LIST_FIELDS.items():
+            if group.get(field):
+                item[key] = list(group[field])
+        if group.get(CONF_GROUP_PATTERN):
+            item["pattern"] = group[CONF_GROUP_PATTERN]
+        data.append(item)
+    return yaml_util.dump({"groups": data})
@@ -0,0 +1,118 @@
+"""Hilfsfunktionen für verschachtelte Gruppen.
+
+Gruppen können andere Gruppen enthalten (z.B. Gebäude → Etage → Raum →
+Stromkreis). Die Hierarchie bildet einen gerichteten azyklischen Graphen.
+Aus ihm wird einmalig vorberechnet, welche Gruppen eine Änderung einer Gruppe
+mit welcher Vielfachheit (Anzahl der Pfade) enthalten, sodass eine Änderung
+eines Blattes in einem einzigen Durchlauf bis zur Wurzel weitergegeben wird.
+"""
+
+from collections.abc import Mapping, Iterable
+
+
+def find_cycle(children: Mapping[str, Iterable[str]]) -> list[str] | None:
+    """Sucht einen Zyklus in der Gruppenhierarchie.
+
+    Args:
+        children (Mapping[str, Iterable[str]]): Untergruppen je Gruppe.
+
+    Returns:
+        list[str] | None: Die Gruppen des gefundenen Zyklus oder ``None``.
+
+    """
+    visiting, done = set(), set()
+
+    for start in children:
+        if start in done:
+            continue
+        path = [start]
+        stack = [iter(children.get(start, ()))]
+        visiting.add(start)
+        while stack:
+            child = next(stack[-1], None)
+            if child is None:
+                stack.pop()
+                node = path.pop()
+                visiting.discard(node)
+                done.add(node)
+                continue
+            if child in visiting:
+                return path[path.index(child):] + [child]
+            if child in done or child not in children:
+                continue
+            visiting.add(child)
+            path.append(child)
+            stack.append(iter(children.get(child, ())))
+
+    return None
+
+
+def topological_order(children: Mapping[str, Iterable[str]]) -> list[str]:
+    """Sortiert die Gruppen so, dass Untergruppen vor ihren Obergruppen stehen.
+
+    Args:
+        children (Mapping[str, Iterable[str]]): Untergruppen je Gruppe.
+
+    Returns:
+        list[str]: Die Gruppen in topologischer Reihenfolge (Blätter zuerst).
+
+    Raises:
+        ValueError: Wenn die Hierarchie einen Zyklus enthält.
+
+    """
+    cycle = find_cycle(children)
+    if cycle is not None:
+        raise ValueError(f"Zyklus in der Gruppenhierarchie: {' → '.join(cycle)}")
+
+    order: list[str] = []
+    seen: set[str] = set()
+
+    def visit(group_id: str) -> None:
+        seen.add(group_id)
+        for child in children.get(group_id, ()):
+            if child in children and child not in seen:
+                visit(child)
+        order.append(group_id)
+
+    for group_id in children:
+        if group_id not in seen:
+            visit(group_id)
+    return order
+
+
+def ancestor_weights(children: Mapping[str, Iterable[str]]) -> dict[str, dict[str, int]]:
+    """Berechnet für jede Gruppe, welche Gruppen sie wie oft enthalten.
+
+    Die Gruppe selbst ist mit Gewicht 1 enthalten. Erreicht eine Gruppe eine
+    Obergruppe über mehrere Pfade, wird sie entsprechend mehrfach gezählt.
+
+    Args:
+        children (Mapping[str, Iterable[str]]): Untergruppen je Gruppe.
+
+    Returns:
+        dict[str, dict[str, int]]: Gewichte der (transitiven) Obergruppen je Gruppe.
+
+    Raises:
+        ValueError: Wenn die Hierarchie einen Zyklus enthält.
+
+    """
+    parents: dict[str, list[str]] = {group_id: [] for group_id in children}
+    for group_id, group_children in children.items():
+        for child in group_children:
+            if child in parents:
+                parents[child].append(group_id)
+
+    weights: dict[str, dict[str, int]] = {}
+    for group_id in reversed(topological_order(children)):
+        own = {group_id: 1}
+        for parent in parents[group_id]:
+            for ancestor, weight in weights[parent].items():
+                own[ancestor] = own.get(ancestor, 0) + weight
+        weights[group_id] = own
+    return weights
+
+
+def root_groups(children: Mapping[str, Iterable[str]]) -> list[str]:
+    """Liefert alle Gruppen, die in keiner anderen Gruppe enthalten sind."""
+    contained = {child for group_children in children.values() for child in group_children}
+    return [group_id for group_id in children if group_id not in contained]
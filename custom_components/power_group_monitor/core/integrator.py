@@ -0,0 +1,168 @@
+"""Gemeinsamer Integrator für die Energie einer Gruppe.
+
+Die Gruppenleistung der Engine ist eine Treppenfunktion der Mitgliederzustände:
+zwischen zwei Ereignissen bleibt sie konstant. Deshalb wird sie einmal pro Gruppe
+mit der Rechteckregel (Wert bis zum nächsten Ereignis gehalten) integriert. Die
+Energie wird als Festkommazahl in Millijoule geführt und auf beliebig viele
+Akkumulatoren (z.B. heute, gesamt) verteilt, sodass auch lange Zählerstände
+ohne Rundungsverluste weiterzählen. Zuwächse von Energiezählern werden direkt
+auf dieselben Akkumulatoren gebucht.
+
+Optional führt der Integrator Kosten-Akkumulatoren: Jeder Energie-Abschnitt
+wird im selben Durchlauf mit dem Preis multipliziert, der während dieses
+Abschnitts galt (``price``). Ändert sich der Tarif, integriert die Engine zuerst
+bis zum Zeitpunkt der Änderung und setzt danach den neuen Preis.
+
+Classes:
+    EnergyIntegrator: Integriert die Leistung einer Gruppe in mehrere Akkumulatoren.
+"""
+
+import math
+
+# Millijoule pro Kilowattstunde
+MJ_PER_KWH = 3_600_000_000
+
+
+class EnergyIntegrator:
+    """Integriert die Leistung einer Gruppe in mehrere Energie-Akkumulatoren."""
+
+    def __init__(self, accumulators=(), costs=()) -> None:
+        """Initialisiert den Integrator.
+
+        Args:
+            accumulators (Iterable[str]): Namen der Akkumulatoren, z.B. ``today``.
+            costs (Iterable[str]): Namen der Kosten-Akkumulatoren, z.B. ``today``.
+
+        """
+        self._last_time: float | None = None
+        self._power = 0.0
+        self._remainder = 0.0
+        self._energy: dict[str, int] = dict.fromkeys(accumulators, 0)
+        self._cost: dict[str, float] = dict.fromkeys(costs, 0.0)
+        # Aktueller Preis je kWh
+        self.price = 0.0
+
+    @property
+    def power(self) -> float:
+        """Zuletzt übernommene Leistung in Watt."""
+        return self._power
+
+    @property
+    def last_time(self) -> float | None:
+        """Zeitpunkt der letzten Integration (Unix-Zeit in Sekunden)."""
+        return self._last_time
+
+    def update(self, timestamp: float, power: float | None = None) -> float:
+        """Integriert bis ``timestamp`` und übernimmt anschließend die neue Leistung.
+
+        Args:
+            timestamp (float): Aktueller Zeitpunkt (Unix-Zeit in Sekunden).
+            power (float | None): Neue Leistung in Watt, ``None`` behält sie bei.
+
+        Returns:
+            float: Die seit dem letzten Aufruf integrierte Energie in kWh.
+
+        """
+        slice_mj = 0
+        if self._last_time is not None and timestamp > self._last_time:
+            exact = self._power * (timestamp - self._last_time) * 1000 + self._remainder
+            slice_mj = math.floor(exact)
+            self._remainder = exact - slice_mj
+            for name in self._energy:
+                self._energy[name] += slice_mj
+            if self._cost:
+                self._add_cost(slice_mj)
+
+        if self._last_time is None or timestamp > self._last_time:
+            self._last_time = timestamp
+        if power is not None:
+            self._power = power
+        return slice_mj / MJ_PER_KWH
+
+    def energy(self, name: str) -> float:
+        """Liefert den Stand eines Akkumulators in kWh."""
+        return self._energy.get(name, 0) / MJ_PER_KWH
+
+    def add_energy(self, name: str, kwh: float) -> None:
+        """Addiert Energie (kWh) auf einen Akkumulator, z.B. beim Wiederherstellen."""
+        self._energy[name] = self._energy.get(name, 0) + round(kwh * MJ_PER_KWH)
+
+    def count(self, kwh: float) -> None:
+        """Addiert gezählte Energie (kWh) eines Energiezählers auf alle Akkumulatoren."""
+        exact = kwh * MJ_PER_KWH + self._remainder
+        slice_mj = math.floor(exact)
+        self._remainder = exact - slice_mj
+        for name in self._energy:
+            self._energy[name] += slice_mj
+        if self._cost:
+            self._add_cost(slice_mj)
+
+    def cost(self, name: str) -> float:
+        """Liefert den Stand eines Kosten-Akkumulators."""
+        return self._cost.get(name, 0.0)
+
+    def add_cost(self, name: str, amount: float) -> None:
+        """Addiert Kosten auf einen Akkumulator, z.B. beim Wiederherstellen."""
+        if name in self._cost:
+            self._cost[name] += amount
+
+    def _add_cost(self, slice_mj: int) -> None:
+        cost = slice_mj / MJ_PER_KWH * self.price
+        for name in self._cost:
+            self._cost[name] += cost
+
+    def set_energy(self, name: str, kwh: float) -> None:
+        """Setzt einen Akkumulator auf einen Wert in kWh."""
+        self._energy[name] = round(kwh * MJ_PER_KWH)
+
+    def as_dict(self) -> dict:
+        """Liefert den Zustand des Integrators für einen Snapshot."""
+        return {
+            "energy": dict(self._energy),
+            "cost": dict(self._cost),
+            "price": self.price,
+            "remainder": self._remainder,
+            "power": self._power,
+            "last_time": self._last_time,
+        }
+
+    @classmethod
+    def from_dict(
+        cls, accumulators, data: dict, running: bool = True, costs=()
+    ) -> "EnergyIntegrator":
+        """Erstellt einen Integrator aus einem Snapshot.
+
+        Args:
+            accumulators (Iterable[str]): Namen der aktuell konfigurierten Akkumulatoren.
+            data (dict): Der mit ``as_dict`` gespeicherte Zustand.
+            running (bool): Übernimmt auch Leistung und Zeitpunkt, sodass die
+                nächste Integration die Lücke seit dem Snapshot überbrückt.
+            costs (Iterable[str]): Namen der aktuell konfigurierten Kosten-Akkumulatoren.
+
+        """
+        integrator = cls(accumulators, costs)
+        stored = data.get("energy", {})
+        for name in integrator._energy:
+            integrator._energy[name] = int(stored.get(name, 0))
+        stored = data.get("cost", {})
+        for name in integrator._cost:
+            integrator._cost[name] = float(stored.get(name, 0.0))
+        integrator.price = float(data.get("price", 0.0))
+        integrator._remainder = float(data.get("remainder", 0.0))
+        if running:
+            integrator._power = float(data.get("power", 0.0))
+            integrator._last_time = data.get("last_time")
+        return integrator
+
+    def reset(self, name: str) -> float:
+        """Setzt einen Akkumulator und die gleichnamigen Kosten zurück.
+
+        Returns:
+            float: Der vorherige Stand des Energie-Akkumulators in kWh.
+
+        """
+        previous = self.energy(name)
+        self._energy[name] = 0
+        if name in self._cost:
+            self._cost[name] = 0.0
+        return previous
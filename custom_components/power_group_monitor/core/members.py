@@ -0,0 +1,269 @@
+"""Mitglieder, Hierarchie und Einstellungen der Gruppen eines ConfigEntry.
+
+``GroupMembers`` liest die Gruppen ein, löst ihre dynamischen Regeln auf und
+übersetzt die Hierarchie einmalig in eine topologische Reihenfolge und
+Gewichte je Mitglied. Das Gewicht eines Mitglieds in einer Gruppe ist die
+Anzahl der Pfade, über die es in der Gruppe enthalten ist; in der Gesamtsumme
+zählt es entweder über die obersten Gruppen oder, als Vereinigung, genau
+einmal. Zusätzlich wird je Mitglied das kleinste maximale Alter aller Gruppen
+vorberechnet, die es enthalten.
+
+Classes:
+    GroupMembers: Mitglieder und Topologie der Gruppen eines ConfigEntry.
+"""
+
+from collections.abc import Callable, Iterable
+import logging
+import re
+
+from homeassistant.core import HomeAssistant, callback
+
+from ..const import (  # noqa: TID252
+    CONF_GROUP_AREAS,
+    CONF_GROUP_CHILDREN,
+    CONF_GROUP_DEADBAND,
+    CONF_GROUP_DEADBAND_RELATIVE,
+    CONF_GROUP_DEVICE_CLASSES,
+    CONF_GROUP_ENTITIES,
+    CONF_GROUP_FLOORS,
+    CONF_GROUP_HEARTBEAT,
+    CONF_GROUP_ID,
+    CONF_GROUP_LABELS,
+    CONF_GROUP_MAX_AGE,
+    CONF_GROUP_PATTERN,
+    DEFAULT_DEADBAND,
+    DEFAULT_DEADBAND_RELATIVE,
+    DEFAULT_DEVICE_CLASSES,
+    DEFAULT_HEARTBEAT,
+    DEFAULT_MAX_AGE,
+)
+from .hierarchy import ancestor_weights, root_groups, topological_order
+from .membership import DynamicMembership, MemberRule, compile_pattern
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class GroupMembers:
+    """Mitglieder und Topologie der Gruppen eines ConfigEntry."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        union_total: bool,
+        on_change: Callable[[str, frozenset[str]], None],
+    ) -> None:
+        """Initialisiert die Mitglieder ohne Gruppen.
+
+        Args:
+            hass (HomeAssistant): Die Home Assistant-Instanz.
+            union_total (bool): Die Gesamtsumme ist die Vereinigung aller
+                Mitglieder, in der jedes Mitglied genau einmal zählt.
+            on_change (Callable[[str, frozenset[str]], None]): Wird mit einer
+                Entität und ihren neuen dynamischen Gruppen aufgerufen.
+
+        """
+        self.hass = hass
+        self.union_total = union_total
+        self._on_change = on_change
+
+        # Mitglieder und Untergruppen je Gruppe
+        self.groups: dict[str, list[str]] = {}
+        self.children: dict[str, list[str]] = {}
+        self._deadbands: dict[str, tuple[float, float, float]] = {}
+        self._group_max_ages: dict[str, float] = {}
+        self._rules: dict[str, MemberRule] = {}
+        self._static_groups: dict[str, set[str]] = {}
+        self._membership: DynamicMembership | None = None
+
+        # Topologie: Reihenfolge, Wurzeln und Gewichte (Gruppe, Pfade) je Mitglied
+        self.order: list[str] = []
+        self.roots: list[str] = []
+        self._ancestor_weights: dict[str, dict[str, int]] = {}
+        self.weights: dict[str, list[tuple[str, int]]] = {}
+        self.total_weights: dict[str, int] = {}
+        # Maximales Alter (s) je Mitglied: das kleinste aller Gruppen, die es enthalten
+        self.max_ages: dict[str, float] = {}
+
+    def load(self, groups: list[dict]) -> None:
+        """Liest Mitglieder, Untergruppen und Einstellungen der Gruppen ein.
+
+        Die dynamischen Regeln werden dabei einmalig aufgelöst und Topologie
+        und Gewichte vollständig neu berechnet.
+        """
+        self.groups = {}
+        self.children = {}
+        self._deadbands = {}
+        self._group_max_ages = {}
+        self._rules = {}
+        for group in groups:
+            group_id = group[CONF_GROUP_ID]
+            self._deadbands[group_id] = (
+                float(group.get(CONF_GROUP_DEADBAND, DEFAULT_DEADBAND)),
+                float(group.get(CONF_GROUP_DEADBAND_RELATIVE, DEFAULT_DEADBAND_RELATIVE)),
+                float(group.get(CONF_GROUP_HEARTBEAT, DEFAULT_HEARTBEAT)),
+            )
+            self._group_max_ages[group_id] = (
+                float(group.get(CONF_GROUP_MAX_AGE, DEFAULT_MAX_AGE)) * 60
+            )
+            self.groups[group_id] = list(dict.fromkeys(group.get(CONF_GROUP_ENTITIES, [])))
+            self.children[group_id] = list(group.get(CONF_GROUP_CHILDREN, []))
+            rule = self._member_rule(group)
+            if rule is not None:
+                self._rules[group_id] = rule
+
+        # Feste Gruppen je Entität und Auflösung der dynamischen Regeln
+        self._static_groups = {}
+        for group_id, entities in self.groups.items():
+            for entity_id in entities:
+                self._static_groups.setdefault(entity_id, set()).add(group_id)
+        self._membership = None
+        if self._rules:
+            self._membership = DynamicMembership(self.hass, self._rules, self._on_change)
+            for entity_id, groups_of in self._membership.resolve().items():
+                for group_id in groups_of:
+                    if entity_id not in self.groups[group_id]:
+                        self.groups[group_id].append(entity_id)
+
+        self.weights = {}
+        self.total_weights = {}
+        self.max_ages = {}
+        self._build_topology()
+
+    @staticmethod
+    def _member_rule(group: dict) -> MemberRule | None:
+        """Liest die dynamischen Regeln einer Gruppe, ``None`` ohne Kriterium."""
+        try:
+            pattern = compile_pattern(group.get(CONF_GROUP_PATTERN))
+        except re.error as err:
+            _LOGGER.error("Muster der Gruppe %s wird ignoriert: %s", group[CONF_GROUP_ID], err)
+            pattern = None
+        rule = MemberRule(
+            areas=frozenset(group.get(CONF_GROUP_AREAS, [])),
+            floors=frozenset(group.get(CONF_GROUP_FLOORS, [])),
+            labels=frozenset(group.get(CONF_GROUP_LABELS, [])),
+            device_classes=frozenset(group.get(CONF_GROUP_DEVICE_CLASSES, DEFAULT_DEVICE_CLASSES)),
+            pattern=pattern,
+        )
+        return rule if rule.active else None
+
+    @callback
+    def async_start(self) -> None:
+        """Startet die Überwachung der dynamischen Regeln."""
+        if self._membership is not None:
+            self._membership.async_start()
+
+    @callback
+    def async_stop(self) -> None:
+        """Beendet die Überwachung der dynamischen Regeln."""
+        if self._membership is not None:
+            self._membership.async_stop()
+
+    def groups_for(self, entity_id: str, dynamic: frozenset[str]) -> set[str]:
+        """Liefert die festen Gruppen einer Entität zusammen mit ``dynamic``."""
+        return self._static_groups.get(entity_id, set()) | dynamic
+
+    def containing(self, entity_id: str) -> set[str]:
+        """Liefert die Gruppen, die eine Entität direkt enthalten."""
+        return {group_id for group_id, members in self.groups.items() if entity_id in members}
+
+    def move(self, entity_id: str, old_groups: set[str], groups: set[str]) -> None:
+        """Verschiebt eine Entität zur Laufzeit und berechnet ihre Gewichte neu."""
+        for group_id in old_groups - groups:
+            self.groups[group_id].remove(entity_id)
+        for group_id in groups - old_groups:
+            self.groups[group_id].append(entity_id)
+        self._set_member_groups(entity_id, groups)
+
+    def group_members(self, group_id: str) -> dict[str, int]:
+        """Liefert alle Mitglieder einer Gruppe inklusive Untergruppen mit Gewicht."""
+        return {
+            entity_id: weight
+            for entity_id, weights in self.weights.items()
+            for member_group, weight in weights
+            if member_group == group_id
+        }
+
+    def has_max_age(self, group_id: str) -> bool:
+        """Gibt an, ob Mitglieder der Gruppe veralten können."""
+        return any(entity_id in self.max_ages for entity_id in self.group_members(group_id))
+
+    def deadband(self, group_id: str | None) -> tuple[float, float, float]:
+        """Liefert Totband (W, %) und Heartbeat (s) einer Gruppe.
+
+        Für die Gesamtsummen (``group_id`` ist ``None``) wird jeweils die
+        strengste Einstellung aller Gruppen verwendet.
+
+        Returns:
+            tuple[float, float, float]: Absolutes und relatives Totband sowie Heartbeat.
+
+        """
+        if group_id is not None:
+            return self._deadbands.get(
+                group_id, (DEFAULT_DEADBAND, DEFAULT_DEADBAND_RELATIVE, DEFAULT_HEARTBEAT)
+            )
+
+        if not self._deadbands:
+            return (DEFAULT_DEADBAND, DEFAULT_DEADBAND_RELATIVE, DEFAULT_HEARTBEAT)
+
+        settings = self._deadbands.values()
+        heartbeats = [heartbeat for _, _, heartbeat in settings if heartbeat]
+        return (
+            min(absolute for absolute, _, _ in settings),
+            min(relative for _, relative, _ in settings),
+            min(heartbeats, default=0.0),
+        )
+
+    def _build_topology(self) -> None:
+        """Berechnet Reihenfolge, Wurzeln und Gewichte der Mitglieder vor."""
+        for children in self.children.values():
+            children[:] = [child for child in children if child in self.groups]
+
+        try:
+            self.order = topological_order(self.children)
+            weights = ancestor_weights(self.children)
+        except ValueError as err:
+            _LOGGER.error("Gruppenhierarchie wird ignoriert: %s", err)
+            for children in self.children.values():
+                children.clear()
+            self.order = list(self.groups)
+            weights = {group_id: {group_id: 1} for group_id in self.groups}
+
+        self.roots = root_groups(self.children)
+        self._ancestor_weights = weights
+
+        member_groups: dict[str, list[str]] = {}
+        for group_id, entities in self.groups.items():
+            for entity_id in entities:
+                member_groups.setdefault(entity_id, []).append(group_id)
+        for entity_id, groups in member_groups.items():
+            self._set_member_groups(entity_id, groups)
+
+    def _set_member_groups(self, entity_id: str, groups: Iterable[str]) -> None:
+        """Berechnet Gewichte und maximales Alter eines Mitglieds aus seinen Gruppen."""
+        merged: dict[str, int] = {}
+        for group_id in groups:
+            for ancestor, weight in self._ancestor_weights[group_id].items():
+                merged[ancestor] = merged.get(ancestor, 0) + weight
+        if not merged:
+            self.weights.pop(entity_id, None)
+            self.total_weights.pop(entity_id, None)
+            self.max_ages.pop(entity_id, None)
+            return
+
+        self.weights[entity_id] = list(merged.items())
+        if self.union_total:
+            # Jedes Mitglied zählt in der Gesamtsumme genau einmal
+            self.total_weights[entity_id] = 1
+        else:
+            self.total_weights[entity_id] = sum(
+                weight for group_id, weight in merged.items() if group_id in self.roots
+            )
+        ages = [
+            self._group_max_ages[group_id]
+            for group_id in merged
+            if self._group_max_ages[group_id] > 0
+        ]
+        if ages:
+            self.max_ages[entity_id] = min(ages)
+        else:
+            self.max_ages.pop(entity_id, None)
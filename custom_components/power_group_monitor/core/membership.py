@@ -0,0 +1,211 @@
+"""Dynamische Mitgliedschaft von Gruppen nach Bereich, Etage, Label oder Muster.
+
+Eine Gruppe kann neben ihrer festen Entitätenliste Regeln enthalten: Alle
+Sensoren der gewählten Geräteklassen, die in einem der Bereiche oder Etagen
+liegen, eines der Labels tragen oder deren Entity-ID dem Muster entspricht,
+sind Mitglied. Das Muster ist ein Glob (``sensor.*_power``) oder mit dem
+Präfix ``re:`` ein regulärer Ausdruck.
+
+Die Regeln werden beim Start einmal gegen das Entity-Registry aufgelöst. Danach
+hält ``DynamicMembership`` einen invertierten Index (Entität → Gruppen) und wertet
+bei Änderungen der Registries nur die betroffenen Entitäten neu aus: die
+geänderte Entität, die Entitäten eines geänderten Geräts oder die Entitäten
+eines Bereichs, dessen Etage sich geändert hat. Jede geänderte Zuordnung wird
+an die Engine gemeldet, die das Mitglied ohne Neuladen hinzufügt oder entfernt.
+
+Classes:
+    MemberRule: Regel für die dynamischen Mitglieder einer Gruppe.
+    DynamicMembership: Löst die Regeln auf und hält die Zuordnung aktuell.
+"""
+
+from collections.abc import Callable, Iterable
+import fnmatch
+import logging
+import re
+from typing import NamedTuple
+
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers import (
+    area_registry as ar,
+    device_registry as dr,
+    entity_registry as er,
+)
+
+from ..const import DOMAIN  # noqa: TID252
+
+_LOGGER = logging.getLogger(__name__)
+
+MEMBER_DOMAIN = "sensor"
+REGEX_PREFIX = "re:"
+
+
+def compile_pattern(pattern: str | None) -> re.Pattern | None:
+    """Übersetzt ein Glob-Muster oder einen regulären Ausdruck (``re:``).
+
+    Raises:
+        re.error: Wenn der reguläre Ausdruck ungültig ist.
+
+    """
+    pattern = (pattern or "").strip()
+    if not pattern:
+        return None
+    if pattern.startswith(REGEX_PREFIX):
+        return re.compile(pattern[len(REGEX_PREFIX):])
+    return re.compile(fnmatch.translate(pattern))
+
+
+class MemberRule(NamedTuple):
+    """Regel für die dynamischen Mitglieder einer Gruppe."""
+
+    areas: frozenset[str]
+    floors: frozenset[str]
+    labels: frozenset[str]
+    device_classes: frozenset[str]
+    pattern: re.Pattern | None
+
+    @property
+    def active(self) -> bool:
+        """Gibt an, ob die Regel mindestens ein Kriterium enthält."""
+        return bool(self.areas or self.floors or self.labels or self.pattern)
+
+    def matches(
+        self, entry: er.RegistryEntry, area_id: str | None, floor_id: str | None
+    ) -> bool:
+        """Prüft, ob ein Eintrag des Entity-Registry die Regel erfüllt."""
+        if (entry.device_class or entry.original_device_class) not in self.device_classes:
+            return False
+        return (
+            (area_id is not None and area_id in self.areas)
+            or (floor_id is not None and floor_id in self.floors)
+            or not self.labels.isdisjoint(entry.labels)
+            or (self.pattern is not None and self.pattern.fullmatch(entry.entity_id) is not None)
+        )
+
+
+class DynamicMembership:
+    """Löst die Regeln der Gruppen auf und hält die Zuordnung aktuell."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        rules: dict[str, MemberRule],
+        on_change: Callable[[str, frozenset[str]], None],
+    ) -> None:
+        """Initialisiert die Zuordnung.
+
+        Args:
+            hass (HomeAssistant): Die Home Assistant-Instanz.
+            rules (dict[str, MemberRule]): Aktive Regel je Gruppe.
+            on_change (Callable[[str, frozenset[str]], None]): Wird mit der
+                Entität und ihren neuen dynamischen Gruppen aufgerufen.
+
+        """
+        self.hass = hass
+        self._rules = rules
+        self._on_change = on_change
+        self._entities = er.async_get(hass)
+        self._devices = dr.async_get(hass)
+        self._areas = ar.async_get(hass)
+        # Invertierter Index: dynamische Gruppen je Entität
+        self._groups_of: dict[str, frozenset[str]] = {}
+        self._unsubs: list[CALLBACK_TYPE] = []
+
+    def resolve(self) -> dict[str, frozenset[str]]:
+        """Löst alle Regeln einmalig gegen das Entity-Registry auf.
+
+        Returns:
+            dict[str, frozenset[str]]: Die dynamischen Gruppen je Entität.
+
+        """
+        self._groups_of = {}
+        for entry in self._entities.entities.values():
+            if groups := self._evaluate(entry):
+                self._groups_of[entry.entity_id] = groups
+        return dict(self._groups_of)
+
+    @callback
+    def async_start(self) -> None:
+        """Abonniert die Änderungen von Entity-, Geräte- und Bereichs-Registry."""
+        bus = self.hass.bus
+        self._unsubs = [
+            bus.async_listen(er.EVENT_ENTITY_REGISTRY_UPDATED, self._async_entity_updated),
+            bus.async_listen(dr.EVENT_DEVICE_REGISTRY_UPDATED, self._async_device_updated),
+            bus.async_listen(ar.EVENT_AREA_REGISTRY_UPDATED, self._async_area_updated),
+        ]
+
+    @callback
+    def async_stop(self) -> None:
+        """Beendet die Abonnements."""
+        while self._unsubs:
+            self._unsubs.pop()()
+
+    def groups_of(self, entity_id: str) -> frozenset[str]:
+        """Liefert die dynamischen Gruppen einer Entität."""
+        return self._groups_of.get(entity_id, frozenset())
+
+    def _evaluate(self, entry: er.RegistryEntry | None) -> frozenset[str]:
+        """Ermittelt die Gruppen, deren Regel ein Eintrag erfüllt."""
+        if entry is None or entry.domain != MEMBER_DOMAIN or entry.disabled_by is not None:
+            return frozenset()
+        if entry.platform == DOMAIN:
+            # Eigene Sensoren (Leistung, Spitzen, Mittelwerte) würden sich sonst
+            # über Label, Bereich oder Muster selbst in die Summen zurückspeisen
+            return frozenset()
+        area_id = entry.area_id
+        if area_id is None and entry.device_id is not None:
+            device = self._devices.async_get(entry.device_id)
+            area_id = device.area_id if device is not None else None
+        area = self._areas.async_get_area(area_id) if area_id is not None else None
+        floor_id = area.floor_id if area is not None else None
+        return frozenset(
+            group_id
+            for group_id, rule in self._rules.items()
+            if rule.matches(entry, area_id, floor_id)
+        )
+
+    def _update(self, entity_ids: Iterable[str]) -> None:
+        """Wertet die Entitäten neu aus und meldet geänderte Zuordnungen."""
+        for entity_id in entity_ids:
+            groups = self._evaluate(self._entities.async_get(entity_id))
+            if groups == self._groups_of.get(entity_id, frozenset()):
+                continue
+            if groups:
+                self._groups_of[entity_id] = groups
+            else:
+                self._groups_of.pop(entity_id, None)
+            _LOGGER.debug("Dynamische Gruppen von %s: %s", entity_id, sorted(groups))
+            self._on_change(entity_id, groups)
+
+    @callback
+    def _async_entity_updated(self, event: Event) -> None:
+        data = event.data
+        entity_ids = [data["entity_id"]]
+        if old_entity_id := data.get("old_entity_id"):
+            entity_ids.append(old_entity_id)
+        self._update(entity_ids)
+
+    @callback
+    def _async_device_updated(self, event: Event) -> None:
+        data = event.data
+        if data["action"] != "update" or "area_id" not in data.get("changes", {}):
+            return
+        self._update(
+            entry.entity_id
+            for entry in er.async_entries_for_device(self._entities, data["device_id"])
+        )
+
+    @callback
+    def _async_area_updated(self, event: Event) -> None:
+        data = event.data
+        if data["action"] != "update" or not any(rule.floors for rule in self._rules.values()):
+            return
+        area_id = data["area_id"]
+        entity_ids = {
+            entry.entity_id for entry in er.async_entries_for_area(self._entities, area_id)
+        }
+        for device in dr.async_entries_for_area(self._devices, area_id):
+            entity_ids.update(
+                entry.entity_id
+                for entry in er.async_entries_for_device(self._entities, device.id)
+            )
+        self._update(entity_ids)
@@ -0,0 +1,138 @@
+"""Gemeinsamer Zeitplan für Perioden-Grenzen (Tag, Woche, Monat, Jahr, Abrechnung).
+
+Statt dass jeder Sensor einen eigenen Timer für Mitternacht registriert, gibt
+es pro ConfigEntry genau einen ``PeriodScheduler``. Er plant immer nur die
+nächste Grenze ein und benachrichtigt beim Erreichen alle Listener mit den
+abgeschlossenen Perioden und einem einheitlichen Zeitstempel der Grenze. Die
+Engine schließt zuerst alle Akkumulatoren ab; die Sensoren übernehmen danach
+nur noch die Werte und schreiben gebündelt.
+
+Classes:
+    PeriodScheduler: Plant die Perioden-Grenzen eines ConfigEntry.
+"""
+
+from collections.abc import Callable
+from datetime import date, datetime, timedelta
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.util import dt as dt_util
+
+from ..const import (  # noqa: TID252
+    PERIOD_BILLING,
+    PERIOD_DAY,
+    PERIOD_MONTH,
+    PERIOD_WEEK,
+    PERIOD_YEAR,
+)
+
+PERIODS = (PERIOD_DAY, PERIOD_WEEK, PERIOD_MONTH, PERIOD_YEAR, PERIOD_BILLING)
+
+
+def _add_months(day: date, months: int, day_of_month: int = 1) -> date:
+    month = day.month - 1 + months
+    return date(day.year + month // 12, month % 12 + 1, day_of_month)
+
+
+def period_start_date(period: str, day: date, billing_day: int = 1) -> date:
+    """Liefert den ersten Tag der Periode, in die ``day`` fällt."""
+    if period == PERIOD_WEEK:
+        return day - timedelta(days=day.weekday())
+    if period == PERIOD_MONTH:
+        return day.replace(day=1)
+    if period == PERIOD_YEAR:
+        return day.replace(month=1, day=1)
+    if period == PERIOD_BILLING:
+        if day.day >= billing_day:
+            return day.replace(day=billing_day)
+        return _add_months(day, -1, billing_day)
+    return day
+
+
+def next_period_start_date(period: str, day: date, billing_day: int = 1) -> date:
+    """Liefert den ersten Tag der auf ``day`` folgenden Periode."""
+    start = period_start_date(period, day, billing_day)
+    if period == PERIOD_WEEK:
+        return start + timedelta(days=7)
+    if period == PERIOD_MONTH:
+        return _add_months(start, 1)
+    if period == PERIOD_YEAR:
+        return start.replace(year=start.year + 1)
+    if period == PERIOD_BILLING:
+        return _add_months(start, 1, billing_day)
+    return start + timedelta(days=1)
+
+
+class PeriodScheduler:
+    """Plant die Perioden-Grenzen eines ConfigEntry."""
+
+    def __init__(self, hass: HomeAssistant, billing_day: int = 1) -> None:
+        """Initialisiert den Zeitplan.
+
+        Args:
+            hass (HomeAssistant): Die Home Assistant-Instanz.
+            billing_day (int): Tag des Monats, an dem die Abrechnungsperiode beginnt.
+
+        """
+        self.hass = hass
+        self.billing_day = billing_day
+        self._listeners: list[Callable[[frozenset[str], datetime], None]] = []
+        self._next: datetime | None = None
+        self._unsub: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Plant die nächste Grenze ein."""
+        self._schedule(dt_util.now())
+
+    @callback
+    def async_stop(self) -> None:
+        """Beendet den Zeitplan."""
+        if self._unsub:
+            self._unsub()
+            self._unsub = None
+
+    @callback
+    def async_add_listener(
+        self, listener: Callable[[frozenset[str], datetime], None]
+    ) -> Callable[[], None]:
+        """Registriert einen Listener für Perioden-Grenzen.
+
+        Die Listener werden in der Reihenfolge der Registrierung mit den
+        abgeschlossenen Perioden und dem Zeitpunkt der Grenze aufgerufen.
+
+        Returns:
+            Callable[[], None]: Funktion zum Entfernen des Listeners.
+
+        """
+        self._listeners.append(listener)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(listener)
+
+        return remove_listener
+
+    def period_start(self, period: str, moment: datetime | None = None) -> datetime:
+        """Liefert den Beginn (lokal) der Periode, in die ``moment`` fällt."""
+        day = dt_util.as_local(moment or dt_util.utcnow()).date()
+        return dt_util.start_of_local_day(period_start_date(period, day, self.billing_day))
+
+    def _schedule(self, moment: datetime) -> None:
+        day = dt_util.as_local(moment).date()
+        self._next = min(
+            dt_util.start_of_local_day(next_period_start_date(period, day, self.billing_day))
+            for period in PERIODS
+        )
+        self._unsub = async_track_point_in_time(self.hass, self._async_boundary, self._next)
+
+    @callback
+    def _async_boundary(self, _now: datetime) -> None:
+        """Benachrichtigt alle Listener über die erreichte Grenze."""
+        boundary = self._next
+        closed = frozenset(
+            period for period in PERIODS if self.period_start(period, boundary) == boundary
+        )
+        for listener in list(self._listeners):
+            listener(closed, boundary)
+        self._schedule(boundary)
@@ -0,0 +1,256 @@
+"""Speicherbegrenzte, zusammenführbare Quantil-Skizzen für Leistungswerte.
+
+Die ``QuantileSketch`` ordnet jeden Wert einem logarithmischen Bucket zu
+(DDSketch-Verfahren), sodass jedes Quantil mit einem garantierten relativen
+Fehler (Standard 1 %) geschätzt wird. Die Anzahl der Buckets ist begrenzt und
+wächst nur mit dem Logarithmus des Wertebereichs, nicht mit der Anzahl der
+Messwerte. Zwei Skizzen lassen sich durch Addition der Bucket-Gewichte
+verlustfrei zusammenführen.
+
+``PowerQuantiles`` gewichtet die Leistung einer Gruppe mit ihrer Haltedauer
+und führt eine Skizze für den laufenden Tag sowie die Skizzen der letzten
+Tage, aus denen die Quantile der gleitenden Woche zusammengeführt werden.
+
+Classes:
+    QuantileSketch: Zusammenführbare Quantil-Skizze mit relativer Genauigkeit.
+    PowerQuantiles: Zeitgewichtete Tages- und Wochen-Skizzen einer Gruppe.
+"""
+
+from collections import deque
+from collections.abc import Mapping
+import math
+
+# Werte mit kleinerem Betrag (W) werden als 0 gezählt
+MIN_VALUE = 1e-3
+
+
+class QuantileSketch:
+    """Zusammenführbare Quantil-Skizze mit relativer Genauigkeit."""
+
+    __slots__ = (
+        "relative_accuracy",
+        "max_bins",
+        "_gamma",
+        "_log_gamma",
+        "_positive",
+        "_negative",
+        "_zero",
+        "_sorted",
+        "count",
+    )
+
+    def __init__(self, relative_accuracy: float = 0.01, max_bins: int = 1024) -> None:
+        """Initialisiert eine leere Skizze.
+
+        Args:
+            relative_accuracy (float): Garantierter relativer Fehler der Quantile.
+            max_bins (int): Maximale Anzahl Buckets je Vorzeichen. Bei Überlauf
+                werden die kleinsten Beträge zusammengefasst.
+
+        """
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._positive: dict[int, float] = {}
+        self._negative: dict[int, float] = {}
+        self._zero = 0.0
+        self._sorted: list | None = None
+        self.count = 0.0
+
+    @property
+    def bins(self) -> tuple[Mapping[int, float], Mapping[int, float], float]:
+        """Gewichte der Buckets positiver und negativer Beträge sowie der Null."""
+        return self._positive, self._negative, self._zero
+
+    def add(self, value: float, weight: float = 1.0) -> None:
+        """Übernimmt einen Wert mit dem angegebenen Gewicht."""
+        if weight <= 0:
+            return
+        if value > MIN_VALUE:
+            self._add_bin(self._positive, value, weight)
+        elif value < -MIN_VALUE:
+            self._add_bin(self._negative, -value, weight)
+        else:
+            self._zero += weight
+        self.count += weight
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Führt eine Skizze gleicher Genauigkeit in diese Skizze zusammen."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Skizzen mit unterschiedlicher Genauigkeit")
+        positive, negative, zero = other.bins
+        for own, foreign in ((self._positive, positive), (self._negative, negative)):
+            for key, weight in foreign.items():
+                if key not in own:
+                    self._sorted = None
+                own[key] = own.get(key, 0.0) + weight
+            self._collapse(own)
+        self._zero += zero
+        self.count += other.count
+
+    def quantile(self, q: float) -> float | None:
+        """Liefert das Quantil ``q`` (0 bis 1) oder ``None`` ohne Werte."""
+        if self.count <= 0:
+            return None
+
+        rank = q * self.count
+        cumulative = 0.0
+        for sign, key, weight in self._ordered():
+            cumulative += weight
+            if cumulative >= rank:
+                if sign == 0:
+                    return 0.0
+                return sign * 2 * self._gamma ** key / (self._gamma + 1)
+        return self._last_value()
+
+    def as_dict(self) -> dict:
+        """Liefert die Buckets der Skizze für einen Snapshot."""
+        return {
+            "positive": list(self._positive.items()),
+            "negative": list(self._negative.items()),
+            "zero": self._zero,
+            "count": self.count,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "QuantileSketch":
+        """Erstellt eine Skizze aus einem Snapshot."""
+        sketch = cls()
+        sketch._positive = {int(key): float(weight) for key, weight in data.get("positive", ())}
+        sketch._negative = {int(key): float(weight) for key, weight in data.get("negative", ())}
+        sketch._zero = float(data.get("zero", 0.0))
+        sketch.count = float(data.get("count", 0.0))
+        return sketch
+
+    def _add_bin(self, bins: dict[int, float], magnitude: float, weight: float) -> None:
+        key = math.ceil(math.log(magnitude) / self._log_gamma)
+        if key in bins:
+            bins[key] += weight
+            return
+        bins[key] = weight
+        self._sorted = None
+        self._collapse(bins)
+
+    def _collapse(self, bins: dict[int, float]) -> None:
+        """Fasst die kleinsten Beträge zusammen, bis die Bucket-Grenze eingehalten ist."""
+        while len(bins) > self.max_bins:
+            lowest = min(bins)
+            weight = bins.pop(lowest)
+            following = min(bins)
+            bins[following] += weight
+            self._sorted = None
+
+    def _ordered(self) -> list[tuple[int, int, float]]:
+        """Liefert alle Buckets aufsteigend nach Wert als (Vorzeichen, Schlüssel, Gewicht)."""
+        if self._sorted is None:
+            self._sorted = (
+                [(-1, key) for key in sorted(self._negative, reverse=True)]
+                + [(0, 0)]
+                + [(1, key) for key in sorted(self._positive)]
+            )
+        ordered = []
+        for sign, key in self._sorted:
+            if sign > 0:
+                ordered.append((sign, key, self._positive[key]))
+            elif sign < 0:
+                ordered.append((sign, key, self._negative[key]))
+            else:
+                ordered.append((0, 0, self._zero))
+        return ordered
+
+    def _last_value(self) -> float:
+        if self._positive:
+            return 2 * self._gamma ** max(self._positive) / (self._gamma + 1)
+        if self._zero:
+            return 0.0
+        return -2 * self._gamma ** min(self._negative) / (self._gamma + 1)
+
+
+class PowerQuantiles:
+    """Zeitgewichtete Tages- und Wochen-Skizzen der Leistung einer Gruppe."""
+
+    def __init__(self, days: int = 7) -> None:
+        """Initialisiert die Skizzen.
+
+        Args:
+            days (int): Anzahl Tage der gleitenden Auswertung inklusive heute.
+
+        """
+        self.today = QuantileSketch()
+        self._history: deque[QuantileSketch] = deque(maxlen=days - 1)
+        # Zusammenführung der abgeschlossenen Tage, nur beim Tageswechsel neu berechnet
+        self._past = QuantileSketch()
+        self._power: float | None = None
+        self._last_time: float | None = None
+
+    def update(self, timestamp: float, power: float | None = None) -> None:
+        """Gewichtet die bisherige Leistung bis ``timestamp`` und übernimmt ``power``.
+
+        Args:
+            timestamp (float): Zeitpunkt (Unix-Zeit in Sekunden).
+            power (float | None): Neue Leistung ab ``timestamp``; ``None``
+                behält die bisherige Leistung bei.
+
+        """
+        if self._last_time is not None and timestamp > self._last_time:
+            if self._power is not None:
+                self.today.add(self._power, timestamp - self._last_time)
+            self._last_time = timestamp
+        elif self._last_time is None:
+            self._last_time = timestamp
+
+        if power is not None:
+            self._power = power
+
+    def rollover(self, timestamp: float) -> None:
+        """Schließt den laufenden Tag ab und beginnt eine neue Tages-Skizze."""
+        self.update(timestamp)
+        self._history.append(self.today)
+        self.today = QuantileSketch()
+        self._past = QuantileSketch()
+        for sketch in self._history:
+            self._past.merge(sketch)
+
+    def as_dict(self) -> dict:
+        """Liefert die Skizzen für einen Snapshot."""
+        return {
+            "today": self.today.as_dict(),
+            "history": [sketch.as_dict() for sketch in self._history],
+            "power": self._power,
+            "last_time": self._last_time,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict, days: int = 7, running: bool = True) -> "PowerQuantiles":
+        """Erstellt die Skizzen aus einem Snapshot.
+
+        Args:
+            data (dict): Der mit ``as_dict`` gespeicherte Zustand.
+            days (int): Anzahl Tage der gleitenden Auswertung inklusive heute.
+            running (bool): Übernimmt auch die zuletzt gehaltene Leistung.
+
+        """
+        quantiles = cls(days)
+        quantiles.today = QuantileSketch.from_dict(data.get("today", {}))
+        quantiles._history.extend(
+            QuantileSketch.from_dict(sketch) for sketch in data.get("history", ())
+        )
+        for sketch in quantiles._history:
+            quantiles._past.merge(sketch)
+        if running:
+            quantiles._power = data.get("power")
+            quantiles._last_time = data.get("last_time")
+        return quantiles
+
+    def quantile(self, q: float, timestamp: float) -> float | None:
+        """Liefert das Quantil ``q`` des laufenden Tages bis ``timestamp``."""
+        self.update(timestamp)
+        return self.today.quantile(q)
+
+    def week(self) -> QuantileSketch:
+        """Führt die Skizzen der gleitenden Woche zu einer Skizze zusammen."""
+        merged = QuantileSketch()
+        merged.merge(self._past)
+        merged.merge(self.today)
+        return merged
@@ -0,0 +1,145 @@
+"""Domänenweites Register der Quell-Entitäten aller ConfigEntries.
+
+Eine Entität kann Mitglied mehrerer Gruppen und mehrerer ConfigEntries sein.
+Das ``MemberRegistry`` unter ``hass.data[DOMAIN]`` abonniert jede Entität
+genau einmal, liest jeden neuen Zustand genau einmal über einen gemeinsamen
+``UnitCache`` und verteilt Ereignis und Messwert an alle Engines, die die
+Entität verwenden. Abonnements werden gezählt und entfernt, sobald keine
+Engine die Entität mehr verwendet.
+
+Functions:
+    async_get_registry: Liefert das Register der Domäne und legt es bei Bedarf an.
+
+Classes:
+    MemberRegistry: Abonniert Quell-Entitäten einmalig und verteilt ihre Zustände.
+"""
+
+from collections.abc import Callable, Iterable
+
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import (
+    async_track_state_change_event,
+    async_track_state_report_event,
+)
+
+from ..const import DATA_REGISTRY, DOMAIN  # noqa: TID252
+from .units import UnitCache
+
+ChangeAction = Callable[[Event, tuple[str, float] | None], None]
+ReportAction = Callable[[Event], None]
+
+
+@callback
+def async_get_registry(hass: HomeAssistant) -> "MemberRegistry":
+    """Liefert das Register der Domäne und legt es bei Bedarf an."""
+    data = hass.data.setdefault(DOMAIN, {})
+    if (registry := data.get(DATA_REGISTRY)) is None:
+        registry = data[DATA_REGISTRY] = MemberRegistry(hass)
+    return registry
+
+
+class MemberRegistry:
+    """Abonniert Quell-Entitäten einmalig und verteilt ihre Zustände."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialisiert das Register.
+
+        Args:
+            hass (HomeAssistant): Die Home Assistant-Instanz.
+
+        """
+        self.hass = hass
+        self.units = UnitCache()
+        self._changes: dict[str, list[ChangeAction]] = {}
+        self._reports: dict[str, list[ReportAction]] = {}
+        self._unsub_changes: dict[str, CALLBACK_TYPE] = {}
+        self._unsub_reports: dict[str, CALLBACK_TYPE] = {}
+
+    @property
+    def entity_count(self) -> int:
+        """Liefert die Anzahl der abonnierten Entitäten."""
+        return len(self._changes)
+
+    @callback
+    def async_track_changes(
+        self, entity_ids: Iterable[str], action: ChangeAction
+    ) -> Callable[[], None]:
+        """Registriert ``action`` für Zustandsänderungen der Entitäten.
+
+        Args:
+            entity_ids (Iterable[str]): Die Quell-Entitäten.
+            action (ChangeAction): Wird mit dem Ereignis und dem einmal gelesenen
+                Messwert (``UnitCache.read``) aufgerufen.
+
+        Returns:
+            Callable[[], None]: Funktion zum Entfernen der Registrierung.
+
+        """
+        return self._add(
+            self._changes,
+            self._unsub_changes,
+            entity_ids,
+            action,
+            lambda entity_id: async_track_state_change_event(
+                self.hass, [entity_id], self._async_state_changed
+            ),
+        )
+
+    @callback
+    def async_track_reports(
+        self, entity_ids: Iterable[str], action: ReportAction
+    ) -> Callable[[], None]:
+        """Registriert ``action`` für unveränderte Zustandsmeldungen der Entitäten.
+
+        Returns:
+            Callable[[], None]: Funktion zum Entfernen der Registrierung.
+
+        """
+        return self._add(
+            self._reports,
+            self._unsub_reports,
+            entity_ids,
+            action,
+            lambda entity_id: async_track_state_report_event(
+                self.hass, [entity_id], self._async_state_reported
+            ),
+        )
+
+    def read(self, entity_id: str, state) -> tuple[str, float] | None:
+        """Liest einen Zustand über den gemeinsamen ``UnitCache``."""
+        return self.units.read(entity_id, state)
+
+    def _add(self, registry, unsubs, entity_ids, action, subscribe) -> Callable[[], None]:
+        entity_ids = list(dict.fromkeys(entity_ids))
+        for entity_id in entity_ids:
+            actions = registry.setdefault(entity_id, [])
+            if not actions:
+                unsubs[entity_id] = subscribe(entity_id)
+            actions.append(action)
+
+        @callback
+        def remove() -> None:
+            for entity_id in entity_ids:
+                actions = registry[entity_id]
+                actions.remove(action)
+                if not actions:
+                    del registry[entity_id]
+                    unsubs.pop(entity_id)()
+                    if entity_id not in self._changes:
+                        self.units.discard(entity_id)
+
+        return remove
+
+    @callback
+    def _async_state_changed(self, event: Event) -> None:
+        """Liest den neuen Zustand einmal und verteilt ihn an alle Engines."""
+        entity_id = event.data["entity_id"]
+        reading = self.units.read(entity_id, event.data["new_state"])
+        for action in list(self._changes.get(entity_id, ())):
+            action(event, reading)
+
+    @callback
+    def _async_state_reported(self, event: Event) -> None:
+        """Verteilt eine unveränderte Zustandsmeldung an alle Engines."""
+        for action in list(self._reports.get(event.data["entity_id"], ())):
+            action(event)
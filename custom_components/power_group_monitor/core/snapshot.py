@@ -0,0 +1,113 @@
+"""Persistenter Snapshot des Aggregationszustands eines ConfigEntry.
+
+Die Engine legt ihren vollständigen Zustand (Mitgliederwerte, Energiezähler,
+Integratoren, Messwertspeicher, Spitzenwerte und Quantil-Skizzen) in einem
+versionierten ``Store`` ab. Gespeichert wird gebündelt im ``SNAPSHOT_INTERVAL``,
+beim Entladen des Eintrags sowie beim Beenden von Home Assistant. Beim Start
+wird der Snapshot mit einem einzigen Lesezugriff geladen, sodass alle Sensoren
+ohne Abfragen des Recorders sofort ihre Werte haben.
+
+Classes:
+    SnapshotStore: Lädt und speichert den Snapshot eines ConfigEntry.
+"""
+
+from collections.abc import Callable
+import logging
+from typing import Any
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
+
+from ..const import DOMAIN, SNAPSHOT_INTERVAL, SNAPSHOT_SAVE_DELAY  # noqa: TID252
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+STORAGE_MINOR_VERSION = 1
+
+
+def storage_key(entry_id: str) -> str:
+    """Liefert den Schlüssel der Snapshot-Datei eines ConfigEntry."""
+    return f"{DOMAIN}.{entry_id}.snapshot"
+
+
+class SnapshotStore:
+    """Lädt und speichert den Snapshot eines ConfigEntry."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialisiert den Speicher.
+
+        Args:
+            hass (HomeAssistant): Die Home Assistant-Instanz.
+            entry_id (str): Die ID des ConfigEntry.
+
+        """
+        self.hass = hass
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, storage_key(entry_id), minor_version=STORAGE_MINOR_VERSION
+        )
+        self._data_func: Callable[[], dict[str, Any]] | None = None
+        self._unsub_interval: CALLBACK_TYPE | None = None
+        self._unsub_stop: CALLBACK_TYPE | None = None
+
+    async def async_load(self) -> dict[str, Any] | None:
+        """Liest den gespeicherten Snapshot oder ``None``, wenn keiner vorhanden ist."""
+        try:
+            return await self._store.async_load()
+        except (ValueError, KeyError, TypeError) as err:
+            _LOGGER.warning("Snapshot %s wird verworfen: %s", self._store.key, err)
+            return None
+
+    @callback
+    def async_start(self, data_func: Callable[[], dict[str, Any]]) -> None:
+        """Speichert den Snapshot ab jetzt periodisch und beim Beenden.
+
+        Args:
+            data_func (Callable[[], dict]): Liefert den aktuellen Snapshot.
+
+        """
+        self._data_func = data_func
+        self._unsub_interval = async_track_time_interval(
+            self.hass, self._async_schedule_save, SNAPSHOT_INTERVAL
+        )
+        self._unsub_stop = self.hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_STOP, self._async_stop_event
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Beendet das periodische Speichern."""
+        if self._unsub_interval:
+            self._unsub_interval()
+            self._unsub_interval = None
+        if self._unsub_stop:
+            self._unsub_stop()
+            self._unsub_stop = None
+
+    async def async_save(self) -> None:
+        """Speichert den Snapshot sofort, z.B. beim Entladen des Eintrags."""
+        if self._data_func is not None:
+            await self._store.async_save(self._data_func())
+
+    async def async_remove(self) -> None:
+        """Entfernt die Snapshot-Datei, z.B. beim Löschen des Eintrags."""
+        await self._store.async_remove()
+
+    @callback
+    def _async_schedule_save(self, _now=None) -> None:
+        """Plant das Speichern mit kurzer Verzögerung ein, um Aufrufe zu bündeln."""
+        if self._data_func is not None:
+            self._store.async_delay_save(self._data_func, SNAPSHOT_SAVE_DELAY)
+
+    @callback
+    def _async_stop_event(self, _event: Event) -> None:
+        """Übergibt den Snapshot an den abschließenden Schreibvorgang von Home Assistant.
+
+        Während Home Assistant beendet wird, schreibt der ``Store`` ausstehende
+        Daten beim abschließenden Schreibvorgang, unabhängig von der Verzögerung.
+        """
+        # Der Listener wurde bereits entfernt und darf nicht erneut abgemeldet werden
+        self._unsub_stop = None
+        self._async_schedule_save()
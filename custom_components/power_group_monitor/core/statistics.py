@@ -0,0 +1,334 @@
+"""Langzeitstatistiken der Gruppen aus dem gemeinsamen Integrator.
+
+Zu jeder vollen Stunde wird die Energie jeder Gruppe und der Gesamtsumme aus
+dem Stunden-Akkumulator des Integrators entnommen und als Zeile der
+Langzeitstatistik des Recorders vorbereitet: die Energie als fortlaufende
+Summe (kWh) und die mittlere Leistung (W) mit Minimum und Maximum der Stunde
+aus dem Messwertspeicher der Engine. Alle Zeilen einer Stunde werden
+gemeinsam über die Import-Schnittstelle für externe Statistiken geschrieben.
+
+Ein Backfill ersetzt die Stunden eines Zeitraums. Die fortlaufende Summe setzt
+dabei an der letzten Zeile vor dem Zeitraum an, und bei der Summe der obersten
+Gruppen wird die Gesamtsumme um die Differenz der Gruppe korrigiert.
+
+Der Recorder speichert Langzeitstatistiken stündlich und fasst sie bei der
+Abfrage selbst zu Tages-, Wochen- und Monatswerten zusammen. Dashboards über
+lange Zeiträume lesen damit nur wenige vorverdichtete Zeilen statt aller
+Zustandsänderungen der Energie-Sensoren.
+
+Classes:
+    StatisticsCompiler: Erstellt und schreibt die stündlichen Statistiken eines ConfigEntry.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+import logging
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import (
+    StatisticData,
+    StatisticMeanType,
+    StatisticMetaData,
+)
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
+    statistics_during_period,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import UnitOfEnergy, UnitOfPower
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_utc_time_change
+from homeassistant.util import dt as dt_util
+from homeassistant.util import slugify
+
+from ..const import (  # noqa: TID252
+    CONF_GROUP_ID,
+    CONF_GROUP_NAME,
+    DOMAIN,
+    ENERGY_HOUR,
+    STATISTICS_HOUR_WINDOW,
+)
+from .engine import PowerGroupEngine
+from .window_stats import WindowStats
+
+_LOGGER = logging.getLogger(__name__)
+
+STATISTIC_ENERGY = "energy"
+STATISTIC_POWER = "power"
+
+
+def statistic_id(entry: ConfigEntry, group_id: str | None, kind: str) -> str:
+    """Liefert die ID der externen Statistik einer Gruppe oder der Gesamtsumme."""
+    key = group_id or "total"
+    return f"{DOMAIN}:{slugify(f'{entry.entry_id}_{key}_{kind}')}"
+
+
+class StatisticsCompiler:
+    """Erstellt und schreibt die stündlichen Statistiken eines ConfigEntry."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        engine: PowerGroupEngine,
+        groups: list[dict],
+    ) -> None:
+        """Initialisiert den Compiler.
+
+        Args:
+            hass (HomeAssistant): Die Home Assistant-Instanz.
+            entry (ConfigEntry): Der Konfigurationseintrag.
+            engine (PowerGroupEngine): Die Aggregations-Engine des ConfigEntry.
+            groups (list[dict]): Die Gruppen des Eintrags.
+
+        """
+        self.hass = hass
+        self._entry = entry
+        self._engine = engine
+        self._group_ids: list[str] = []
+        self._metadata: dict[str, StatisticMetaData] = {}
+        self._set_groups(groups)
+
+        # Fortlaufende Summe und Beginn der letzten Zeile je Energie-Statistik
+        self._sums: dict[str, float] = {}
+        self._last_start: dict[str, float] = {}
+        # Noch nicht geschriebene Zeilen je Statistik
+        self._pending: dict[str, list[StatisticData]] = {}
+        self._unsub: CALLBACK_TYPE | None = None
+        # Gesetzt, sobald der Start abgeschlossen ist, auch ohne Recorder
+        self._started = asyncio.Event()
+
+    def _set_groups(self, groups: list[dict]) -> None:
+        """Erstellt die Metadaten der Statistiken aller Gruppen und der Gesamtsumme."""
+        entry = self._entry
+        names = {group[CONF_GROUP_ID]: group[CONF_GROUP_NAME] for group in groups}
+        self._group_ids = list(names)
+        self._metadata = {}
+        for group_id, name in (*names.items(), (None, "Gesamt")):
+            self._metadata[statistic_id(entry, group_id, STATISTIC_ENERGY)] = StatisticMetaData(
+                has_mean=False,
+                has_sum=True,
+                mean_type=StatisticMeanType.NONE,
+                name=f"{entry.title} {name} Energie",
+                source=DOMAIN,
+                statistic_id=statistic_id(entry, group_id, STATISTIC_ENERGY),
+                unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            )
+            self._metadata[statistic_id(entry, group_id, STATISTIC_POWER)] = StatisticMetaData(
+                has_mean=True,
+                has_sum=False,
+                mean_type=StatisticMeanType.ARITHMETIC,
+                name=f"{entry.title} {name} Leistung",
+                source=DOMAIN,
+                statistic_id=statistic_id(entry, group_id, STATISTIC_POWER),
+                unit_of_measurement=UnitOfPower.WATT,
+            )
+
+    async def async_start(self) -> None:
+        """Liest die letzten Summen aus dem Recorder und startet die stündliche Erstellung."""
+        try:
+            if "recorder" not in self.hass.config.components:
+                _LOGGER.debug("Recorder nicht geladen, Langzeitstatistiken deaktiviert")
+                return
+
+            instance = get_instance(self.hass)
+            if not await instance.async_db_ready:
+                return
+
+            await self._async_load_sums(list(self._metadata))
+            self._unsub = async_track_utc_time_change(
+                self.hass, self._async_compile_hour, minute=0, second=0
+            )
+        finally:
+            self._started.set()
+
+    async def async_wait_started(self) -> bool:
+        """Wartet, bis der Start abgeschlossen ist.
+
+        Returns:
+            bool: ``True``, wenn die Statistiken erstellt werden.
+
+        """
+        await self._started.wait()
+        return self._unsub is not None
+
+    async def async_update_groups(self, groups: list[dict]) -> None:
+        """Übernimmt geänderte Gruppen zur Laufzeit.
+
+        Für hinzugekommene Gruppen wird die letzte Summe aus dem Recorder
+        gelesen, damit eine Gruppe mit bekannter ID ihre Statistik fortsetzt.
+        """
+        previous = set(self._metadata)
+        self._set_groups(groups)
+        for stat_id in previous - set(self._metadata):
+            self._sums.pop(stat_id, None)
+            self._last_start.pop(stat_id, None)
+            self._pending.pop(stat_id, None)
+        if self._unsub is not None:
+            await self._async_load_sums(set(self._metadata) - previous)
+
+    async def _async_load_sums(self, stat_ids) -> None:
+        """Liest die letzte Summe der Energie-Statistiken aus dem Recorder."""
+        instance = get_instance(self.hass)
+        for stat_id in stat_ids:
+            metadata = self._metadata.get(stat_id)
+            if metadata is None or not metadata["has_sum"]:
+                continue
+            last = await instance.async_add_executor_job(
+                get_last_statistics, self.hass, 1, stat_id, True, {"sum"}
+            )
+            if rows := last.get(stat_id):
+                self._sums[stat_id] = rows[0].get("sum") or 0.0
+                self._last_start[stat_id] = rows[0]["start"]
+
+    @callback
+    def async_stop(self) -> None:
+        """Beendet die stündliche Erstellung."""
+        if self._unsub:
+            self._unsub()
+            self._unsub = None
+
+    @callback
+    def async_add_hour(
+        self,
+        group_id: str | None,
+        start: datetime,
+        energy: float,
+        stats: WindowStats | None = None,
+    ) -> None:
+        """Bereitet die Zeilen einer abgeschlossenen Stunde vor.
+
+        Args:
+            group_id (str | None): Die Gruppe oder ``None`` für die Gesamtsumme.
+            start (datetime): Beginn der Stunde (UTC).
+            energy (float): Energie der Stunde in kWh.
+            stats (WindowStats | None): Kennzahlen der Leistung in der Stunde,
+                aus denen Minimum und Maximum übernommen werden.
+
+        """
+        energy_id = statistic_id(self._entry, group_id, STATISTIC_ENERGY)
+        if start.timestamp() <= self._last_start.get(energy_id, float("-inf")):
+            return
+
+        total = self._sums.get(energy_id, 0.0) + energy
+        self._sums[energy_id] = total
+        self._last_start[energy_id] = start.timestamp()
+
+        self._pending.setdefault(energy_id, []).append(
+            StatisticData(start=start, state=total, sum=total)
+        )
+        power = StatisticData(start=start, mean=energy * 1000)
+        if stats is not None:
+            power["min"] = stats.minimum
+            power["max"] = stats.maximum
+        self._pending.setdefault(
+            statistic_id(self._entry, group_id, STATISTIC_POWER), []
+        ).append(power)
+
+    async def async_recorded_hours(
+        self, group_id: str | None, start: datetime
+    ) -> dict[float, float]:
+        """Liest die geschriebene Energie je Stunde ab ``start`` aus dem Recorder.
+
+        Args:
+            group_id (str | None): Die Gruppe oder ``None`` für die Gesamtsumme.
+            start (datetime): Beginn der ersten Stunde (UTC).
+
+        Returns:
+            dict[float, float]: Energie (kWh) je Beginn der Stunde (Unix-Zeit),
+            leer, solange keine Statistiken erstellt werden.
+
+        """
+        if self._unsub is None:
+            return {}
+
+        energy_id = statistic_id(self._entry, group_id, STATISTIC_ENERGY)
+        rows = await get_instance(self.hass).async_add_executor_job(
+            statistics_during_period,
+            self.hass,
+            start,
+            None,
+            {energy_id},
+            "hour",
+            None,
+            {"change"},
+        )
+        return {row["start"]: row.get("change") or 0.0 for row in rows.get(energy_id, [])}
+
+    async def async_import_history(
+        self, group_id: str, hours: list[tuple[datetime, float]]
+    ) -> None:
+        """Ersetzt die Statistiken einer Gruppe durch nachberechnete Stundenwerte.
+
+        Die fortlaufende Summe setzt an der letzten Zeile vor der ersten
+        übergebenen Stunde an. Ist die Gruppe eine oberste Gruppe und die
+        Gesamtsumme die Summe der obersten Gruppen, werden die Stunden der
+        Gesamtsumme um die Differenz zu den bisherigen Werten der Gruppe
+        korrigiert.
+
+        Args:
+            group_id (str): Die Gruppe.
+            hours (list[tuple[datetime, float]]): Beginn (UTC) und Energie (kWh)
+                jeder abgeschlossenen Stunde in aufsteigender Reihenfolge.
+
+        """
+        if not hours or self._unsub is None:
+            return
+
+        start = hours[0][0]
+        recorded = await self.async_recorded_hours(group_id, start)
+        imports = [(group_id, hours, recorded)]
+        members = self._engine.members
+        if not members.union_total and group_id in members.roots:
+            total_recorded = await self.async_recorded_hours(None, start)
+            total_hours = [
+                (
+                    hour,
+                    total_recorded.get(hour.timestamp(), 0.0)
+                    - recorded.get(hour.timestamp(), 0.0)
+                    + energy,
+                )
+                for hour, energy in hours
+            ]
+            imports.append((None, total_hours, total_recorded))
+
+        for target, rows, previous in imports:
+            energy_id = statistic_id(self._entry, target, STATISTIC_ENERGY)
+            # Summe vor dem Zeitraum: letzte Summe ohne die bisherigen Stunden
+            self._sums[energy_id] = self._sums.get(energy_id, 0.0) - sum(previous.values())
+            self._last_start[energy_id] = float("-inf")
+            self._pending.pop(energy_id, None)
+            self._pending.pop(statistic_id(self._entry, target, STATISTIC_POWER), None)
+            for hour, energy in rows:
+                self.async_add_hour(target, hour, energy)
+        self.async_flush()
+
+    @callback
+    def async_flush(self) -> None:
+        """Schreibt alle vorbereiteten Zeilen gesammelt in den Recorder."""
+        pending, self._pending = self._pending, {}
+        for stat_id, rows in pending.items():
+            async_add_external_statistics(self.hass, self._metadata[stat_id], rows)
+
+    @callback
+    def _async_compile_hour(self, now: datetime) -> None:
+        """Entnimmt die Energie der abgelaufenen Stunde und schreibt die Statistiken."""
+        start = dt_util.as_utc(now).replace(minute=0, second=0, microsecond=0) - timedelta(hours=1)
+
+        engine = self._engine
+        roots = set(engine.members.roots)
+        total = 0.0
+        for group_id in self._group_ids:
+            energy = engine.energy.async_reset_energy(group_id, ENERGY_HOUR, now)
+            if group_id in roots:
+                total += energy
+            self.async_add_hour(
+                group_id, start, energy, engine.window_stats(group_id, STATISTICS_HOUR_WINDOW)
+            )
+        if engine.members.union_total:
+            # Gemeinsame Mitglieder zählen in der Vereinigung nur einmal
+            total = engine.energy.async_reset_energy(None, ENERGY_HOUR, now)
+        self.async_add_hour(None, start, total, engine.window_stats(None, STATISTICS_HOUR_WINDOW))
+
+        self.async_flush()
@@ -0,0 +1,184 @@
+"""Strompreis für die Kostenberechnung (Zeitplan oder Preis-Entität).
+
+Der Preis stammt aus einer Preis-Entität (z.B. eines dynamischen Tarifs) oder
+aus einem lokalen Zeitplan mit Umschaltzeiten im Format
+``"00:00=0.30; 06:00=0.35; 22:00=0.28"``. Ist beides konfiguriert, gilt die
+Entität, solange sie einen gültigen Preis liefert, sonst der Zeitplan.
+
+Der ``Tariff`` meldet jede Preisänderung mit ihrem Zeitpunkt an die Engine,
+die daraufhin alle Integratoren bis zu diesem Zeitpunkt fortschreibt und erst
+dann den neuen Preis setzt. Der Preis wird damit nur bei einer Änderung gelesen
+und nicht bei jedem Ereignis eines Mitglieds.
+
+Functions:
+    parse_schedule: Liest einen Tarif-Zeitplan.
+
+Classes:
+    Tariff: Liefert den aktuellen Preis je kWh und meldet Änderungen.
+"""
+
+from collections.abc import Callable
+from datetime import datetime, time, timedelta
+import logging
+
+from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, State, callback
+from homeassistant.helpers.event import (
+    async_track_point_in_time,
+    async_track_state_change_event,
+)
+from homeassistant.util import dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def parse_schedule(text: str | None) -> list[tuple[time, float]]:
+    """Liest einen Tarif-Zeitplan.
+
+    Args:
+        text (str | None): Umschaltzeiten und Preise, z.B. ``"06:00=0.35; 22:00=0.28"``.
+            Einträge werden durch ``;`` oder Zeilenumbrüche getrennt.
+
+    Returns:
+        list[tuple[time, float]]: Nach Uhrzeit sortierte Einträge, leer ohne Zeitplan.
+
+    Raises:
+        ValueError: Wenn ein Eintrag nicht gelesen werden kann.
+
+    """
+    schedule = []
+    for item in (text or "").replace("\n", ";").split(";"):
+        if not item.strip():
+            continue
+        start, _, price = item.partition("=")
+        schedule.append(
+            (time.fromisoformat(start.strip()), float(price.strip().replace(",", ".")))
+        )
+    schedule.sort()
+    if len({start for start, _ in schedule}) != len(schedule):
+        raise ValueError("Doppelte Umschaltzeit im Tarif-Zeitplan")
+    return schedule
+
+
+def price_factor(unit: str | None) -> float:
+    """Bestimmt den Faktor, mit dem ein Preis in ``unit`` auf eine kWh umgerechnet wird."""
+    if unit and unit.endswith("/MWh"):
+        return 0.001
+    if unit and unit.endswith("/Wh"):
+        return 1000.0
+    return 1.0
+
+
+class Tariff:
+    """Liefert den aktuellen Preis je kWh und meldet Änderungen."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        price_entity: str | None,
+        schedule: list[tuple[time, float]],
+        on_change: Callable[[float, float], None],
+    ) -> None:
+        """Initialisiert den Tarif.
+
+        Args:
+            hass (HomeAssistant): Die Home Assistant-Instanz.
+            price_entity (str | None): Entität mit dem aktuellen Preis.
+            schedule (list[tuple[time, float]]): Lokaler Zeitplan aus ``parse_schedule``.
+            on_change (Callable[[float, float], None]): Wird mit Zeitpunkt und
+                neuem Preis aufgerufen, wenn sich der Preis ändert.
+
+        """
+        self.hass = hass
+        self._price_entity = price_entity
+        self._schedule = schedule
+        self._on_change = on_change
+        self._entity_price: float | None = None
+        self._scheduled_price: float | None = None
+        self.price: float | None = None
+        self._unsubs: list[CALLBACK_TYPE] = []
+        self._unsub_schedule: CALLBACK_TYPE | None = None
+        self._next_switch: datetime | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Liest den aktuellen Preis und abonniert Entität und Zeitplan."""
+        now = dt_util.now()
+        if self._schedule:
+            self._scheduled_price = self._price_at(now)
+            self._schedule_next(now)
+        if self._price_entity:
+            self._entity_price = self._read(self.hass.states.get(self._price_entity))
+            self._unsubs.append(
+                async_track_state_change_event(
+                    self.hass, [self._price_entity], self._async_price_entity_changed
+                )
+            )
+        self._apply(now.timestamp())
+
+    @callback
+    def async_stop(self) -> None:
+        """Beendet alle Abonnements."""
+        while self._unsubs:
+            self._unsubs.pop()()
+        if self._unsub_schedule:
+            self._unsub_schedule()
+            self._unsub_schedule = None
+
+    def _price_at(self, moment: datetime) -> float:
+        """Liefert den Preis des Zeitplans zum lokalen Zeitpunkt ``moment``."""
+        current = dt_util.as_local(moment).time()
+        price = self._schedule[-1][1]
+        for start, scheduled in self._schedule:
+            if start > current:
+                break
+            price = scheduled
+        return price
+
+    def _schedule_next(self, moment: datetime) -> None:
+        """Plant die nächste Umschaltzeit des Zeitplans ein."""
+        local = dt_util.as_local(moment)
+        candidates = [
+            datetime.combine(local.date() + timedelta(days=offset), start, local.tzinfo)
+            for offset in (0, 1)
+            for start, _ in self._schedule
+        ]
+        self._next_switch = min(candidate for candidate in candidates if candidate > local)
+        self._unsub_schedule = async_track_point_in_time(
+            self.hass, self._async_switch, self._next_switch
+        )
+
+    @callback
+    def _async_switch(self, _now: datetime) -> None:
+        """Übernimmt den Preis der erreichten Umschaltzeit zu ihrem genauen Zeitpunkt."""
+        switch = self._next_switch
+        self._scheduled_price = self._price_at(switch)
+        self._schedule_next(switch)
+        self._apply(switch.timestamp())
+
+    @callback
+    def _async_price_entity_changed(self, event) -> None:
+        """Übernimmt den neuen Preis der Preis-Entität."""
+        self._entity_price = self._read(event.data["new_state"])
+        self._apply(event.time_fired_timestamp)
+
+    @staticmethod
+    def _read(state: State | None) -> float | None:
+        if state is None:
+            return None
+        try:
+            return float(state.state) * price_factor(
+                state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+            )
+        except ValueError:
+            return None
+
+    def _apply(self, timestamp: float) -> None:
+        """Ermittelt den gültigen Preis und meldet ihn bei einer Änderung."""
+        price = self._entity_price if self._entity_price is not None else self._scheduled_price
+        if price is None:
+            # Ohne gültigen Preis gilt der zuletzt bekannte weiter
+            return
+        if price != self.price:
+            self.price = price
+            self._on_change(timestamp, price)
@@ -0,0 +1,114 @@
+"""Hierarchisches Timing Wheel für die Ablaufzeiten der Mitglieder.
+
+Statt für jedes Mitglied einen eigenen Timer zu registrieren, legt die Engine
+die Ablaufzeit jedes Mitglieds in einem gemeinsamen ``TimingWheel`` ab. Das
+Rad besteht aus mehreren Ebenen mit je ``slots`` Fächern; Ebene ``n`` deckt
+``slots ** (n + 1)`` Ticks ab. Einträge liegen im Fach ihrer Ablaufzeit auf
+der kleinsten Ebene, die sie abdeckt, und rutschen beim Umlauf der unteren
+Ebene eine Ebene tiefer. Einplanen, Verschieben und Entfernen kosten O(1),
+ein Tick verarbeitet nur das fällige Fach, unabhängig von der Anzahl der
+Einträge.
+
+Classes:
+    TimingWheel: Hierarchisches Timing Wheel mit Schlüsseln und Ablaufzeiten.
+"""
+
+import math
+
+
+class TimingWheel:
+    """Hierarchisches Timing Wheel mit Schlüsseln und Ablaufzeiten."""
+
+    def __init__(self, tick: float, now: float, slots: int = 64, levels: int = 4) -> None:
+        """Initialisiert das Rad.
+
+        Args:
+            tick (float): Auflösung in Sekunden; Einträge laufen frühestens im
+                ersten Tick nach ihrer Ablaufzeit ab.
+            now (float): Aktueller Zeitstempel.
+            slots (int): Anzahl der Fächer je Ebene.
+            levels (int): Anzahl der Ebenen.
+
+        """
+        self.tick = tick
+        self._slots = slots
+        self._tick = math.floor(now / tick)
+        self._wheels: list[list[set[str]]] = [
+            [set() for _ in range(slots)] for _ in range(levels)
+        ]
+        # Ablauf-Tick und Fach je Schlüssel, damit Verschieben O(1) bleibt
+        self._deadlines: dict[str, int] = {}
+        self._buckets: dict[str, set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._deadlines
+
+    def schedule(self, key: str, deadline: float) -> None:
+        """Plant ``key`` zum Zeitstempel ``deadline`` ein oder verschiebt ihn."""
+        self._deadlines[key] = max(math.ceil(deadline / self.tick), self._tick + 1)
+        self._place(key)
+
+    def cancel(self, key: str) -> None:
+        """Entfernt ``key`` aus dem Rad, falls vorhanden."""
+        if self._deadlines.pop(key, None) is not None:
+            self._buckets.pop(key).discard(key)
+
+    def advance(self, now: float) -> list[str]:
+        """Schaltet das Rad bis ``now`` weiter.
+
+        Returns:
+            list[str]: Die abgelaufenen Schlüssel; sie sind danach nicht mehr eingeplant.
+
+        """
+        expired: list[str] = []
+        target = math.floor(now / self.tick)
+        slots = self._slots
+        while self._tick < target:
+            self._tick += 1
+            # Höhere Ebenen beim Umlauf der darunterliegenden eine Ebene tiefer legen
+            span = slots
+            for level in range(1, len(self._wheels)):
+                if self._tick % span:
+                    break
+                self._cascade(self._wheels[level][(self._tick // span) % slots])
+                span *= slots
+            bucket = self._wheels[0][self._tick % slots]
+            if not bucket:
+                continue
+            due = list(bucket)
+            bucket.clear()
+            for key in due:
+                del self._buckets[key]
+                if self._deadlines[key] <= self._tick:
+                    del self._deadlines[key]
+                    expired.append(key)
+                else:
+                    self._place(key)
+        return expired
+
+    def _cascade(self, bucket: set[str]) -> None:
+        keys = list(bucket)
+        bucket.clear()
+        for key in keys:
+            self._place(key)
+
+    def _place(self, key: str) -> None:
+        """Legt ``key`` in das Fach seiner Ablaufzeit auf der passenden Ebene."""
+        old = self._buckets.get(key)
+        if old is not None:
+            old.discard(key)
+        deadline = self._deadlines[key]
+        delta = deadline - self._tick
+        span = 1
+        for level, wheel in enumerate(self._wheels):
+            if delta < span * self._slots or level == len(self._wheels) - 1:
+                # Jenseits der obersten Ebene wird am Umlauf neu eingeordnet
+                position = min(deadline, self._tick + span * self._slots - 1) // span
+                bucket = wheel[position % self._slots]
+                break
+            span *= self._slots
+        bucket.add(key)
+        self._buckets[key] = bucket
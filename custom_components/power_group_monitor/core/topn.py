@@ -0,0 +1,122 @@
+"""Indizierter Max-Heap für die größten Verbraucher einer Gruppe.
+
+Der ``IndexedMaxHeap`` hält den Beitrag jedes Mitglieds einer Gruppe und
+kennt die Position jedes Mitglieds im Heap. Ändert sich ein Mitglied, wird
+nur sein Eintrag nach oben oder unten verschoben (O(log n)), statt die
+Mitglieder bei jedem Ereignis zu sortieren. Die größten ``n`` Einträge werden
+erst beim Schreiben des Sensors mit einer kleinen Suche ab der Wurzel
+gelesen (O(n log n)), unabhängig von der Anzahl der Mitglieder.
+
+Classes:
+    IndexedMaxHeap: Max-Heap mit Positionsindex je Schlüssel.
+"""
+
+import heapq
+
+
+class IndexedMaxHeap:
+    """Max-Heap mit Positionsindex je Schlüssel."""
+
+    __slots__ = ("_heap", "_index")
+
+    def __init__(self) -> None:
+        """Initialisiert einen leeren Heap."""
+        self._heap: list[tuple[float, str]] = []
+        self._index: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def get(self, key: str) -> float | None:
+        """Liefert den Wert eines Schlüssels oder ``None``."""
+        position = self._index.get(key)
+        return None if position is None else self._heap[position][0]
+
+    def rebuild(self, items: dict[str, float]) -> None:
+        """Baut den Heap in O(n) aus allen Einträgen neu auf."""
+        self._heap = [(value, key) for key, value in items.items()]
+        self._index = {key: position for position, (_, key) in enumerate(self._heap)}
+        for position in reversed(range(len(self._heap) // 2)):
+            self._sift_down(position)
+
+    def set(self, key: str, value: float) -> None:
+        """Setzt den Wert eines Schlüssels und stellt die Heap-Ordnung wieder her."""
+        position = self._index.get(key)
+        if position is None:
+            self._heap.append((value, key))
+            self._index[key] = len(self._heap) - 1
+            self._sift_up(len(self._heap) - 1)
+            return
+        old = self._heap[position][0]
+        if value == old:
+            return
+        self._heap[position] = (value, key)
+        if value > old:
+            self._sift_up(position)
+        else:
+            self._sift_down(position)
+
+    def remove(self, key: str) -> None:
+        """Entfernt einen Schlüssel, falls vorhanden."""
+        position = self._index.pop(key, None)
+        if position is None:
+            return
+        last = self._heap.pop()
+        if position == len(self._heap):
+            return
+        self._heap[position] = last
+        self._index[last[1]] = position
+        self._sift_up(position)
+        self._sift_down(self._index[last[1]])
+
+    def top(self, count: int) -> list[tuple[str, float]]:
+        """Liefert die ``count`` größten Einträge absteigend als ``(Schlüssel, Wert)``.
+
+        Durchsucht nur die Kandidaten ab der Wurzel; der Heap bleibt unverändert.
+        """
+        result: list[tuple[str, float]] = []
+        if not self._heap or count <= 0:
+            return result
+        heap = self._heap
+        candidates = [(-heap[0][0], 0)]
+        while candidates and len(result) < count:
+            negative, position = heapq.heappop(candidates)
+            result.append((heap[position][1], -negative))
+            for child in (2 * position + 1, 2 * position + 2):
+                if child < len(heap):
+                    heapq.heappush(candidates, (-heap[child][0], child))
+        return result
+
+    def _sift_up(self, position: int) -> None:
+        heap, index = self._heap, self._index
+        item = heap[position]
+        while position > 0:
+            parent = (position - 1) // 2
+            if heap[parent][0] >= item[0]:
+                break
+            heap[position] = heap[parent]
+            index[heap[position][1]] = position
+            position = parent
+        heap[position] = item
+        index[item[1]] = position
+
+    def _sift_down(self, position: int) -> None:
+        heap, index = self._heap, self._index
+        size = len(heap)
+        item = heap[position]
+        while True:
+            child = 2 * position + 1
+            if child >= size:
+                break
+            if child + 1 < size and heap[child + 1][0] > heap[child][0]:
+                child += 1
+            if heap[child][0] <= item[0]:
+                break
+            heap[position] = heap[child]
+            index[heap[position][1]] = position
+            position = child
+        heap[position] = item
+        index[item[1]] = position
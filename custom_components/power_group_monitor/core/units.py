@@ -0,0 +1,163 @@
+"""Zwischenspeicher für Einheiten und Umrechnungsfaktoren der Quell-Entitäten.
+
+Für jede Quell-Entität wird der Umrechnungsfaktor nach Watt bzw. Kilowattstunden
+einmalig über den ``PowerConverter`` bzw. ``EnergyConverter`` von Home Assistant
+bestimmt und nur neu berechnet, wenn sich die Einheit tatsächlich ändert. Damit
+werden alle Leistungs- und Energieeinheiten von Home Assistant (z.B. mW, W, kW,
+BTU/h, Wh, kWh, MWh) ohne zusätzliche Kosten pro Ereignis unterstützt.
+
+Classes:
+    UnitCache: Liefert Leistungswerte in Watt und Zählerstände in kWh.
+"""
+
+import math
+
+from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT, UnitOfEnergy, UnitOfPower
+from homeassistant.core import State
+from homeassistant.util.unit_conversion import EnergyConverter, PowerConverter
+
+# Art einer Quell-Entität
+KIND_POWER = "power"
+KIND_ENERGY = "energy"
+
+# Ein Rückgang des Zählers unter diesen Anteil des letzten Stands gilt als
+# Zählerrücksetzung bzw. Zählerwechsel, kleinere Rückgänge als Messrauschen.
+METER_RESET_RATIO = 0.9
+
+
+def watt_factor(unit: str | None) -> float | None:
+    """Bestimmt den Faktor, mit dem ein Wert in ``unit`` nach Watt umgerechnet wird.
+
+    Args:
+        unit (str | None): Die Einheit der Quell-Entität.
+
+    Returns:
+        float | None: Der Faktor oder ``None``, wenn es keine Leistungseinheit ist.
+
+    """
+    if unit not in PowerConverter.VALID_UNITS:
+        return None
+    return PowerConverter.converter_factory(unit, UnitOfPower.WATT)(1.0)
+
+
+def kwh_factor(unit: str | None) -> float | None:
+    """Bestimmt den Faktor, mit dem ein Wert in ``unit`` nach kWh umgerechnet wird.
+
+    Args:
+        unit (str | None): Die Einheit der Quell-Entität.
+
+    Returns:
+        float | None: Der Faktor oder ``None``, wenn es keine Energieeinheit ist.
+
+    """
+    if unit not in EnergyConverter.VALID_UNITS:
+        return None
+    return EnergyConverter.converter_factory(unit, UnitOfEnergy.KILO_WATT_HOUR)(1.0)
+
+
+def unit_kind(unit: str | None) -> tuple[str | None, float | None]:
+    """Bestimmt Art und Umrechnungsfaktor einer Einheit.
+
+    Returns:
+        tuple[str | None, float | None]: ``KIND_POWER`` mit Faktor nach Watt,
+        ``KIND_ENERGY`` mit Faktor nach kWh oder ``(None, None)``.
+
+    """
+    if (factor := watt_factor(unit)) is not None:
+        return KIND_POWER, factor
+    if (factor := kwh_factor(unit)) is not None:
+        return KIND_ENERGY, factor
+    return None, None
+
+
+def counter_delta(previous: float, value: float) -> float | None:
+    """Berechnet den Zuwachs eines Energiezählers.
+
+    Args:
+        previous (float): Letzter gezählter Stand.
+        value (float): Neuer Stand.
+
+    Returns:
+        float | None: Der Zuwachs; nach einer Rücksetzung oder einem
+        Zählerwechsel der neue Stand. ``None`` bei einem kleinen Rückgang, der
+        ignoriert wird, ohne den letzten Stand zu ersetzen.
+
+    """
+    if value >= previous:
+        return value - previous
+    if value < previous * METER_RESET_RATIO:
+        return value
+    return None
+
+
+class UnitCache:
+    """Liefert Leistungswerte in Watt und Zählerstände in kWh.
+
+    Home Assistant verwendet das Attribut-Objekt eines Zustands weiter, solange
+    sich die Attribute nicht ändern. Solange das Objekt identisch ist, wird
+    daher nicht einmal die Einheit erneut gelesen.
+    """
+
+    def __init__(self) -> None:
+        """Initialisiert einen leeren Zwischenspeicher."""
+        # entity_id -> (Attribut-Objekt, Einheit, Art, Faktor)
+        self._entries: dict[str, tuple[object, str | None, str | None, float | None]] = {}
+
+    def read(self, entity_id: str, state: State | None) -> tuple[str, float] | None:
+        """Liest den Wert eines Zustands in Watt bzw. kWh aus.
+
+        Args:
+            entity_id (str): Die Quell-Entität.
+            state (State | None): Der aktuelle Zustand der Quell-Entität.
+
+        Returns:
+            tuple[str, float] | None: Art (``KIND_POWER`` oder ``KIND_ENERGY``)
+            und Wert oder ``None`` ohne gültigen Wert.
+
+        """
+        if state is None:
+            return None
+
+        attributes = state.attributes
+        cached = self._entries.get(entity_id)
+        if cached is None or cached[0] is not attributes:
+            unit = attributes.get(ATTR_UNIT_OF_MEASUREMENT)
+            if cached is None or cached[1] != unit:
+                cached = (attributes, unit, *unit_kind(unit))
+            else:
+                cached = (attributes, unit, cached[2], cached[3])
+            self._entries[entity_id] = cached
+
+        kind, factor = cached[2], cached[3]
+        if kind is None:
+            return None
+
+        try:
+            value = float(state.state) * factor
+        except ValueError:
+            return None
+        # ``nan`` und ``inf`` ließen sich aus den inkrementellen Summen nicht
+        # mehr herausrechnen und gelten daher wie ``unavailable``
+        if not math.isfinite(value):
+            return None
+        return kind, value
+
+    def to_watts(self, entity_id: str, state: State | None) -> float | None:
+        """Liest den Leistungswert eines Zustands in Watt aus.
+
+        Args:
+            entity_id (str): Die Quell-Entität.
+            state (State | None): Der aktuelle Zustand der Quell-Entität.
+
+        Returns:
+            float | None: Die Leistung in Watt oder ``None`` ohne gültigen Wert.
+
+        """
+        reading = self.read(entity_id, state)
+        if reading is None or reading[0] != KIND_POWER:
+            return None
+        return reading[1]
+
+    def discard(self, entity_id: str) -> None:
+        """Entfernt den Eintrag einer Quell-Entität."""
+        self._entries.pop(entity_id, None)
@@ -0,0 +1,340 @@
+"""Kompakter Messwertspeicher mit mehreren gleitenden Zeitfenstern.
+
+Ein einziger, array-basierter Ringpuffer pro Gruppe bedient beliebig viele
+Zeitfenster (z.B. 1 min, 5 min, 15 min, 1 h, 24 h). Jedes Fenster führt
+laufende, zeitgewichtete Summen für Mittelwert und Standardabweichung sowie
+monotone Deques für Minimum und Maximum. Ein zusätzliches Fenster kostet damit
+nur Speicher für die Deques, aber keine Datenbankabfragen.
+
+Die Werte werden als Treppenfunktion interpretiert. Um den Speicher zu
+begrenzen, werden Messwerte zu Segmenten mit fester Auflösung zusammengefasst.
+Pro Segment werden der zeitgewichtete Mittelwert, der Mittelwert der Quadrate
+sowie das exakte Minimum und Maximum gespeichert.
+
+Classes:
+    WindowStats: Kennzahlen eines Zeitfensters.
+    SampleStore: Ringpuffer mit mehreren gleitenden Zeitfenstern.
+"""
+
+from array import array
+import base64
+from collections import deque
+from collections.abc import Iterable
+import math
+from typing import NamedTuple
+
+# Maximale Anzahl Segmente, die das größte Fenster umfassen soll
+MAX_SEGMENTS = 8640
+
+
+class WindowStats(NamedTuple):
+    """Kennzahlen eines Zeitfensters."""
+
+    mean: float
+    minimum: float
+    maximum: float
+    stddev: float
+    maximum_time: float
+
+
+class _Window:
+    """Laufende Summen und monotone Deques eines Zeitfensters."""
+
+    __slots__ = ("length", "head", "area", "sq_area", "max_queue", "min_queue")
+
+    def __init__(self, length: float, head: int) -> None:
+        self.length = length
+        self.head = head
+        self.area = 0.0
+        self.sq_area = 0.0
+        self.max_queue: deque[int] = deque()
+        self.min_queue: deque[int] = deque()
+
+
+# pylint: disable=too-many-instance-attributes
+class SampleStore:
+    """Ringpuffer aus Segmenten mit mehreren gleitenden Zeitfenstern."""
+
+    def __init__(self, windows: Iterable[float], capacity: int = 256) -> None:
+        """Initialisiert den Speicher.
+
+        Args:
+            windows (Iterable[float]): Längen der Zeitfenster in Sekunden.
+            capacity (int): Anfangskapazität des Ringpuffers (Zweierpotenz).
+
+        """
+        self._windows = {float(length): _Window(float(length), 0) for length in windows}
+        longest = max(self._windows, default=0.0)
+        self.resolution = max(1.0, longest / MAX_SEGMENTS)
+
+        self._capacity = capacity
+        self._time = array("d", bytes(8 * capacity))
+        self._mean = array("d", bytes(8 * capacity))
+        self._sq_mean = array("d", bytes(8 * capacity))
+        self._min = array("d", bytes(8 * capacity))
+        self._max = array("d", bytes(8 * capacity))
+        # Absolute Indizes des ältesten und hinter dem neuesten Segment
+        self._start = 0
+        self._end = 0
+
+        # Offenes Segment, das noch Messwerte aufnimmt
+        self._open_start: float | None = None
+        self._open_area = 0.0
+        self._open_sq_area = 0.0
+        self._open_min = math.inf
+        self._open_max = -math.inf
+        self._last_time = 0.0
+        self._last_value = 0.0
+
+    @property
+    def windows(self) -> list[float]:
+        """Liefert die Längen der konfigurierten Zeitfenster in Sekunden."""
+        return list(self._windows)
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def add(self, timestamp: float, value: float) -> None:
+        """Übernimmt einen neuen Messwert.
+
+        Args:
+            timestamp (float): Zeitpunkt des Messwerts (Unix-Zeit in Sekunden).
+            value (float): Messwert, z.B. Leistung in Watt.
+
+        """
+        if self._open_start is None:
+            self._open_start = self._last_time = timestamp
+            self._last_value = value
+            return
+
+        # Ein Ereignis kann geringfügig vor dem letzten Abruf (``stats``) liegen;
+        # es gilt dann ab diesem Zeitpunkt, statt verworfen zu werden
+        timestamp = max(timestamp, self._last_time)
+        self._advance(timestamp)
+        self._last_value = value
+        if timestamp - self._open_start >= self.resolution:
+            self._close_segment(timestamp)
+
+    def stats(self, length: float, now: float) -> WindowStats | None:
+        """Liefert die Kennzahlen eines Zeitfensters.
+
+        Args:
+            length (float): Länge des Zeitfensters in Sekunden.
+            now (float): Aktueller Zeitpunkt (Unix-Zeit in Sekunden).
+
+        Returns:
+            WindowStats | None: Die Kennzahlen oder ``None`` ohne Messwerte.
+
+        """
+        window = self._windows[float(length)]
+        if self._open_start is None:
+            return None
+
+        if now > self._last_time:
+            self._advance(now)
+            if now - self._open_start >= self.resolution:
+                self._close_segment(now)
+
+        begin = now - window.length
+        self._evict(window, begin)
+
+        area = window.area + self._open_area
+        sq_area = window.sq_area + self._open_sq_area
+        minimum, maximum = self._open_min, self._open_max
+        maximum_time = self._last_time
+        first_time = self._open_start
+
+        if window.head < self._end:
+            head = window.head & (self._capacity - 1)
+            first_time = self._time[head]
+            if first_time < begin:
+                area -= self._mean[head] * (begin - first_time)
+                sq_area -= self._sq_mean[head] * (begin - first_time)
+            min_index = window.min_queue[0] & (self._capacity - 1)
+            max_index = window.max_queue[0] & (self._capacity - 1)
+            minimum = min(minimum, self._min[min_index])
+            if self._max[max_index] >= maximum:
+                maximum = self._max[max_index]
+                maximum_time = self._time[max_index]
+
+        span = now - max(begin, first_time)
+        if span <= 0 or minimum > maximum:
+            return WindowStats(
+                self._last_value, self._last_value, self._last_value, 0.0, self._last_time
+            )
+
+        mean = area / span
+        variance = max(sq_area / span - mean * mean, 0.0)
+        return WindowStats(mean, minimum, maximum, math.sqrt(variance), maximum_time)
+
+    def as_dict(self) -> dict:
+        """Liefert Segmente und offenes Segment für einen Snapshot.
+
+        Die Segmente werden als Bytes der ``array``-Puffer (Base64) abgelegt,
+        sodass auch 24-Stunden-Fenster kompakt und ohne Formatierung jedes
+        einzelnen Werts gespeichert werden.
+        """
+        mask = self._capacity - 1
+        columns = {}
+        for name in ("_time", "_mean", "_sq_mean", "_min", "_max"):
+            column = getattr(self, name)
+            values = array("d", (column[index & mask] for index in range(self._start, self._end)))
+            columns[name.lstrip("_")] = base64.b64encode(values.tobytes()).decode("ascii")
+        return {
+            "segments": columns,
+            "open": None if self._open_start is None else [
+                self._open_start,
+                self._open_area,
+                self._open_sq_area,
+                None if math.isinf(self._open_min) else self._open_min,
+                None if math.isinf(self._open_max) else self._open_max,
+                self._last_time,
+                self._last_value,
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, windows: Iterable[float], data: dict) -> "SampleStore":
+        """Erstellt einen Speicher aus einem Snapshot.
+
+        Args:
+            windows (Iterable[float]): Längen der aktuell konfigurierten Zeitfenster.
+            data (dict): Der mit ``as_dict`` gespeicherte Zustand.
+
+        """
+        store = cls(windows)
+        if data.get("open") is None:
+            return store
+
+        columns = {}
+        for name, encoded in data.get("segments", {}).items():
+            column = array("d")
+            column.frombytes(base64.b64decode(encoded))
+            columns[name] = column
+
+        (open_start, open_area, open_sq_area, open_min, open_max,
+         last_time, last_value) = data["open"]
+        times = columns.get("time", array("d"))
+        for index, start in enumerate(times):
+            end = times[index + 1] if index + 1 < len(times) else open_start
+            store._push(
+                start,
+                columns["mean"][index],
+                columns["sq_mean"][index],
+                columns["min"][index],
+                columns["max"][index],
+                end - start,
+            )
+
+        store._open_start = open_start
+        store._open_area = open_area
+        store._open_sq_area = open_sq_area
+        store._open_min = math.inf if open_min is None else open_min
+        store._open_max = -math.inf if open_max is None else open_max
+        store._last_time = last_time
+        store._last_value = last_value
+
+        for window in store._windows.values():
+            store._evict(window, last_time - window.length)
+        store._start = min((window.head for window in store._windows.values()), default=store._end)
+        return store
+
+    def _advance(self, timestamp: float) -> None:
+        """Schreibt das offene Segment mit dem gehaltenen Wert bis ``timestamp`` fort."""
+        elapsed = timestamp - self._last_time
+        value = self._last_value
+        if elapsed > 0:
+            self._open_area += value * elapsed
+            self._open_sq_area += value * value * elapsed
+        self._open_min = min(self._open_min, value)
+        self._open_max = max(self._open_max, value)
+        self._last_time = timestamp
+
+    def _close_segment(self, timestamp: float) -> None:
+        """Schließt das offene Segment ab und übernimmt es in alle Fenster."""
+        duration = timestamp - self._open_start
+        self._push(
+            self._open_start,
+            self._open_area / duration,
+            self._open_sq_area / duration,
+            self._open_min,
+            self._open_max,
+            duration,
+        )
+        # Erst das neue offene Segment beginnen: ``_evict`` verwendet seinen
+        # Beginn als Ende des gerade abgeschlossenen Segments
+        self._open_start = timestamp
+        self._open_area = self._open_sq_area = 0.0
+        self._open_min, self._open_max = math.inf, -math.inf
+
+        for window in self._windows.values():
+            self._evict(window, timestamp - window.length)
+
+        self._start = min((window.head for window in self._windows.values()), default=self._end)
+
+    # pylint: disable=too-many-arguments, too-many-positional-arguments
+    def _push(
+        self, start: float, mean: float, sq_mean: float, minimum: float, maximum: float,
+        duration: float,
+    ) -> None:
+        """Hängt ein abgeschlossenes Segment an und übernimmt es in alle Fenster."""
+        if self._end - self._start == self._capacity:
+            self._grow()
+
+        index = self._end
+        mask = self._capacity - 1
+        pos = index & mask
+        self._time[pos] = start
+        self._mean[pos] = mean
+        self._sq_mean[pos] = sq_mean
+        self._min[pos] = minimum
+        self._max[pos] = maximum
+        self._end += 1
+
+        for window in self._windows.values():
+            window.area += mean * duration
+            window.sq_area += sq_mean * duration
+            queue = window.max_queue
+            while queue and self._max[queue[-1] & mask] <= maximum:
+                queue.pop()
+            queue.append(index)
+            queue = window.min_queue
+            while queue and self._min[queue[-1] & mask] >= minimum:
+                queue.pop()
+            queue.append(index)
+
+    def _evict(self, window: _Window, begin: float) -> None:
+        """Entfernt Segmente, die vollständig vor dem Fensterbeginn liegen."""
+        mask = self._capacity - 1
+        while window.head < self._end:
+            pos = window.head & mask
+            following = window.head + 1
+            end_time = self._time[following & mask] if following < self._end else self._open_start
+            if end_time > begin:
+                break
+            duration = end_time - self._time[pos]
+            window.area -= self._mean[pos] * duration
+            window.sq_area -= self._sq_mean[pos] * duration
+            window.head = following
+
+        while window.max_queue and window.max_queue[0] < window.head:
+            window.max_queue.popleft()
+        while window.min_queue and window.min_queue[0] < window.head:
+            window.min_queue.popleft()
+
+        if window.head == self._end:
+            # Keine Segmente mehr im Fenster: Rundungsfehler verwerfen
+            window.area = window.sq_area = 0.0
+
+    def _grow(self) -> None:
+        """Verdoppelt die Kapazität des Ringpuffers."""
+        old_mask = self._capacity - 1
+        capacity = self._capacity * 2
+        new_mask = capacity - 1
+        for name in ("_time", "_mean", "_sq_mean", "_min", "_max"):
+            old = getattr(self, name)
+            new = array("d", bytes(8 * capacity))
+            for index in range(self._start, self._end):
+                new[index & new_mask] = old[index & old_mask]
+            setattr(self, name, new)
+        self._capacity = capacity
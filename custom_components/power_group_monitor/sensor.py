@@ -16,6 +16,7 @@ import logging
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .sensors.power_sensor import PowerSensor
@@ -29,20 +30,67 @@ from .sensors.energy_today_sensor import EnergyTodaySensor
 from .sensors.energy_total_sensor import EnergyTotalSensor
 from .sensors.energy_total_all_sensor import EnergyTotalAllSensor
 from .sensors.energy_today_all_sensor import EnergyTodayAllSensor
+from .sensors.energy_period_sensor import EnergyPeriodSensor
+from .sensors.cost_sensor import (
+    CostSensor,
+    CostTodayAllSensor,
+    CostTodaySensor,
+    CostTotalAllSensor,
+)
 
 from .sensors.average_power_sensor import AveragePowerSensor
 from .sensors.average_power_all_sensor import AveragePowerAllSensor
+from .sensors.power_statistics_sensor import PowerStatisticsSensor
+from .sensors.power_rolling_peak_sensor import PowerRollingPeakSensor
+from .sensors.power_demand_sensor import PowerDemandSensor, PowerDemandTotalSensor
+from .sensors.power_quantile_sensor import PowerQuantileSensor, PowerQuantileTotalSensor
+from .sensors.stale_members_sensor import StaleMembersSensor
 
+from .core.engine import PowerGroupEngine
 from .const import (
-    CONF_GROUP_NAME,
+    DATA_ADD_ENTITIES,
+    DATA_ENGINE,
+    DATA_GROUP_ENTITIES,
+    DATA_GROUP_STORE,
+    DATA_TOTAL_ENTITIES,
+    DOMAIN,
+    CONF_GROUP_AREAS,
+    CONF_GROUP_BACKFILL,
+    CONF_GROUP_BACKFILL_STATISTICS,
+    CONF_GROUP_CHILDREN,
+    CONF_GROUP_DEVICE_CLASSES,
     CONF_GROUP_ENTITIES,
+    CONF_GROUP_FLOORS,
+    CONF_GROUP_LABELS,
+    CONF_GROUP_NAME,
+    CONF_GROUP_PATTERN,
     CONF_GROUP_STANDBY,
     CONF_GROUP_ID,
-    CONF_GROUPS,
+    CONF_PEAK_WINDOWS,
+    CONF_QUANTILES,
+    CONF_STATISTICS_WINDOWS,
+    DEFAULT_PEAK_WINDOWS,
+    DEFAULT_QUANTILES,
+    DEFAULT_STATISTICS_WINDOWS,
+    PERIOD_DAY,
+    PERIOD_MONTH,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+# Felder einer Gruppe, die nur die Engine betreffen und keine neuen Sensoren erfordern
+ENGINE_FIELDS = (
+    CONF_GROUP_ENTITIES,
+    CONF_GROUP_CHILDREN,
+    CONF_GROUP_AREAS,
+    CONF_GROUP_FLOORS,
+    CONF_GROUP_LABELS,
+    CONF_GROUP_DEVICE_CLASSES,
+    CONF_GROUP_PATTERN,
+)
+# Felder ohne Einfluss auf Engine und Sensoren
+IGNORED_FIELDS = (CONF_GROUP_BACKFILL, CONF_GROUP_BACKFILL_STATISTICS)
+
 
 async def async_setup_entry(  # pylint: disable=too-many-locals, too-many-statements, unused-argument
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
@@ -59,94 +107,270 @@ async def async_setup_entry(  # pylint: disable=too-many-locals, too-many-statem
         None
 
     """
-    # groups = data.get(CONF_GROUPS, [])
-    _LOGGER.warning(
-        "PowerGroupMonitor: entry_id=%s data=%s", entry.entry_id, entry.data
-    )
-    groups = entry.data.get(CONF_GROUPS, []) or []
-    for i, g in enumerate(groups):
-        _LOGGER.warning(
-            "PowerGroupMonitor: group[%s] type=%s keys=%s value=%s",
-            i,
-            type(g),
-            list(g.keys()) if isinstance(g, dict) else None,
-            g,
-        )
+    runtime = hass.data[DOMAIN][entry.entry_id]
+    engine = runtime[DATA_ENGINE]
+    groups = runtime[DATA_GROUP_STORE].groups
 
+    group_entities: dict[str, list] = {}
     entity_list = []
-    energy_total_list = []
-    energy_today_list = []
-    power_average_list = []
+    for group in groups:
+        entities = _create_group_entities(entry, engine, group)
+        group_entities[group[CONF_GROUP_ID]] = entities
+        entity_list.extend(entities)
 
-    total_standby_threshold = float(0)
+    async_add_entities(entity_list, update_before_add=True)
 
-    for group in groups:
-        group_id = group[CONF_GROUP_ID]
-        group_name = group[CONF_GROUP_NAME]
-        standby_threshold = group[CONF_GROUP_STANDBY]
-        total_standby_threshold += float(standby_threshold)
-        entities = group[CONF_GROUP_ENTITIES]
-
-        power_sensor = PowerSensor(entry, group_id, group_name, entities)
-        power_peak_sensor = PowerPeakSensor(entry, group_id, group_name, entities)
-
-        standby_sensor = PowerStandbySensor(
-            entry,
-            group_id,
-            group_name,
-            power_sensor,  # ← auf den dynamischen ID-Zugriff achten
-            standby_threshold=float(standby_threshold),  # konfigurierbarer Wert?
-        )
+    # Add - Gesamt über alle Gruppen
+    total_entities = _create_total_entities(entry, engine, groups, group_entities)
+    percentiles = _percentiles(entry)
 
-        # Durchschnittswert
-        average_power = AveragePowerSensor(entry, group_name, power_sensor)
+    async_add_entities(
+        [
+            *total_entities,
+            PowerPeakTotalSensor(entry, engine),
+            PowerDemandTotalSensor(entry, engine, PERIOD_DAY),
+            PowerDemandTotalSensor(entry, engine, PERIOD_MONTH),
+            *(
+                PowerQuantileTotalSensor(entry, engine, percentile)
+                for percentile in percentiles
+            ),
+        ]
+    )
 
-        # Energie pro Gruppe heute
-        energie_heute_gruppe = EnergyTodaySensor(
-            hass, entry, group_id, group_name, power_sensor
-        )
-        # Energie pro Gruppe gesamt
-        energie_gesamt_gruppe = EnergyTotalSensor(
-            hass, entry, group_id, group_name, power_sensor
-        )
+    if engine.energy.has_tariff:
+        async_add_entities([CostTodayAllSensor(entry, engine), CostTotalAllSensor(entry, engine)])
+
+    # Für Gruppenänderungen zur Laufzeit (``async_apply_group_changes``)
+    runtime[DATA_ADD_ENTITIES] = async_add_entities
+    runtime[DATA_GROUP_ENTITIES] = group_entities
+    runtime[DATA_TOTAL_ENTITIES] = total_entities
+
+
+def _percentiles(entry: ConfigEntry) -> list[int]:
+    return sorted(
+        int(percentile) for percentile in entry.data.get(CONF_QUANTILES, DEFAULT_QUANTILES)
+    )
+
+
+def _create_group_entities(entry: ConfigEntry, engine: PowerGroupEngine, group: dict) -> list:
+    """Erstellt alle Sensoren einer Gruppe."""
+    group_id = group[CONF_GROUP_ID]
+    group_name = group[CONF_GROUP_NAME]
+    standby_threshold = group[CONF_GROUP_STANDBY]
+
+    statistics_windows = sorted(
+        int(minutes) * 60
+        for minutes in entry.data.get(CONF_STATISTICS_WINDOWS, DEFAULT_STATISTICS_WINDOWS)
+    )
+    peak_windows = sorted(
+        int(minutes) * 60
+        for minutes in entry.data.get(CONF_PEAK_WINDOWS, DEFAULT_PEAK_WINDOWS)
+    )
+
+    power_sensor = PowerSensor(entry, engine, group_id, group_name)
+    power_peak_sensor = PowerPeakSensor(entry, engine, group_id, group_name)
+
+    standby_sensor = PowerStandbySensor(
+        entry,
+        group_id,
+        group_name,
+        power_sensor,  # ← auf den dynamischen ID-Zugriff achten
+        standby_threshold=float(standby_threshold),  # konfigurierbarer Wert?
+    )
+
+    # Durchschnittswert
+    average_power = AveragePowerSensor(
+        entry, engine, group_id, group_name, power_sensor
+    )
+
+    # Energie pro Gruppe heute
+    energie_heute_gruppe = EnergyTodaySensor(entry, engine, group_id, group_name)
+    # Energie pro Gruppe gesamt
+    energie_gesamt_gruppe = EnergyTotalSensor(entry, engine, group_id, group_name)
+
+    entity_list = [
+        power_sensor,
+        power_peak_sensor,
+        standby_sensor,
+        energie_heute_gruppe,
+        energie_gesamt_gruppe,
+        average_power,
+    ]
+
+    # Energie je Woche, Monat, Jahr bzw. Abrechnungsperiode
+    entity_list.extend(
+        EnergyPeriodSensor(entry, engine, group_id, group_name, period)
+        for period in engine.energy.periods
+    )
 
+    # Kosten nach Tarif
+    if engine.energy.has_tariff:
         entity_list.extend(
             [
-                power_sensor,
-                power_peak_sensor,
-                standby_sensor,
-                energie_heute_gruppe,
-                energie_gesamt_gruppe,
-                average_power,
+                CostTodaySensor(entry, engine, group_id, group_name),
+                CostSensor(entry, engine, group_id, group_name),
             ]
         )
 
-        energy_total_list.extend([energie_gesamt_gruppe])
-        energy_today_list.extend([energie_heute_gruppe])
-        power_average_list.extend([average_power])
+    # Statistiken über die konfigurierten Zeitfenster
+    entity_list.extend(
+        PowerStatisticsSensor(entry, engine, group_id, group_name, window)
+        for window in statistics_windows
+    )
 
-    async_add_entities(entity_list, update_before_add=True)
+    # Spitzenwerte über gleitende Zeitfenster und nach Abrechnung (15 Min.)
+    entity_list.extend(
+        PowerRollingPeakSensor(entry, engine, group_id, group_name, window)
+        for window in peak_windows
+    )
+    entity_list.extend(
+        PowerDemandSensor(entry, engine, group_id, group_name, period)
+        for period in (PERIOD_DAY, PERIOD_MONTH)
+    )
 
-    # Add - Gesamt über alle Gruppen
-    power_total_sensor = PowerTotalSensor(entry)
-    power_peak_total_sensor = PowerPeakTotalSensor(entry)
+    # Perzentile der Leistung (Tag und gleitende Woche)
+    entity_list.extend(
+        PowerQuantileSensor(entry, engine, group_id, group_name, percentile)
+        for percentile in _percentiles(entry)
+    )
+
+    # Veraltete Mitglieder, falls ein maximales Alter gilt
+    if engine.members.has_max_age(group_id):
+        entity_list.append(StaleMembersSensor(entry, engine, group_id, group_name))
+
+    return entity_list
 
-    # pylint: disable=line-too-long
+
+def _root_standby(groups: list[dict], root_groups) -> float:
+    """Summiert die Standby-Schwellen der obersten Gruppen."""
+    return sum(
+        float(group[CONF_GROUP_STANDBY]) for group in groups if group[CONF_GROUP_ID] in root_groups
+    )
+
+
+def _create_total_entities(
+    entry: ConfigEntry, engine: PowerGroupEngine, groups: list[dict], group_entities: dict
+) -> list:
+    """Erstellt die Gesamtsensoren, die von den obersten Gruppen abhängen."""
+    # Untergruppen sind bereits in ihren Eltern enthalten
+    roots = [
+        group_entities[group_id] for group_id in engine.members.roots if group_id in group_entities
+    ]
+
+    power_total_sensor = PowerTotalSensor(entry, engine)
     power_standby_total_sensor = PowerStandbyTotalSensor(
-        entry, power_total_sensor, total_standby_threshold
+        entry, power_total_sensor, _root_standby(groups, engine.members.roots)
     )
 
-    all_energy_total = EnergyTotalAllSensor(entry, energy_total_list)
-    all_energy_today = EnergyTodayAllSensor(entry, energy_today_list)
-    all_power_average = AveragePowerAllSensor(entry, power_average_list)
+    return [
+        power_total_sensor,
+        power_standby_total_sensor,
+        EnergyTotalAllSensor(entry, engine, _entities_of(roots, EnergyTotalSensor)),
+        EnergyTodayAllSensor(entry, engine, _entities_of(roots, EnergyTodaySensor)),
+        AveragePowerAllSensor(entry, engine),
+    ]
 
-    async_add_entities(
-        [
-            power_total_sensor,
-            power_peak_total_sensor,
-            power_standby_total_sensor,
-            all_energy_total,
-            all_energy_today,
-            all_power_average
-        ]
+
+def _entities_of(entity_lists, cls) -> list:
+    """Liefert je Gruppe die Entität genau der Klasse ``cls``, ohne Unterklassen."""
+    return [
+        entity
+        for entities in entity_lists
+        for entity in entities
+        if type(entity) is cls  # pylint: disable=unidiomatic-typecheck
+    ]
+
+
+async def async_apply_group_changes(
+    hass: HomeAssistant, entry: ConfigEntry, old_groups: list[dict], groups: list[dict]
+) -> None:
+    """Übernimmt geänderte Gruppen, ohne den Eintrag neu zu laden.
+
+    Die Gruppen werden über ``CONF_GROUP_ID`` verglichen. Die Engine übernimmt
+    Mitglieder, Untergruppen und Einstellungen, ohne die übrigen Gruppen zu
+    unterbrechen. Sensoren werden nur für hinzugefügte, entfernte und Gruppen
+    mit geänderten Sensor-Einstellungen (z.B. Name oder Standby) erzeugt bzw.
+    entfernt. Die Gesamtsensoren werden nur neu erzeugt, wenn sich die
+    obersten Gruppen, ihre Standby-Schwellen oder das Totband geändert haben.
+
+    Args:
+        hass (HomeAssistant): Die Home Assistant Instanz.
+        entry (ConfigEntry): Der Konfigurationseintrag.
+        old_groups (list[dict]): Die bisher übernommenen Gruppen.
+        groups (list[dict]): Die neuen Gruppen aus dem Gruppen-Store.
+
+    """
+    runtime = hass.data[DOMAIN][entry.entry_id]
+    engine: PowerGroupEngine = runtime[DATA_ENGINE]
+    group_entities: dict[str, list] = runtime[DATA_GROUP_ENTITIES]
+    add_entities: AddEntitiesCallback = runtime[DATA_ADD_ENTITIES]
+
+    if _without(old_groups, IGNORED_FIELDS) == _without(groups, IGNORED_FIELDS):
+        return
+
+    old_roots = engine.members.roots
+    old_standby = _root_standby(old_groups, old_roots)
+    old_deadband = engine.members.deadband(None)
+    engine.async_update_groups(groups)
+
+    # Gruppen, deren Sensoren neu erzeugt werden müssen
+    old_by_id = {group[CONF_GROUP_ID]: group for group in old_groups}
+    sensor_fields = (*IGNORED_FIELDS, *ENGINE_FIELDS)
+    changed = {
+        group[CONF_GROUP_ID]
+        for group in groups
+        if group[CONF_GROUP_ID] in old_by_id
+        and (
+            _without([group], sensor_fields)
+            != _without([old_by_id[group[CONF_GROUP_ID]]], sensor_fields)
+            or engine.members.has_max_age(group[CONF_GROUP_ID])
+            != any(
+                isinstance(entity, StaleMembersSensor)
+                for entity in group_entities[group[CONF_GROUP_ID]]
+            )
+        )
+    }
+    removed = set(old_by_id) - {group[CONF_GROUP_ID] for group in groups}
+
+    registry = er.async_get(hass)
+    for group_id in removed:
+        for entity in group_entities.pop(group_id, []):
+            # Gelöschte Gruppen verlieren auch ihre Einträge im Entity-Registry
+            if entity.entity_id is not None and registry.async_get(entity.entity_id):
+                registry.async_remove(entity.entity_id)
+            else:
+                await entity.async_remove()
+    for group_id in changed:
+        for entity in group_entities.pop(group_id, []):
+            await entity.async_remove()
+
+    entity_list = []
+    for group in groups:
+        if group[CONF_GROUP_ID] not in group_entities:
+            entities = _create_group_entities(entry, engine, group)
+            group_entities[group[CONF_GROUP_ID]] = entities
+            entity_list.extend(entities)
+    if entity_list:
+        add_entities(entity_list, update_before_add=True)
+
+    _LOGGER.debug(
+        "Gruppen geändert: %d neu erzeugt, %d entfernt", len(entity_list), len(removed)
     )
+
+    if (
+        engine.members.roots != old_roots
+        or _root_standby(groups, engine.members.roots) != old_standby
+        or engine.members.deadband(None) != old_deadband
+    ):
+        for entity in runtime[DATA_TOTAL_ENTITIES]:
+            await entity.async_remove()
+        total_entities = _create_total_entities(entry, engine, groups, group_entities)
+        runtime[DATA_TOTAL_ENTITIES] = total_entities
+        add_entities(total_entities)
+
+
+def _without(groups: list[dict], fields) -> list[dict]:
+    """Liefert die Gruppen ohne die angegebenen Felder für einen Vergleich."""
+    return [
+        {key: value for key, value in group.items() if key not in fields} for group in groups
+    ]
@@ -1,38 +1,42 @@
-"""Sensor für Gesamtenergie pro Gruppe.
+"""Sensor für die durchschnittliche Gesamtleistung.
 
-Dieses Modul definiert einen Sensor für Home Assistant,
-der die gesamte Energie gruppenübergreifent berechnet.
-Dazu werden einfach die Gruppensensoren addiert.
+Dieses Modul definiert einen Sensor für Home Assistant, der den
+zeitgewichteten 15-Minuten-Durchschnitt der Gesamtleistung liefert. Der Wert
+stammt aus dem Messwertspeicher der Gesamtsumme in der Engine; er folgt damit
+der eingestellten Gesamtsumme (Summe der obersten Gruppen oder Vereinigung
+aller Mitglieder) und wird bei jeder Änderung der Gesamtleistung fortgeschrieben.
 """
 import logging
 
 from homeassistant.components.sensor import SensorEntity, SensorStateClass
 from homeassistant.const import UnitOfPower
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.core import callback
 
-from ..const import DEVICE_INFO, DOMAIN
+from ..const import AVERAGE_WINDOW, DEVICE_INFO, DOMAIN
+from ..core.deadband import SignificantChangeWriter
+from ..core.engine import PowerGroupEngine
 
 _LOGGER = logging.getLogger(__name__)
 
 
 class AveragePowerAllSensor(SensorEntity):
-    """Addiert alle Gruppen-Gesamtsummen"""
+    """Durchschnittliche Gesamtleistung über 15 Minuten."""
     _attr_translation_key = "AveragePowerAllSensor"
     _attr_has_entity_name = True
 
-    def __init__(self, entry: ConfigEntry, obj_entities) -> None:
+    def __init__(self, entry: ConfigEntry, engine: PowerGroupEngine) -> None:
         """Initialisiert den Sensor.
 
         Args:
             entry (ConfigEntry): Die Konfigurationseintrag-Instanz für diese Integration.
+            engine (PowerGroupEngine): Die Aggregations-Engine des ConfigEntry.
 
         """
         self._attr_suggested_display_precision = 3
         self._entry = entry
-        self._obj_entities = obj_entities
-        self._entities = [entity.entity_id for entity in self._obj_entities]
-        self._unsub = None
+        self._engine = engine
+        self._writer = None
 
         self._attr_unique_id = f"{entry.entry_id}_avg_all_power"
         # self._attr_device_class = SensorDeviceClass.M
@@ -44,38 +48,33 @@ class AveragePowerAllSensor(SensorEntity):
 
     async def async_added_to_hass(self):
         """Wird beim Hinzufügen zur Home Assistant-Instanz aufgerufen."""
-
-        for entity in self._obj_entities:
-
-            if entity.entity_id is None:
-                _LOGGER.warning("Sensor entity_id is None during standby setup!")
-                return
-
-        self._entities = [entity.entity_id for entity in self._obj_entities]
-        self._unsub = async_track_state_change_event(self.hass, self._entities,
-                                                     self._async_state_changed)
-
-        await self._async_update_value()
-
-    # pylint: disable=unused-argument
-    async def _async_state_changed(self, event):
-        # Wird aufgerufen, wenn sich eine Entity im Set ändert
-        await self._async_update_value()
-
-    async def _async_update_value(self):
-        total = 0.0
-        for entity_id in self._entities:
-            state = self.hass.states.get(entity_id)
-            if state is None:
-                continue
-            try:
-                value = float(state.state)
-
-                total += value
-            except ValueError:
-                continue
-        self._attr_native_value = round(total, 3)
-        self.async_write_ha_state()
+        self._writer = SignificantChangeWriter(
+            self.hass, self._async_write_value, *self._engine.members.deadband(None)
+        )
+        self.async_on_remove(self._writer.async_shutdown)
+
+        self.async_on_remove(
+            self._engine.async_add_listener(None, self._async_engine_updated)
+        )
+        # Auch bei konstanter Leistung gleitet das Fenster weiter
+        self.async_on_remove(
+            self._engine.energy.async_add_listener(None, self._async_engine_updated)
+        )
+
+        self._async_engine_updated()
+
+    @callback
+    def _async_engine_updated(self):
+        """Übernimmt den Durchschnitt der Gesamtsumme aus der Engine."""
+        stats = self._engine.window_stats(None, AVERAGE_WINDOW)
+        if stats is not None:
+            self._writer.async_update(round(stats.mean, 3))
+
+    @callback
+    def _async_write_value(self, value):
+        """Schreibt einen signifikant geänderten Wert (gebündelt)."""
+        self._attr_native_value = value
+        self._engine.coalescer.async_schedule_write(self)
 
     @property
     def device_info(self):
@@ -1,5 +1,6 @@
 """Modul definiert einen 15 Minuten Durchschnittsleistungssensor für Home Assistant.
-Dazu wird die History der letzten 15 Minuten ausgewertet."""
+Der Durchschnitt wird zeitgewichtet aus dem Messwertspeicher der Gruppe in der
+Aggregations-Engine berechnet. Die History wird nur einmalig beim Start gelesen."""
 import logging
 from datetime import timedelta
 
@@ -9,7 +10,8 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import UnitOfPower
 from homeassistant.util import dt as dt_util
 
-from ..const import DEVICE_INFO, DOMAIN  # noqa: TID252
+from ..const import AVERAGE_WINDOW, DEVICE_INFO, DOMAIN  # noqa: TID252
+from ..core.engine import PowerGroupEngine
 from .power_sensor import PowerSensor
 
 _LOGGER = logging.getLogger(__name__)
@@ -21,58 +23,84 @@ class AveragePowerSensor(SensorEntity):
     _attr_translation_key = "AveragePowerSensor"
     _attr_has_entity_name = True
 
-    def __init__(self, entry: ConfigEntry, group_name: str, source: PowerSensor):
+    # pylint: disable=too-many-arguments, too-many-positional-arguments
+    def __init__(
+        self,
+        entry: ConfigEntry,
+        engine: PowerGroupEngine,
+        group_id,
+        group_name: str,
+        source: PowerSensor,
+    ):
         self._entry = entry
+        self._engine = engine
+        self._group_id = group_id
         self._group_name = group_name
         self._attr_translation_placeholders = {"index": self._group_name}
         self._source = source
-        self._attr_unique_id = f"{entry.entry_id}_{self._group_name}_avg_power"
+        self._attr_unique_id = f"{entry.entry_id}_{self._group_id}_avg_power"
         self._attr_native_unit_of_measurement = UnitOfPower.WATT
         self._attr_suggested_display_precision = 3
         self._source_entity_id = source.entity_id
-        self._statistics_sensor = None
 
     async def async_added_to_hass(self):
-        """Wird aufgerufen, wenn die Entity zu HA hinzugefügt wird."""        
+        """Wird aufgerufen, wenn die Entity zu HA hinzugefügt wird.
+
+        Füllt den Messwertspeicher der Gruppe einmalig aus der History, sofern
+        er nicht bereits aus dem Snapshot der Engine stammt.
+        """
 
         source_entity_id = self._source.entity_id
         if source_entity_id is None:
             _LOGGER.warning("Sensor entity_id is None during avg setup!")
             return
 
+        self._source_entity_id = source_entity_id
         await super().async_added_to_hass()
 
-    async def async_update(self):
-        """Wird aufgerufen, wenn die Entity aktualisiert wird."""
-        self._attr_native_value = await self.async_calculate_average()
+        if not self._engine.samples_restored(self._group_id):
+            await self._async_warm_up()
 
-    async def async_calculate_average(self):
-        """Berechne den Durchschnitt der letzten 15 Minuten aus der History."""
+    async def _async_warm_up(self):
+        """Liest die History der letzten 15 Minuten einmalig in den Messwertspeicher."""
         now = dt_util.utcnow()
-        start = now - timedelta(minutes=15)
+        start = now - timedelta(seconds=AVERAGE_WINDOW)
 
         def _fetch():
             return recorder.history.state_changes_during_period(
                 self.hass,
                 start_time=start,
                 end_time=now,
-                entity_id=self._source.entity_id,
+                entity_id=self._source_entity_id,
                 no_attributes=True,
+                include_start_time_state=True,
             )
 
-        instance = recorder.get_instance(self.hass)
-        states = await instance.async_add_executor_job(_fetch)
+        try:
+            instance = recorder.get_instance(self.hass)
+            states = await instance.async_add_executor_job(_fetch)
+        except KeyError:
+            _LOGGER.debug("Recorder nicht verfügbar, Durchschnitt startet ohne History")
+            return
 
-        values = []
-        for state in states.get(self._source.entity_id, []):
+        samples = []
+        for state in states.get(self._source_entity_id, []):
             try:
-                values.append(float(state.state))
+                value = float(state.state)
             except (ValueError, TypeError):
                 continue
+            samples.append((max(state.last_changed, start).timestamp(), value))
+
+        self._engine.async_seed_samples(self._group_id, samples)
+
+    async def async_update(self):
+        """Wird aufgerufen, wenn die Entity aktualisiert wird."""
+        self._attr_native_value = self.calculate_average()
 
-        if values:
-            return sum(values) / len(values)
-        return None
+    def calculate_average(self):
+        """Berechne den zeitgewichteten Durchschnitt der letzten 15 Minuten."""
+        stats = self._engine.window_stats(self._group_id, AVERAGE_WINDOW)
+        return None if stats is None else stats.mean
 
     @property
     def device_info(self):
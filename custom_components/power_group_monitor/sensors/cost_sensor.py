@@ -0,0 +1,154 @@
+"""Sensor-Entitäten zur Anzeige der Stromkosten je Gruppe und gesamt.
+
+Die Kosten werden von den Integratoren der Aggregations-Engine im selben
+Durchlauf wie die Energie berechnet: Jeder Energie-Abschnitt wird mit dem
+Preis multipliziert, der während dieses Abschnitts galt. Die Sensoren lesen
+nur die Akkumulatoren aus und fragen keine Zustände anderer Entitäten ab.
+
+Classes:
+    CostSensor: Gesamtkosten einer Gruppe.
+    CostTodaySensor: Kosten einer Gruppe am laufenden Tag.
+    CostTotalAllSensor: Gesamtkosten über alle Gruppen.
+    CostTodayAllSensor: Kosten über alle Gruppen am laufenden Tag.
+"""
+
+from datetime import datetime
+
+from homeassistant.components.sensor import (
+    RestoreSensor,
+    SensorDeviceClass,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import callback
+from homeassistant.util import dt as dt_util
+
+from ..const import (  # noqa: TID252
+    DEVICE_INFO,
+    DOMAIN,
+    ENERGY_TODAY,
+    ENERGY_TOTAL,
+    PERIOD_DAY,
+)
+from ..core.engine import PowerGroupEngine
+
+
+class CostSensor(RestoreSensor):
+    """Gesamtkosten des Stromverbrauchs einer Gruppe."""
+
+    _attr_translation_key = "CostTotalSensor"
+    _attr_has_entity_name = True
+    _attr_device_class = SensorDeviceClass.MONETARY
+    _attr_state_class = SensorStateClass.TOTAL
+    _attr_icon = "mdi:cash"
+    _accumulator = ENERGY_TOTAL
+
+    def __init__(self, entry: ConfigEntry, engine: PowerGroupEngine, group_id, group_name: str):
+        self._entry = entry
+        self._engine = engine
+        self._group_id = group_id
+        self._group_name = group_name
+        self._attr_translation_placeholders = {"index": group_name}
+        self._attr_unique_id = f"{entry.entry_id}_{group_id}_cost_{self._accumulator}"
+        self._attr_suggested_display_precision = 2
+
+    async def async_added_to_hass(self):
+        """Übernimmt den gespeicherten Wert und registriert den Sensor bei der Engine.
+
+        Der gespeicherte Wert wird nur übernommen, wenn die Engine weder aus
+        ihrem Snapshot geladen wurde noch den Stand bereits übernommen hat.
+        """
+        await super().async_added_to_hass()
+        self._attr_native_unit_of_measurement = self.hass.config.currency
+
+        # Die Summe der obersten Gruppen hat keinen eigenen Stand, die Vereinigung schon
+        own_state = self._group_id is not None or self._engine.members.union_total
+        if own_state and self._engine.claim_restore(self._group_id, f"cost_{self._accumulator}"):
+            last_state = await self.async_get_last_state()
+            last_data = await self.async_get_last_sensor_data()
+            if (
+                last_state is not None
+                and last_data is not None
+                and last_data.native_value is not None
+                and self._restore_valid(last_state)
+            ):
+                self._engine.energy.integrator(self._group_id).add_cost(
+                    self._accumulator, float(last_data.native_value)
+                )
+
+        self.async_on_remove(
+            self._engine.energy.async_add_listener(self._group_id, self._async_cost_updated)
+        )
+        self._attr_native_value = self._cost()
+
+    def _restore_valid(self, last_state) -> bool:  # pylint: disable=unused-argument
+        """Gibt an, ob ein gespeicherter Zustand fortgesetzt werden darf."""
+        return True
+
+    @callback
+    def _async_cost_updated(self):
+        """Übernimmt die aktuellen Kosten aus der Engine."""
+        self._attr_native_value = self._cost()
+        self._attr_extra_state_attributes = {"price": self._engine.energy.price}
+        self._engine.coalescer.async_schedule_write(self)
+
+    def _cost(self) -> float:
+        return round(self._engine.energy.cost(self._group_id, self._accumulator), 4)
+
+    @property
+    def device_info(self):
+        """Liefert die Geräteinformationen für diese Sensor-Entity."""
+        return {
+            "identifiers": {(DOMAIN, self._entry.entry_id)},
+            "name": self._entry.title,
+            **DEVICE_INFO,
+        }
+
+
+class CostTodaySensor(CostSensor):
+    """Kosten des Stromverbrauchs einer Gruppe am laufenden Tag."""
+
+    _attr_translation_key = "CostTodaySensor"
+    _accumulator = ENERGY_TODAY
+
+    def __init__(self, entry: ConfigEntry, engine: PowerGroupEngine, group_id, group_name: str):
+        super().__init__(entry, engine, group_id, group_name)
+        self._attr_last_reset = dt_util.as_utc(engine.periods.period_start(PERIOD_DAY))
+
+    async def async_added_to_hass(self):
+        """Registriert den Sensor zusätzlich beim Tageswechsel."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self._engine.periods.async_add_listener(self._async_period_closed))
+
+    def _restore_valid(self, last_state) -> bool:
+        return last_state.last_changed >= self._engine.periods.period_start(PERIOD_DAY)
+
+    @callback
+    def _async_period_closed(self, closed: frozenset[str], boundary: datetime):
+        """Übernimmt die von der Engine zurückgesetzten Tageskosten."""
+        if PERIOD_DAY not in closed:
+            return
+        self._attr_last_reset = dt_util.as_utc(boundary)
+        self._async_cost_updated()
+
+
+class CostTotalAllSensor(CostSensor):
+    """Gesamtkosten des Stromverbrauchs über alle Gruppen."""
+
+    _attr_translation_key = "CostTotalAllSensor"
+
+    def __init__(self, entry: ConfigEntry, engine: PowerGroupEngine):
+        super().__init__(entry, engine, None, None)
+        self._attr_translation_placeholders = {}
+        self._attr_unique_id = f"{entry.entry_id}_cost_{self._accumulator}_all"
+
+
+class CostTodayAllSensor(CostTodaySensor):
+    """Kosten des Stromverbrauchs über alle Gruppen am laufenden Tag."""
+
+    _attr_translation_key = "CostTodayAllSensor"
+
+    def __init__(self, entry: ConfigEntry, engine: PowerGroupEngine):
+        super().__init__(entry, engine, None, None)
+        self._attr_translation_placeholders = {}
+        self._attr_unique_id = f"{entry.entry_id}_cost_{self._accumulator}_all"
@@ -0,0 +1,47 @@
+"""Sensor zur Energiezählung einer Gruppe je Woche, Monat, Jahr oder Abrechnungsperiode.
+
+Der Sensor arbeitet wie der Tagessensor, zählt aber den Akkumulator der
+konfigurierten Periode und wird an deren Grenze vom gemeinsamen
+``PeriodScheduler`` zurückgesetzt.
+"""
+
+from ..const import PERIOD_BILLING, PERIOD_MONTH, PERIOD_WEEK, PERIOD_YEAR  # noqa: TID252
+from ..core.engine import PowerGroupEngine
+from .today_integral_sensor import TodayIntegralSensor
+
+TRANSLATION_KEYS = {
+    PERIOD_WEEK: "EnergyWeekSensor",
+    PERIOD_MONTH: "EnergyMonthSensor",
+    PERIOD_YEAR: "EnergyYearSensor",
+    PERIOD_BILLING: "EnergyBillingSensor",
+}
+
+
+class EnergyPeriodSensor(TodayIntegralSensor):
+    """Sensor zur Integration der Energie (kWh) einer Gruppe über eine Periode."""
+
+    _attr_entity_registry_enabled_default = True
+
+    # pylint: disable=too-many-arguments, too-many-positional-arguments
+    def __init__(
+        self,
+        entry,
+        engine: PowerGroupEngine,
+        group_id: str,
+        group_name: str,
+        period: str,
+    ) -> None:
+        """Initialisiert den Sensor für eine Periode.
+
+        Args:
+            entry (ConfigEntry): Der Konfigurationseintrag mit den Einstellungen dieser Entität.
+            engine (PowerGroupEngine): Die Aggregations-Engine des ConfigEntry.
+            group_id (str): Die ID der Gruppe.
+            group_name (str): Der Name der Gruppe.
+            period (str): Die Periode, z.B. ``PERIOD_MONTH``.
+
+        """
+        self._period = period
+        super().__init__(entry, engine, group_id, group_name)
+        self._attr_translation_key = TRANSLATION_KEYS[period]
+        self._attr_unique_id = f"{entry.entry_id}_{group_id}_energy_{period}"
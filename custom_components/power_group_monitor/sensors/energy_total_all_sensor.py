@@ -2,34 +2,40 @@
 
 Dieses Modul definiert einen Sensor für Home Assistant,
 der die gesamte Energie gruppenübergreifent berechnet.
-Dazu werden einfach die Gruppensensoren addiert.
+Dazu werden einfach die Gruppensensoren addiert. Ist die Gesamtsumme die
+Vereinigung aller Mitglieder, stammt der Wert aus dem Integrator der
+Gesamtsumme in der Engine.
 """
 import logging
 
-from homeassistant.components.sensor import SensorEntity, SensorDeviceClass, SensorStateClass
+from homeassistant.components.sensor import RestoreSensor, SensorDeviceClass, SensorStateClass
 from homeassistant.const import UnitOfEnergy
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import callback
 from homeassistant.helpers.event import async_track_state_change_event
 
-from ..const import DEVICE_INFO, DOMAIN
+from ..const import DEVICE_INFO, DOMAIN, ENERGY_TOTAL
+from ..core.engine import PowerGroupEngine
 
 _LOGGER = logging.getLogger(__name__)
 
 
-class EnergyTotalAllSensor(SensorEntity):
+class EnergyTotalAllSensor(RestoreSensor):
     """Addiert alle Gruppen-Gesamtsummen"""
     _attr_translation_key = "EnergyTotalAllSensor"
     _attr_has_entity_name = True
 
-    def __init__(self, entry: ConfigEntry, obj_entities) -> None:
+    def __init__(self, entry: ConfigEntry, engine: PowerGroupEngine, obj_entities) -> None:
         """Initialisiert den Sensor.
 
         Args:
             entry (ConfigEntry): Die Konfigurationseintrag-Instanz für diese Integration.
+            engine (PowerGroupEngine): Die Aggregations-Engine des ConfigEntry.
 
         """
         self._attr_suggested_display_precision = 3
         self._entry = entry
+        self._engine = engine
         self._obj_entities = obj_entities
         self._entities = [entity.entity_id for entity in self._obj_entities]
         self._unsub = None
@@ -44,6 +50,24 @@ class EnergyTotalAllSensor(SensorEntity):
 
     async def async_added_to_hass(self):
         """Wird beim Hinzufügen zur Home Assistant-Instanz aufgerufen."""
+        await super().async_added_to_hass()
+
+        if self._engine.members.union_total:
+            # Die Vereinigung führt die Engine, gemeinsame Mitglieder zählen einmal
+            last_data = await self.async_get_last_sensor_data()
+            if (
+                self._engine.claim_restore(None, ENERGY_TOTAL)
+                and last_data is not None
+                and last_data.native_value is not None
+            ):
+                self._engine.energy.integrator(None).add_energy(
+                    ENERGY_TOTAL, float(last_data.native_value)
+                )
+            self.async_on_remove(
+                self._engine.energy.async_add_listener(None, self._async_energy_updated)
+            )
+            self._attr_native_value = self._energy()
+            return
 
         for entity in self._obj_entities:
 
@@ -54,6 +78,8 @@ class EnergyTotalAllSensor(SensorEntity):
         self._entities = [entity.entity_id for entity in self._obj_entities]
         self._unsub = async_track_state_change_event(self.hass, self._entities,
                                                      self._async_state_changed)
+        # Die Gesamtsensoren werden bei Gruppenänderungen zur Laufzeit neu erzeugt
+        self.async_on_remove(self._unsub)
 
         await self._async_update_value()
 
@@ -62,6 +88,15 @@ class EnergyTotalAllSensor(SensorEntity):
         # Wird aufgerufen, wenn sich eine Entity im Set ändert
         await self._async_update_value()
 
+    @callback
+    def _async_energy_updated(self):
+        """Übernimmt die Energie der Vereinigung aus der Engine."""
+        self._attr_native_value = self._energy()
+        self._engine.coalescer.async_schedule_write(self)
+
+    def _energy(self) -> float:
+        return round(self._engine.energy.integrator(None).energy(ENERGY_TOTAL), 3)
+
     async def _async_update_value(self):
         total = 0.0
         for entity_id in self._entities:
@@ -75,7 +110,7 @@ class EnergyTotalAllSensor(SensorEntity):
             except ValueError:
                 continue
         self._attr_native_value = round(total, 3)
-        self.async_write_ha_state()
+        self._engine.coalescer.async_schedule_write(self)
 
     @property
     def device_info(self):
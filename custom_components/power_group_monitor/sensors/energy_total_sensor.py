@@ -1,8 +1,8 @@
 """Sensor für Gesamtenergie pro Gruppe.
 
-Dieses Modul definiert eine benutzerdefinierte IntegrationSensor-Entität für Home Assistant,
-die die gesamte Energie pro Gruppe berechnet, die über einen Zeitraum verbraucht oder erzeugt wurde.
-Die Integration erfolgt über eine trapezförmige Methode mit automatischer Einheitenskalierung.
+Dieses Modul definiert eine benutzerdefinierte Sensor-Entität für Home Assistant,
+die die gesamte Energie pro Gruppe anzeigt, die über einen Zeitraum verbraucht oder erzeugt wurde.
+Die Integration erfolgt im gemeinsamen Integrator der Gruppe in der Aggregations-Engine.
 """
 from .total_integral_sensor import TotalIntegralSensor
 
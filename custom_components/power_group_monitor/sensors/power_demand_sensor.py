@@ -0,0 +1,109 @@
+"""Sensor-Entitäten zur Anzeige der Leistungsspitze nach Abrechnung.
+
+Die Leistungsspitze ist der höchste Mittelwert einer festen 15-Minuten-Messperiode
+im laufenden Tag bzw. Monat. Die Messperioden werden von der Aggregations-Engine
+geführt; der Sensor zeigt den Spitzenwert an und stellt den Beginn der
+betreffenden Messperiode als Attribut ``peak_time`` bereit.
+
+Classes:
+    PowerDemandSensor: Leistungsspitze einer Gruppe.
+    PowerDemandTotalSensor: Leistungsspitze über alle Gruppen.
+"""
+
+from homeassistant.components.sensor import (
+    RestoreSensor,
+    SensorDeviceClass,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import UnitOfPower
+from homeassistant.util import dt as dt_util
+
+from ..const import DEVICE_INFO, DOMAIN, PERIOD_DAY  # noqa: TID252
+from ..core.engine import PowerGroupEngine
+
+
+class PowerDemandSensor(RestoreSensor):
+    """Höchster 15-Minuten-Mittelwert einer Gruppe im laufenden Tag oder Monat."""
+
+    _attr_has_entity_name = True
+    _attr_device_class = SensorDeviceClass.POWER
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_icon = "mdi:chart-timeline-variant-shimmer"
+
+    # pylint: disable=too-many-arguments, too-many-positional-arguments
+    def __init__(
+        self,
+        entry: ConfigEntry,
+        engine: PowerGroupEngine,
+        group_id,
+        group_name: str,
+        period: str,
+    ):
+        self._entry = entry
+        self._engine = engine
+        self._group_id = group_id
+        self._group_name = group_name
+        self._period = period
+        suffix = "Today" if period == PERIOD_DAY else "Month"
+        self._attr_translation_key = f"PowerDemand{suffix}Sensor"
+        self._attr_translation_placeholders = {"index": group_name}
+        self._attr_unique_id = f"{entry.entry_id}_{group_id}_demand_{period}"
+        self._attr_native_unit_of_measurement = UnitOfPower.WATT
+        self._attr_suggested_display_precision = 2
+        self._attr_extra_state_attributes = {}
+
+    async def async_added_to_hass(self):
+        """Übernimmt einen gespeicherten Spitzenwert des laufenden Zeitraums."""
+        await super().async_added_to_hass()
+
+        last_state = await self.async_get_last_state()
+        last_data = await self.async_get_last_sensor_data()
+        if last_state is None or last_data is None or last_data.native_value is None:
+            return
+
+        peak_time = dt_util.parse_datetime(str(last_state.attributes.get("peak_time")))
+        if peak_time is None:
+            return
+
+        try:
+            value = float(last_data.native_value)
+        except (TypeError, ValueError):
+            return
+        self._engine.demand(self._group_id).restore(self._period, value, peak_time)
+
+    async def async_update(self):
+        """Übernimmt den Spitzenwert des laufenden Zeitraums aus der Engine."""
+        tracker = self._engine.demand(self._group_id)
+        now = dt_util.utcnow().timestamp()
+        peak = tracker.peak(self._period, now)
+        current = tracker.current(now)
+
+        self._attr_native_value = None if peak is None else round(peak.value, 2)
+        self._attr_extra_state_attributes = {
+            "peak_time": (
+                None if peak is None
+                else dt_util.utc_from_timestamp(peak.timestamp).isoformat()
+            ),
+            "current_interval": None if current is None else round(current, 2),
+        }
+
+    @property
+    def device_info(self):
+        """Liefert die Geräteinformationen für diese Sensor-Entity."""
+        return {
+            "identifiers": {(DOMAIN, self._entry.entry_id)},
+            "name": self._entry.title,
+            **DEVICE_INFO,
+        }
+
+
+class PowerDemandTotalSensor(PowerDemandSensor):
+    """Höchster 15-Minuten-Mittelwert über alle Gruppen im laufenden Tag oder Monat."""
+
+    def __init__(self, entry: ConfigEntry, engine: PowerGroupEngine, period: str):
+        super().__init__(entry, engine, None, None, period)
+        suffix = "Today" if period == PERIOD_DAY else "Month"
+        self._attr_translation_key = f"PowerDemand{suffix}TotalSensor"
+        self._attr_translation_placeholders = {}
+        self._attr_unique_id = f"{entry.entry_id}_demand_total_{period}"
@@ -10,9 +10,11 @@ from homeassistant.components.sensor import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import UnitOfPower
-from homeassistant.helpers.event import async_track_state_change_event, async_track_time_change
+from homeassistant.core import callback
+from homeassistant.util import dt as dt_util
 
-from ..const import DOMAIN, DEVICE_INFO
+from ..const import DOMAIN, DEVICE_INFO, PERIOD_DAY
+from ..core.engine import PowerGroupEngine
 
 
 class PowerPeakSensor(SensorEntity):
@@ -26,29 +28,28 @@ class PowerPeakSensor(SensorEntity):
     _attr_state_class = SensorStateClass.MEASUREMENT
     _attr_icon = "mdi:flash-alert"
 
-    def __init__(self, entry: ConfigEntry, group_id, group_name: str, entities: list[str]):
+    def __init__(self, entry: ConfigEntry, engine: PowerGroupEngine, group_id, group_name: str):
         self._entry = entry
+        self._engine = engine
         self._group_id = group_id
         self._group_name = group_name
-        self._entities = entities
         self._unsub = None
         self._reset_job = None
 
         self._attr_unique_id = f"{entry.entry_id}_{group_id}_peak_power_sensor"
         self._attr_translation_placeholders = {"index": group_name}
         self._attr_native_value = 0.0
+        self._attr_extra_state_attributes = {"peak_time": None}
 
     async def async_added_to_hass(self):
-        self._unsub = async_track_state_change_event(
-            self.hass, self._entities, self._async_state_changed
+        self._unsub = self._engine.async_add_listener(
+            self._group_id, self._async_update_peak
         )
 
-        # Täglicher Reset um 00:00 Uhr
-        self._reset_job = async_track_time_change(
-            self.hass, self._reset_peak, hour=0, minute=0, second=0
-        )
+        # Täglicher Reset über den gemeinsamen Perioden-Zeitplan
+        self._reset_job = self._engine.periods.async_add_listener(self._reset_peak)
 
-        await self._async_update_peak()
+        self._async_update_peak()
 
     async def async_will_remove_from_hass(self):
         if self._unsub:
@@ -56,38 +57,26 @@ class PowerPeakSensor(SensorEntity):
         if self._reset_job:
             self._reset_job()
 
-    # pylint: disable=unused-argument
-    async def _async_state_changed(self, event):
-        await self._async_update_peak()
-
-    async def _async_update_peak(self):
-        total_power = 0.0
-        for entity_id in self._entities:
-            state = self.hass.states.get(entity_id)
-            if state is None or state.state in ("unknown", "unavailable"):
-                continue
-
-            try:
-                value = float(state.state)
-                unit = state.attributes.get("unit_of_measurement")
-                if unit == UnitOfPower.KILO_WATT:
-                    value *= 1000
-                elif unit != UnitOfPower.WATT:
-                    continue
-                total_power += value
-            except ValueError:
-                continue
-
-        # Nur aktualisieren, wenn neue Spitzenleistung erreicht
-        if total_power > (self._attr_native_value or 0.0):
-            self._attr_native_value = round(total_power, 2)
-            self.async_write_ha_state()
+    @callback
+    def _async_update_peak(self):
+        peak = self._engine.daily_peak(self._group_id)
+        value = 0.0 if peak is None else round(peak[0], 2)
+
+        # Nur schreiben, wenn sich die Tagesspitze geändert hat
+        if value != self._attr_native_value:
+            self._attr_native_value = value
+            self._attr_extra_state_attributes = {
+                "peak_time": None if peak is None
+                else dt_util.utc_from_timestamp(peak[1]).isoformat()
+            }
+            self._engine.coalescer.async_schedule_write(self)
 
     # pylint: disable=unused-argument
-    async def _reset_peak(self, now=None):
-        """Setzt den Spitzenwert um Mitternacht zurück."""
-        self._attr_native_value = 0.0
-        self.async_write_ha_state()
+    @callback
+    def _reset_peak(self, closed: frozenset[str], boundary=None):
+        """Übernimmt um Mitternacht die von der Engine neu begonnene Tagesspitze."""
+        if PERIOD_DAY in closed:
+            self._async_update_peak()
 
     @property
     def device_info(self):
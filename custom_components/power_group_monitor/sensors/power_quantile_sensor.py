@@ -0,0 +1,89 @@
+"""Sensor-Entitäten zur Anzeige von Leistungs-Perzentilen.
+
+Die Perzentile werden aus den zeitgewichteten Quantil-Skizzen der
+Aggregations-Engine berechnet. Der Zustand ist das Perzentil des laufenden
+Tages, das Attribut ``rolling_week`` das Perzentil der letzten sieben Tage,
+das aus den zusammengeführten Tages-Skizzen berechnet wird. Die Tages-Skizze
+wird um Mitternacht zurückgesetzt.
+
+Classes:
+    PowerQuantileSensor: Perzentil der Leistung einer Gruppe.
+    PowerQuantileTotalSensor: Perzentil der Leistung über alle Gruppen.
+"""
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import UnitOfPower
+from homeassistant.util import dt as dt_util
+
+from ..const import DEVICE_INFO, DOMAIN  # noqa: TID252
+from ..core.engine import PowerGroupEngine
+
+
+class PowerQuantileSensor(SensorEntity):
+    """Perzentil der Leistung einer Gruppe am laufenden Tag."""
+
+    _attr_translation_key = "PowerQuantileSensor"
+    _attr_has_entity_name = True
+    _attr_device_class = SensorDeviceClass.POWER
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_icon = "mdi:chart-bell-curve"
+
+    # pylint: disable=too-many-arguments, too-many-positional-arguments
+    def __init__(
+        self,
+        entry: ConfigEntry,
+        engine: PowerGroupEngine,
+        group_id,
+        group_name: str,
+        percentile: int,
+    ):
+        self._entry = entry
+        self._engine = engine
+        self._group_id = group_id
+        self._group_name = group_name
+        self._percentile = percentile
+        self._attr_translation_placeholders = {
+            "index": group_name,
+            "percentile": str(percentile),
+        }
+        self._attr_unique_id = f"{entry.entry_id}_{group_id}_quantile_{percentile}"
+        self._attr_native_unit_of_measurement = UnitOfPower.WATT
+        self._attr_suggested_display_precision = 2
+        self._attr_extra_state_attributes = {}
+
+    async def async_update(self):
+        """Berechnet das Perzentil des Tages und der gleitenden Woche."""
+        quantiles = self._engine.quantiles(self._group_id)
+        q = self._percentile / 100
+        today = quantiles.quantile(q, dt_util.utcnow().timestamp())
+        week = quantiles.week().quantile(q)
+
+        self._attr_native_value = None if today is None else round(today, 2)
+        self._attr_extra_state_attributes = {
+            "rolling_week": None if week is None else round(week, 2),
+        }
+
+    @property
+    def device_info(self):
+        """Liefert die Geräteinformationen für diese Sensor-Entity."""
+        return {
+            "identifiers": {(DOMAIN, self._entry.entry_id)},
+            "name": self._entry.title,
+            **DEVICE_INFO,
+        }
+
+
+class PowerQuantileTotalSensor(PowerQuantileSensor):
+    """Perzentil der Leistung über alle Gruppen am laufenden Tag."""
+
+    _attr_translation_key = "PowerQuantileTotalSensor"
+
+    def __init__(self, entry: ConfigEntry, engine: PowerGroupEngine, percentile: int):
+        super().__init__(entry, engine, None, None, percentile)
+        self._attr_translation_placeholders = {"percentile": str(percentile)}
+        self._attr_unique_id = f"{entry.entry_id}_quantile_total_{percentile}"
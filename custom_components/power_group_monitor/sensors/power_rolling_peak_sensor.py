@@ -0,0 +1,73 @@
+"""Sensor-Entity zur Anzeige der Spitzenlast einer Gruppe in einem gleitenden Zeitfenster.
+
+Der Spitzenwert stammt aus dem Messwertspeicher der Gruppe in der
+Aggregations-Engine, der das Maximum je Zeitfenster über eine monotone Deque
+führt. Der Zeitpunkt der Spitze wird als Attribut ``peak_time`` bereitgestellt.
+"""
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import UnitOfPower
+from homeassistant.util import dt as dt_util
+
+from ..const import DEVICE_INFO, DOMAIN  # noqa: TID252
+from ..core.engine import PowerGroupEngine
+from .power_statistics_sensor import window_label
+
+
+class PowerRollingPeakSensor(SensorEntity):
+    """Maximale Leistung einer Gruppe im gleitenden Zeitfenster."""
+
+    _attr_translation_key = "PowerRollingPeakSensor"
+    _attr_has_entity_name = True
+    _attr_device_class = SensorDeviceClass.POWER
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_icon = "mdi:flash-alert"
+
+    # pylint: disable=too-many-arguments, too-many-positional-arguments
+    def __init__(
+        self,
+        entry: ConfigEntry,
+        engine: PowerGroupEngine,
+        group_id,
+        group_name: str,
+        window: int,
+    ):
+        self._entry = entry
+        self._engine = engine
+        self._group_id = group_id
+        self._group_name = group_name
+        self._window = window
+        self._attr_translation_placeholders = {
+            "index": group_name,
+            "window": window_label(window),
+        }
+        self._attr_unique_id = f"{entry.entry_id}_{group_id}_rolling_peak_{window}"
+        self._attr_native_unit_of_measurement = UnitOfPower.WATT
+        self._attr_suggested_display_precision = 2
+        self._attr_extra_state_attributes = {}
+
+    async def async_update(self):
+        """Übernimmt das Maximum des Zeitfensters und seinen Zeitpunkt."""
+        stats = self._engine.window_stats(self._group_id, self._window)
+        if stats is None:
+            self._attr_native_value = None
+            self._attr_extra_state_attributes = {}
+            return
+
+        self._attr_native_value = round(stats.maximum, 2)
+        self._attr_extra_state_attributes = {
+            "peak_time": dt_util.utc_from_timestamp(stats.maximum_time).isoformat(),
+        }
+
+    @property
+    def device_info(self):
+        """Liefert die Geräteinformationen für diese Sensor-Entity."""
+        return {
+            "identifiers": {(DOMAIN, self._entry.entry_id)},
+            "name": self._entry.title,
+            **DEVICE_INFO,
+        }
@@ -1,7 +1,8 @@
 """Sensor-Entity zur Anzeige der aktuellen Leistung einer Gruppe in Home Assistant.
 
 Dieses Modul definiert die `PowerSensor`-Klasse, die einen Sensor zur Messung der Leistung
-einer Gruppe bereitstellt.
+einer Gruppe bereitstellt. Das Attribut ``top_members`` nennt die größten
+Verbraucher der Gruppe mit ihrem Anteil; es wird nicht im Recorder gespeichert.
 """
 
 import logging
@@ -13,13 +14,17 @@ from homeassistant.components.sensor import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import UnitOfPower
-from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.core import callback
 
 from ..const import DEVICE_INFO, DOMAIN  # noqa: TID252
+from ..core.deadband import SignificantChangeWriter
+from ..core.engine import PowerGroupEngine
 
 
 _LOGGER = logging.getLogger(__name__)
 
+ATTR_TOP_MEMBERS = "top_members"
+
 
 class PowerSensor(SensorEntity):
     """SensorEntity für die aktuelle Leistung der Gruppe (Pccu-Wert).
@@ -29,12 +34,14 @@ class PowerSensor(SensorEntity):
 
     _attr_translation_key = "PowerSensor"
     _attr_has_entity_name = True
+    _unrecorded_attributes = frozenset({ATTR_TOP_MEMBERS})
 
-    def __init__(self, entry: ConfigEntry, group_id, group_name, entities) -> None:
+    def __init__(self, entry: ConfigEntry, engine: PowerGroupEngine, group_id, group_name) -> None:
         """Initialisiert den Sensor.
 
         Args:
             entry (ConfigEntry): Die Konfigurationseintrag-Instanz für diese Integration.
+            engine (PowerGroupEngine): Die Aggregations-Engine des ConfigEntry.
 
         """
         self._attr_suggested_display_precision = 2
@@ -42,8 +49,9 @@ class PowerSensor(SensorEntity):
 
         self._group_id = group_id
         self._group_name = group_name
-        self._entities = entities
+        self._engine = engine
         self._unsub = None
+        self._writer = None
 
         self._attr_translation_placeholders = {"index": self._group_name}
 
@@ -57,43 +65,34 @@ class PowerSensor(SensorEntity):
     async def async_added_to_hass(self):
         """Wird beim Hinzufügen zur Home Assistant-Instanz aufgerufen.
 
-        Verbindet den Sensor mit dem Dispatcher-Signal zur Aktualisierung
-        der Messwerte per Webhook.
+        Registriert den Sensor als Listener der Aggregations-Engine und
+        übernimmt den aktuellen Wert der Gruppe.
         """
-        self._unsub = async_track_state_change_event(
-            self.hass, self._entities, self._async_state_changed
+        self._writer = SignificantChangeWriter(
+            self.hass, self._async_write_value, *self._engine.members.deadband(self._group_id)
         )
+        self.async_on_remove(self._writer.async_shutdown)
 
-        await self._async_update_value()
-
-    # pylint: disable=unused-argument
-    async def _async_state_changed(self, event):
-        # Wird aufgerufen, wenn sich eine Entity im Set ändert
-        await self._async_update_value()
-
-    # pylint: disable=line-too-long
-    async def _async_update_value(self):
-        total_power = 0.0
-        for entity_id in self._entities:
-            state = self.hass.states.get(entity_id)
-            if state is None:
-                continue
-
-            if state.attributes.get("unit_of_measurement") != UnitOfPower.WATT and state.attributes.get("unit_of_measurement") != UnitOfPower.KILO_WATT:
-                continue
+        self._unsub = self._engine.async_add_listener(
+            self._group_id, self._async_engine_updated
+        )
+        self.async_on_remove(self._unsub)
 
-            try:
-                value = float(state.state)
+        self._async_engine_updated()
 
-                if state.attributes.get("unit_of_measurement") == UnitOfPower.KILO_WATT:
-                    value = value * 1000
+    @callback
+    def _async_engine_updated(self):
+        """Übernimmt die neue Gruppenleistung aus der Engine."""
+        self._writer.async_update(round(self._engine.group_power(self._group_id), 2))
 
-                total_power += value
-            except ValueError:
-                continue
-        # self._state = round(total_power, 2)
-        self._attr_native_value = round(total_power, 2)
-        self.async_write_ha_state()
+    @callback
+    def _async_write_value(self, value):
+        """Schreibt einen signifikant geänderten Wert (gebündelt)."""
+        self._attr_native_value = value
+        self._attr_extra_state_attributes = {
+            ATTR_TOP_MEMBERS: self._engine.top_members(self._group_id)
+        }
+        self._engine.coalescer.async_schedule_write(self)
 
     @property
     def device_info(self):
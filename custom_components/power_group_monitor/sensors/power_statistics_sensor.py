@@ -0,0 +1,85 @@
+"""Modul definiert einen Statistik-Sensor für ein gleitendes Zeitfenster einer Gruppe.
+
+Der Sensor zeigt den zeitgewichteten Mittelwert der Gruppenleistung über das
+konfigurierte Zeitfenster an und stellt Minimum, Maximum und Standardabweichung
+als Attribute bereit. Alle Fenster einer Gruppe werden aus demselben
+Messwertspeicher der Aggregations-Engine berechnet.
+"""
+import logging
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import UnitOfPower
+
+from ..const import DEVICE_INFO, DOMAIN  # noqa: TID252
+from ..core.engine import PowerGroupEngine
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def window_label(window: int) -> str:
+    """Liefert eine lesbare Bezeichnung für ein Zeitfenster in Sekunden."""
+    if window % 3600 == 0:
+        return f"{window // 3600} h"
+    return f"{window // 60} min"
+
+
+class PowerStatisticsSensor(SensorEntity):
+    """Mittelwert, Minimum, Maximum und Streuung der Leistung über ein Zeitfenster."""
+
+    _attr_translation_key = "PowerStatisticsSensor"
+    _attr_has_entity_name = True
+    _attr_device_class = SensorDeviceClass.POWER
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_icon = "mdi:chart-bell-curve-cumulative"
+
+    # pylint: disable=too-many-arguments, too-many-positional-arguments
+    def __init__(
+        self,
+        entry: ConfigEntry,
+        engine: PowerGroupEngine,
+        group_id,
+        group_name: str,
+        window: int,
+    ):
+        self._entry = entry
+        self._engine = engine
+        self._group_id = group_id
+        self._group_name = group_name
+        self._window = window
+        self._attr_translation_placeholders = {
+            "index": group_name,
+            "window": window_label(window),
+        }
+        self._attr_unique_id = f"{entry.entry_id}_{group_id}_statistics_{window}"
+        self._attr_native_unit_of_measurement = UnitOfPower.WATT
+        self._attr_suggested_display_precision = 2
+        self._attr_extra_state_attributes = {}
+
+    async def async_update(self):
+        """Berechnet die Kennzahlen des Zeitfensters neu."""
+        stats = self._engine.window_stats(self._group_id, self._window)
+        if stats is None:
+            self._attr_native_value = None
+            self._attr_extra_state_attributes = {}
+            return
+
+        self._attr_native_value = round(stats.mean, 2)
+        self._attr_extra_state_attributes = {
+            "min": round(stats.minimum, 2),
+            "max": round(stats.maximum, 2),
+            "stddev": round(stats.stddev, 2),
+        }
+
+    @property
+    def device_info(self):
+        """Liefert die Geräteinformationen für diese Sensor-Entity."""
+        return {
+            "identifiers": {(DOMAIN, self._entry.entry_id)},
+            "name": self._entry.title,
+            **DEVICE_INFO,
+        }
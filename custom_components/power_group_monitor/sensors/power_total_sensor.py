@@ -13,9 +13,11 @@ from homeassistant.components.sensor import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import UnitOfPower
-from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.core import callback
 
-from ..const import DEVICE_INFO, DOMAIN, CONF_GROUP_ENTITIES  # noqa: TID252
+from ..const import DEVICE_INFO, DOMAIN  # noqa: TID252
+from ..core.deadband import SignificantChangeWriter
+from ..core.engine import PowerGroupEngine
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -30,24 +32,19 @@ class PowerTotalSensor(SensorEntity):
     _attr_translation_key = "PowerTotalSensor"
     _attr_has_entity_name = True
 
-    def __init__(self, entry: ConfigEntry) -> None:
+    def __init__(self, entry: ConfigEntry, engine: PowerGroupEngine) -> None:
         """Initialisiert den Sensor.
 
         Args:
             entry (ConfigEntry): Die Konfigurationseintrag-Instanz für diese Integration.
+            engine (PowerGroupEngine): Die Aggregations-Engine des ConfigEntry.
 
         """
         self._attr_suggested_display_precision = 2
         self._entry = entry
-        self._groups = self._entry.data.get("groups", [])
-
-        self._entities = []
-
-        for group in self._groups:
-            entities = group[CONF_GROUP_ENTITIES]
-            self._entities.extend(entities)
-
+        self._engine = engine
         self._unsub = None
+        self._writer = None
 
         self._attr_unique_id = f"{entry.entry_id}_power_total_sensor"
         self._attr_icon = "mdi:flash"
@@ -59,42 +56,29 @@ class PowerTotalSensor(SensorEntity):
     async def async_added_to_hass(self):
         """Wird beim Hinzufügen zur Home Assistant-Instanz aufgerufen.
 
-        Verbindet den Sensor mit dem Dispatcher-Signal zur Aktualisierung
-        der Messwerte per Webhook.
+        Registriert den Sensor als Listener der Aggregations-Engine und
+        übernimmt den aktuellen Wert über alle Gruppen.
         """
-        self._unsub = async_track_state_change_event(
-             self.hass, self._entities, self._async_state_changed
+        self._writer = SignificantChangeWriter(
+            self.hass, self._async_write_value, *self._engine.members.deadband(None)
         )
-        await self._async_update_value()
-
-    # pylint: disable=unused-argument
-    async def _async_state_changed(self, event):
-        # Wird aufgerufen, wenn sich eine Entity im Set ändert
-        await self._async_update_value()
-
-    # pylint: disable=line-too-long
-    async def _async_update_value(self):
-        total_power = 0.0
-        for entity_id in self._entities:
-            state = self.hass.states.get(entity_id)
-            if state is None:
-                continue
-
-            if state.attributes.get("unit_of_measurement") != UnitOfPower.WATT and state.attributes.get("unit_of_measurement") != UnitOfPower.KILO_WATT:
-                continue
-
-            try:
-                value = float(state.state)
-
-                if state.attributes.get("unit_of_measurement") == UnitOfPower.KILO_WATT:
-                    value = value * 1000
-
-                total_power += value
-            except ValueError:
-                continue
-        # self._state = round(total_power, 2)
-        self._attr_native_value = round(total_power, 2)
-        self.async_write_ha_state()
+        self.async_on_remove(self._writer.async_shutdown)
+
+        self._unsub = self._engine.async_add_listener(None, self._async_engine_updated)
+        self.async_on_remove(self._unsub)
+
+        self._async_engine_updated()
+
+    @callback
+    def _async_engine_updated(self):
+        """Übernimmt die neue Gesamtleistung aus der Engine."""
+        self._writer.async_update(round(self._engine.total_power, 2))
+
+    @callback
+    def _async_write_value(self, value):
+        """Schreibt einen signifikant geänderten Wert (gebündelt)."""
+        self._attr_native_value = value
+        self._engine.coalescer.async_schedule_write(self)
 
     @property
     def device_info(self):
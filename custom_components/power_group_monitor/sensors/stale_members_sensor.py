@@ -0,0 +1,74 @@
+"""Sensor-Entity zur Anzeige der veralteten Mitglieder einer Gruppe.
+
+Ein Mitglied gilt als veraltet, wenn sein letzter Bericht älter als das
+maximale Alter der Gruppe ist. Die Engine nimmt es dann aus den Summen; der
+Sensor zeigt die Anzahl, das Attribut ``stale_members`` die Entitäten. Das
+Attribut wird nicht im Recorder gespeichert.
+"""
+
+from homeassistant.components.sensor import SensorEntity, SensorStateClass
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory
+from homeassistant.core import callback
+
+from ..const import DEVICE_INFO, DOMAIN  # noqa: TID252
+from ..core.engine import PowerGroupEngine
+
+ATTR_STALE_MEMBERS = "stale_members"
+
+
+class StaleMembersSensor(SensorEntity):
+    """Anzahl der veralteten Mitglieder einer Gruppe."""
+
+    _attr_translation_key = "StaleMembersSensor"
+    _attr_has_entity_name = True
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_icon = "mdi:timer-sand-complete"
+    _unrecorded_attributes = frozenset({ATTR_STALE_MEMBERS})
+
+    def __init__(self, entry: ConfigEntry, engine: PowerGroupEngine, group_id, group_name) -> None:
+        """Initialisiert den Sensor.
+
+        Args:
+            entry (ConfigEntry): Die Konfigurationseintrag-Instanz für diese Integration.
+            engine (PowerGroupEngine): Die Aggregations-Engine des ConfigEntry.
+            group_id (str): Die ID der Gruppe.
+            group_name (str): Der Name der Gruppe.
+
+        """
+        self._entry = entry
+        self._engine = engine
+        self._group_id = group_id
+        self._attr_translation_placeholders = {"index": group_name}
+        self._attr_unique_id = f"{entry.entry_id}_{group_id}_stale_members"
+        self._attr_native_value = None
+        self._attr_extra_state_attributes = {ATTR_STALE_MEMBERS: []}
+
+    async def async_added_to_hass(self):
+        """Registriert den Sensor als Listener der Aggregations-Engine."""
+        self.async_on_remove(
+            self._engine.async_add_listener(self._group_id, self._async_engine_updated)
+        )
+        self._async_engine_updated()
+
+    @callback
+    def _async_engine_updated(self):
+        """Übernimmt die veralteten Mitglieder, wenn sie sich geändert haben."""
+        stale = self._engine.stale_members(self._group_id)
+        if stale == self._attr_extra_state_attributes[ATTR_STALE_MEMBERS] and (
+            self._attr_native_value is not None
+        ):
+            return
+        self._attr_native_value = len(stale)
+        self._attr_extra_state_attributes = {ATTR_STALE_MEMBERS: stale}
+        self._engine.coalescer.async_schedule_write(self)
+
+    @property
+    def device_info(self):
+        """Liefert die Geräteinformationen für diese Sensor-Entity."""
+        return {
+            "identifiers": {(DOMAIN, self._entry.entry_id)},
+            "name": self._entry.title,
+            **DEVICE_INFO,
+        }
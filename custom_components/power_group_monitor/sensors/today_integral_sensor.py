@@ -1,47 +1,44 @@
 """Oberklassen-Sensor für die Tagesenergiezählung.
 
-Dieses Modul definiert eine benutzerdefinierte IntegrationSensor-Entität für Home Assistant,
+Dieses Modul definiert eine benutzerdefinierte Sensor-Entität für Home Assistant,
 die die gesamte Energie über den Tag aufsummiert.
 
-Die Energiemenge wird mittels der Trapezregel integriert und in Kilowattstunden dargestellt.
+Die Energie wird vom gemeinsamen Integrator der Gruppe in der Aggregations-Engine
+berechnet und in Kilowattstunden dargestellt. Das Zurücksetzen übernimmt der
+gemeinsame ``PeriodScheduler`` der Engine; der Stand der abgeschlossenen Periode
+steht im Attribut ``previous_period``.
 
 Classes:
     TodayIntegralSensor: Oberklassen-Sensorentität zur Anzeige der aufsummierten Energie
 """
 
-from datetime import UTC, datetime, timedelta
+from datetime import datetime, timedelta
 from decimal import Decimal
 import logging
 
-from homeassistant.components.integration.sensor import (
-    UNIT_PREFIXES,
-    UNIT_TIME,
-    IntegrationSensor,
-    UnitOfTime,
-    _IntegrationMethod,
-    _IntegrationTrigger,
+from homeassistant.components.sensor import (
+    RestoreSensor,
+    SensorDeviceClass,
+    SensorStateClass,
 )
-from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
+from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import UnitOfEnergy
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.event import async_track_time_change
+from homeassistant.core import callback
 from homeassistant.util import dt as dt_util
 
-from .power_sensor import PowerSensor
-
-from ..const import DEVICE_INFO, DOMAIN  # noqa: TID252
+from ..const import DEVICE_INFO, DOMAIN, PERIOD_DAY  # noqa: TID252
+from ..core.engine import PowerGroupEngine
 from ..tools import clean_title
 
 _LOGGER = logging.getLogger(__name__)
 
 
 # pylint: disable=too-many-instance-attributes
-class TodayIntegralSensor(IntegrationSensor):
+class TodayIntegralSensor(RestoreSensor):
     """Sensorentität zur Anzeige der gesamten Energie des Tages (kWh).
 
-    Diese Entität summiert Energie über den Tag auf, um
-    die Insgesamtenergie zu berechnen. Sie nutzt dafür die Trapezregel
-    zur Integration und stellt den Wert in Kilowattstunden dar.
+    Diese Entität zeigt den Tages-Akkumulator des gemeinsamen Integrators der
+    Gruppe an. Unterklassen können über ``_period`` eine andere Periode zählen.
 
     Attributes:
         _attr_entity_registry_enabled_default (bool): Gibt an, ob die Entität standardmäßig
@@ -55,19 +52,21 @@ class TodayIntegralSensor(IntegrationSensor):
     """
 
     _attr_has_entity_name = True
+    _period = PERIOD_DAY
 
-    # pylint: disable=super-init-not-called, too-many-arguments, too-many-locals, line-too-long, too-many-positional-arguments
-    def __init__(self, hass: HomeAssistant, entry, group_id: str, group_name: str, source: PowerSensor) -> None:
+    # pylint: disable=line-too-long
+    def __init__(self, entry: ConfigEntry, engine: PowerGroupEngine, group_id: str, group_name: str) -> None:
         """Initialisiert die Sensorentität für den gesamten Tag.
 
         Args:
-            hass (HomeAssistant): Die Home Assistant-Instanz.
             entry (ConfigEntry): Der Konfigurationseintrag mit den Einstellungen dieser Entität.
-            source_entity_id (str): Die Quell-Entity-ID, die den Wert in Watt liefert.
+            engine (PowerGroupEngine): Die Aggregations-Engine des ConfigEntry.
+            group_id (str): Die ID der Gruppe.
+            group_name (str): Der Name der Gruppe.
 
         """
 
-        self.hass = hass
+        self._engine = engine
         self._group_id = group_id
         self._group_name = group_name
         self._attr_translation_key = self.__class__.__name__
@@ -75,35 +74,9 @@ class TodayIntegralSensor(IntegrationSensor):
         self._attr_unique_id = (
             f"{entry.entry_id}_{self._group_id}_{clean_title(self.__class__.__name__)}"
         )
-        self._source = source
-        self._source_entity = source.entity_id
-        self._sensor_source_id = source.entity_id
         self._round_digits = 3
-        self._state = None
-        self._integration_method = self._method = _IntegrationMethod.from_name(
-            "trapezoidal"
-        )
-
-        self._unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
         self._attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
-        self.unit_prefix = "k"
-        self._unit_prefix_string = "" if self.unit_prefix is None else self.unit_prefix
-        self._unit_of_measurement: str | None = None
-        self._unit_prefix = UNIT_PREFIXES[self.unit_prefix]
-        self.unit_time = UnitOfTime.HOURS
-        self._unit_time = UNIT_TIME[self.unit_time]
-        self._unit_time_str = self.unit_time
-        self._last_valid_state = None
-
-        self._max_sub_interval = timedelta(seconds=120)
-        self._last_integration_time = datetime.now(tz=UTC)
-        self._last_integration_trigger = _IntegrationTrigger.StateEvent
-        self._attr_suggested_display_precision = self._round_digits or 2
-
-        # Zuweisung
-        self._max_sub_interval_exceeded_callback = (
-            self._handle_max_sub_interval_exceeded
-        )
+        self._attr_suggested_display_precision = self._round_digits
 
         # Setzte neue Attribute
         self._entry = entry
@@ -112,47 +85,61 @@ class TodayIntegralSensor(IntegrationSensor):
         self.my_icon = "mdi:counter"
         self._attr_icon = self.my_icon
 
-        # Setze initialen Reset-Zeitpunkt auf heutige Mitternacht lokal
-        self._unsub_time_reset = None
-        local_midnight = dt_util.start_of_local_day()
-        self._last_reset = dt_util.as_utc(local_midnight)
-
-    def _handle_max_sub_interval_exceeded(self):
-        _LOGGER.debug(
-            "[%s] Kein neuer Wert innerhalb von %s empfangen – Integration pausiert",
-            self.entity_id,
-            self._max_sub_interval,
-        )
+        # Setze initialen Reset-Zeitpunkt auf den Beginn der laufenden Periode
+        self._last_reset = dt_util.as_utc(engine.periods.period_start(self._period))
 
     async def async_added_to_hass(self):
         """Wird aufgerufen, wenn die Entität zu Home Assistant hinzugefügt wird.
 
-        Registriert einen täglichen Reset der Energiewerte um 0:00 Uhr lokale Zeit.
+        Übernimmt den gespeicherten Wert der laufenden Periode, sofern die
+        Engine weder aus ihrem Snapshot geladen wurde noch den Stand bereits
+        übernommen hat, und registriert den Sensor beim Integrator der Gruppe
+        sowie bei den Perioden-Grenzen.
         """
-        source_entity_id = self._source.entity_id
-
-        if source_entity_id is None:
-            _LOGGER.warning("Power sensor entity_id is None during standby setup!")
-            return
-
-        self._source_entity = self._source.entity_id
-        self._sensor_source_id = self._source.entity_id
-
-        _LOGGER.debug("Source.entity_id: %s", self._source.entity_id)
-
         await super().async_added_to_hass()
 
-        # Registriere täglichen Reset um 0:00 Uhr lokale Zeit
-        self._unsub_time_reset = async_track_time_change(
-            self.hass,
-            self._reset_energy_daily,
-            hour=0,
-            minute=0,
-            second=0,
+        last_state = await self.async_get_last_state()
+        last_data = await self.async_get_last_sensor_data()
+        if (
+            self._engine.claim_restore(
+                self._group_id, self._engine.energy.period_accumulator(self._period)
+            )
+            and last_state is not None
+            and last_data is not None
+            and last_data.native_value is not None
+        ):
+            self._restore(last_state, float(last_data.native_value))
+
+        self.async_on_remove(
+            self._engine.energy.async_add_listener(self._group_id, self._async_energy_updated)
         )
+        self.async_on_remove(self._engine.periods.async_add_listener(self._async_period_closed))
 
-        if self._unsub_time_reset is not None:
-            self.async_on_remove(self._unsub_time_reset)
+        self._attr_native_value = self._energy()
+        self._update_attributes()
+
+    def _restore(self, last_state, value: float) -> None:
+        """Übernimmt Stand und Vorperiode aus dem gespeicherten Zustand.
+
+        Stammt der Zustand aus der laufenden Periode, wird er fortgesetzt.
+        Stammt er aus einer früheren Periode, ist er der Stand der Vorperiode.
+        """
+        period_start = self._engine.periods.period_start(self._period)
+        accumulator = self._engine.energy.period_accumulator(self._period)
+        if dt_util.as_local(last_state.last_changed) >= period_start:
+            self._engine.energy.integrator(self._group_id).add_energy(accumulator, value)
+            previous = last_state.attributes.get("previous_period")
+        elif last_state.last_changed >= self._engine.periods.period_start(
+            self._period, period_start - timedelta(seconds=1)
+        ):
+            previous = value
+        else:
+            previous = None
+
+        if previous is not None:
+            self._engine.energy.async_restore_previous_energy(
+                self._group_id, self._period, float(previous)
+            )
 
     def set_state_from_migration(self, value: Decimal):
         """Einen valid Status setzen, nach der Migration.
@@ -166,23 +153,50 @@ class TodayIntegralSensor(IntegrationSensor):
         """
 
         _LOGGER.info("Setze neuen State: %s", value)
-        self._state = value
-        self._last_valid_state = value
+        self._engine.energy.integrator(self._group_id).set_energy(
+            self._engine.energy.period_accumulator(self._period), float(value)
+        )
+        self._attr_native_value = self._energy()
         self.async_write_ha_state()
 
-    async def _reset_energy_daily(self, now):
-        """Setzt den Energiewert jeden Tag um Mitternacht zurück.
+    @callback
+    def _async_energy_updated(self):
+        """Übernimmt den aktuellen Tageswert aus dem Integrator."""
+        self._attr_native_value = self._energy()
+        self._engine.coalescer.async_schedule_write(self)
+
+    def _energy(self) -> float:
+        return round(
+            self._engine.energy.integrator(self._group_id).energy(
+                self._engine.energy.period_accumulator(self._period)
+            ),
+            self._round_digits,
+        )
+
+    def _update_attributes(self) -> None:
+        previous = self._engine.energy.previous_energy(self._group_id, self._period)
+        self._attr_extra_state_attributes = {
+            "previous_period": None if previous is None else round(previous, self._round_digits),
+        }
+
+    @callback
+    def _async_period_closed(self, closed: frozenset[str], boundary: datetime):
+        """Übernimmt den Abschluss der Periode an einer Perioden-Grenze.
+
+        Die Engine hat den Akkumulator zu diesem Zeitpunkt bereits zurückgesetzt.
 
         Args:
-            now (datetime): Aktuelle Uhrzeit (automatisch durch den Scheduler übergeben).
+            closed (frozenset[str]): Die an dieser Grenze abgeschlossenen Perioden.
+            boundary (datetime): Zeitpunkt der Grenze.
 
         """
-        # Setze Reset-Zeitpunkt auf aktuelle Mitternacht lokal (als UTC)
-        local_midnight = now
-        self._last_reset = dt_util.as_utc(local_midnight)
-        self._state = 0.0
-        self.async_write_ha_state()
-        _LOGGER.info("Resetting daily energy")
+        if self._period not in closed:
+            return
+        self._last_reset = dt_util.as_utc(boundary)
+        self._attr_native_value = self._energy()
+        self._update_attributes()
+        self._engine.coalescer.async_schedule_write(self)
+        _LOGGER.debug("Periode %s der Gruppe %s abgeschlossen", self._period, self._group_id)
 
     @property
     def last_reset(self):
@@ -1,46 +1,38 @@
 """Oberklassen-Sensor für die Gesamtenergiezählung pro Gruppe.
 
-Dieses Modul definiert eine benutzerdefinierte IntegrationSensor-Entität für Home Assistant,
+Dieses Modul definiert eine benutzerdefinierte Sensor-Entität für Home Assistant,
 die die gesamte Energie über die Zeit aufsummiert.
 
-Die Energiemenge wird mittels der Trapezregel integriert und in Kilowattstunden dargestellt.
+Die Energie wird vom gemeinsamen Integrator der Gruppe in der Aggregations-Engine
+berechnet und in Kilowattstunden dargestellt.
 
 Classes:
     TotalIntegralSensor: Oberklassen-Sensorentität zur Anzeige der aufsummierten Energie
 """
 
-from datetime import UTC, datetime, timedelta
-
 import logging
 
-from homeassistant.components.integration.sensor import (
-    UNIT_PREFIXES,
-    UNIT_TIME,
-    IntegrationSensor,
-    UnitOfTime,
-    _IntegrationMethod,
-    _IntegrationTrigger,
+from homeassistant.components.sensor import (
+    RestoreSensor,
+    SensorDeviceClass,
+    SensorStateClass,
 )
-from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
+from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import UnitOfEnergy
-from homeassistant.core import HomeAssistant
-from homeassistant.util import dt as dt_util
-
-from .power_sensor import PowerSensor
+from homeassistant.core import callback
 
-from ..const import DEVICE_INFO, DOMAIN  # noqa: TID252
+from ..const import DEVICE_INFO, DOMAIN, ENERGY_TOTAL  # noqa: TID252
+from ..core.engine import PowerGroupEngine
 from ..tools import clean_title
 
 _LOGGER = logging.getLogger(__name__)
 
 
-# pylint: disable=too-many-instance-attributes, too-many-instance-attributes, too-many-instance-attributes
-class TotalIntegralSensor(IntegrationSensor):
+class TotalIntegralSensor(RestoreSensor):
     """Sensorentität zur Anzeige der gesamten Energie (kWh).
 
-    Diese Entität summiert Energie über die Zeit auf, um
-    die Insgesamtenergie zu berechnen. Sie nutzt dafür die Trapezregel
-    zur Integration und stellt den Wert in Kilowattstunden dar.
+    Diese Entität zeigt den Gesamt-Akkumulator des gemeinsamen Integrators der
+    Gruppe an.
 
     Attributes:
         _attr_entity_registry_enabled_default (bool): Gibt an, ob die Entität standardmäßig
@@ -55,17 +47,18 @@ class TotalIntegralSensor(IntegrationSensor):
 
     _attr_has_entity_name = True
 
-    # pylint: disable=super-init-not-called, too-many-arguments, too-many-locals, line-too-long, too-many-instance-attributes, too-many-instance-attributes, too-many-positional-arguments
-    def __init__(self, hass: HomeAssistant, entry, group_id, group_name: str, source: PowerSensor) -> None:
+    # pylint: disable=line-too-long
+    def __init__(self, entry: ConfigEntry, engine: PowerGroupEngine, group_id, group_name: str) -> None:
         """Initialisiert die Sensorentität für die gesamte Energie.
 
         Args:
-            hass (HomeAssistant): Die Home Assistant-Instanz.
             entry (ConfigEntry): Der Konfigurationseintrag mit den Einstellungen dieser Entität.
-            source_entity_id (str): Die Quell-Entity-ID, die den Wert in Watt liefert.
+            engine (PowerGroupEngine): Die Aggregations-Engine des ConfigEntry.
+            group_id (str): Die ID der Gruppe.
+            group_name (str): Der Name der Gruppe.
 
         """
-        self.hass = hass
+        self._engine = engine
         self._group_id = group_id
         self._group_name = group_name
         self._attr_translation_key = self.__class__.__name__
@@ -73,35 +66,9 @@ class TotalIntegralSensor(IntegrationSensor):
         self._attr_unique_id = (
             f"{entry.entry_id}_{self._group_id}_{clean_title(self.__class__.__name__)}"
         )
-        self._source = source
-        self._source_entity = source.entity_id
-        self._sensor_source_id = source.entity_id
         self._round_digits = 3
-        self._state = None
-        self._integration_method = self._method = _IntegrationMethod.from_name(
-            "trapezoidal"
-        )
-
-        # self._attr_name = name if name is not None else f"{source_entity} integral"
-        self._unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
         self._attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
-        self.unit_prefix = "k"
-        self._unit_prefix_string = "" if self.unit_prefix is None else self.unit_prefix
-        self._unit_of_measurement: str | None = None
-        self._unit_prefix = UNIT_PREFIXES[self.unit_prefix]
-        self.unit_time = UnitOfTime.HOURS
-        self._unit_time = UNIT_TIME[self.unit_time]
-        self._unit_time_str = self.unit_time
-        self._last_valid_state = None
-        # self._attr_device_info = device_info
-        self._max_sub_interval = timedelta(seconds=120)
-        self._last_integration_time = datetime.now(tz=UTC)
-        self._last_integration_trigger = _IntegrationTrigger.StateEvent
-        self._attr_suggested_display_precision = self._round_digits or 2
-        # Zuweisung
-        self._max_sub_interval_exceeded_callback = (
-            self._handle_max_sub_interval_exceeded
-        )
+        self._attr_suggested_display_precision = self._round_digits
 
         # Setzte neue Attribute
         self._entry = entry
@@ -110,38 +77,41 @@ class TotalIntegralSensor(IntegrationSensor):
         self.my_icon = "mdi:counter"
         self._attr_icon = self.my_icon
 
-        # Setze initialen Reset-Zeitpunkt auf heutige Mitternacht lokal
-        self._unsub_time_reset = None
-        local_midnight = dt_util.start_of_local_day()
-        self._last_reset = dt_util.as_utc(local_midnight)
-
-    def _handle_max_sub_interval_exceeded(self):
-        _LOGGER.debug(
-            "[%s] Kein neuer Wert innerhalb von %s empfangen – Integration pausiert",
-            self.entity_id,
-            self._max_sub_interval,
-        )
-
     async def async_added_to_hass(self):
         """Wird aufgerufen, wenn die Entität zu Home Assistant hinzugefügt wird.
 
-        Registriert einen täglichen Reset der Energiewerte um 0:00 Uhr lokale Zeit.
+        Übernimmt den gespeicherten Gesamtwert in den Integrator der Gruppe,
+        sofern die Engine weder aus ihrem Snapshot geladen wurde noch den Stand
+        bereits übernommen hat, und registriert den Sensor als Listener.
         """
-        source_entity_id = self._source.entity_id
-
-        if source_entity_id is None:
-            _LOGGER.warning("Power sensor entity_id is None during standby setup!")
-            return
+        await super().async_added_to_hass()
 
-        self._source_entity = self._source.entity_id
-        self._sensor_source_id = self._source.entity_id
+        last_data = await self.async_get_last_sensor_data()
+        if (
+            self._engine.claim_restore(self._group_id, ENERGY_TOTAL)
+            and last_data is not None
+            and last_data.native_value is not None
+        ):
+            self._engine.energy.integrator(self._group_id).add_energy(
+                ENERGY_TOTAL, float(last_data.native_value)
+            )
+
+        self.async_on_remove(
+            self._engine.energy.async_add_listener(self._group_id, self._async_energy_updated)
+        )
 
-        _LOGGER.debug("Source.entity_id: %s", self._source.entity_id)
+        self._attr_native_value = self._energy()
 
-        await super().async_added_to_hass()
+    @callback
+    def _async_energy_updated(self):
+        """Übernimmt den aktuellen Gesamtwert aus dem Integrator."""
+        self._attr_native_value = self._energy()
+        self._engine.coalescer.async_schedule_write(self)
 
-        if self._unsub_time_reset is not None:
-            self.async_on_remove(self._unsub_time_reset)
+    def _energy(self) -> float:
+        return round(
+            self._engine.energy.integrator(self._group_id).energy(ENERGY_TOTAL), self._round_digits
+        )
 
     @property
     def icon(self):
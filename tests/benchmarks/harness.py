@@ -0,0 +1,273 @@
+"""Synthetische Umgebung und Ereignisstürme für die Benchmarks.
+
+Eine ``Topology`` beschreibt Anzahl der Gruppen, Mitglieder je Gruppe, den
+Anteil der Mitglieder in kW statt W sowie den Anteil der Mitglieder, die
+zusätzlich in der vorherigen Gruppe liegen. Aus ihr werden die Quell-Entitäten,
+die Gruppen im Gruppen-Store und ein ConfigEntry erzeugt.
+
+``event_storm`` erzeugt daraus reproduzierbar (fester Seed) einen realistischen
+Ereignissturm: Die Werte laufen als Random Walk, wenige Geräte melden sehr
+häufig (Zipf-Verteilung), gelegentlich meldet eine ganze Gruppe auf einmal
+(z.B. nach einem WLAN-Reconnect) und einzelne Mitglieder werden kurz
+``unavailable``. Der Sturm wird vor der Messung vollständig erzeugt, damit
+seine Erzeugung nicht mitgemessen wird.
+
+``async_run_storm`` spielt den Sturm in Schüben ab. Nach jedem Schub werden
+die Timer ausgelöst, die innerhalb von ``burst_interval`` (mindestens dem
+Zeitfenster zum Zusammenfassen) fällig sind. Damit wirkt das Zusammenfassen
+der Schreibvorgänge unabhängig von der Geschwindigkeit der Maschine, und
+Schreibvorgänge und Recorder-Zeilen sind reproduzierbar.
+
+Classes:
+    Topology: Beschreibt eine synthetische Konfiguration.
+    StormResult: Messwerte eines abgespielten Ereignissturms.
+"""
+
+from dataclasses import dataclass, field
+from datetime import timedelta
+import random
+import time
+import tracemalloc
+
+from homeassistant.const import (
+    ATTR_DEVICE_CLASS,
+    ATTR_UNIT_OF_MEASUREMENT,
+    CONF_NAME,
+    EVENT_STATE_CHANGED,
+    STATE_UNAVAILABLE,
+    UnitOfPower,
+)
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.power_group_monitor.const import (
+    CONF_COALESCE_WINDOW,
+    CONF_GROUP_ENTITIES,
+    CONF_GROUP_ID,
+    CONF_GROUP_NAME,
+    CONF_GROUP_STANDBY,
+    CONF_GROUP_STORE,
+    CONF_GROUPS_REVISION,
+    DEFAULT_COALESCE_WINDOW,
+    DOMAIN,
+)
+from custom_components.power_group_monitor.core.group_store import async_get_group_store
+
+# Leistungsbereich (W) der Mitglieder und Anteil der Ereignisse mit ``unavailable``
+MAX_POWER = 3000.0
+UNAVAILABLE_RATE = 0.002
+# Anteil der Schübe, in denen alle Mitglieder einer Gruppe gleichzeitig melden
+GROUP_BURST_RATE = 0.05
+# Exponent der Zipf-Verteilung, mit der Mitglieder gewählt werden
+ZIPF_EXPONENT = 1.1
+
+
+@dataclass(frozen=True)
+class Topology:
+    """Beschreibt eine synthetische Konfiguration und ihren Ereignissturm."""
+
+    name: str
+    groups: int
+    members: int
+    kw_ratio: float = 0.25
+    shared_ratio: float = 0.0
+    events: int = 10_000
+    burst: int = 100
+    burst_interval: float = 1.0
+    coalesce_window: int = DEFAULT_COALESCE_WINDOW
+    seed: int = 1
+
+    def member_ids(self) -> list[list[str]]:
+        """Liefert die Mitglieder je Gruppe.
+
+        Ab der zweiten Gruppe wird der Anteil ``shared_ratio`` der Mitglieder
+        durch Mitglieder der vorherigen Gruppe ersetzt.
+        """
+        groups = [
+            [f"sensor.bench_g{group:03d}_m{member:04d}_power" for member in range(self.members)]
+            for group in range(self.groups)
+        ]
+        shared = int(self.members * self.shared_ratio)
+        for index in range(1, self.groups):
+            groups[index][:shared] = groups[index - 1][-shared:] if shared else []
+        return groups
+
+    def units(self) -> dict[str, str]:
+        """Liefert die Einheit jedes Mitglieds, reproduzierbar aus dem Seed."""
+        rng = random.Random(self.seed)
+        return {
+            entity_id: UnitOfPower.KILO_WATT if rng.random() < self.kw_ratio else UnitOfPower.WATT
+            for entity_id in dict.fromkeys(
+                entity_id for members in self.member_ids() for entity_id in members
+            )
+        }
+
+    def groups_config(self) -> list[dict]:
+        """Liefert die Gruppen, wie sie im Gruppen-Store liegen."""
+        return [
+            {
+                CONF_GROUP_ID: f"bench-{index:03d}",
+                CONF_GROUP_NAME: f"Bench {index:03d}",
+                CONF_GROUP_ENTITIES: members,
+                CONF_GROUP_STANDBY: "0",
+            }
+            for index, members in enumerate(self.member_ids())
+        ]
+
+
+@dataclass
+class StormResult:
+    """Messwerte eines abgespielten Ereignissturms."""
+
+    events: int = 0
+    seconds: float = 0.0
+    latencies_ns: list[int] = field(default_factory=list)
+    state_writes: int = 0
+
+    @property
+    def events_per_second(self) -> float:
+        """Liefert den Durchsatz inklusive Schreibvorgängen zwischen den Schüben."""
+        return self.events / self.seconds if self.seconds else 0.0
+
+    def latency_percentile(self, percent: float) -> float:
+        """Liefert ein Perzentil der Latenz je Ereignis in Mikrosekunden."""
+        if not self.latencies_ns:
+            return 0.0
+        ordered = sorted(self.latencies_ns)
+        index = min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))
+        return ordered[index] / 1000
+
+
+def _attributes(unit: str) -> dict:
+    return {ATTR_UNIT_OF_MEASUREMENT: unit, ATTR_DEVICE_CLASS: "power"}
+
+
+def _format(watts: float, unit: str) -> str:
+    return f"{watts / 1000:.3f}" if unit == UnitOfPower.KILO_WATT else f"{watts:.1f}"
+
+
+def event_storm(topology: Topology) -> list[list[tuple[str, str, dict]]]:
+    """Erzeugt den Ereignissturm einer Topologie als Liste von Schüben.
+
+    Returns:
+        list[list[tuple[str, str, dict]]]: Je Schub die Zustände als
+        ``(entity_id, state, attributes)``.
+
+    """
+    rng = random.Random(topology.seed)
+    units = topology.units()
+    entity_ids = list(units)
+    groups = topology.member_ids()
+    power = {entity_id: rng.uniform(0, MAX_POWER) for entity_id in entity_ids}
+    # Wenige Geräte melden sehr häufig, die meisten selten
+    weights = [1 / (rank + 1) ** ZIPF_EXPONENT for rank in range(len(entity_ids))]
+    chatty = entity_ids[:]
+    rng.shuffle(chatty)
+
+    def reading(entity_id: str) -> tuple[str, str, dict]:
+        unit = units[entity_id]
+        if rng.random() < UNAVAILABLE_RATE:
+            return entity_id, STATE_UNAVAILABLE, _attributes(unit)
+        walk = power[entity_id] + rng.gauss(0, MAX_POWER * 0.02)
+        power[entity_id] = min(MAX_POWER, max(0.0, walk))
+        return entity_id, _format(power[entity_id], unit), _attributes(unit)
+
+    bursts = []
+    remaining = topology.events
+    while remaining > 0:
+        if rng.random() < GROUP_BURST_RATE:
+            members = rng.choice(groups)[:remaining]
+        else:
+            members = rng.choices(chatty, weights=weights, k=min(topology.burst, remaining))
+        bursts.append([reading(entity_id) for entity_id in members])
+        remaining -= len(members)
+    return bursts
+
+
+async def async_setup_topology(hass: HomeAssistant, topology: Topology) -> tuple[MockConfigEntry, int]:
+    """Legt die Quell-Entitäten und einen ConfigEntry an und lädt ihn.
+
+    Returns:
+        tuple[MockConfigEntry, int]: Der geladene Eintrag und die während des
+        Ladens zusätzlich belegten Bytes (``tracemalloc``).
+
+    """
+    for entity_id, unit in topology.units().items():
+        hass.states.async_set(entity_id, "0", _attributes(unit))
+
+    entry_id = f"bench_{topology.name}"
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        entry_id=entry_id,
+        title=topology.name,
+        version=1,
+        minor_version=4,
+        data={
+            CONF_NAME: topology.name,
+            CONF_COALESCE_WINDOW: topology.coalesce_window,
+            CONF_GROUP_STORE: entry_id,
+            CONF_GROUPS_REVISION: 0,
+        },
+    )
+    entry.add_to_hass(hass)
+    store = async_get_group_store(hass, entry.entry_id)
+    store.async_set_groups(topology.groups_config())
+    await store.async_save()
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return entry, allocated
+
+
+def entity_ids_of(hass: HomeAssistant, entry: MockConfigEntry) -> set[str]:
+    """Liefert die Entitäten, die die Integration für einen Eintrag angelegt hat."""
+    return {
+        registry_entry.entity_id
+        for registry_entry in er.async_entries_for_config_entry(er.async_get(hass), entry.entry_id)
+    }
+
+
+async def async_run_storm(
+    hass: HomeAssistant, topology: Topology, bursts: list, entity_ids: set[str]
+) -> StormResult:
+    """Spielt einen Ereignissturm ab und misst Durchsatz, Latenz und Schreibvorgänge.
+
+    Die Latenz eines Ereignisses ist die Dauer von ``async_set``, in der die
+    Engine das Ereignis synchron verarbeitet. Die zusammengefassten
+    Schreibvorgänge am Ende eines Schubs gehen in den Durchsatz ein.
+    """
+    result = StormResult()
+
+    @callback
+    def count_write(event: Event) -> None:
+        if event.data["entity_id"] in entity_ids:
+            result.state_writes += 1
+
+    unsub = hass.bus.async_listen(EVENT_STATE_CHANGED, count_write)
+    async_set = hass.states.async_set
+    clock = time.perf_counter_ns
+    interval = timedelta(seconds=max(topology.burst_interval, topology.coalesce_window / 1000))
+    start = clock()
+    for burst in bursts:
+        for entity_id, state, attributes in burst:
+            began = clock()
+            async_set(entity_id, state, attributes)
+            result.latencies_ns.append(clock() - began)
+        result.events += len(burst)
+        async_fire_time_changed(hass, dt_util.utcnow() + interval)
+        await hass.async_block_till_done()
+    # Restliche zusammengefasste Schreibvorgänge abschließen
+    async_fire_time_changed(hass, dt_util.utcnow() + interval)
+    await hass.async_block_till_done()
+    result.seconds = (clock() - start) / 1e9
+    unsub()
+    return result
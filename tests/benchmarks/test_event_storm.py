@@ -0,0 +1,122 @@
+"""Benchmarks der Aggregation unter Ereignisstürmen.
+
+Je Szenario wird eine synthetische Topologie geladen und ein reproduzierbarer
+Ereignissturm abgespielt. Gemessen werden Ereignisse je Sekunde, Perzentile
+der Latenz je Ereignis, Schreibvorgänge der Sensoren, Zeilen im Recorder und
+der Speicherbedarf je Mitglied.
+
+Ausführen und Ergebnisse schreiben::
+
+    pytest tests/benchmarks --bench --bench-output bench.json
+"""
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.db_schema import States, StatesMeta
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT, UnitOfPower
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.components.recorder.common import (
+    async_wait_recording_done,
+)
+import pytest
+from sqlalchemy import distinct, func
+
+from custom_components.power_group_monitor.const import (
+    CONF_GROUP_ENTITIES,
+    CONF_GROUP_ID,
+    DATA_ENGINE,
+    DOMAIN,
+)
+
+from .harness import (
+    Topology,
+    async_run_storm,
+    async_setup_topology,
+    entity_ids_of,
+    event_storm,
+)
+
+pytestmark = [pytest.mark.asyncio, pytest.mark.benchmark]
+
+SCENARIOS = [
+    Topology("small", groups=5, members=20),
+    Topology("medium", groups=20, members=50, shared_ratio=0.1),
+    Topology("large", groups=50, members=100, events=20_000, burst=250),
+    Topology("uncoalesced", groups=20, members=50, coalesce_window=0),
+]
+
+
+def _count_rows(hass: HomeAssistant, entity_ids: set[str]) -> tuple[int, int]:
+    """Zählt die Zustands- und Attribut-Zeilen der Entitäten im Recorder."""
+    with session_scope(hass=hass, read_only=True) as session:
+        query = (
+            session.query(States)
+            .join(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+            .filter(StatesMeta.entity_id.in_(entity_ids))
+        )
+        return (
+            query.count(),
+            query.with_entities(func.count(distinct(States.attributes_id))).scalar(),
+        )
+
+
+async def _async_recorder_rows(hass: HomeAssistant, entity_ids: set[str]) -> tuple[int, int]:
+    await async_wait_recording_done(hass)
+    return await get_instance(hass).async_add_executor_job(_count_rows, hass, entity_ids)
+
+
+def _watts(hass: HomeAssistant, entity_id: str) -> float:
+    """Liefert den aktuellen Wert eines Mitglieds in Watt, ungültige Werte als 0."""
+    state = hass.states.get(entity_id)
+    try:
+        value = float(state.state)
+    except ValueError:
+        return 0.0
+    if state.attributes.get(ATTR_UNIT_OF_MEASUREMENT) == UnitOfPower.KILO_WATT:
+        return value * 1000
+    return value
+
+
+@pytest.mark.parametrize("topology", SCENARIOS, ids=lambda topology: topology.name)
+async def test_event_storm(
+    recorder_mock,
+    hass: HomeAssistant,
+    topology: Topology,
+    bench_results: dict,
+) -> None:
+    """Spielt einen Ereignissturm ab und erfasst die Kennzahlen des Szenarios."""
+    entry, allocated = await async_setup_topology(hass, topology)
+    entity_ids = entity_ids_of(hass, entry)
+    members = topology.units()
+    bursts = event_storm(topology)
+    rows_before, attribute_rows_before = await _async_recorder_rows(hass, entity_ids)
+
+    result = await async_run_storm(hass, topology, bursts, entity_ids)
+    rows, attribute_rows = await _async_recorder_rows(hass, entity_ids)
+
+    # Die Summen müssen nach dem Sturm zu den letzten Zuständen passen
+    engine = hass.data[DOMAIN][entry.entry_id][DATA_ENGINE]
+    for group in topology.groups_config():
+        expected = sum(_watts(hass, entity_id) for entity_id in group[CONF_GROUP_ENTITIES])
+        assert engine.group_power(group[CONF_GROUP_ID]) == pytest.approx(expected, abs=1e-3)
+
+    metrics = {
+        "groups": topology.groups,
+        "members": len(members),
+        "entities": len(entity_ids),
+        "events": result.events,
+        "events_per_second": round(result.events_per_second, 1),
+        "latency_p50_us": round(result.latency_percentile(50), 2),
+        "latency_p95_us": round(result.latency_percentile(95), 2),
+        "latency_p99_us": round(result.latency_percentile(99), 2),
+        "latency_max_us": round(result.latency_percentile(100), 2),
+        "state_writes": result.state_writes,
+        "writes_per_event": round(result.state_writes / result.events, 4),
+        "recorder_rows": rows - rows_before,
+        "recorder_attribute_rows": attribute_rows - attribute_rows_before,
+        "memory_bytes_per_member": round(allocated / len(members)),
+    }
+    bench_results[topology.name] = metrics
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
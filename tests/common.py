@@ -0,0 +1,79 @@
+"""Gemeinsame Hilfsfunktionen der Tests der Integration."""
+
+from homeassistant.const import ATTR_DEVICE_CLASS, ATTR_UNIT_OF_MEASUREMENT, CONF_NAME
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.power_group_monitor.const import (
+    CONF_GROUP_ENTITIES,
+    CONF_GROUP_ID,
+    CONF_GROUP_NAME,
+    CONF_GROUP_STANDBY,
+    CONF_GROUP_STORE,
+    CONF_GROUPS_REVISION,
+    DATA_ENGINE,
+    DOMAIN,
+)
+from custom_components.power_group_monitor.core.engine import PowerGroupEngine
+from custom_components.power_group_monitor.core.group_store import async_get_group_store
+
+ENTRY_ID = "test"
+
+
+def group(group_id: str, entities: list[str], **settings) -> dict:
+    """Liefert eine Gruppe, wie sie im Gruppen-Store liegt."""
+    return {
+        CONF_GROUP_ID: group_id,
+        CONF_GROUP_NAME: group_id.capitalize(),
+        CONF_GROUP_ENTITIES: entities,
+        CONF_GROUP_STANDBY: "0",
+        **settings,
+    }
+
+
+def set_power(hass: HomeAssistant, entity_id: str, value: str, unit: str = "W") -> None:
+    """Setzt den Zustand eines Leistungssensors."""
+    hass.states.async_set(
+        entity_id, value, {ATTR_UNIT_OF_MEASUREMENT: unit, ATTR_DEVICE_CLASS: "power"}
+    )
+
+
+def mock_entry(minor_version: int = 4, **data) -> MockConfigEntry:
+    """Liefert einen Eintrag mit Verweis auf den Gruppen-Store (Standard: aktuelle Version)."""
+    return MockConfigEntry(
+        domain=DOMAIN,
+        entry_id=ENTRY_ID,
+        title="Test",
+        version=1,
+        minor_version=minor_version,
+        data={CONF_NAME: "Test", CONF_GROUP_STORE: ENTRY_ID, CONF_GROUPS_REVISION: 0, **data},
+    )
+
+
+async def async_store_groups(hass: HomeAssistant, groups: list[dict]) -> None:
+    """Speichert die Gruppen im Gruppen-Store des Test-Eintrags."""
+    store = async_get_group_store(hass, ENTRY_ID)
+    store.async_set_groups(groups)
+    await store.async_save()
+
+
+async def async_setup_groups(hass: HomeAssistant, groups: list[dict], **data) -> MockConfigEntry:
+    """Legt die Gruppen im Store an und lädt einen Eintrag.
+
+    Args:
+        hass (HomeAssistant): Die Home Assistant-Instanz.
+        groups (list[dict]): Die Gruppen des Eintrags.
+        **data: Weitere Einstellungen des Eintrags.
+
+    """
+    entry = mock_entry(**data)
+    entry.add_to_hass(hass)
+    await async_store_groups(hass, groups)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entry
+
+
+def engine_of(hass: HomeAssistant, entry: MockConfigEntry) -> PowerGroupEngine:
+    """Liefert die Aggregations-Engine eines geladenen Eintrags."""
+    return hass.data[DOMAIN][entry.entry_id][DATA_ENGINE]
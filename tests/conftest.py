@@ -0,0 +1,78 @@
+"""Gemeinsame Fixtures und Optionen der Tests.
+
+Die Benchmarks (Marker ``benchmark``) laufen nur mit ``--bench``. Ihre
+Ergebnisse werden mit ``--bench-output`` als JSON geschrieben.
+"""
+
+import json
+from pathlib import Path
+import platform
+import sys
+
+from homeassistant.const import __version__ as HA_VERSION
+from homeassistant.util import dt as dt_util
+import pytest
+
+BENCH_RESULTS = pytest.StashKey[dict]()
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Registriert die Optionen der Benchmarks."""
+    group = parser.getgroup("power_group_monitor benchmarks")
+    group.addoption("--bench", action="store_true", help="Benchmarks ausführen")
+    group.addoption(
+        "--bench-output", type=Path, help="Ergebnisse als JSON in diese Datei schreiben"
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Registriert den Marker und den Speicher der Ergebnisse."""
+    config.addinivalue_line("markers", "benchmark: Benchmark, läuft nur mit --bench")
+    config.stash[BENCH_RESULTS] = {}
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    """Überspringt die Benchmarks ohne ``--bench``."""
+    if config.getoption("--bench"):
+        return
+    skip = pytest.mark.skip(reason="Benchmarks laufen nur mit --bench")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    """Schreibt die gesammelten Ergebnisse der Benchmarks."""
+    config = session.config
+    results = config.stash.get(BENCH_RESULTS, {})
+    if not results or (output := config.getoption("--bench-output")) is None:
+        return
+    output.write_text(
+        json.dumps(
+            {
+                "meta": {
+                    "created": dt_util.utcnow().isoformat(),
+                    "python": sys.version.split()[0],
+                    "homeassistant": HA_VERSION,
+                    "platform": platform.platform(),
+                    "machine": platform.machine(),
+                },
+                "results": dict(sorted(results.items())),
+            },
+            indent=2,
+        )
+        + "\n",
+        encoding="utf-8",
+    )
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Erlaubt das Laden der Integration aus ``custom_components``."""
+    return
+
+
+@pytest.fixture
+def bench_results(request: pytest.FixtureRequest) -> dict:
+    """Liefert den Speicher der Ergebnisse je Szenario."""
+    return request.config.stash[BENCH_RESULTS]
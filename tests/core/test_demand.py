@@ -0,0 +1,55 @@
+"""Tests der Leistungsspitzen fester Messperioden."""
+
+import pytest
+
+from custom_components.power_group_monitor.const import PERIOD_DAY, PERIOD_MONTH
+from custom_components.power_group_monitor.core.demand import DemandTracker
+
+# Mittwoch, 15.01.2025 12:00 UTC, an einer Messperiode ausgerichtet
+START = 1_736_942_400.0
+
+
+def test_partial_first_period_is_not_scaled_up() -> None:
+    """Eine nach dem Start nur teilweise erfasste Messperiode zählt über die volle Länge."""
+    tracker = DemandTracker(900)
+    tracker.add(START + 840, 6000)
+
+    peak = tracker.peak(PERIOD_DAY, START + 900)
+
+    assert peak.value == pytest.approx(6000 * 60 / 900)
+    assert peak.timestamp == START
+
+
+def test_highest_period_wins() -> None:
+    """Der Spitzenwert ist der höchste Mittelwert abgeschlossener Messperioden."""
+    tracker = DemandTracker(900)
+    tracker.add(START, 1000)
+    tracker.add(START + 900, 3000)
+    tracker.add(START + 1350, 1000)
+
+    peak = tracker.peak(PERIOD_MONTH, START + 2700)
+
+    assert peak.value == pytest.approx((3000 * 450 + 1000 * 450) / 900)
+    assert peak.timestamp == START + 900
+
+
+def test_current_is_mean_of_running_period() -> None:
+    """Der laufende Mittelwert bezieht sich auf den bisher erfassten Teil."""
+    tracker = DemandTracker(900)
+    tracker.add(START, 1000)
+    tracker.add(START + 100, 2000)
+
+    assert tracker.current(START + 200) == pytest.approx(1500)
+    assert tracker.peak(PERIOD_DAY, START + 200) is None
+
+
+def test_snapshot_keeps_running_period() -> None:
+    """Ein Snapshot übernimmt die laufende Messperiode und die Spitzenwerte."""
+    tracker = DemandTracker(900)
+    tracker.add(START, 2000)
+    tracker.add(START + 1000, 500)
+
+    restored = DemandTracker.from_dict(tracker.as_dict(), interval=900)
+
+    assert restored.current(START + 1100) == pytest.approx(tracker.current(START + 1100))
+    assert restored.peak(PERIOD_DAY, START + 1100) == tracker.peak(PERIOD_DAY, START + 1100)
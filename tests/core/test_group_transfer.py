@@ -0,0 +1,109 @@
+"""Tests des Imports und Exports von Gruppendefinitionen."""
+
+import pytest
+
+from custom_components.power_group_monitor.const import (
+    CONF_GROUP_CHILDREN,
+    CONF_GROUP_ENTITIES,
+    CONF_GROUP_ID,
+    CONF_GROUP_NAME,
+    CONF_GROUP_STANDBY,
+    IMPORT_FORMAT_CSV,
+    IMPORT_FORMAT_YAML,
+    IMPORT_MODE_MERGE,
+    IMPORT_MODE_REPLACE,
+)
+from custom_components.power_group_monitor.core.group_transfer import (
+    build_groups,
+    export_groups,
+    parse_groups,
+)
+
+YAML = """
+groups:
+  - name: Haus
+    children: [Küche]
+  - name: Küche
+    id: kueche
+    standby: 5
+    entities: [sensor.herd_power, sensor.kuehlschrank_power]
+"""
+
+CSV = """group;entity;parent;standby
+Küche;sensor.herd_power;Haus;5
+Küche;sensor.kuehlschrank_power;;
+"""
+
+
+def _by_name(groups: list[dict]) -> dict[str, dict]:
+    return {group[CONF_GROUP_NAME]: group for group in groups}
+
+
+@pytest.mark.parametrize(("content", "fmt"), [(YAML, IMPORT_FORMAT_YAML), (CSV, IMPORT_FORMAT_CSV)])
+def test_yaml_and_csv_describe_same_groups(content: str, fmt: str) -> None:
+    """YAML und CSV ergeben dieselbe Hierarchie und dieselben Mitglieder."""
+    groups = _by_name(build_groups(parse_groups(content, fmt), [], IMPORT_MODE_REPLACE))
+
+    kitchen = groups["Küche"]
+    assert kitchen[CONF_GROUP_ENTITIES] == ["sensor.herd_power", "sensor.kuehlschrank_power"]
+    assert kitchen[CONF_GROUP_STANDBY] == "5"
+    assert groups["Haus"][CONF_GROUP_CHILDREN] == [kitchen[CONF_GROUP_ID]]
+
+
+def test_ids_are_stable() -> None:
+    """Ein erneuter Import erzeugt dieselben IDs; bestehende Gruppen behalten ihre ID."""
+    first = build_groups(parse_groups(CSV, IMPORT_FORMAT_CSV), [], IMPORT_MODE_REPLACE)
+    second = build_groups(parse_groups(CSV, IMPORT_FORMAT_CSV), [], IMPORT_MODE_REPLACE)
+    existing = [{CONF_GROUP_ID: "alt", CONF_GROUP_NAME: "Haus", CONF_GROUP_ENTITIES: []}]
+    kept = _by_name(build_groups(parse_groups(CSV, IMPORT_FORMAT_CSV), existing, IMPORT_MODE_REPLACE))
+
+    assert first == second
+    assert kept["Haus"][CONF_GROUP_ID] == "alt"
+
+
+def test_merge_keeps_other_groups() -> None:
+    """Beim Zusammenführen bleiben Gruppen erhalten, die nicht in der Datei stehen."""
+    existing = [
+        {CONF_GROUP_ID: "garage", CONF_GROUP_NAME: "Garage", CONF_GROUP_ENTITIES: ["sensor.wallbox_power"]}
+    ]
+
+    merged = _by_name(build_groups(parse_groups(YAML, IMPORT_FORMAT_YAML), existing, IMPORT_MODE_MERGE))
+    replaced = _by_name(build_groups(parse_groups(YAML, IMPORT_FORMAT_YAML), existing, IMPORT_MODE_REPLACE))
+
+    assert merged["Garage"][CONF_GROUP_ENTITIES] == ["sensor.wallbox_power"]
+    assert "Garage" not in replaced
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "- name: A\n- name: A\n",
+        "- name: A\n  entities: [kein_sensor]\n",
+        "- name: A\n  standby: viel\n",
+        "- entities: [sensor.a]\n",
+        "name: A\n",
+    ],
+)
+def test_invalid_definitions_are_rejected(content: str) -> None:
+    """Doppelte Namen, ungültige Entitäten und Werte sowie falsche Strukturen werden abgelehnt."""
+    with pytest.raises(ValueError):
+        parse_groups(content, IMPORT_FORMAT_YAML)
+
+
+@pytest.mark.parametrize(
+    "content", ["- name: A\n  children: [B]\n", "- name: A\n  children: [B]\n- name: B\n  children: [A]\n"]
+)
+def test_unknown_children_and_cycles_are_rejected(content: str) -> None:
+    """Unbekannte Untergruppen und Zyklen werden vor der Übernahme abgelehnt."""
+    with pytest.raises(ValueError):
+        build_groups(parse_groups(content, IMPORT_FORMAT_YAML), [], IMPORT_MODE_REPLACE)
+
+
+@pytest.mark.parametrize("fmt", [IMPORT_FORMAT_YAML, IMPORT_FORMAT_CSV])
+def test_export_round_trip(fmt: str) -> None:
+    """Ein Export lässt sich unverändert wieder importieren."""
+    groups = build_groups(parse_groups(YAML, IMPORT_FORMAT_YAML), [], IMPORT_MODE_REPLACE)
+
+    imported = build_groups(parse_groups(export_groups(groups, fmt), fmt), groups, IMPORT_MODE_REPLACE)
+
+    assert imported == groups
@@ -0,0 +1,51 @@
+"""Tests der Hilfsfunktionen für verschachtelte Gruppen."""
+
+import pytest
+
+from custom_components.power_group_monitor.core.hierarchy import (
+    ancestor_weights,
+    find_cycle,
+    root_groups,
+    topological_order,
+)
+
+# Ein Raum, der über beide Etagen im Haus liegt
+CHILDREN = {
+    "house": ["floor1", "floor2"],
+    "floor1": ["room"],
+    "floor2": ["room"],
+    "room": [],
+}
+
+
+def test_topological_order_puts_children_first() -> None:
+    """Untergruppen stehen vor ihren Obergruppen."""
+    order = topological_order(CHILDREN)
+
+    assert sorted(order) == sorted(CHILDREN)
+    for group_id, children in CHILDREN.items():
+        for child in children:
+            assert order.index(child) < order.index(group_id)
+
+
+def test_ancestor_weights_count_paths() -> None:
+    """Eine über zwei Pfade erreichte Obergruppe zählt doppelt."""
+    weights = ancestor_weights(CHILDREN)
+
+    assert weights["room"] == {"room": 1, "floor1": 1, "floor2": 1, "house": 2}
+    assert weights["house"] == {"house": 1}
+
+
+def test_root_groups() -> None:
+    """Nur Gruppen ohne Obergruppe sind Wurzeln."""
+    assert root_groups(CHILDREN) == ["house"]
+
+
+def test_cycle_is_reported() -> None:
+    """Ein Zyklus wird gefunden und verhindert die Sortierung."""
+    children = {"a": ["b"], "b": ["c"], "c": ["a"]}
+
+    assert find_cycle(children) == ["a", "b", "c", "a"]
+    assert find_cycle(CHILDREN) is None
+    with pytest.raises(ValueError):
+        topological_order(children)
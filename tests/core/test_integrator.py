@@ -0,0 +1,59 @@
+"""Tests des Energie-Integrators einer Gruppe."""
+
+import pytest
+
+from custom_components.power_group_monitor.core.integrator import MJ_PER_KWH, EnergyIntegrator
+
+
+def test_holds_power_until_next_update() -> None:
+    """Die Leistung gilt bis zum nächsten Aufruf (Rechteckregel)."""
+    integrator = EnergyIntegrator(("today", "total"))
+    integrator.update(0, 1000)
+
+    assert integrator.update(1800, 2000) == pytest.approx(0.5)
+    integrator.update(3600)
+
+    assert integrator.energy("today") == pytest.approx(1.5)
+    assert integrator.energy("total") == pytest.approx(1.5)
+
+
+def test_small_slices_do_not_lose_energy() -> None:
+    """Viele kleine Abschnitte verlieren höchstens den noch nicht gebuchten Rest (< 1 mJ)."""
+    integrator = EnergyIntegrator(("total",))
+    integrator.update(0, 0.3)
+    for step in range(1, 36_001):
+        integrator.update(step / 10)
+
+    assert integrator.energy("total") == pytest.approx(0.3 * 3600 / 3_600_000, abs=1 / MJ_PER_KWH)
+
+
+def test_counter_and_cost() -> None:
+    """Gezählte Energie und Kosten laufen über dieselben Akkumulatoren."""
+    integrator = EnergyIntegrator(("today",), ("today",))
+    integrator.price = 0.3
+    integrator.update(0, 2000)
+    integrator.update(1800)
+    integrator.count(1.0)
+
+    assert integrator.energy("today") == pytest.approx(2.0)
+    assert integrator.cost("today") == pytest.approx(0.6)
+    assert integrator.reset("today") == pytest.approx(2.0)
+    assert integrator.energy("today") == 0
+    assert integrator.cost("today") == 0
+
+
+def test_snapshot_bridges_gap_only_when_running() -> None:
+    """Nur ein laufender Snapshot überbrückt die Lücke mit der gehaltenen Leistung."""
+    integrator = EnergyIntegrator(("total",))
+    integrator.update(0, 1000)
+    integrator.update(3600)
+    data = integrator.as_dict()
+
+    running = EnergyIntegrator.from_dict(("total", "week"), data)
+    stopped = EnergyIntegrator.from_dict(("total",), data, running=False)
+    running.update(7200)
+    stopped.update(7200)
+
+    assert running.energy("total") == pytest.approx(2.0)
+    assert running.energy("week") == pytest.approx(1.0)
+    assert stopped.energy("total") == pytest.approx(1.0)
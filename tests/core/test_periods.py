@@ -0,0 +1,47 @@
+"""Tests der Perioden-Grenzen (Woche, Monat, Jahr, Abrechnung)."""
+
+from datetime import date
+
+import pytest
+
+from custom_components.power_group_monitor.const import (
+    PERIOD_BILLING,
+    PERIOD_DAY,
+    PERIOD_MONTH,
+    PERIOD_WEEK,
+    PERIOD_YEAR,
+)
+from custom_components.power_group_monitor.core.periods import (
+    next_period_start_date,
+    period_start_date,
+)
+
+# Mittwoch
+DAY = date(2025, 1, 15)
+
+
+@pytest.mark.parametrize(
+    ("period", "start", "following"),
+    [
+        (PERIOD_DAY, date(2025, 1, 15), date(2025, 1, 16)),
+        (PERIOD_WEEK, date(2025, 1, 13), date(2025, 1, 20)),
+        (PERIOD_MONTH, date(2025, 1, 1), date(2025, 2, 1)),
+        (PERIOD_YEAR, date(2025, 1, 1), date(2026, 1, 1)),
+    ],
+)
+def test_calendar_periods(period: str, start: date, following: date) -> None:
+    """Kalenderperioden beginnen am Montag, am Monatsersten bzw. am Neujahrstag."""
+    assert period_start_date(period, DAY) == start
+    assert next_period_start_date(period, DAY) == following
+
+
+def test_billing_period_before_billing_day() -> None:
+    """Vor dem Abrechnungstag gehört ein Tag zur Periode des Vormonats."""
+    assert period_start_date(PERIOD_BILLING, date(2025, 1, 14), 15) == date(2024, 12, 15)
+    assert next_period_start_date(PERIOD_BILLING, date(2025, 1, 14), 15) == date(2025, 1, 15)
+
+
+def test_billing_period_on_billing_day() -> None:
+    """Am Abrechnungstag beginnt eine neue Periode, auch über den Jahreswechsel."""
+    assert period_start_date(PERIOD_BILLING, date(2024, 12, 15), 15) == date(2024, 12, 15)
+    assert next_period_start_date(PERIOD_BILLING, date(2024, 12, 20), 15) == date(2025, 1, 15)
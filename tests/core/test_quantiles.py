@@ -0,0 +1,64 @@
+"""Tests der Quantil-Skizzen für Leistungswerte."""
+
+import pytest
+
+from custom_components.power_group_monitor.core.quantiles import (
+    PowerQuantiles,
+    QuantileSketch,
+)
+
+
+def test_quantiles_within_relative_accuracy() -> None:
+    """Die Quantile liegen innerhalb der garantierten relativen Genauigkeit."""
+    sketch = QuantileSketch(relative_accuracy=0.01)
+    for value in range(1, 1001):
+        sketch.add(value)
+
+    for q, expected in ((0.5, 500), (0.9, 900), (0.99, 990)):
+        assert sketch.quantile(q) == pytest.approx(expected, rel=0.01)
+    assert QuantileSketch().quantile(0.5) is None
+
+
+def test_merge_equals_single_sketch() -> None:
+    """Zusammengeführte Skizzen liefern dieselben Quantile wie eine gemeinsame."""
+    single, first, second = QuantileSketch(), QuantileSketch(), QuantileSketch()
+    for value in (-50, 0, 10, 200, 3000):
+        single.add(value)
+        first.add(value)
+    for value in (5, 70, 1500):
+        single.add(value, 2)
+        second.add(value, 2)
+
+    first.merge(second)
+
+    for q in (0.0, 0.1, 0.5, 0.9, 1.0):
+        assert first.quantile(q) == single.quantile(q)
+    with pytest.raises(ValueError):
+        first.merge(QuantileSketch(relative_accuracy=0.05))
+
+
+def test_power_is_weighted_by_duration() -> None:
+    """Die Leistung zählt mit ihrer Haltedauer."""
+    quantiles = PowerQuantiles()
+    quantiles.update(0, 100)
+    quantiles.update(3 * 3600, 1000)
+
+    assert quantiles.quantile(0.5, 4 * 3600) == pytest.approx(100, rel=0.01)
+    assert quantiles.quantile(0.9, 4 * 3600) == pytest.approx(1000, rel=0.01)
+
+
+def test_week_keeps_previous_days() -> None:
+    """Die gleitende Woche enthält die abgeschlossenen Tage und den laufenden Tag."""
+    quantiles = PowerQuantiles(days=2)
+    quantiles.update(0, 100)
+    quantiles.rollover(86400)
+    quantiles.update(86400, 1000)
+    quantiles.rollover(2 * 86400)
+    quantiles.update(2 * 86400, 10)
+    quantiles.update(3 * 86400)
+
+    restored = PowerQuantiles.from_dict(quantiles.as_dict(), days=2)
+
+    for merged in (quantiles.week(), restored.week()):
+        assert merged.count == pytest.approx(2 * 86400)
+        assert merged.quantile(0.9) == pytest.approx(1000, rel=0.01)
@@ -0,0 +1,46 @@
+"""Tests des Strompreises aus Zeitplan und Preis-Entität."""
+
+from datetime import time
+
+import pytest
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.power_group_monitor.core.tariff import (
+    Tariff,
+    parse_schedule,
+    price_factor,
+)
+
+
+def test_parse_schedule_sorts_entries() -> None:
+    """Einträge werden nach Uhrzeit sortiert; Dezimalkomma und Zeilenumbrüche sind erlaubt."""
+    schedule = parse_schedule("22:00=0,28\n06:00=0.35; ")
+
+    assert schedule == [(time(6), 0.35), (time(22), 0.28)]
+    assert parse_schedule(None) == []
+
+
+@pytest.mark.parametrize("text", ["06:00=0.3; 06:00=0.4", "6 Uhr=0.3", "06:00=teuer"])
+def test_parse_schedule_rejects_invalid_entries(text: str) -> None:
+    """Doppelte Umschaltzeiten und unlesbare Einträge werden abgelehnt."""
+    with pytest.raises(ValueError):
+        parse_schedule(text)
+
+
+@pytest.mark.parametrize(
+    ("unit", "factor"), [("EUR/kWh", 1.0), ("EUR/MWh", 0.001), ("ct/Wh", 1000.0), (None, 1.0)]
+)
+def test_price_factor(unit: str | None, factor: float) -> None:
+    """Preise je MWh oder Wh werden auf eine kWh umgerechnet."""
+    assert price_factor(unit) == factor
+
+
+def test_price_before_first_switch_wraps_to_last() -> None:
+    """Vor der ersten Umschaltzeit gilt der Preis der letzten des Vortags."""
+    tariff = Tariff(None, None, parse_schedule("06:00=0.35; 22:00=0.28"), lambda *_: None)
+    today = dt_util.as_local(dt_util.utcnow())
+
+    assert tariff._price_at(today.replace(hour=3, minute=0)) == 0.28
+    assert tariff._price_at(today.replace(hour=6, minute=0)) == 0.35
+    assert tariff._price_at(today.replace(hour=23, minute=0)) == 0.28
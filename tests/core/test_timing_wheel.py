@@ -0,0 +1,49 @@
+"""Tests des Timing Wheels für die Ablaufzeiten der Mitglieder."""
+
+from custom_components.power_group_monitor.core.timing_wheel import TimingWheel
+
+
+def test_expires_in_first_tick_after_deadline() -> None:
+    """Ein Eintrag läuft im ersten Tick nach seiner Ablaufzeit ab."""
+    wheel = TimingWheel(10, 0)
+    wheel.schedule("sensor.a", 25)
+
+    assert wheel.advance(29) == []
+    assert wheel.advance(30) == ["sensor.a"]
+    assert "sensor.a" not in wheel
+
+
+def test_reschedule_moves_deadline() -> None:
+    """Ein erneutes Einplanen verschiebt die Ablaufzeit."""
+    wheel = TimingWheel(10, 0)
+    wheel.schedule("sensor.a", 25)
+    wheel.schedule("sensor.a", 55)
+
+    assert wheel.advance(30) == []
+    assert wheel.advance(60) == ["sensor.a"]
+
+
+def test_cancel_removes_entry() -> None:
+    """Ein entfernter Eintrag läuft nicht mehr ab."""
+    wheel = TimingWheel(10, 0)
+    wheel.schedule("sensor.a", 25)
+    wheel.cancel("sensor.a")
+    wheel.cancel("sensor.a")
+
+    assert len(wheel) == 0
+    assert wheel.advance(100) == []
+
+
+def test_far_deadlines_cascade_through_levels() -> None:
+    """Einträge auf höheren Ebenen laufen zum richtigen Tick ab."""
+    wheel = TimingWheel(1, 0, slots=4, levels=3)
+    deadlines = {f"sensor.m{index}": index * 7 + 1 for index in range(20)}
+    for key, deadline in deadlines.items():
+        wheel.schedule(key, deadline)
+
+    expired = {}
+    for now in range(200):
+        for key in wheel.advance(now):
+            expired[key] = now
+
+    assert expired == deadlines
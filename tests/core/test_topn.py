@@ -0,0 +1,43 @@
+"""Tests des indizierten Max-Heaps für die größten Verbraucher."""
+
+import random
+
+from custom_components.power_group_monitor.core.topn import IndexedMaxHeap
+
+
+def test_top_after_updates_and_removal() -> None:
+    """Änderungen und Entfernen halten die Reihenfolge der größten Einträge."""
+    heap = IndexedMaxHeap()
+    heap.rebuild({"sensor.a": 100, "sensor.b": 300, "sensor.c": 200})
+    heap.set("sensor.d", 250)
+    heap.set("sensor.b", 50)
+    heap.remove("sensor.c")
+    heap.remove("sensor.missing")
+
+    assert heap.top(2) == [("sensor.d", 250), ("sensor.a", 100)]
+    assert heap.get("sensor.b") == 50
+    assert "sensor.c" not in heap
+    assert len(heap) == 3
+
+
+def test_matches_sorting_under_random_changes() -> None:
+    """Nach zufälligen Änderungen entspricht ``top`` einer vollständigen Sortierung."""
+    rng = random.Random(1)
+    heap = IndexedMaxHeap()
+    values: dict[str, float] = {}
+    for _ in range(2000):
+        key = f"sensor.m{rng.randrange(50)}"
+        if rng.random() < 0.1:
+            heap.remove(key)
+            values.pop(key, None)
+        else:
+            values[key] = rng.uniform(0, 3000)
+            heap.set(key, values[key])
+
+    expected = sorted(values.items(), key=lambda item: item[1], reverse=True)[:5]
+    assert heap.top(5) == expected
+
+
+def test_top_of_empty_heap() -> None:
+    """Ein leerer Heap liefert keine Einträge."""
+    assert IndexedMaxHeap().top(3) == []
@@ -0,0 +1,33 @@
+"""Tests des Zwischenspeichers für Einheiten der Quell-Entitäten."""
+
+import pytest
+
+from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT
+from homeassistant.core import State
+
+from custom_components.power_group_monitor.core.units import (
+    KIND_ENERGY,
+    KIND_POWER,
+    UnitCache,
+)
+
+
+def test_reads_power_and_energy() -> None:
+    """Leistung wird in Watt, Zählerstände werden in kWh geliefert."""
+    cache = UnitCache()
+
+    power = State("sensor.herd_power", "1.5", {ATTR_UNIT_OF_MEASUREMENT: "kW"})
+    energy = State("sensor.herd_energy", "2500", {ATTR_UNIT_OF_MEASUREMENT: "Wh"})
+
+    assert cache.read("sensor.herd_power", power) == (KIND_POWER, pytest.approx(1500))
+    assert cache.read("sensor.herd_energy", energy) == (KIND_ENERGY, pytest.approx(2.5))
+
+
+@pytest.mark.parametrize("value", ["nan", "inf", "-inf", "unavailable", "unknown"])
+def test_rejects_invalid_values(value: str) -> None:
+    """Nicht endliche und ungültige Werte gelten wie ``unavailable`` als ohne Wert."""
+    cache = UnitCache()
+    state = State("sensor.herd_power", value, {ATTR_UNIT_OF_MEASUREMENT: "W"})
+
+    assert cache.read("sensor.herd_power", state) is None
+    assert cache.to_watts("sensor.herd_power", state) is None
@@ -0,0 +1,69 @@
+"""Tests des Messwertspeichers mit gleitenden Zeitfenstern."""
+
+import pytest
+
+from custom_components.power_group_monitor.core.window_stats import SampleStore
+
+
+def test_value_held_longer_than_window() -> None:
+    """Ein länger als das Fenster gehaltener Wert bleibt nach einer Änderung im Fenster."""
+    store = SampleStore([900])
+    store.add(0, 800)
+    store.add(1200, 300)
+
+    stats = store.stats(900, 1205)
+
+    assert stats.mean == pytest.approx((800 * 895 + 300 * 5) / 900)
+    assert stats.maximum == 800
+    assert stats.minimum == 300
+
+
+def test_value_held_expires_after_window() -> None:
+    """Ein Wert verlässt das Fenster erst, wenn er vollständig davor liegt."""
+    store = SampleStore([60])
+    store.add(0, 800)
+    store.add(100, 300)
+
+    stats = store.stats(60, 200)
+
+    assert stats.mean == pytest.approx(300)
+    assert stats.maximum == 300
+
+
+def test_sample_before_last_read_is_kept() -> None:
+    """Ein Ereignis kurz vor dem letzten Abruf wird ab dem Abruf übernommen."""
+    store = SampleStore([60])
+    store.add(1000, 100)
+    store.stats(60, 1010)
+    store.add(1009.9, 5000)
+
+    stats = store.stats(60, 1020)
+
+    assert stats.maximum == 5000
+    assert stats.mean == pytest.approx((100 * 10 + 5000 * 10) / 20)
+
+
+def test_multiple_windows_share_one_store() -> None:
+    """Mehrere Fenster werden aus denselben Segmenten bedient."""
+    store = SampleStore([60, 300])
+    store.add(0, 100)
+    store.add(200, 400)
+
+    short = store.stats(60, 260)
+    long = store.stats(300, 260)
+
+    assert short.mean == pytest.approx(400)
+    assert long.mean == pytest.approx((100 * 200 + 400 * 60) / 260)
+    assert long.minimum == 100
+
+
+def test_snapshot_round_trip() -> None:
+    """Ein aus dem Snapshot geladener Speicher liefert dieselben Kennzahlen."""
+    store = SampleStore([60, 900])
+    for second in range(0, 1200, 7):
+        store.add(second, second % 500)
+
+    restored = SampleStore.from_dict([60, 900], store.as_dict())
+
+    for length in (60, 900):
+        assert restored.stats(length, 1210) == pytest.approx(store.stats(length, 1210))
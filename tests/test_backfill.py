@@ -0,0 +1,77 @@
+"""Tests des Backfills aus der History des Recorders."""
+
+from datetime import timedelta
+from unittest.mock import AsyncMock, patch
+
+from homeassistant.components.recorder import Recorder
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+import pytest
+from pytest_homeassistant_custom_component.components.recorder.common import (
+    async_wait_recording_done,
+)
+
+from custom_components.power_group_monitor.const import DATA_STATISTICS, DOMAIN, ENERGY_TOTAL
+from custom_components.power_group_monitor.core.backfill import async_backfill_group
+from custom_components.power_group_monitor.core.statistics import (
+    STATISTIC_ENERGY,
+    statistic_id,
+)
+
+from .common import async_setup_groups, engine_of, group, set_power
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_backfill_keeps_total_before_window(
+    recorder_mock: Recorder, hass: HomeAssistant
+) -> None:
+    """Der Gesamtzähler behält die vor dem Zeitraum gezählte Energie."""
+    set_power(hass, "sensor.herd_power", "0")
+    entry = await async_setup_groups(hass, [group("kitchen", ["sensor.herd_power"])])
+    statistics = hass.data[DOMAIN][entry.entry_id][DATA_STATISTICS]
+    await statistics.async_wait_started()
+    await async_wait_recording_done(hass)
+
+    engine = engine_of(hass, entry)
+    engine.energy.async_set_energy("kitchen", {ENERGY_TOTAL: 5.0})
+
+    assert await async_backfill_group(hass, engine, statistics, "kitchen", 1)
+
+    assert engine.energy.integrator("kitchen").energy(ENERGY_TOTAL) == pytest.approx(5.0)
+
+
+async def test_import_continues_sum_and_corrects_total(hass: HomeAssistant) -> None:
+    """Die Statistik setzt die Summe vor dem Zeitraum fort und korrigiert die Gesamtsumme."""
+    set_power(hass, "sensor.herd_power", "0")
+    entry = await async_setup_groups(hass, [group("kitchen", ["sensor.herd_power"])])
+    statistics = hass.data[DOMAIN][entry.entry_id][DATA_STATISTICS]
+
+    first = dt_util.utcnow().replace(minute=0, second=0, microsecond=0) - timedelta(hours=2)
+    group_id = statistic_id(entry, "kitchen", STATISTIC_ENERGY)
+    total_id = statistic_id(entry, None, STATISTIC_ENERGY)
+    # Bisher geschrieben: 10 kWh vor dem Zeitraum, 2 kWh in der ersten Stunde;
+    # die Gesamtsumme enthält dort weitere 3 kWh anderer Gruppen
+    statistics._unsub = lambda: None
+    statistics._sums = {group_id: 12.0, total_id: 30.0}
+    recorded = {"kitchen": {first.timestamp(): 2.0}, None: {first.timestamp(): 5.0}}
+
+    with (
+        patch.object(
+            statistics,
+            "async_recorded_hours",
+            AsyncMock(side_effect=lambda group_id, start: recorded[group_id]),
+        ),
+        patch(
+            "custom_components.power_group_monitor.core.statistics.async_add_external_statistics"
+        ) as add_statistics,
+    ):
+        await statistics.async_import_history(
+            "kitchen", [(first, 3.0), (first + timedelta(hours=1), 1.0)]
+        )
+
+    rows = {
+        metadata["statistic_id"]: rows for (_, metadata, rows), _ in add_statistics.call_args_list
+    }
+    assert [row["sum"] for row in rows[group_id]] == [13.0, 14.0]
+    assert [row["sum"] for row in rows[total_id]] == [31.0, 32.0]
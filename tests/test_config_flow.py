@@ -0,0 +1,95 @@
+"""Tests des Konfigurations-Flows."""
+
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+import pytest
+
+from custom_components.power_group_monitor.const import (
+    CONF_GROUP_CHILDREN,
+    CONF_GROUP_ID,
+    CONF_GROUP_NAME,
+    CONF_IMPORT_CONTENT,
+    CONF_IMPORT_FORMAT,
+    CONF_IMPORT_MODE,
+    CONF_NEXT_STEP,
+    IMPORT_FORMAT_CSV,
+    IMPORT_MODE_REPLACE,
+)
+from custom_components.power_group_monitor.core.group_store import async_get_group_store
+
+from .common import ENTRY_ID, async_setup_groups, group, set_power
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_edit_rejects_group_cycle(hass: HomeAssistant) -> None:
+    """Eine Untergruppe, die die Gruppe selbst enthält, wird abgelehnt."""
+    set_power(hass, "sensor.herd_power", "100")
+    entry = await async_setup_groups(
+        hass,
+        [
+            group("house", [], **{CONF_GROUP_CHILDREN: ["kitchen"]}),
+            group("kitchen", ["sensor.herd_power"]),
+        ],
+    )
+
+    result = await entry.start_reconfigure_flow(hass)
+    flow_id = result["flow_id"]
+    await hass.config_entries.flow.async_configure(flow_id, {CONF_NEXT_STEP: "edit"})
+    result = await hass.config_entries.flow.async_configure(flow_id, {CONF_GROUP_ID: "kitchen"})
+    assert result["step_id"] == "edit_group"
+
+    result = await hass.config_entries.flow.async_configure(
+        flow_id, {CONF_GROUP_CHILDREN: ["house"]}
+    )
+
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == "edit_group"
+    assert result["errors"] == {"base": "group_cycle"}
+
+
+async def test_import_and_export_through_flow(hass: HomeAssistant) -> None:
+    """Importierte Gruppen werden exportiert und beim Abschluss gespeichert."""
+    set_power(hass, "sensor.herd_power", "100")
+    set_power(hass, "sensor.tv_power", "50")
+    entry = await async_setup_groups(hass, [group("kitchen", ["sensor.herd_power"])])
+
+    result = await entry.start_reconfigure_flow(hass)
+    flow_id = result["flow_id"]
+    await hass.config_entries.flow.async_configure(flow_id, {CONF_NEXT_STEP: "import"})
+    result = await hass.config_entries.flow.async_configure(
+        flow_id,
+        {
+            CONF_IMPORT_FORMAT: IMPORT_FORMAT_CSV,
+            CONF_IMPORT_MODE: IMPORT_MODE_REPLACE,
+            CONF_IMPORT_CONTENT: (
+                "group,entity,parent\n"
+                "Kitchen,sensor.herd_power,House\n"
+                "Living,sensor.tv_power,House\n"
+                "House,,\n"
+            ),
+        },
+    )
+    assert result["step_id"] == "reconfigure_menu"
+
+    await hass.config_entries.flow.async_configure(flow_id, {CONF_NEXT_STEP: "export"})
+    result = await hass.config_entries.flow.async_configure(
+        flow_id, {CONF_IMPORT_FORMAT: IMPORT_FORMAT_CSV}
+    )
+    assert result["step_id"] == "export_result"
+    exported = result["data_schema"]({})[CONF_IMPORT_CONTENT]
+    assert "Living,sensor.tv_power,House" in exported
+
+    await hass.config_entries.flow.async_configure(flow_id, {})
+    result = await hass.config_entries.flow.async_configure(flow_id, {CONF_NEXT_STEP: "finish"})
+    await hass.async_block_till_done()
+
+    assert result["type"] is FlowResultType.ABORT
+    groups = {g[CONF_GROUP_NAME]: g for g in async_get_group_store(hass, ENTRY_ID).groups}
+    assert set(groups) == {"Kitchen", "Living", "House"}
+    # Die bestehende Gruppe behält ihre ID und damit ihre Energiezähler
+    assert groups["Kitchen"][CONF_GROUP_ID] == "kitchen"
+    assert set(groups["House"][CONF_GROUP_CHILDREN]) == {
+        "kitchen",
+        groups["Living"][CONF_GROUP_ID],
+    }
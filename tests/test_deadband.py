@@ -0,0 +1,60 @@
+"""Tests des Filters für signifikante Änderungen."""
+
+from datetime import timedelta
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+import pytest
+
+from custom_components.power_group_monitor.core.deadband import SignificantChangeWriter
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _async_wait(hass: HomeAssistant, seconds: float) -> None:
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=seconds))
+    await hass.async_block_till_done()
+
+
+async def test_small_changes_are_held_back(hass: HomeAssistant) -> None:
+    """Änderungen innerhalb des Totbands werden erst mit dem Heartbeat geschrieben."""
+    writes = []
+    writer = SignificantChangeWriter(hass, writes.append, 10, 0, 60)
+
+    writer.async_update(100)
+    writer.async_update(105)
+    writer.async_update(120)
+    assert writes == [100, 120]
+
+    writer.async_update(125)
+    await _async_wait(hass, 61)
+    assert writes == [100, 120, 125]
+    writer.async_shutdown()
+
+
+async def test_heartbeat_rewrites_unchanged_value(hass: HomeAssistant) -> None:
+    """Ein unveränderter Wert wird nach jeder Ruhezeit erneut geschrieben."""
+    writes = []
+    writer = SignificantChangeWriter(hass, writes.append, 10, 0, 60)
+
+    writer.async_update(100)
+    await _async_wait(hass, 61)
+    await _async_wait(hass, 122)
+    assert writes == [100, 100, 100]
+
+    writer.async_shutdown()
+    await _async_wait(hass, 300)
+    assert writes == [100, 100, 100]
+
+
+async def test_without_heartbeat_nothing_is_rewritten(hass: HomeAssistant) -> None:
+    """Ohne Heartbeat bleibt ein unveränderter Wert ungeschrieben."""
+    writes = []
+    writer = SignificantChangeWriter(hass, writes.append, 10, 0, 0)
+
+    writer.async_update(100)
+    writer.async_update(101)
+    await _async_wait(hass, 3600)
+
+    assert writes == [100]
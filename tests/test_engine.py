@@ -0,0 +1,95 @@
+"""Tests der Aggregations-Engine im geladenen Eintrag."""
+
+from datetime import timedelta
+
+from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT, EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant, State
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.power_group_monitor.const import (
+    AVERAGE_WINDOW,
+    CONF_GROUP_MAX_AGE,
+    DOMAIN,
+)
+from custom_components.power_group_monitor.core.units import KIND_POWER
+
+from .common import async_setup_groups, engine_of, group, set_power
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_member_reported_too_long_ago_is_ignored(hass: HomeAssistant) -> None:
+    """Ein Zustand, dessen letzter Bericht älter als das maximale Alter ist, zählt nicht."""
+    set_power(hass, "sensor.herd_power", "100")
+    entry = await async_setup_groups(
+        hass, [group("kitchen", ["sensor.herd_power"], **{CONF_GROUP_MAX_AGE: 5})]
+    )
+    engine = engine_of(hass, entry)
+    assert engine.group_power("kitchen") == 100
+
+    reported = dt_util.utcnow() - timedelta(minutes=10)
+    state = State(
+        "sensor.herd_power",
+        "500",
+        {ATTR_UNIT_OF_MEASUREMENT: "W"},
+        last_changed=reported,
+        last_reported=reported,
+        last_updated=reported,
+    )
+    event = Event(EVENT_STATE_CHANGED, {"entity_id": "sensor.herd_power", "new_state": state})
+    engine._async_member_changed(event, (KIND_POWER, 500.0))
+
+    assert engine.group_power("kitchen") == 0
+    assert engine.stale_members("kitchen") == ["sensor.herd_power"]
+
+
+async def test_average_all_follows_total_store_in_sum_mode(hass: HomeAssistant) -> None:
+    """Der Gesamtdurchschnitt stammt auch als Summe der Gruppen aus der Engine."""
+    set_power(hass, "sensor.herd_power", "100")
+    set_power(hass, "sensor.tv_power", "50")
+    entry = await async_setup_groups(
+        hass,
+        [group("kitchen", ["sensor.herd_power"]), group("living", ["sensor.tv_power"])],
+    )
+    engine = engine_of(hass, entry)
+    assert engine.window_stats(None, AVERAGE_WINDOW).mean == pytest.approx(150)
+
+    entity_id = er.async_get(hass).async_get_entity_id(
+        "sensor", DOMAIN, f"{entry.entry_id}_avg_all_power"
+    )
+    set_power(hass, "sensor.herd_power", "300")
+    await hass.async_block_till_done()
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=5))
+    await hass.async_block_till_done()
+
+    average = engine.window_stats(None, AVERAGE_WINDOW).mean
+    assert float(hass.states.get(entity_id).state) == pytest.approx(average, abs=1)
+
+
+async def test_group_and_total_sensors_follow_engine(hass: HomeAssistant) -> None:
+    """Gruppen- und Gesamtsensor zeigen die Summen der gemeinsamen Engine."""
+    set_power(hass, "sensor.herd_power", "100")
+    set_power(hass, "sensor.tv_power", "0.05", unit="kW")
+    entry = await async_setup_groups(
+        hass,
+        [group("kitchen", ["sensor.herd_power"]), group("living", ["sensor.tv_power"])],
+    )
+    engine = engine_of(hass, entry)
+    registry = er.async_get(hass)
+    kitchen = registry.async_get_entity_id(
+        "sensor", DOMAIN, f"{entry.entry_id}_kitchen_power_sensor"
+    )
+    total = registry.async_get_entity_id("sensor", DOMAIN, f"{entry.entry_id}_power_total_sensor")
+
+    set_power(hass, "sensor.herd_power", "300")
+    await hass.async_block_till_done()
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=5))
+    await hass.async_block_till_done()
+
+    assert engine.group_power("kitchen") == 300
+    assert engine.total_power == 350
+    assert float(hass.states.get(kitchen).state) == 300
+    assert float(hass.states.get(total).state) == 350
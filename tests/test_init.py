@@ -0,0 +1,67 @@
+"""Tests der Einrichtung und Migration der Einträge."""
+
+from homeassistant.const import CONF_NAME
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.power_group_monitor.const import (
+    CONF_GROUP_STORE,
+    CONF_GROUPS,
+    CONF_GROUPS_REVISION,
+    DOMAIN,
+)
+from custom_components.power_group_monitor.core.group_store import async_get_group_store
+
+from .common import ENTRY_ID, async_store_groups, engine_of, group, mock_entry, set_power
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_migrate_groups_into_store(hass: HomeAssistant) -> None:
+    """Die Version 1.2 verschiebt die Gruppen aus ConfigEntry.data in den Store."""
+    set_power(hass, "sensor.herd_power", "100")
+    groups = [group("kitchen", ["sensor.herd_power"])]
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        entry_id=ENTRY_ID,
+        title="Test",
+        version=1,
+        minor_version=2,
+        data={CONF_NAME: "Test", CONF_GROUPS: groups},
+    )
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert entry.minor_version == 4
+    assert CONF_GROUPS not in entry.data
+    assert entry.data[CONF_GROUP_STORE] == ENTRY_ID
+    assert entry.data[CONF_GROUPS_REVISION] == 0
+    assert await async_get_group_store(hass, ENTRY_ID).async_load() == groups
+    assert engine_of(hass, entry).group_power("kitchen") == 100
+
+
+async def test_migrate_average_unique_id_to_group_id(hass: HomeAssistant) -> None:
+    """Der Durchschnittssensor wird von der Version 1.3 auf die Gruppen-ID umgestellt."""
+    set_power(hass, "sensor.herd_power", "100")
+    entry = mock_entry(minor_version=3)
+    entry.add_to_hass(hass)
+    await async_store_groups(hass, [group("kitchen", ["sensor.herd_power"])])
+    registry = er.async_get(hass)
+    average = registry.async_get_or_create(
+        "sensor",
+        DOMAIN,
+        f"{ENTRY_ID}_Kitchen_avg_power",
+        config_entry=entry,
+        suggested_object_id="kitchen_average",
+    )
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert entry.minor_version == 4
+    assert registry.async_get(average.entity_id).unique_id == f"{ENTRY_ID}_kitchen_avg_power"
+    assert registry.async_get_entity_id("sensor", DOMAIN, f"{ENTRY_ID}_Kitchen_avg_power") is None
@@ -0,0 +1,33 @@
+"""Tests der dynamischen Mitgliedschaft im geladenen Eintrag."""
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+import pytest
+
+from custom_components.power_group_monitor.const import CONF_GROUP_PATTERN
+
+from .common import async_setup_groups, engine_of, group, set_power
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_pattern_does_not_match_own_sensors(hass: HomeAssistant) -> None:
+    """Ein Muster nimmt die Sensoren der Integration nicht in die Gruppe auf."""
+    registry = er.async_get(hass)
+    registry.async_get_or_create(
+        "sensor", "test", "herd", suggested_object_id="herd_power", original_device_class="power"
+    )
+    set_power(hass, "sensor.herd_power", "300")
+
+    entry = await async_setup_groups(
+        hass, [group("kitchen", [], **{CONF_GROUP_PATTERN: "sensor.*"})]
+    )
+    engine = engine_of(hass, entry)
+    own = {
+        registry_entry.entity_id
+        for registry_entry in er.async_entries_for_config_entry(registry, entry.entry_id)
+    }
+
+    assert own
+    assert engine.members.group_members("kitchen") == {"sensor.herd_power": 1}
+    assert engine.group_power("kitchen") == 300
@@ -0,0 +1,84 @@
+"""Tests der Übernahme geänderter Gruppen ohne Neuladen des Eintrags."""
+
+from homeassistant.core import HomeAssistant
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.power_group_monitor.const import (
+    CONF_GROUP_NAME,
+    CONF_GROUPS_REVISION,
+    DATA_GROUP_ENTITIES,
+    DOMAIN,
+    ENERGY_TOTAL,
+)
+
+from .common import async_setup_groups, async_store_groups, engine_of, group, set_power
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _async_change_groups(
+    hass: HomeAssistant, entry: MockConfigEntry, groups: list[dict]
+) -> None:
+    """Speichert geänderte Gruppen und meldet sie über eine neue Revision."""
+    await async_store_groups(hass, groups)
+    hass.config_entries.async_update_entry(
+        entry, data={**entry.data, CONF_GROUPS_REVISION: entry.data[CONF_GROUPS_REVISION] + 1}
+    )
+    await hass.async_block_till_done()
+
+
+async def test_changed_members_keep_engine_and_sensors(hass: HomeAssistant) -> None:
+    """Geänderte Mitglieder werden ohne Neuladen übernommen, Zähler bleiben erhalten."""
+    set_power(hass, "sensor.herd_power", "100")
+    set_power(hass, "sensor.oven_power", "200")
+    set_power(hass, "sensor.tv_power", "50")
+    entry = await async_setup_groups(
+        hass,
+        [group("kitchen", ["sensor.herd_power"]), group("living", ["sensor.tv_power"])],
+    )
+    engine = engine_of(hass, entry)
+    engine.energy.async_set_energy("kitchen", {ENERGY_TOTAL: 2.0})
+    group_entities = hass.data[DOMAIN][entry.entry_id][DATA_GROUP_ENTITIES]
+    kitchen = list(group_entities["kitchen"])
+    living = list(group_entities["living"])
+
+    await _async_change_groups(
+        hass,
+        entry,
+        [
+            group("kitchen", ["sensor.herd_power", "sensor.oven_power"]),
+            group("living", ["sensor.tv_power"]),
+        ],
+    )
+
+    assert engine_of(hass, entry) is engine
+    assert engine.group_power("kitchen") == 300
+    assert engine.energy.integrator("kitchen").energy(ENERGY_TOTAL) == pytest.approx(2.0)
+    assert group_entities["kitchen"] == kitchen
+    assert group_entities["living"] == living
+
+
+async def test_renamed_group_recreates_only_its_sensors(hass: HomeAssistant) -> None:
+    """Nur die Sensoren einer umbenannten Gruppe werden neu erzeugt."""
+    set_power(hass, "sensor.herd_power", "100")
+    set_power(hass, "sensor.tv_power", "50")
+    entry = await async_setup_groups(
+        hass,
+        [group("kitchen", ["sensor.herd_power"]), group("living", ["sensor.tv_power"])],
+    )
+    group_entities = hass.data[DOMAIN][entry.entry_id][DATA_GROUP_ENTITIES]
+    kitchen = list(group_entities["kitchen"])
+    living = list(group_entities["living"])
+
+    await _async_change_groups(
+        hass,
+        entry,
+        [
+            group("kitchen", ["sensor.herd_power"]),
+            group("living", ["sensor.tv_power"], **{CONF_GROUP_NAME: "Wohnzimmer"}),
+        ],
+    )
+
+    assert group_entities["kitchen"] == kitchen
+    assert not set(map(id, group_entities["living"])) & set(map(id, living))
@@ -0,0 +1,30 @@
+"""Tests des Snapshots der Aggregation beim Neustart."""
+
+from homeassistant.core import HomeAssistant
+import pytest
+
+from custom_components.power_group_monitor.const import ENERGY_TOTAL
+
+from .common import async_setup_groups, engine_of, group, set_power
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_restart_restores_energy_and_held_power(hass: HomeAssistant) -> None:
+    """Energie und der letzte Wert eines noch nicht geladenen Mitglieds überstehen den Neustart."""
+    set_power(hass, "sensor.herd_power", "100")
+    entry = await async_setup_groups(hass, [group("kitchen", ["sensor.herd_power"])])
+    engine_of(hass, entry).energy.async_set_energy("kitchen", {ENERGY_TOTAL: 3.0})
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    # Die Quelle ist nach dem Neustart noch nicht geladen
+    hass.states.async_remove("sensor.herd_power")
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    engine = engine_of(hass, entry)
+    assert engine.restored
+    assert engine.group_power("kitchen") == 100
+    assert engine.energy.integrator("kitchen").energy(ENERGY_TOTAL) == pytest.approx(3.0, abs=1e-3)
@@ -0,0 +1,39 @@
+"""Tests der stündlichen Langzeitstatistiken."""
+
+from unittest.mock import patch
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+import pytest
+
+from custom_components.power_group_monitor.const import DATA_STATISTICS, DOMAIN
+from custom_components.power_group_monitor.core.statistics import (
+    STATISTIC_POWER,
+    statistic_id,
+)
+
+from .common import async_setup_groups, group, set_power
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_power_rows_contain_minimum_and_maximum(hass: HomeAssistant) -> None:
+    """Die Leistungszeilen enthalten Minimum und Maximum der Stunde."""
+    set_power(hass, "sensor.herd_power", "100")
+    entry = await async_setup_groups(hass, [group("kitchen", ["sensor.herd_power"])])
+    set_power(hass, "sensor.herd_power", "300")
+    await hass.async_block_till_done()
+
+    statistics = hass.data[DOMAIN][entry.entry_id][DATA_STATISTICS]
+    with patch(
+        "custom_components.power_group_monitor.core.statistics.async_add_external_statistics"
+    ) as add_statistics:
+        statistics._async_compile_hour(dt_util.utcnow())
+
+    rows = {
+        metadata["statistic_id"]: rows for (_, metadata, rows), _ in add_statistics.call_args_list
+    }
+    for group_id in ("kitchen", None):
+        (row,) = rows[statistic_id(entry, group_id, STATISTIC_POWER)]
+        assert row["min"] == 100
+        assert row["max"] == 300